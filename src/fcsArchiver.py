@@ -12,8 +12,9 @@
 ##
 #############################################################
 
-import sys,getopt,os.path,shutil,subprocess
-import re,datetime,time,tempfile,copy
+import sys,getopt,os.path,shutil
+import re,datetime,time,tempfile,copy,weakref,threading
+import signal,select,errno
 import sqlite3
 import hashlib
 import socket
@@ -49,8 +50,21 @@ class fcsArchiver(fcsxml.FCSBaseObject):
   archiveSetName = ''       ## Name of backup software selection set
   archiveBatchSize = ''      ## Number of files per batch submission.
 
-  archiveQueue = {}         ## A dict of objects to archive, keyed by archiveSet
-  restoreQueue = {}         ## A dict of objects to restore, keyed by restoreSet
+  archiveQueue = None       ## archiveQueueModel of objects to archive, keyed by archiveSet
+  restoreQueue = None       ## archiveQueueModel of objects to restore, keyed by restoreSet
+  
+  ## Statuses loaded for each of our queue processing phases, see 
+  ## loadArchiveQueue() and loadRestoreQueue()
+  archiveQueuedStatuses = ('archiveQueued','offsiteQueued')
+  archiveProcessStatuses = ('archiveSubmitted','archiveRunning',
+                            'offsiteSubmitted','offsiteRunning',
+                            'archiveFailed','archiveDied','archiveCancelled',
+                            'offsiteFailed','offsiteDied','offsiteCancelled',
+                            'archiveCompleted','offsiteCompleted')
+  restoreQueuedStatuses = ('restoreQueued',)
+  restoreProcessStatuses = ('restoreSubmitted','restoreRunning',
+                            'restoreFailed','restoreDied','restoreCancelled',
+                            'restoreCompleted')
   
   archivePlan = ''          ## PresStore ArchivePlan
   offsiteArchivePlan = ''   ## PresStore ArchivePlan for our offsite set
@@ -117,8 +131,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     self.archiveSetName = 'SELECTION_%s' % datetime.datetime.today().strftime('%Y-%m-%d:%H%M')
     self.archiveBatchSize = 100
     self.archivePath = ''
-    self.archiveQueue = {}
-    self.restoreQueue = {}
+    self.archiveQueue = archiveQueueModel(type='archive')
+    self.restoreQueue = archiveQueueModel(type='restore')
     self.configParser = ''
 
     self.backupSystemName = 'PresStore'
@@ -191,6 +205,11 @@ class fcsArchiver(fcsxml.FCSBaseObject):
         self.nsdchatpath = parser.get('BACKUP','nsdchatpath')
       except:
         pass
+      fcsxml.commandRunner.loadConfiguration(parser)
+      try:
+        fcsxml.memoryMonitor.memoryBudget = parser.getint('GLOBAL','memoryBudget') * 1024
+      except:
+        pass
       try:
         self.trustRestoreChecksumMismatch = parser.getboolean('BACKUP','trustRestoreChecksumMismatch')
       except:
@@ -235,42 +254,94 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     
 
   def connectToSQL(self):
-    '''Open a connection to sqlite db and save the connection at self.sqlConn'''
-    sqlConn = ''
+    '''Returns our persistent connection to our sqlite db, which is shared
+    by all fcsArchiver objects using the same support path. See 
+    :class:`fcsArchiver.archiveDatabase`.'''
     if not self.supportPath:
       self.logger('Support path not set, using PWD: %s!' % os.getcwd(),'warning')
       
     dbPath = os.path.join(self.supportPath,'backupHistory.db')
-    self.logger('connectToSQL() using DBPath:%s' % dbPath,'debug')
     
-    if dbPath and not os.path.exists(dbPath):
-      if os.path.exists(os.path.dirname(dbPath)):
-        self.logger('Creating SQL database at path:\'%s\'' % dbPath,'detailed')
-        try:
-          sqlConn = sqlite3.connect(dbPath)
-          sqlConn.row_factory = sqlite3.Row
-          myCursor = sqlConn.cursor()
-          myCursor.execute('CREATE TABLE archiveHistory(fcsID,'
-            'filePath,checksum,barcode,tapeSet,archiveSet,jobID,completionDate,status)')
-          myCursor.execute('CREATE TABLE archiveQueue(fcsID,filePath,checksum,'
-            'archiveSet,tapeSet,jobID,jobSubmitDate,retryCount,status)')
-          myCursor.execute('CREATE TABLE restoreQueue(fcsID,filePath,'
-            'archiveSet,tapeSet,barcode,jobID,jobSubmitDate,retryCount,status)')
-          sqlConn.commit()
-          myCursor.close()
-        except Exception,err:
-          self.logger('An error occured creating sqlite db at path: %s'
-            ' Error:%s' % (dbPath,err),'error')
-          raise
-    else:
+    archiveDatabase.sharedDatabasesLock.acquire()
+    try:
       try:
-        sqlConn = sqlite3.connect(dbPath)
-        sqlConn.row_factory = sqlite3.Row
-      except Exception, err:
-        self.logger('An error occured opening sqlitedb at: %s Error:%s' % (dbPath,err))
-        raise
-        
-    return sqlConn
+        database = archiveDatabase.sharedDatabases[dbPath]
+      except KeyError:
+        self.logger('connectToSQL() using DBPath:%s' % dbPath,'debug')
+        database = archiveDatabase(dbPath=dbPath)
+        if self.debug:
+          database.debug = True
+        archiveDatabase.sharedDatabases[dbPath] = database
+    finally:
+      archiveDatabase.sharedDatabasesLock.release()
+    
+    try:
+      return database.connection()
+    except Exception, err:
+      self.logger('An error occured opening sqlitedb at: %s Error:%s' 
+                                                    % (dbPath,err),'error')
+      raise
+    
+  #############
+  ## Queue processing phases, used by main() and fcsArchiverDaemon
+  
+  def checkRestoreQueue(self):
+    '''Loads submitted, failed and completed restore records and updates 
+    them, see :func:`processRestoreQueue`'''
+    self.logger('Processing Restore Queues...')
+    self.logOffset += 1
+    try:
+      try:
+        self.loadRestoreQueue(status=self.restoreProcessStatuses)
+        self.processRestoreQueue()
+      except FCSArchiveEmptyQueueError,err:
+        self.logger('Restore Queue is empty.')
+    finally:
+      self.logOffset -= 1
+  
+  def intakeRestoreQueue(self):
+    '''Reads new files from our filesToRestore spool file and submits all
+    queued restore records, see :func:`restoreFilesFromQueue`'''
+    self.logger('Checking for new restore files...')
+    self.logOffset += 1
+    try:
+      try:
+        self.createRestoreQueueFromFile()
+        self.loadRestoreQueue(status=self.restoreQueuedStatuses)
+        self.restoreFilesFromQueue()
+      except FCSArchiveEmptyQueueError,err:
+        self.logger('Restore Queue is empty.')
+    finally:
+      self.logOffset -= 1
+  
+  def checkArchiveQueue(self):
+    '''Loads submitted, failed and completed archive records and updates 
+    them, see :func:`processArchiveQueue`'''
+    self.logger('Processing Archive Queues...')
+    self.logOffset += 1
+    try:
+      try:
+        self.loadArchiveQueue(status=self.archiveProcessStatuses)
+        self.processArchiveQueue()
+      except FCSArchiveEmptyQueueError,err:
+        self.logger('Archive Queue is empty.')
+    finally:
+      self.logOffset -= 1
+  
+  def intakeArchiveQueue(self):
+    '''Reads new files from our filesToArchive spool file and submits all
+    queued archive records, see :func:`archiveFilesFromQueue`'''
+    self.logger('Checking for new archive files...') 
+    self.logOffset += 1
+    try:
+      try:
+        self.createArchiveQueueFromFile()
+        self.loadArchiveQueue(status=self.archiveQueuedStatuses)
+        self.archiveFilesFromQueue()
+      except FCSArchiveEmptyQueueError,err:
+        self.logger('Archive Queue is empty.')
+    finally:
+      self.logOffset -= 1
     
   #############
   ## archiveQueue methods
@@ -291,11 +362,12 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     archiveQueue = self.archiveQueue
     
     ## Fetch our archive sets with status 'archiveQueued'
-    archiveSets = self.archiveSetsWithStatus(status='archiveQueued')
     if self.useOffsitePlan:
       self.logger('archiveFilesFromQueue() looking for offsite queues','debug')
-      archiveSets.update(self.archiveSetsWithStatus(status='offsiteQueued'))
+      archiveSets = self.archiveSetsWithStatus(status=('archiveQueued',
+                                                        'offsiteQueued'))
     else:
+      archiveSets = self.archiveSetsWithStatus(status='archiveQueued')
       self.logger('archiveFilesFromQueue() we are not using an offsite queue!','debug')
     
     ## If we have no found archive sets, abort.
@@ -577,7 +649,7 @@ class fcsArchiver(fcsxml.FCSBaseObject):
         myArchiveSet = archiveSet(name=archiveSetName,type='archive',jobID=archiveSet.jobID)
         if self.debug:
           archiveSet.debug = True
-        self.archiveQueue[archiveSetName] = myArchiveSet
+        self.archiveQueue.addArchiveSet(myArchiveSet)
       else:
         ## If the archive set already exists, make sure it doesn't have more
         ## files then our archiveBatchSize specifies, if so, create a new 
@@ -595,12 +667,14 @@ class fcsArchiver(fcsxml.FCSBaseObject):
             myArchiveSet = archiveSet(name=archiveSetName,type='archive',jobID=archiveSet.jobID)
             if self.debug:
               myArchiveSet.debug = True
-            self.archiveQueue[archiveSetName] = myArchiveSet
+            self.archiveQueue.addArchiveSet(myArchiveSet)
+          else:
+            myArchiveSet = self.archiveQueue[archiveSetName]
           currentSetCount += 1
       
       
       ## Append our archive object to our current set.
-      myArchiveSet.archiveObjects.append(archiveObject)
+      self.archiveQueue.addArchiveObject(archiveObject,setName=myArchiveSet.name)
     
     elif isDuplicate:
       if alreadyArchived and self.preventArchiveDuplicates:
@@ -628,25 +702,61 @@ class fcsArchiver(fcsxml.FCSBaseObject):
       
     return True
 
-  def loadArchiveQueue(self):
+  def queueQueryForStatus(self,table,status=None):
+    '''Returns a (sqlQuery,sqlVars) tuple which selects records from the 
+    provided queue table, in the order they were queued. If status is 
+    provided, only records with matching status are selected (utilizing the
+    table's status index).
+    
+    :param table: Provide the table name: 'archiveQueue' or 'restoreQueue'
+    :type table: str
+    :param status: Provide a status, or a list of statuses to match
+    :type status: str or list
+    
+    :returns: (*tuple*)
+    
+    '''
+    
+    sqlQuery = 'SELECT rowid AS rowid,* FROM %s' % table
+    sqlVars = ()
+    if status:
+      if isinstance(status,basestring):
+        sqlVars = (status,)
+      else:
+        sqlVars = tuple(status)
+      sqlQuery += ' WHERE status IN (%s)' % ','.join(['?'] * len(sqlVars))
+    sqlQuery += ' ORDER BY rowid'
+    
+    return (sqlQuery,sqlVars)
+
+  def loadArchiveQueue(self,status=None):
     '''Function which reads our sqlite database and generates archiveSet objects
-    for queued files'''
+    for queued files. 
+    
+    :param status: Provide a status, or list of statuses to load, defaults to 
+      all records. Each queue processing phase only requires a subset of 
+      statuses, see :attr:`archiveQueuedStatuses` and 
+      :attr:`archiveProcessStatuses`.
+    :type status: str or list
+    
+    '''
     
     ## Load our SQL connection
     sqlConn = self.connectToSQL()
     sqlConn.row_factory = sqlite3.Row
     myCursor = sqlConn.cursor()
     
-    archiveQueue = {}
+    archiveQueue = archiveQueueModel(type='archive')
     
-    ## Query for all entries in our archiveQueue
-    sqlQuery = 'SELECT rowid,* FROM archiveQueue'
-    self.logger('loadArchiveQueue() executing with query: %s'%sqlQuery,'debug')
-    myCursor.execute(sqlQuery)
+    ## Query for entries in our archiveQueue, rows are read from our cursor as
+    ## we go rather than fetched up front.
+    sqlQuery,sqlVars = self.queueQueryForStatus(table='archiveQueue',status=status)
+    self.logger('loadArchiveQueue() executing with query: %s vars: %s','debug',
+                                                    logArgs=(sqlQuery,sqlVars))
+    myCursor.execute(sqlQuery,sqlVars)
     isDuplicate = False
     isConflict = True
-    myResults = myCursor.fetchall()
-    for row in myResults:
+    for row in myCursor:
       ## If we are Python 2.5, convert our row to a dict
       versionInfo = sys.version_info
       if versionInfo[0] == 2 and versionInfo[1] == 5:
@@ -666,7 +776,7 @@ class fcsArchiver(fcsxml.FCSBaseObject):
         myArchiveSet = archiveSet(name=archiveSetName,type='archive',jobID=archiveSetJobID)
         if self.debug:
           myArchiveSet.debug = True
-        archiveQueue[archiveSetName] = myArchiveSet
+        archiveQueue.addArchiveSet(myArchiveSet)
       else: 
         ## If the archive set already exists, make sure it doesn't have more
         ## files then our archiveBatchSize specifies, if so, create a new 
@@ -692,11 +802,11 @@ class fcsArchiver(fcsxml.FCSBaseObject):
         '''
       
       ## Create our archive object from our SQL result and append it to our current set
-      myArchiveObject = archiveObject(action='archive')
+      myArchiveObject = archiveObject(action='archive',owner=self)
       myArchiveObject.loadFromSQLResult(myRow)
-      self.logger('loadArchiveQueue() Adding file to archive batch: %s. Current file count: %s of %s'
-        % (archiveSetName,len(myArchiveSet.archiveObjects),self.archiveBatchSize),'debug')
-      myArchiveSet.archiveObjects.append(myArchiveObject)
+      self.logger('loadArchiveQueue() Adding file to archive batch: %s. Current file count: %s of %s',
+        'debug',logArgs=(archiveSetName,len(myArchiveSet.archiveObjects),self.archiveBatchSize))
+      archiveQueue.addArchiveObject(myArchiveObject,setName=archiveSetName)
       
     ## self.archiveQueue.update(archiveQueue)
     self.archiveQueue = archiveQueue
@@ -705,7 +815,9 @@ class fcsArchiver(fcsxml.FCSBaseObject):
   
   def commitArchiveObjectsInArchiveSet(self,archiveSet):
     '''Commits each archiveObject in the provided archiveSet both to the SQL
-    DB as well as FCS'''
+    DB as well as FCS. SQL records are written in a single transaction (see
+    :func:`commitArchiveObjects`) and FCS records are written in bulk (see
+    :func:`commitArchiveObjectsToFCS`).'''
         
     self.logger('Updating files from set: %s in FCS and Archive DataBase' % archiveSet.name)
     self.logger('commitArchiveObjectsInArchiveSet() committing record for objects in archiveSet:%s' 
@@ -722,81 +834,206 @@ class fcsArchiver(fcsxml.FCSBaseObject):
         self.logger('commitArchiveObjectsInArchiveSet() archiveObject with fcsID:%s'
             ' reports an error: %s' % (archiveObject.fcsID,archiveObject.statusMessage))
 
-      self.commitArchiveObject(archiveObject)
-      try:
-        self.commitArchiveObjectToFCS(archiveObject)
-      except Exception,excp:
-        self.logger('An error occured commiting FCS Asset with ID: %s, ERROR: %s' 
-          % archiveObject.fcsID,excp,'error')
+    self.commitArchiveObjects(archiveSet.archiveObjects)
+    try:
+      self.commitArchiveObjectsToFCS(archiveSet.archiveObjects)
+    except Exception,excp:
+      self.logger('An error occured commiting FCS Assets for archiveSet: %s, ERROR: %s' 
+        % (archiveSet.name,excp),'error')
     return True
 
   def commitArchiveObject(self,archiveObject,sqlConn=None):
     '''Commits the passed archiveObject to our archiveQueue'''
+    return self.commitArchiveObjects([archiveObject],sqlConn=sqlConn)
+
+  def commitArchiveObjects(self,archiveObjects,sqlConn=None):
+    '''Commits the passed archiveObjects to our archiveQueue and restoreQueue
+    tables. All records are written with executemany() in a single 
+    transaction, so a set is committed with one sync to disk rather than one
+    per record.
+    
+    :param archiveObjects: Provide a list of archiveObjects to commit
+    :type archiveObjects: list
+    :param sqlConn: Provide an optional sqlite3 connection, defaults to
+      :func:`connectToSQL`
+    :type sqlConn: sqlite3.Connection
+    
+    :raises: sqlite3.Error
+    :returns: (*bool*)
+    
+    '''
     
     ## Connect to SQL if we weren't provided an sqlConn 
     if sqlConn == None:
       sqlConn = self.connectToSQL()
       sqlConn.row_factory = sqlite3.Row
-      
+    
+    ## Build our rows for each table
+    archiveQueueValues = []
+    restoreQueueValues = []
+    for archiveObject in archiveObjects:
+      self.logger('commitArchiveObjects() committing record with id:%s','debug',
+                                            logArgs=(archiveObject.recordID,))
+      if archiveObject.action == 'archive' or archiveObject.action == 'offsiteArchive':
+        archiveQueueValues.append((archiveObject.fcsID,
+            archiveObject.filePath,
+            archiveObject.checksum,
+            archiveObject.archiveSetName,
+            archiveObject.jobID,
+            archiveObject.tapeSet,
+            archiveObject.submitDate,
+            archiveObject.status,
+            archiveObject.retryCount,
+            archiveObject.recordID,
+          ))
+      elif archiveObject.action == 'restore':
+        restoreQueueValues.append((archiveObject.fcsID,
+            archiveObject.filePath,
+            archiveObject.archiveSetName,
+            archiveObject.tapeSet,
+            archiveObject.barcode,
+            archiveObject.jobID,
+            archiveObject.submitDate,
+            archiveObject.retryCount,
+            archiveObject.status,
+            archiveObject.recordID,
+          ))
+    
+    if not archiveQueueValues and not restoreQueueValues:
+      return True
+    
     myCursor = sqlConn.cursor()
+    try:
+      if archiveQueueValues:
+        myCursor.executemany('UPDATE archiveQueue set fcsID = ?,filePath = ?,'
+          'checksum = ?,archiveSet = ?,jobID = ?,tapeSet = ?, jobSubmitDate = ?,status = ?,'
+          'retryCount = ? WHERE rowid = ?', archiveQueueValues)
+      if restoreQueueValues:
+        myCursor.executemany('UPDATE restoreQueue set fcsID = ?,filePath = ?,'
+          'archiveSet = ?,tapeSet = ?,barcode = ?,jobID = ?,jobSubmitDate = ?,'
+          'retryCount = ?,status = ? WHERE rowid = ?', restoreQueueValues)
+      sqlConn.commit()
+    except:
+      sqlConn.rollback()
+      raise
+    
+    self.logger('commitArchiveObjects() committed %s archiveQueue and %s '
+      'restoreQueue records.','debug',
+      logArgs=(len(archiveQueueValues),len(restoreQueueValues)))
     
-    if archiveObject.action == 'archive' or archiveObject.action == 'offsiteArchive':
-      self.logger('commitArchiveObject() committing record with id:%s' % archiveObject.recordID,'debug')
-      dbValues = (archiveObject.fcsID,
-          archiveObject.filePath,
-          archiveObject.checksum,
-          archiveObject.archiveSetName,
-          archiveObject.jobID,
-          archiveObject.tapeSet,
-          archiveObject.submitDate,
-          archiveObject.status,
-          archiveObject.retryCount,
-          archiveObject.recordID,
-        )
-      
-      ## Execute our SQL Query
-      myCursor.execute('UPDATE archiveQueue set fcsID = ?,filePath = ?,'
-        'checksum = ?,archiveSet = ?,jobID = ?,tapeSet = ?, jobSubmitDate = ?,status = ?,'
-        'retryCount = ? WHERE rowid = ?', dbValues)
-    elif archiveObject.action == 'restore':
-      self.logger('commitArchiveObject() committing record with id:%s' % archiveObject.recordID,'debug')
-      dbValues = (archiveObject.fcsID,
-          archiveObject.filePath,
-          archiveObject.archiveSetName,
-          archiveObject.tapeSet,
-          archiveObject.barcode,
-          archiveObject.jobID,
-          archiveObject.submitDate,
-          archiveObject.retryCount,
-          archiveObject.status,
-          archiveObject.recordID,
-        )
-      
-      ## Execute our SQL Query
-      myCursor.execute('UPDATE restoreQueue set fcsID = ?,filePath = ?,'
-        'archiveSet = ?,tapeSet = ?,barcode = ?,jobID = ?,jobSubmitDate = ?,'
-        'retryCount = ?,status = ? WHERE rowid = ?', dbValues)
-        
-    commitResult = sqlConn.commit()
     return True
 
   def commitArchiveObjectToFCS(self,archiveObject):
-    '''Reports archive object to FCS'''
+    '''Reports archive object to FCS. See :func:`commitArchiveObjectsToFCS`
+    to report many archive objects at once.'''
     
-    ## Get our FCS ID
-    fcsID = archiveObject.fcsID
+    ## Fetch our fcsxml.FCSVRClient object, loading it if necessary
+    try:
+      fcsObj = archiveObject.getFCSObject()
+    except:
+      self.logger("Could not commit file: %s to FCS, object could not be"
+        " loaded!" % archiveObject.filePath,'error')
+      return False
+    
+    self.appendStatusToFCSObject(archiveObject,fcsObj)
+    fcsObj.setMD()
+    self.restoreFCSObjectForArchiveObject(archiveObject,fcsObj)
+    
+    return
+
+  def commitArchiveObjectsToFCS(self,archiveObjects):
+    '''Reports many archive objects to FCS. Assets which are not already 
+    loaded are resolved with bulk searches (see 
+    :func:`fcsxml.FCSVRClient.assetsWithIDs`) and metadata is written via 
+    :func:`fcsxml.FCSVRClient.setMDForEntities`, which coalesces records for 
+    the same asset and runs writes across the shared command pool.
+    
+    If several archiveObjects reference the same asset, only the last is
+    reported.
+    
+    :param archiveObjects: Provide a list of archiveObjects to report
+    :type archiveObjects: list
+    
+    :returns: (*dict*) -- Dictionary keyed by entity path, with a value of
+      True for successful writes, or the raised exception for failures.
+    
+    '''
+    
+    myFCSVRClient = fcsxml.FCSVRClient()
+    if self.configParser:
+      myFCSVRClient.loadConfiguration(self.configParser)
+    
+    ## Report each asset once, objects which share an fcsID share an fcsObj
+    uniqueObjects = {}
+    for archiveObject in archiveObjects:
+      uniqueObjects[archiveObject.fcsID or id(archiveObject)] = archiveObject
+    archiveObjects = [archiveObject for archiveObject in archiveObjects
+          if uniqueObjects[archiveObject.fcsID or id(archiveObject)] is archiveObject]
+    
+    ## Find our objects which need to be loaded and load them in bulk. 
+    fcsObjects = {}
+    unloadedIDs = []
+    for archiveObject in archiveObjects:
+      if archiveObject.fcsObject is not None:
+        fcsObjects[archiveObject] = archiveObject.fcsObject
+        continue
+      unloadedIDs.append(archiveObject.fcsID)
     
-    ## Create our fcsxml.FCSVRClient object and load our config
-    if not archiveObject.fcsObject:
+    loadedAssets = {}
+    if unloadedIDs:
       try:
-        archiveObject.loadFCSObject()
-      except:
-        self.logger("Could not commit file: %s to FCS, object could not be"
-          " loaded!" % archiveObject.filePath,'error')
-        return False
-        
-    fcsObj = archiveObject.fcsObject
-        
+        for fcsObj in myFCSVRClient.assetsWithIDs(unloadedIDs,
+                                                          ignoreMissing=True):
+          loadedAssets['%s' % fcsObj.entityID] = fcsObj
+      except Exception,excp:
+        self.logger('commitArchiveObjectsToFCS() Bulk load of %s assets failed,'
+          ' loading individually. Error: %s' % (len(unloadedIDs),excp),'warning')
+    
+    ## Append our status to each object.
+    entities = []
+    for archiveObject in archiveObjects:
+      fcsObj = fcsObjects.get(archiveObject)
+      if fcsObj is None:
+        fcsObj = loadedAssets.get('%s' % archiveObject.fcsID)
+        if fcsObj is not None:
+          archiveObject.setFCSObject(fcsObj)
+          fcsObjects[archiveObject] = fcsObj
+      if fcsObj is None:
+        try:
+          fcsObj = archiveObject.getFCSObject()
+          fcsObjects[archiveObject] = fcsObj
+        except:
+          self.logger("Could not commit file: %s to FCS, object could not be"
+            " loaded!" % archiveObject.filePath,'error')
+          continue
+      try:
+        self.appendStatusToFCSObject(archiveObject,fcsObj)
+      except Exception,excp:
+        self.logger('An error occured commiting FCS Asset with ID: %s, ERROR: %s' 
+          % (archiveObject.fcsID,excp),'error')
+        del fcsObjects[archiveObject]
+        continue
+      entities.append(fcsObj)
+    
+    ## Write our metadata
+    results = myFCSVRClient.setMDForEntities(entities)
+    
+    ## Perform any necessary restores.
+    for archiveObject in archiveObjects:
+      if not archiveObject in fcsObjects:
+        continue
+      fcsObj = fcsObjects[archiveObject]
+      if not results.get(fcsObj.entityPath()) is True:
+        continue
+      self.restoreFCSObjectForArchiveObject(archiveObject,fcsObj)
+    
+    return results
+
+  def appendStatusToFCSObject(self,archiveObject,fcsObj):
+    '''Appends the Archive State, Archive History and barcode fields for 
+    the provided archiveObject to fcsObj. Metadata is not written, see
+    :func:`commitArchiveObjectToFCS`'''
+    
     ## Get our tapeset
     tapeSet = archiveObject.tapeSet
         
@@ -902,7 +1139,12 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ## Append our message
     fcsObj.appendValueForField('Archive History',value=fcsMessage,useTimestamp=True)
   
-    fcsObj.setMD()
+    return
+
+  def restoreFCSObjectForArchiveObject(self,archiveObject,fcsObj):
+    '''Restores fcsObj in FCS if archiveObject reports a completed 
+    restore.'''
+    status = archiveObject.status
     
     ## If the status is 'restoreCompleted', tell the restore object to restore 
     ## in FCS. This will ensure that the asset is properly restored even if the 
@@ -976,35 +1218,89 @@ class fcsArchiver(fcsxml.FCSBaseObject):
 
   def commitArchiveObjectToArchiveHistory(self,archiveObject):
     '''Commits an archive object to our archiveHistory SQL table'''
-    self.logger('commitArchiveObjectToArchiveHistory() committing record '
-      ' with path:%s' % archiveObject.filePath,'debug')
-    if archiveObject.action == 'restore':   
-      completionDate = archiveObject.restoreDate
-    else:
-       completionDate = archiveObject.archiveDate
-    
-    ## Build our values array
-    dbValues = (archiveObject.fcsID,
-        archiveObject.filePath,
-        archiveObject.checksum,
-        archiveObject.barcode,
-        archiveObject.tapeSet,
-        archiveObject.archiveSetName,
-        archiveObject.jobID,
-        completionDate,
-        archiveObject.status,
-    )
+    return self.commitArchiveObjectsToArchiveHistory([archiveObject])
+  
+  def commitArchiveObjectsToArchiveHistory(self,archiveObjects,
+                                          dequeueObjects=None,sqlConn=None):
+    '''Commits the passed archive objects to our archiveHistory SQL table 
+    and optionally removes objects from our archiveQueue table (and our 
+    loaded queue). Inserts and deletes are performed with executemany() in a
+    single transaction.
+    
+    :param archiveObjects: Provide a list of archiveObjects to record
+    :type archiveObjects: list
+    :param dequeueObjects: Provide a list of archiveObjects to remove from 
+      our archiveQueue
+    :type dequeueObjects: list
+    :param sqlConn: Provide an optional sqlite3 connection, defaults to
+      :func:`connectToSQL`
+    :type sqlConn: sqlite3.Connection
+    
+    :raises: sqlite3.Error
     
-    ## Connect to SQL
-    sqlConn = self.connectToSQL()
-    sqlConn.row_factory = sqlite3.Row
+    '''
+    
+    if dequeueObjects is None:
+      dequeueObjects = []
+    
+    ## Build our values for each table
+    historyValues = []
+    for archiveObject in archiveObjects:
+      self.logger('commitArchiveObjectsToArchiveHistory() committing record '
+        ' with path:%s','debug',logArgs=(archiveObject.filePath,))
+      if archiveObject.action == 'restore':   
+        completionDate = archiveObject.restoreDate
+      else:
+        completionDate = archiveObject.archiveDate
+      historyValues.append((archiveObject.fcsID,
+          archiveObject.filePath,
+          archiveObject.checksum,
+          archiveObject.barcode,
+          archiveObject.tapeSet,
+          archiveObject.archiveSetName,
+          archiveObject.jobID,
+          completionDate,
+          archiveObject.status,
+      ))
+    
+    deleteByIDValues = []
+    deleteByPathValues = []
+    for archiveObject in dequeueObjects:
+      if archiveObject.recordID:
+        deleteByIDValues.append((archiveObject.recordID,archiveObject.tapeSet))
+      elif archiveObject.filePath:
+        deleteByPathValues.append((archiveObject.filePath,archiveObject.tapeSet))
+    
+    ## Connect to SQL if we weren't provided an sqlConn 
+    if sqlConn == None:
+      sqlConn = self.connectToSQL()
+      sqlConn.row_factory = sqlite3.Row
     
     ## Perform our commit
     myCursor = sqlConn.cursor()
-    myCursor.execute('INSERT INTO archiveHistory (fcsID,filePath,checksum,'
-      'barcode,tapeSet,archiveSet,jobID,completionDate,status) '
-      'VALUES(?,?,?,?,?,?,?,?,?)',dbValues)
-    commitResult = sqlConn.commit()
+    try:
+      if historyValues:
+        myCursor.executemany('INSERT INTO archiveHistory (fcsID,filePath,'
+          'checksum,barcode,tapeSet,archiveSet,jobID,completionDate,status) '
+          'VALUES(?,?,?,?,?,?,?,?,?)',historyValues)
+      if deleteByIDValues:
+        myCursor.executemany('DELETE FROM archiveQueue WHERE rowid = ? AND '
+                                              'tapeSet = ?',deleteByIDValues)
+      if deleteByPathValues:
+        myCursor.executemany('DELETE FROM archiveQueue WHERE filePath = ? AND '
+                                            'tapeSet = ?',deleteByPathValues)
+      sqlConn.commit()
+    except:
+      sqlConn.rollback()
+      raise
+    
+    ## Remove the objects from our loaded queue
+    for archiveObject in dequeueObjects:
+      self.archiveQueue.removeArchiveObject(archiveObject)
+    
+    self.logger('commitArchiveObjectsToArchiveHistory() committed %s '
+      'archiveHistory records and removed %s archiveQueue records.','debug',
+      logArgs=(len(historyValues),len(dequeueObjects)))
     
     return
     
@@ -1019,18 +1315,21 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     
     if archiveObject.recordID:
       self.logger('removeArchiveObjectFromArchiveQueue() removing record with '
-        ' id:%s tapeSet:%s' % (archiveObject.recordID,archiveObject.tapeSet),'debug')
+        ' id:%s tapeSet:%s','debug',logArgs=(archiveObject.recordID,archiveObject.tapeSet))
       dbValues = (archiveObject.recordID,archiveObject.tapeSet)    
       myCursor.execute('DELETE FROM archiveQueue WHERE rowid = ? AND tapeSet = ?', dbValues)
     elif archiveObject.filePath:
       self.logger('removeArchiveObjectFromArchiveQueue() removing record with'
-        ' filePath:%s tapeSet:%s' % (archiveObject.recordID,archiveObject.tapeSet),'debug')
+        ' filePath:%s tapeSet:%s','debug',logArgs=(archiveObject.recordID,archiveObject.tapeSet))
       dbValues = (archiveObject.filePath,archiveObject.tapeSet)
       myCursor.execute('DELETE FROM archiveQueue WHERE filePath = ? AND tapeSet = ?', dbValues)
    
     ## Execute our SQL Query
     commitResult = sqlConn.commit()
     
+    ## Remove the object from our loaded queue
+    self.archiveQueue.removeArchiveObject(archiveObject)
+    
     return
 
   def removeArchiveObjectFromRestoreQueue(self,restoreObject):
@@ -1055,6 +1354,9 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ## Execute our SQL Query
     commitResult = sqlConn.commit()
     
+    ## Remove the object from our loaded queue
+    self.restoreQueue.removeArchiveObject(restoreObject)
+    
     return
 
 
@@ -1071,7 +1373,7 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ## submit our SQL UPDATE Query
     myCursor.execute("UPDATE archiveQueue set status = ? "
       "WHERE archiveSet = ?", (u"%s" % status,u"%s" % archiveSet))
-    commitResult = self.sqlConn.commit()
+    commitResult = sqlConn.commit()
     
     return
 
@@ -1095,34 +1397,20 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     '''Method which returns a dictionary, keyed by the selection set name,
     which match the provided status, if a set contains multiple objects with
     different status, we will return a set only with objects matching the 
-    provided status'''
+    provided status. 
     
-    matchedSets = {}
+    :param status: Provide a status, or a list of statuses to match
+    :type status: str or list
     
-    for setName,set in self.archiveQueue.iteritems():
-      self.logger('archiveSetsWithStatus() Checking set: %s for objects with status: %s'
-        % (setName,status),'debug')
-      modifiedSet = copy.copy(set)
-      modifiedSet.archiveObjects = []
-      for theArchiveObject in set.archiveObjects:
-        ##self.logger('archiveSetsWithStatus() Checking entry: %s with status: %s'
-        ##  % (theArchiveObject.fcsID,archiveObject.status),'debug')
-        if theArchiveObject.status == status:
-          ##self.logger('archiveSetsWithStatus() Found matching entry: %s with status: %s'
-          ##  % (archiveObject.fcsID,archiveObject.status),'debug')
-          modifiedSet.archiveObjects.append(theArchiveObject)
-        else:
-          ##self.logger('archiveSetsWithStatus() Found non-matching entry: %s with status: %s, removing from results!'
-          ##  % (theArchiveObject.fcsID,theArchiveObject.status),'debug')
-          pass
-          
-      if len(modifiedSet.archiveObjects) > 0:
-        self.logger('archiveSetsWithStatus() Set %s contains %s objects with status: %s'
-          % (setName,len(modifiedSet.archiveObjects),status),'debug')
-        matchedSets[setName] = modifiedSet
+    :returns: (*dict*) -- Dictionary of :class:`archiveSet` objects, see
+      :func:`archiveQueueModel.archiveSetsWithStatus`
+    
+    '''
     
-    self.logger('archiveSetsWithStatus() found %s matching sets with status: %s' 
-      % (len(matchedSets),status),'debug')
+    matchedSets = self.archiveQueue.archiveSetsWithStatus(status)
+    
+    self.logger('archiveSetsWithStatus() found %s matching sets with status: %s',
+      'debug',logArgs=(len(matchedSets),status))
     return matchedSets
   
   def performArchiveStatusCheck(self):
@@ -1140,19 +1428,19 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ##self.loadArchiveQueue()
     
     ## Build a dictionary of archiveSets with 'archiveSubmitted' or 'archiveRunning' status
-    myArchiveSets = self.archiveSetsWithStatus(status='archiveSubmitted')
-    myArchiveSets.update(self.archiveSetsWithStatus(status='archiveRunning'))
-    myArchiveSets.update(self.archiveSetsWithStatus(status='offsiteSubmitted'))
-    myArchiveSets.update(self.archiveSetsWithStatus(status='offsiteRunning'))
+    myArchiveSets = self.archiveSetsWithStatus(status=('archiveSubmitted',
+                                                      'archiveRunning',
+                                                      'offsiteSubmitted',
+                                                      'offsiteRunning'))
     
     
     ## Build a dictionary of archiveSets with 'archiveFailed' status
-    myFailedArchiveSets = self.archiveSetsWithStatus(status='archiveFailed')
-    myFailedArchiveSets.update(self.archiveSetsWithStatus(status='archiveDied'))
-    myFailedArchiveSets.update(self.archiveSetsWithStatus(status='archiveCancelled'))
-    myFailedArchiveSets.update(self.archiveSetsWithStatus(status='offsiteFailed'))
-    myFailedArchiveSets.update(self.archiveSetsWithStatus(status='offsiteDied'))
-    myFailedArchiveSets.update(self.archiveSetsWithStatus(status='offsiteCancelled'))
+    myFailedArchiveSets = self.archiveSetsWithStatus(status=('archiveFailed',
+                                                      'archiveDied',
+                                                      'archiveCancelled',
+                                                      'offsiteFailed',
+                                                      'offsiteDied',
+                                                      'offsiteCancelled'))
 
     
     ## Process our submitted and running archiveSets
@@ -1222,56 +1510,66 @@ class fcsArchiver(fcsxml.FCSBaseObject):
       
     ## Fetch our completed sets
     completeDate = datetime.datetime.today()
-    myCompletedArchiveSets = self.archiveSetsWithStatus(status='archiveCompleted')
-    myCompletedArchiveSets.update(self.archiveSetsWithStatus(status='offsiteCompleted'))
+    myCompletedArchiveSets = self.archiveSetsWithStatus(status=('archiveCompleted',
+                                                        'offsiteCompleted'))
     if len(myCompletedArchiveSets) > 0:
       self.logger('Cleaning up completed archive sets','detailed')
       self.logOffset += 1 
 
       for setName,set in myCompletedArchiveSets.iteritems():
         ## For each object in the set, lookup and set the tape barcode label
+        completedObjects = []
         for theArchiveObject in set.archiveObjects:
           try:
             barcode = self.barcodeForArchiveObject(theArchiveObject)
             theArchiveObject.barcode = barcode
             theArchiveObject.archiveDate = completeDate
-            ## Submit the archive object for inclusion into our archiveHistory table
-            self.commitArchiveObjectToArchiveHistory(theArchiveObject)
           except FCSArchiveFileNotFoundInIndex:
             message = ("An error occured cleaning up file: \'%s\' %s reports"
               " that the file could not be found in the %s index!"
               % (theArchiveObject.filePath,self.backupSystem,theArchiveObject.tapeSet))
-            self.logger(error=message,status='error')
+            self.logger(message,'error')
             theArchiveObject.wasError(error=message,status='error')
-            self.commitArchiveObject(theArchiveObject)
-            set.errorObjects.append(archiveObject)
+            set.errorObjects.append(theArchiveObject)
             continue
           except Exception, exp:
             message = ("An error occured cleaning up file: \'%s\' %s reports an"
               " unknown error cleaning up the file. Error: %s"
               % (theArchiveObject.filePath,self.backupSystem,exp))
             theArchiveObject.wasError(error=message,status='error')
-            self.commitArchiveObject(theArchiveObject)
             set.errorObjects.append(theArchiveObject)
             continue
-          
-          ## Report to FCS
-          try:
-            self.commitArchiveObjectToFCS(theArchiveObject)
-          except Exception,excp:
-            self.logger('An error occured commiting FCS Asset with ID: %s, ERROR: %s' 
-              % archiveObject.fcsID,excp,'error')
-
-          
-          ## If the tapeSet is onsite, and we are set to generate offsite archives
-          ## Change the object status to 'archiveQueued' and tapeset to 'offsite'
+          completedObjects.append(theArchiveObject)
+        
+        ## Report to FCS
+        try:
+          self.commitArchiveObjectsToFCS(completedObjects)
+        except Exception,excp:
+          self.logger('An error occured commiting FCS Assets for archiveSet: %s,'
+            ' ERROR: %s' % (setName,excp),'error')
+        
+        ## If the tapeSet is onsite, and we are set to generate offsite archives
+        ## Change the object status to 'offsiteQueued' and tapeset to 'offsite',
+        ## otherwise clear the archive object out of our archive queue
+        requeuedObjects = []
+        dequeueObjects = []
+        for theArchiveObject in completedObjects:
           if theArchiveObject.tapeSet == 'onsite' and self.useOffsitePlan:
-            theArchiveObject.setTapeSet('offsite')
-            theArchiveObject.setStatus('offsiteQueued')
-            self.commitArchiveObject(theArchiveObject)
+            requeuedObjects.append(theArchiveObject)
           else:
-            ## Clear the archive object out of our archive queue
-            self.removeArchiveObjectFromArchiveQueue(theArchiveObject)
+            dequeueObjects.append(theArchiveObject)
+        
+        ## Submit our objects for inclusion into our archiveHistory table,
+        ## before updating the status of our requeued objects.
+        self.commitArchiveObjectsToArchiveHistory(completedObjects,
+                                                dequeueObjects=dequeueObjects)
+        for theArchiveObject in requeuedObjects:
+          theArchiveObject.setTapeSet('offsite')
+          theArchiveObject.setStatus('offsiteQueued')
+        
+        updatedObjects = list(set.errorObjects) + requeuedObjects
+        if updatedObjects:
+          self.commitArchiveObjects(updatedObjects)
         
       self.logOffset -= 1 
  
@@ -1620,18 +1918,18 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ## If we have found the file to exist on disk in an acceptable form,
     ## mark it as restoreCompleted
     if onDisk:
-      restoreObject.archiveSet = 'ondisk'
+      restoreObject.archiveSetName = 'ondisk'
       restoreObject.status = 'restoreCompleted'
       restoreObject.barcode = 'archiveDisk'
     else:
-      restoreObject.archiveSet = ''
+      restoreObject.archiveSetName = ''
       restoreObject.status = 'restoreQueued'
     
     ## If we're here we haven't detected a duplicate, add the file to the
     ## Queue.
     sqlVars = (restoreObject.fcsID,
         restoreObject.filePath,
-        restoreObject.archiveSet,
+        restoreObject.archiveSetName,
         restoreObject.barcode,
         restoreObject.retryCount,
         restoreObject.status,
@@ -1647,29 +1945,38 @@ class fcsArchiver(fcsxml.FCSBaseObject):
       newRestoreSet = archiveSet(name=restoreSetName,type='restore')
       if self.debug:
         newRestoreSet.debug = True
-      self.restoreQueue[restoreSetName] = newRestoreSet
+      self.restoreQueue.addArchiveSet(newRestoreSet)
     
-    self.restoreQueue[restoreSetName].archiveObjects.append(restoreObject)
+    self.restoreQueue.addArchiveObject(restoreObject,setName=restoreSetName)
   
-  def loadRestoreQueue(self):
+  def loadRestoreQueue(self,status=None):
     '''Function which reads our sqlite database and generates archiveSet objects
-    for queued files'''
+    for queued files
+    
+    :param status: Provide a status, or list of statuses to load, defaults to 
+      all records. Each queue processing phase only requires a subset of 
+      statuses, see :attr:`restoreQueuedStatuses` and 
+      :attr:`restoreProcessStatuses`.
+    :type status: str or list
+    
+    '''
     
     ## Load our SQL connection
     sqlConn = self.connectToSQL()
     sqlConn.row_factory = sqlite3.Row
     myCursor = sqlConn.cursor()
     
-    restoreQueue = {}
+    restoreQueue = archiveQueueModel(type='restore')
     
-    ## Query for all entries in our archiveQueue
-    sqlQuery = 'SELECT rowid,* FROM restoreQueue'
-    self.logger('loadRestoreQueue() executing with query: %s' % sqlQuery,'debug')
-    myCursor.execute(sqlQuery)
+    ## Query for entries in our restoreQueue, rows are read from our cursor as
+    ## we go rather than fetched up front.
+    sqlQuery,sqlVars = self.queueQueryForStatus(table='restoreQueue',status=status)
+    self.logger('loadRestoreQueue() executing with query: %s vars: %s','debug',
+                                                    logArgs=(sqlQuery,sqlVars))
+    myCursor.execute(sqlQuery,sqlVars)
     isDuplicate = False
     isConflict = True
-    myResults = myCursor.fetchall()
-    for row in myResults:
+    for row in myCursor:
       
       ## If we are Python 2.5, convert our row to a dict
       versionInfo = sys.version_info
@@ -1687,12 +1994,11 @@ class fcsArchiver(fcsxml.FCSBaseObject):
         newRestoreSet = archiveSet(name=restoreSetName,type='restore',jobID=restoreSetJobID)
         if self.debug:
           newRestoreSet.debug = True
-        restoreQueue[restoreSetName] = newRestoreSet
+        restoreQueue.addArchiveSet(newRestoreSet)
       
-      myRestoreSet = restoreQueue[restoreSetName]
-      myRestoreObject = archiveObject(action='restore')
+      myRestoreObject = archiveObject(action='restore',owner=self)
       myRestoreObject.loadFromSQLResult(myRow)
-      restoreQueue[restoreSetName].archiveObjects.append(myRestoreObject)
+      restoreQueue.addArchiveObject(myRestoreObject,setName=restoreSetName)
       
     ##self.restoreQueue.update(restoreQueue)
     self.restoreQueue = restoreQueue
@@ -1702,14 +2008,22 @@ class fcsArchiver(fcsxml.FCSBaseObject):
   
   def restoreSetsWithStatus(self,status):
     '''Method which returns a dictionary, keyed by the selection set name,
-    which match the provided status'''
+    which match the provided status, if a set contains multiple objects with
+    different status, we will return a set only with objects matching the 
+    provided status.
     
-    matchedSets = {}
+    :param status: Provide a status, or a list of statuses to match
+    :type status: str or list
     
-    for setName,set in self.restoreQueue.iteritems():
-      if set.getStatus() == status:
-        matchedSets[setName] = set
-        
+    :returns: (*dict*) -- Dictionary of :class:`archiveSet` objects, see
+      :func:`archiveQueueModel.archiveSetsWithStatus`
+    
+    '''
+    
+    matchedSets = self.restoreQueue.archiveSetsWithStatus(status)
+    
+    self.logger('restoreSetsWithStatus() found %s matching sets with status: %s',
+      'debug',logArgs=(len(matchedSets),status))
     return matchedSets
   
   def performRestoreStatusCheck(self):
@@ -1723,13 +2037,13 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     
     
     ## Build a dictionary of archiveSets with 'restoreSubmitted' or 'restoreRunning' status
-    myRestoreSets = self.restoreSetsWithStatus(status='restoreSubmitted')
-    myRestoreSets.update(self.restoreSetsWithStatus(status='restoreRunning'))
+    myRestoreSets = self.restoreSetsWithStatus(status=('restoreSubmitted',
+                                                      'restoreRunning'))
     
     ## Build a dictionary of archiveSets with 'archiveFailed' status
-    myFailedRestoreSets = self.restoreSetsWithStatus(status='restoreFailed')
-    myFailedRestoreSets.update(self.restoreSetsWithStatus(status='restoreDied'))
-    myFailedRestoreSets.update(self.restoreSetsWithStatus(status='restoreCancelled'))
+    myFailedRestoreSets = self.restoreSetsWithStatus(status=('restoreFailed',
+                                                      'restoreDied',
+                                                      'restoreCancelled'))
     
     ## Process our submitted and running archiveSets
     self.logger('Found %s running restore jobs.' % len(myRestoreSets)) 
@@ -1836,17 +2150,15 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ## submit our SQL UPDATE Query
     myCursor.execute("UPDATE restoreQueue set status = ? "
       "WHERE restoreSet = ?", (u"%s" % status,u"%s" % restoreSet))
-    commitResult = self.sqlConn.commit()
+    commitResult = sqlConn.commit()
   
   def createArchiveObjectFromFilePath(self,filePath):
     '''Returns an archiveObject loaded from provided filepath. We utilize
     fcsvr_client to fetch FCS data'''
     
-    newArchiveObject = archiveObject()
+    newArchiveObject = archiveObject(owner=self)
     newArchiveObject.archiveSetName = self.archiveSetName
     newArchiveObject.archivePath = self.archivePath
-    if self.debug:
-      newArchiveObject.debug = True
     
     newArchiveObject.loadForFileAtPath(filePath)          
     return newArchiveObject 
@@ -1857,11 +2169,9 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     
     self.logger('createRestoreObjectFromFilePath() hit for file path: %s' % filePath,'debug')
     
-    newRestoreObject = archiveObject(action='restore')
+    newRestoreObject = archiveObject(action='restore',owner=self)
     newRestoreObject.archiveSetName = self.archiveSetName
     newRestoreObject.archivePath = self.archivePath
-    if self.debug:
-      newRestoreObject.debug = True
     newRestoreObject.loadForFileAtPath(filePath)          
     
     return newRestoreObject 
@@ -1884,10 +2194,7 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     archivePath = archiveObject.filePath
     onlinePath = archiveObject.onlinePath
     if not onlinePath:
-      if not archiveObject.fcsObject:
-        archiveObject.loadFCSObject()
-        
-      myFCSVRClient = archiveObject.fcsObject
+      myFCSVRClient = archiveObject.getFCSObject()
       if self.configParser:
         myFCSVRClient.loadConfiguration(self.configParser)
       onlinePath = myFCSVRClient.getFSPathFromArchivePath(archivePath)
@@ -1931,17 +2238,19 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     
     tapeList = []
     
-    ## Get our appropriate restoreSets
-    restoreSets = self.restoreSetsWithStatus(status='restoreSubmitted')
-    restoreSets.update(self.restoreSetsWithStatus(status='restoreRunning'))    
-          
-    ##self.logger('loadRestoreQueue() result row keys:%s rowID:%s' % (row.keys(),row['rowid']),'debug')
-    for setName,set in restoreSets.iteritems():
-      for archiveObject in set.archiveObjects:
-        if archiveObject.status == 'restoreSubmitted' or archiveObject.status == 'restoreRunning':
-          barcode = archiveObject.barcode
-          if not barcode in tapeList:
-            tapeList.append(barcode)
+    ## Query our database rather than our in-memory queue, which may only 
+    ## hold the statuses loaded for the current processing phase.
+    activeStatuses = ('restoreSubmitted','restoreRunning')
+    sqlConn = self.connectToSQL()
+    myCursor = sqlConn.cursor()
+    myCursor.execute('SELECT DISTINCT barcode FROM restoreQueue WHERE status '
+                      'IN (%s)' % ','.join('?' * len(activeStatuses)),
+                      activeStatuses)
+    
+    for row in myCursor:
+      barcode = row[0]
+      if barcode and not barcode in tapeList:
+        tapeList.append(barcode)
       
     self.logger('barcodeListForActiveRestoreJobs() Found %s tapes in use by active restore jobs.' % len(tapeList),'debug')
     return tapeList
@@ -2024,39 +2333,25 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     sqlite3.Row.keys(). Accepts optional parameter table, which is used to
     specify the table that we are creating the result set for.'''
     
-    keyArray = []
     resultsDict = {}
-    if table == 'archiveQueue':
-      if len(row) == 10:
-        keyArray = ['rowid','fcsID','filePath','checksum','archiveSet','tapeSet',
-                    'jobID','jobSubmitDate','retryCount','status']
-      elif len(row) == 9:
-        keyArray = ['fcsID','filePath','checksum','archiveSet','tapeSet',
-                    'jobID','jobSubmitDate','retryCount','status']
-      else:
-        raise RuntimeError('createDictFromSQLRow() Recieved incorrect item count'
-                ' for table:%s expected 9 or 10, recieved:%s' %(table,len(row)));
-    
-    elif table == 'restoreQueue':
-      if len(row) == 10:
-        keyArray = ['rowid','fcsID','filePath','archiveSet','tapeSet','barcode',
-                    'jobID','jobSubmitDate','retryCount','status']
-      elif len(row) == 9:
-        keyArray = ['fcsID','filePath','archiveSet','tapeSet','barcode',
-                    'jobID','jobSubmitDate','retryCount','status']
-      else:
-        raise RuntimeError('createDictFromSQLRow() Recieved incorrect item count'
-                ' for table:%s expected 9 or 10, recieved:%s' %(table,len(row)));
-    elif table == 'archiveHistory':
-      if len(row) == 10:
-        keyArray = ['rowid','fcsID','filePath','checksum','barcode','tapeSet',
-                    'archiveSet','jobID','completionDate','status']
-      elif len(row) == 9:
-        keyArray = ['fcsID','filePath','checksum','barcode','tapeSet',
-                    'archiveSet','jobID','completionDate','status']
-      else:
-        raise RuntimeError('createDictFromSQLRow() Recieved incorrect item count'
-                ' for table:%s expected 9 or 10, recieved:%s' %(table,len(row)));
+    try:
+      columns = archiveDatabase.tableColumns[table]
+    except KeyError:
+      raise RuntimeError('createDictFromSQLRow() Recieved unknown table:%s' 
+                                                                    % table)
+    
+    ## Rows may include our rowid (SELECT rowid AS rowid,*) and our recordID primary 
+    ## key
+    if len(row) == len(columns) + 2:
+      keyArray = ['rowid','recordID'] + columns
+    elif len(row) == len(columns) + 1:
+      keyArray = ['recordID'] + columns
+    elif len(row) == len(columns):
+      keyArray = columns
+    else:
+      raise RuntimeError('createDictFromSQLRow() Recieved incorrect item count'
+              ' for table:%s expected %s to %s, recieved:%s' % (table,
+              len(columns),len(columns) + 2,len(row)));
     
     ## Generate our dict based upon index number
     i=0
@@ -2122,12 +2417,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ## Create our ArchiveSelection handler.
     selectionCMDString = '%s -c ArchiveSelection create localhost "%s"' % (nsdchatCMD,archivePlan)
     self.logger('nsdchatSubmitArchiveJobForArchiveSet() Running Command: (%s)' % selectionCMDString,'debug')
-    selectionCMD = subprocess.Popen(selectionCMDString,
-                            shell=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            universal_newlines=True)
-    selectionCMD_stdout,selectionCMD_stderr = selectionCMD.communicate()
+    selectionCMD = self.runCommand(selectionCMDString)
+    selectionCMD_stdout,selectionCMD_stderr = selectionCMD.stdout,selectionCMD.stderr
 
     if not selectionCMD.returncode == 0:
       theError = "An error occured creating the ArchiveSelection: %s" % self.nsdchatError()
@@ -2152,12 +2443,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
       addEntryCMDString = ('%s -c ArchiveSelection "%s" addentry {"%s"}' 
                               % (nsdchatCMD,archiveSelection,archiveObject.filePath))
       self.logger('nsdchatSubmitArchiveJobForArchiveSet() Running Command: (%s)' % addEntryCMDString,'debug')
-      addEntryCMD = subprocess.Popen(addEntryCMDString,
-                              shell=True,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True)
-      addEntryCMD_stdout,addEntryCMD_stderr = addEntryCMD.communicate()
+      addEntryCMD = self.runCommand(addEntryCMDString)
+      addEntryCMD_stdout,addEntryCMD_stderr = addEntryCMD.stdout,addEntryCMD.stderr
 
       if not addEntryCMD.returncode == 0:
         nsdchatError = self.nsdchatError()
@@ -2178,12 +2465,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     submitJobCMDString = ('%s -c ArchiveSelection "%s" submit 1' 
                               % (nsdchatCMD,archiveSelection))
     self.logger('nsdchatSubmitArchiveJobForArchiveSet() Running Command: (%s)' % submitJobCMDString,'debug')
-    submitJobCMD = subprocess.Popen(submitJobCMDString,
-                              shell=True,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True)
-    submitJobCMD_stdout,submitJobCMD_stderr = submitJobCMD.communicate()
+    submitJobCMD = self.runCommand(submitJobCMDString)
+    submitJobCMD_stdout,submitJobCMD_stderr = submitJobCMD.stdout,submitJobCMD.stderr
 
     if not submitJobCMD.returncode == 0:
       theError = ("An error occured submitting job: %s Error:%s" 
@@ -2230,12 +2513,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     
     dbCMDString = '%s -c ArchivePlan %s database' % (nsdchatCMD,archivePlan)
     self.logger('nsdchatSubmitRestoreJobForRestoreSet() Running Command: (%s)' % dbCMDString,'debug')
-    dbCMD = subprocess.Popen(dbCMDString,
-                            shell=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            universal_newlines=True)
-    dbCMD_stdout,dbCMD_stderr = dbCMD.communicate()
+    dbCMD = self.runCommand(dbCMDString)
+    dbCMD_stdout,dbCMD_stderr = dbCMD.stdout,dbCMD.stderr
 
     if not dbCMD.returncode == 0:
       theError = "An error occured creating the ArchivePlan for restore: %s" % self.nsdchatError()
@@ -2248,12 +2527,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ## Create our ArchiveSelection handler.
     selectionCMDString = '%s -c RestoreSelection create localhost' % nsdchatCMD
     self.logger('nsdchatSubmitRestoreJobForRestoreSet() Running Command: (%s)' % selectionCMDString,'debug')    
-    selectionCMD = subprocess.Popen(selectionCMDString,
-                            shell=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            universal_newlines=True)
-    selectionCMD_stdout,selectionCMD_stderr = selectionCMD.communicate()
+    selectionCMD = self.runCommand(selectionCMDString)
+    selectionCMD_stdout,selectionCMD_stderr = selectionCMD.stdout,selectionCMD.stderr
 
     if not selectionCMD.returncode == 0:
       theError = "An error occured creating the RestoreSelection: %s" % self.nsdchatError()
@@ -2273,13 +2548,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
       ##self.logger('ArchiveObjectType:%s' % type(archiveObject),'debug')
       handleCMDString = '%s -c ArchiveEntry handle localhost {%s} %s' % (nsdchatCMD,archiveObject.filePath,dbHandle)
       self.logger('nsdchatSubmitRestoreJobForRestoreSet() Running Command: (%s)' % handleCMDString,'debug')
-      handleCMD = subprocess.Popen(handleCMDString,
-                              shell=True,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True,)
-                              
-      handleCMD_stdout,handleCMD_stderr = handleCMD.communicate()
+      handleCMD = self.runCommand(handleCMDString)
+      handleCMD_stdout,handleCMD_stderr = handleCMD.stdout,handleCMD.stderr
       handle = handleCMD_stdout.strip()
       self.logger('nsdchatSubmitRestoreJobForRestoreSet() - found handle: %s' % handle,'debug')    
 
@@ -2297,12 +2567,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
         addEntryCMDString = '%s -c RestoreSelection "%s" addentry "%s"' % (nsdchatCMD,restoreSelection,handle)
       
       self.logger('nsdchatSubmitRestoreJobForRestoreSet() Running Command: (%s)' % addEntryCMDString,'debug')
-      addEntryCMD = subprocess.Popen(addEntryCMDString,
-                              shell=True,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True)
-      addEntryCMD_stdout,addEntryCMD_stderr = addEntryCMD.communicate()
+      addEntryCMD = self.runCommand(addEntryCMDString)
+      addEntryCMD_stdout,addEntryCMD_stderr = addEntryCMD.stdout,addEntryCMD.stderr
 
       if not addEntryCMD.returncode == 0:
         nsdchatError = self.nsdchatError()
@@ -2322,12 +2588,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
       
     submitJobCMDString = '%s -c RestoreSelection "%s" submit 1' % (nsdchatCMD,restoreSelection)
     self.logger('nsdchatSubmitRestoreJobForRestoreSet() Running Command: (%s)' % submitJobCMDString,'debug')
-    submitJobCMD = subprocess.Popen(submitJobCMDString,
-                              shell=True,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True)
-    submitJobCMD_stdout,submitJobCMD_stderr = submitJobCMD.communicate()
+    submitJobCMD = self.runCommand(submitJobCMDString)
+    submitJobCMD_stdout,submitJobCMD_stderr = submitJobCMD.stdout,submitJobCMD.stderr
 
     jobID = ''
     if not submitJobCMD.returncode == 0:
@@ -2350,12 +2612,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     
     cmdString = '%s -c Job %s status' % (nsdchatCMD,jobID)
     
-    jobCMD = subprocess.Popen(cmdString,
-                              shell=True,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True)
-    jobCMD_stdout,jobCMD_stderr = jobCMD.communicate()
+    jobCMD = self.runCommand(cmdString)
+    jobCMD_stdout,jobCMD_stderr = jobCMD.stdout,jobCMD.stderr
 
     jobStatus = jobCMD_stdout.strip()
     ## If job status is empty, it means the job has disappeared: server restart
@@ -2395,12 +2653,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ## Get our file handler
     fhCMDString = '%s -c ArchiveEntry handle localhost {%s} %s' % (nsdchatCMD,filePath,archiveDatabase)
     self.logger('nsdchatVolumeLabelsForFilePathFromArchiveDatabase() Running Command: (%s)' % fhCMDString,'debug')
-    fhCMD = subprocess.Popen(fhCMDString,
-                              shell=True,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True)
-    fhCMD_stdout,fhCMD_stderr = fhCMD.communicate()
+    fhCMD = self.runCommand(fhCMDString)
+    fhCMD_stdout,fhCMD_stderr = fhCMD.stdout,fhCMD.stderr
     fhHandle = fhCMD_stdout.strip()
     
     ## Make sure we have a handle.
@@ -2416,12 +2670,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ## Get our volume
     volCMDString = '%s -c ArchiveEntry "%s" volume' % (nsdchatCMD,fhHandle)
     self.logger('nsdchatVolumeLabelForFilePath() Running Command: (%s)' % volCMDString,'debug')
-    volCMD = subprocess.Popen(volCMDString,
-                              shell=True,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True)
-    volCMD_stdout,volCMD_stderr = volCMD.communicate()
+    volCMD = self.runCommand(volCMDString)
+    volCMD_stdout,volCMD_stderr = volCMD.stdout,volCMD.stderr
     volumeOutput = volCMD_stdout.strip()
     
     if not volumeOutput:
@@ -2451,12 +2701,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ## Get our database handler
     cmdString = '%s -c ArchivePlan "%s" database ' % (nsdchatCMD,archivePlan)
     self.logger('nsdchatVolumeLabelForFilePath() Running Command: (%s)' % cmdString,'debug')
-    dbCMD = subprocess.Popen(cmdString,
-                              shell=True,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True)
-    dbCMD_stdout,dbCMD_stderr = dbCMD.communicate()
+    dbCMD = self.runCommand(cmdString)
+    dbCMD_stdout,dbCMD_stderr = dbCMD.stdout,dbCMD.stderr
     dbHandler = dbCMD_stdout.strip()
     
     if dhHandler == "#":
@@ -2487,12 +2733,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ## Finally, get our barcode
     barcodeCMDString = '%s -c Volume "%s" barcode' % (nsdchatCMD,label)
     self.logger('getBarcodeForVolumeLabel() Running Command: (%s)' % barcodeCMDString,'debug')
-    barcodeCMD = subprocess.Popen(barcodeCMDString,
-                              shell=True,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True)
-    barcodeCMD_stdout,barcodeCMD_stderr = barcodeCMD.communicate()
+    barcodeCMD = self.runCommand(barcodeCMDString)
+    barcodeCMD_stdout,barcodeCMD_stderr = barcodeCMD.stdout,barcodeCMD.stderr
     barcode = barcodeCMD_stdout.strip()
     self.logger('getBarcodeForVolumeLabel() - Found barcode:%s for label:%s' % (barcode,label),'debug')
     
@@ -2510,12 +2752,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     ## Get our isonline status
     isonlineCMDString = '%s -c Volume "%s" isonline' % (nsdchatCMD,label)
     self.logger('isVolumeWithLabelOnline() Running Command: (%s)' % isonlineCMDString,'debug')
-    isonlineCMD = subprocess.Popen(isonlineCMDString,
-                              shell=True,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True)
-    isonlineCMD_stdout,isonlineCMD_stderr = isonlineCMD.communicate()
+    isonlineCMD = self.runCommand(isonlineCMDString)
+    isonlineCMD_stdout,isonlineCMD_stderr = isonlineCMD.stdout,isonlineCMD.stderr
     isonline = isonlineCMD_stdout.strip()
     
     if isonline == '1':
@@ -2532,12 +2770,8 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     
     cmdString = '%s -c geterror' % nsdchatCMD
     
-    errorCMD = subprocess.Popen(cmdString,
-                              shell=True,
-                              stdout=subprocess.PIPE,
-                              stderr=subprocess.PIPE,
-                              universal_newlines=True)
-    errorCMD_stdout,errorCMD_stderr = errorCMD.communicate()
+    errorCMD = self.runCommand(cmdString)
+    errorCMD_stdout,errorCMD_stderr = errorCMD.stdout,errorCMD.stderr
 
     return errorCMD_stdout.strip()
   
@@ -2695,49 +2929,62 @@ class fcsArchiver(fcsxml.FCSBaseObject):
     return True
     
     
-class archiveObject(fcsxml.FCSBaseObject):
-  '''Our base archive object which represents a single file entity.'''
+class archiveObject(fcsxml.FCSSlottedObject):
+  '''Our base archive object which represents a single file entity. Archive 
+  queues can hold many thousands of these, so attributes are declared via 
+  __slots__ and log messages are delegated to our owner (typically our 
+  :class:`fcsArchiver.fcsArchiver`).'''
   
-  ## File info
-  fcsID = ''
-  filePath = ''            ## Path to the file as it exists on the archive dev
-  onlinePath = ''          ## Path to the file as it exists when online
-  checksum = ''
-  action = 'archive'
-  
-  ## Archive Info
-  recordID = ''             ## sqlite rowID
-  archiveSetName = ''       ## Selection set name created at time of submission
-  archivePath = ''          ## Path to archive device
-  jobID = ''                ## Backup system job identifier
-  submitDate = ''           ## Date of submission
-  archiveDate = ''          ## Date of completion
-  restoreDate = ''          ## Date of restore
-  didRestore = False        ## Bool value on whether or not we performed a restore from archive.
-  label = ''                ## Backup system label
-  barcode = ''              ## Tape barcode label
-  tapeSet = 'onsite'        ## The name of the tapeSet,'onsite' or 'offsite'
-  retryCount = 0            ## archive and restore retry counters: increment
+  __slots__ = (
+    ## File info
+    'fcsID',
+    'filePath',             ## Path to the file as it exists on the archive dev
+    'onlinePath',           ## Path to the file as it exists when online
+    'checksum',
+    'action',
+    
+    ## Archive Info
+    'recordID',             ## sqlite rowID
+    'archiveSetName',       ## Selection set name created at time of submission
+    'archivePath',          ## Path to archive device
+    'jobID',                ## Backup system job identifier
+    'submitDate',           ## Date of submission
+    'archiveDate',          ## Date of completion
+    'restoreDate',          ## Date of restore
+    'didRestore',           ## Bool value on whether or not we performed a restore from archive.
+    'label',                ## Backup system label
+    'barcode',              ## Tape barcode label
+    'tapeSet',              ## The name of the tapeSet,'onsite' or 'offsite'
+    'retryCount',           ## archive and restore retry counters: increment
                             ## when an object fails to archive or restore.
+    'status',
+    
+    ## State
+    'isLoaded',
+    'isError',
+    'statusMessage',
+    
+    'configParser',
+    
+    ## Our FCS Object, held while we are queued
+    'fcsObject',
+    
+    ## Weak reference to the archiveQueueModel we are queued in
+    'queueRef',
+  )
   
-  statusMap = {}
-
-  status  = ''      
-  
-  ## State
-  isLoaded = False
-  isError = False
-  statusMessage = ''
-  
-  configParser = ''
+  statusMap = fcsArchiver.statusMap
   
-  ## Our FCS Object
-  def __init__(self,action='archive'):
+  def __init__(self,action='archive',owner=None):
+    fcsxml.FCSSlottedObject.__init__(self,owner=owner)
     self.recordID =''
     self.fcsID = ''
     self.action = action
-    self.fcsObject = ''
+    self.fcsObject = None
+    self.queueRef = None
     self.filePath = ''
+    self.onlinePath = ''
+    self.checksum = ''
     self.archivePath = ''
     self.archiveSetName = ''
     self.jobID = ''
@@ -2745,6 +2992,8 @@ class archiveObject(fcsxml.FCSBaseObject):
     self.archiveDate = ''
     self.restoreDate = ''
     self.didRestore = False
+    self.label = ''
+    self.barcode = ''
     self.status = ''
     self.isError = False
     self.retryCount = 0
@@ -2753,8 +3002,6 @@ class archiveObject(fcsxml.FCSBaseObject):
     self.isLoaded = False
     self.configParser = ''
     
-    self.statusMap = fcsArchiver.statusMap
-    
         
   def setTapeSet(self,tapeSet):
     '''Set the tapeSet for the object'''
@@ -2789,8 +3036,15 @@ class archiveObject(fcsxml.FCSBaseObject):
           self.logger('setStatus() passed unmapped status:%s action:%s tapeSet:%s' % (status,self.action,self.tapeSet),'error')
           validatedStatus = statusMap[self.action]['failed']
 
-    self.logger('setStatus() set status to:%s action:%s' % (validatedStatus,self.action),'debug')
+    self.logger('setStatus() set status to:%s action:%s','debug',
+                                      logArgs=(validatedStatus,self.action))
     self.status = validatedStatus
+    
+    ## Update our queue's status index
+    if self.queueRef:
+      queue = self.queueRef()
+      if queue is not None:
+        queue.statusChangedForArchiveObject(self)
 
   
   def loadFromXMLFile(self,xmlFilePath=''):
@@ -2824,7 +3078,7 @@ class archiveObject(fcsxml.FCSBaseObject):
     ## Generate our fcsxml.FCSVRClient object
     myFCSObject = fcsxml.FCSVRClient()
     if self.configParser:
-      myFCSVRObject.loadConfiguration(self.configParser)
+      myFCSObject.loadConfiguration(self.configParser)
     
     ## Load our online path
     onlinePath = myFCSObject.getFSPathFromArchivePath(filePath)
@@ -2839,7 +3093,7 @@ class archiveObject(fcsxml.FCSBaseObject):
     if myFCSObject.initWithAssetFromFSPath(onlinePath):
       self.fcsID = myFCSObject.entityID
       self.onlinePath = onlinePath
-      self.fcsObject = myFCSObject
+      self.setFCSObject(myFCSObject)
     else:
       errMSG = ("Could not load fcsxml.FCSVRClient Object from path:'%s',"
         " error:'%s'" % (filePath,myFCSObject.lastError))
@@ -2855,22 +3109,34 @@ class archiveObject(fcsxml.FCSBaseObject):
     return True
     
   def loadFCSObject(self):
-    '''Loads the archive objects respective FCS object and saves to 
-    self.fcsObject'''
+    '''Loads the archive objects respective FCS object, see 
+    :func:`getFCSObject`'''
     
     ## Generate our fcsxml.FCSVRClient object
-    myFCSObject = fcsxml.FCSVRClient()
-    if self.configParser:
-      myFCSVRObject.loadConfiguration(self.configParser)
-      
-    fcsID = self.fcsID
-    myFCSObject = fcsxml.FCSVRClient(entityType='asset',id=fcsID)
-    myFCSObject.initWithAssetID(assetID=fcsID)
+    myFCSObject = fcsxml.FCSVRClient(configParser=self.configParser)
+    myFCSObject.initWithAssetID(assetID=self.fcsID)
     
-    self.fcsObject = myFCSObject
+    self.setFCSObject(myFCSObject)
     
     return myFCSObject
   
+  def setFCSObject(self,fcsObject):
+    '''Stores our FCS object. It is held until released via 
+    :func:`releaseFCSObject`, which occurs when we are removed from our
+    queue or when our queue releases memory (see
+    :func:`archiveQueueModel.releaseMemory`).'''
+    self.fcsObject = fcsObject
+  
+  def getFCSObject(self):
+    '''Returns our FCS object, loading it if it has been released.'''
+    if self.fcsObject is None:
+      return self.loadFCSObject()
+    return self.fcsObject
+  
+  def releaseFCSObject(self):
+    '''Releases our FCS object, it will be reloaded on next access.'''
+    self.fcsObject = None
+  
   
   def loadFromSQLResult(self,results):
     '''Load internal values from a sqlite3 result row'''
@@ -3085,6 +3351,713 @@ class archiveSet(fcsxml.FCSBaseObject):
     ## Perhaps take a tally of different retryCount'?
     return self.archiveObjects[0].retryCount
 
+
+class archiveQueueModel(fcsxml.FCSBaseObject):
+  '''Our in-memory archive or restore queue: a dictionary of 
+  :class:`archiveSet` objects keyed by set name, which also maintains an 
+  index of queued :class:`archiveObject` objects by status and set. The 
+  index is updated whenever a queued object changes status (via 
+  :func:`archiveObject.setStatus`), so fetching sets or objects by status 
+  is proportional to the number of matching objects rather than the size of
+  the queue.
+  
+  Objects must be added via :func:`addArchiveObject`, rather than appended 
+  to an archiveSet directly, in order to be indexed.
+  
+  :param type: Our queue type: 'archive' or 'restore'
+  :type type: str
+  
+  '''
+  
+  def __init__(self,type='archive'):
+    fcsxml.FCSBaseObject.__init__(self)
+    self.type = type
+    self.archiveSets = {}       ## archiveSet objects keyed by set name
+    self.statusIndex = {}       ## {status : {setName : {objectID : (sequence,archiveObject)}}}
+    self.objectIndex = {}       ## (setName,status,sequence) keyed by objectID
+    self.sequence = 0           ## Incremented as objects are added, used to
+                                ## return objects in the order they were queued
+    fcsxml.memoryMonitor.registerReleasable(self)
+  
+  def __len__(self):
+    return len(self.archiveSets)
+  
+  def __contains__(self,setName):
+    return setName in self.archiveSets
+  
+  def __getitem__(self,setName):
+    return self.archiveSets[setName]
+  
+  def __iter__(self):
+    return iter(self.archiveSets)
+  
+  def keys(self):
+    return self.archiveSets.keys()
+  
+  def values(self):
+    return self.archiveSets.values()
+  
+  def iteritems(self):
+    return self.archiveSets.iteritems()
+  
+  def addArchiveSet(self,archiveSet):
+    '''Adds an archiveSet to our queue, any objects already in the set will
+    be indexed.
+    
+    :param archiveSet: Provide the archiveSet to add
+    :type archiveSet: :class:`archiveSet`
+    
+    '''
+    self.archiveSets[archiveSet.name] = archiveSet
+    for archiveObject in archiveSet.archiveObjects:
+      self.indexArchiveObject(archiveObject,setName=archiveSet.name)
+  
+  def addArchiveObject(self,archiveObject,setName):
+    '''Appends an archiveObject to the queued archiveSet with the provided 
+    name and indexes it by status.
+    
+    :param archiveObject: Provide the archiveObject to add
+    :type archiveObject: :class:`archiveObject`
+    :param setName: Provide the name of a queued archiveSet
+    :type setName: str
+    
+    :raises: KeyError
+    
+    '''
+    self.archiveSets[setName].archiveObjects.append(archiveObject)
+    self.indexArchiveObject(archiveObject,setName=setName)
+  
+  def indexArchiveObject(self,archiveObject,setName):
+    '''Adds an archiveObject to our status index.'''
+    objectID = id(archiveObject)
+    if objectID in self.objectIndex:
+      self.unindexArchiveObject(archiveObject)
+    
+    self.sequence += 1
+    status = archiveObject.status
+    self.objectIndex[objectID] = (setName,status,self.sequence)
+    self.statusIndex.setdefault(status,{}).setdefault(setName,{})[objectID] = (
+                                                  self.sequence,archiveObject)
+    archiveObject.queueRef = weakref.ref(self)
+  
+  def unindexArchiveObject(self,archiveObject):
+    '''Removes an archiveObject from our status index, returns the
+    (setName,status,sequence) tuple for the removed entry, or None if the
+    object was not indexed.'''
+    objectID = id(archiveObject)
+    try:
+      setName,status,sequence = self.objectIndex.pop(objectID)
+    except KeyError:
+      return None
+    
+    setIndex = self.statusIndex[status]
+    del setIndex[setName][objectID]
+    if not setIndex[setName]:
+      del setIndex[setName]
+    if not setIndex:
+      del self.statusIndex[status]
+      
+    return (setName,status,sequence)
+  
+  def removeArchiveObject(self,archiveObject):
+    '''Removes an archiveObject from our queue. Sets which no longer contain
+    any objects are removed.
+    
+    :param archiveObject: Provide the archiveObject to remove
+    :type archiveObject: :class:`archiveObject`
+    
+    :returns: (*bool*) -- False if the object was not queued
+    
+    '''
+    entry = self.unindexArchiveObject(archiveObject)
+    if not entry:
+      return False
+    
+    archiveObject.queueRef = None
+    archiveObject.releaseFCSObject()
+    setName = entry[0]
+    if setName in self.archiveSets:
+      archiveObjects = self.archiveSets[setName].archiveObjects
+      if archiveObject in archiveObjects:
+        archiveObjects.remove(archiveObject)
+      if not archiveObjects:
+        del self.archiveSets[setName]
+        
+    return True
+  
+  def releaseMemory(self):
+    '''Releases the FCS objects held by our queued archiveObjects, called
+    by :func:`fcsxml.FCSMemoryMonitor.releaseCaches` when our memory budget
+    is exceeded.'''
+    for archiveSet in self.archiveSets.itervalues():
+      for archiveObject in archiveSet.archiveObjects:
+        archiveObject.releaseFCSObject()
+  
+  def statusChangedForArchiveObject(self,archiveObject):
+    '''Called by queued archiveObjects when their status changes, updates
+    our status index.'''
+    objectID = id(archiveObject)
+    try:
+      setName,status,sequence = self.objectIndex[objectID]
+    except KeyError:
+      return
+    
+    newStatus = archiveObject.status
+    if status == newStatus:
+      return
+    
+    self.unindexArchiveObject(archiveObject)
+    self.objectIndex[objectID] = (setName,newStatus,sequence)
+    self.statusIndex.setdefault(newStatus,{}).setdefault(setName,{})[objectID] = (
+                                                  sequence,archiveObject)
+  
+  def archiveObjectsBySetWithStatus(self,status):
+    '''Returns a dictionary, keyed by set name, of lists of queued 
+    archiveObjects which match the provided status(es), in queued order.'''
+    if isinstance(status,basestring):
+      statuses = [status]
+    else:
+      statuses = status
+    
+    matchedEntries = {}
+    for status in statuses:
+      for setName,entries in self.statusIndex.get(status,{}).iteritems():
+        matchedEntries.setdefault(setName,[]).extend(entries.itervalues())
+    
+    matchedObjects = {}
+    for setName,entries in matchedEntries.iteritems():
+      entries.sort()
+      matchedObjects[setName] = [entry[1] for entry in entries]
+    
+    return matchedObjects
+  
+  def archiveObjectsWithStatus(self,status):
+    '''Returns a list of queued archiveObjects which match the provided
+    status.
+    
+    :param status: Provide a status, or a list of statuses to match
+    :type status: str or list
+    
+    :returns: (*list*) -- List of :class:`archiveObject` objects
+    
+    '''
+    archiveObjects = []
+    for setObjects in self.archiveObjectsBySetWithStatus(status).itervalues():
+      archiveObjects.extend(setObjects)
+    return archiveObjects
+  
+  def archiveSetsWithStatus(self,status):
+    '''Returns a dictionary, keyed by the selection set name, of sets which
+    contain objects matching the provided status. Returned sets are copies 
+    of our queued sets containing only matching objects.
+    
+    :param status: Provide a status, or a list of statuses to match
+    :type status: str or list
+    
+    :returns: (*dict*) -- Dictionary of :class:`archiveSet` objects
+    
+    '''
+    matchedSets = {}
+    for setName,archiveObjects in self.archiveObjectsBySetWithStatus(status).iteritems():
+      modifiedSet = copy.copy(self.archiveSets[setName])
+      modifiedSet.archiveObjects = archiveObjects
+      self.logger('archiveSetsWithStatus() Set %s contains %s objects with status: %s',
+        'debug',logArgs=(setName,len(archiveObjects),status))
+      matchedSets[setName] = modifiedSet
+    
+    return matchedSets
+  
+  def statusCounts(self):
+    '''Returns a dictionary of queued object counts keyed by status.'''
+    statusCounts = {}
+    for status,setIndex in self.statusIndex.iteritems():
+      statusCounts[status] = sum([len(entries) for entries in setIndex.itervalues()])
+    return statusCounts
+
+
+class archiveDatabase(fcsxml.FCSBaseObject):
+  '''Manages our persistent connection to our sqlite queue and history 
+  database (backupHistory.db). A single archiveDatabase is created per 
+  database path and shared by all :class:`fcsArchiver.fcsArchiver` objects
+  (see :func:`fcsArchiver.fcsArchiver.connectToSQL`). Connections use WAL 
+  journaling, and databases are migrated to our current schema version 
+  (stored as the sqlite user_version) when they are first opened.
+  
+  :param dbPath: The path to our database file
+  :type dbPath: str
+  
+  '''
+  
+  ## Columns for each of our tables, in order. As of schema version 2, each
+  ## table also has a leading INTEGER PRIMARY KEY 'recordID' column, which 
+  ## aliases the sqlite rowid.
+  tableColumns = {
+    'archiveHistory' : ['fcsID','filePath','checksum','barcode','tapeSet',
+                        'archiveSet','jobID','completionDate','status'],
+    'archiveQueue' : ['fcsID','filePath','checksum','archiveSet','tapeSet',
+                        'jobID','jobSubmitDate','retryCount','status'],
+    'restoreQueue' : ['fcsID','filePath','archiveSet','tapeSet','barcode',
+                        'jobID','jobSubmitDate','retryCount','status'],
+  }
+  
+  ## Our schema migrations: a list of (schemaVersion,migrationScript) tuples,
+  ## applied in order. Version 1 is our original, unindexed schema, version
+  ## 2 rebuilds our tables with primary keys (preserving rowids, which are 
+  ## referenced by queued records) and adds indexes.
+  migrations = [
+    (1, '''
+      CREATE TABLE IF NOT EXISTS archiveHistory(fcsID,filePath,checksum,
+        barcode,tapeSet,archiveSet,jobID,completionDate,status);
+      CREATE TABLE IF NOT EXISTS archiveQueue(fcsID,filePath,checksum,
+        archiveSet,tapeSet,jobID,jobSubmitDate,retryCount,status);
+      CREATE TABLE IF NOT EXISTS restoreQueue(fcsID,filePath,archiveSet,
+        tapeSet,barcode,jobID,jobSubmitDate,retryCount,status);
+    '''),
+    (2, '''
+      ALTER TABLE archiveHistory RENAME TO archiveHistory_v1;
+      CREATE TABLE archiveHistory(recordID INTEGER PRIMARY KEY AUTOINCREMENT,
+        fcsID,filePath,checksum,barcode,tapeSet,archiveSet,jobID,
+        completionDate,status);
+      INSERT INTO archiveHistory(recordID,fcsID,filePath,checksum,barcode,
+          tapeSet,archiveSet,jobID,completionDate,status) 
+        SELECT rowid,fcsID,filePath,checksum,barcode,tapeSet,archiveSet,jobID,
+          completionDate,status FROM archiveHistory_v1;
+      DROP TABLE archiveHistory_v1;
+      CREATE INDEX archiveHistory_filePath ON archiveHistory(filePath,tapeSet);
+      CREATE INDEX archiveHistory_status ON archiveHistory(status);
+      CREATE INDEX archiveHistory_archiveSet ON archiveHistory(archiveSet);
+      CREATE INDEX archiveHistory_jobID ON archiveHistory(jobID);
+      CREATE INDEX archiveHistory_fcsID ON archiveHistory(fcsID);
+      
+      ALTER TABLE archiveQueue RENAME TO archiveQueue_v1;
+      CREATE TABLE archiveQueue(recordID INTEGER PRIMARY KEY AUTOINCREMENT,
+        fcsID,filePath,checksum,archiveSet,tapeSet,jobID,jobSubmitDate,
+        retryCount,status);
+      INSERT INTO archiveQueue(recordID,fcsID,filePath,checksum,archiveSet,
+          tapeSet,jobID,jobSubmitDate,retryCount,status) 
+        SELECT rowid,fcsID,filePath,checksum,archiveSet,tapeSet,jobID,
+          jobSubmitDate,retryCount,status FROM archiveQueue_v1;
+      DROP TABLE archiveQueue_v1;
+      CREATE INDEX archiveQueue_filePath ON archiveQueue(filePath,tapeSet);
+      CREATE INDEX archiveQueue_status ON archiveQueue(status);
+      CREATE INDEX archiveQueue_archiveSet ON archiveQueue(archiveSet);
+      CREATE INDEX archiveQueue_jobID ON archiveQueue(jobID);
+      CREATE INDEX archiveQueue_fcsID ON archiveQueue(fcsID);
+      
+      ALTER TABLE restoreQueue RENAME TO restoreQueue_v1;
+      CREATE TABLE restoreQueue(recordID INTEGER PRIMARY KEY AUTOINCREMENT,
+        fcsID,filePath,archiveSet,tapeSet,barcode,jobID,jobSubmitDate,
+        retryCount,status);
+      INSERT INTO restoreQueue(recordID,fcsID,filePath,archiveSet,tapeSet,
+          barcode,jobID,jobSubmitDate,retryCount,status) 
+        SELECT rowid,fcsID,filePath,archiveSet,tapeSet,barcode,jobID,
+          jobSubmitDate,retryCount,status FROM restoreQueue_v1;
+      DROP TABLE restoreQueue_v1;
+      CREATE INDEX restoreQueue_filePath ON restoreQueue(filePath);
+      CREATE INDEX restoreQueue_status ON restoreQueue(status);
+      CREATE INDEX restoreQueue_archiveSet ON restoreQueue(archiveSet);
+      CREATE INDEX restoreQueue_jobID ON restoreQueue(jobID);
+      CREATE INDEX restoreQueue_fcsID ON restoreQueue(fcsID);
+    '''),
+  ]
+  
+  sharedDatabases = {}    ## Shared archiveDatabase objects, keyed by path
+  sharedDatabasesLock = threading.Lock()
+  
+  def __init__(self,dbPath=''):
+    '''Our construct.'''
+    fcsxml.FCSBaseObject.__init__(self)
+    self.dbPath = dbPath
+    self.sqlConn = None
+  
+  def connection(self):
+    '''Returns our sqlite3 connection, opening and migrating our database 
+    if necessary.
+    
+    :raises: sqlite3.Error
+    :returns: (*sqlite3.Connection*) -- Our connection
+    '''
+    if self.sqlConn:
+      return self.sqlConn
+    
+    if not os.path.exists(self.dbPath):
+      self.logger('Creating SQL database at path:\'%s\'' % self.dbPath,
+                                                                  'detailed')
+    
+    sqlConn = sqlite3.connect(self.dbPath,timeout=30)
+    sqlConn.row_factory = sqlite3.Row
+    try:
+      sqlConn.execute('PRAGMA journal_mode=WAL')
+      sqlConn.execute('PRAGMA synchronous=NORMAL')
+      self.migrate(sqlConn)
+    except:
+      sqlConn.close()
+      raise
+    
+    self.sqlConn = sqlConn
+    return sqlConn
+  
+  def schemaVersionForConnection(self,sqlConn):
+    '''Returns the schema version of the database at the provided 
+    connection, 0 for new databases or those predating versioning.'''
+    return sqlConn.execute('PRAGMA user_version').fetchone()[0]
+  
+  def currentSchemaVersion(self):
+    '''Returns the schema version provided by our migrations.'''
+    return self.migrations[-1][0]
+  
+  def migrate(self,sqlConn):
+    '''Applies any outstanding schema migrations to the provided connection.
+    Each migration is applied in its own transaction.
+    
+    :raises: sqlite3.Error
+    :returns: (*int*) -- The number of migrations applied
+    '''
+    
+    schemaVersion = self.schemaVersionForConnection(sqlConn)
+    migrationCount = 0
+    for migrationVersion,migrationScript in self.migrations:
+      if migrationVersion <= schemaVersion:
+        continue
+      self.logger('Migrating database: \'%s\' to schema version: %s' 
+                              % (self.dbPath,migrationVersion),'detailed')
+      try:
+        sqlConn.executescript('BEGIN;\n%s\nPRAGMA user_version = %s;\n'
+                          'COMMIT;' % (migrationScript,migrationVersion))
+      except sqlite3.Error, err:
+        sqlConn.rollback()
+        self.logger('Could not migrate database: \'%s\' to schema version: '
+                  '%s Error: %s' % (self.dbPath,migrationVersion,err),'error')
+        raise
+      migrationCount += 1
+    return migrationCount
+  
+  def close(self):
+    '''Closes our connection.'''
+    if self.sqlConn:
+      self.sqlConn.close()
+      self.sqlConn = None
+  
+
+class spoolWatcher(fcsxml.FCSBaseObject):
+  '''Watches our support directory for entries added to our queue spool 
+  files (filesToArchive, filesToRestore). Where kqueue is available (Mac OS
+  X), we are notified of changes to the directory and to the spool files 
+  themselves, otherwise we poll the spool files every :attr:`pollInterval` 
+  seconds.
+  
+  :param directory: The directory containing our spool files
+  :type directory: str
+  :param fileNames: The names of the spool files to watch
+  :type fileNames: list
+  :param pollInterval: Seconds between checks when polling, defaults to 
+    :attr:`pollInterval`
+  :type pollInterval: int
+  :param usePolling: Poll even if kqueue is available
+  :type usePolling: bool
+  
+  '''
+  
+  pollInterval = 5          ## Seconds between checks when polling
+  
+  def __init__(self,directory,fileNames,pollInterval=None,usePolling=False):
+    fcsxml.FCSBaseObject.__init__(self)
+    self.directory = directory
+    self.fileNames = fileNames
+    if pollInterval:
+      self.pollInterval = pollInterval
+    self.isInterrupted = False
+    self.kqueue = None
+    self.watchedFiles = {}    ## (fd,inode) tuples keyed by spool file name
+    self.directoryFD = None
+    
+    if not usePolling and hasattr(select,'kqueue'):
+      try:
+        self.directoryFD = self.openForEvents(directory)
+        self.kqueue = select.kqueue()
+      except (OSError,IOError), err:
+        self.logger('Could not watch directory: \'%s\' using kqueue, falling '
+          'back to polling. Error: %s' % (directory,err),'warning')
+        self.close()
+    
+    if self.kqueue:
+      self.logger('spoolWatcher() watching directory: \'%s\' using kqueue',
+                                              'debug',logArgs=(directory,))
+    else:
+      self.logger('spoolWatcher() polling directory: \'%s\' every %s seconds',
+                              'debug',logArgs=(directory,self.pollInterval))
+  
+  def openForEvents(self,path):
+    '''Returns a file descriptor for path suitable for kqueue vnode events.'''
+    return os.open(path,getattr(os,'O_EVTONLY',os.O_RDONLY))
+  
+  def usesKQueue(self):
+    '''Returns True if we are notified of changes via kqueue.'''
+    return self.kqueue is not None
+  
+  def pendingFileNames(self):
+    '''Returns a list of our spool file names which contain entries.'''
+    pendingFileNames = []
+    for fileName in self.fileNames:
+      try:
+        if os.path.getsize(os.path.join(self.directory,fileName)) > 0:
+          pendingFileNames.append(fileName)
+      except OSError:
+        pass
+    return pendingFileNames
+  
+  def kqueueEvents(self):
+    '''Returns kevents for our directory and each existing spool file, 
+    (re)opening spool files which have been created or replaced since our 
+    last call.'''
+    for fileName in self.fileNames:
+      filePath = os.path.join(self.directory,fileName)
+      try:
+        inode = os.stat(filePath).st_ino
+      except OSError:
+        inode = None
+      if fileName in self.watchedFiles:
+        fd,watchedInode = self.watchedFiles[fileName]
+        if watchedInode == inode:
+          continue
+        os.close(fd)
+        del self.watchedFiles[fileName]
+      if inode is not None:
+        try:
+          self.watchedFiles[fileName] = (self.openForEvents(filePath),inode)
+        except OSError:
+          pass
+    
+    eventFlags = select.KQ_EV_ADD | select.KQ_EV_CLEAR
+    events = [select.kevent(self.directoryFD,filter=select.KQ_FILTER_VNODE,
+                            flags=eventFlags,fflags=select.KQ_NOTE_WRITE)]
+    for fd,inode in self.watchedFiles.itervalues():
+      events.append(select.kevent(fd,filter=select.KQ_FILTER_VNODE,
+                  flags=eventFlags,
+                  fflags=(select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND
+                          | select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME)))
+    return events
+  
+  def wait(self,timeout):
+    '''Blocks until one of our spool files contains entries, we are 
+    interrupted (see :func:`interrupt`) or timeout seconds elapse.
+    
+    :param timeout: The maximum number of seconds to wait
+    :type timeout: float
+    
+    :returns: (*list*) -- The names of spool files which contain entries
+    
+    '''
+    deadline = time.time() + timeout
+    self.isInterrupted = False
+    while not self.isInterrupted:
+      pendingFileNames = self.pendingFileNames()
+      if pendingFileNames:
+        return pendingFileNames
+      remaining = deadline - time.time()
+      if remaining <= 0:
+        break
+      try:
+        if self.kqueue:
+          self.kqueue.control(self.kqueueEvents(),4,remaining)
+        else:
+          time.sleep(min(remaining,self.pollInterval))
+      except (OSError,IOError,select.error), err:
+        if not err.args or not err.args[0] == errno.EINTR:
+          raise
+    return self.pendingFileNames()
+  
+  def interrupt(self):
+    '''Causes :func:`wait` to return at its next opportunity, intended to be
+    called from signal handlers.'''
+    self.isInterrupted = True
+  
+  def close(self):
+    '''Closes our kqueue and any open file descriptors.'''
+    for fd,inode in self.watchedFiles.itervalues():
+      os.close(fd)
+    self.watchedFiles = {}
+    if self.directoryFD is not None:
+      os.close(self.directoryFD)
+      self.directoryFD = None
+    if self.kqueue:
+      self.kqueue.close()
+      self.kqueue = None
+
+
+class fcsArchiverDaemon(fcsxml.FCSBaseObject):
+  '''Runs an :class:`fcsArchiver` as a resident process. Rather than 
+  re-reading our configuration and re-opening our database for each run, a 
+  single fcsArchiver (along with its database connection and fcsxml state) 
+  is kept for the life of the process. New entries in our filesToArchive and
+  filesToRestore spool files are processed within seconds of arriving (see
+  :class:`spoolWatcher`), while status checks for submitted jobs run every 
+  :attr:`statusInterval` seconds.
+  
+  Send SIGHUP to reload our configuration file, SIGTERM or SIGINT to exit
+  once the current operation has completed.
+  
+  :param archiver: The archiver to run
+  :type archiver: :class:`fcsArchiver`
+  :param configFilePath: Path to our configuration file, re-read on SIGHUP
+  :type configFilePath: str
+  
+  '''
+  
+  statusInterval = 600      ## Seconds between full queue processing runs
+  pollInterval = 5          ## Seconds between spool checks when polling
+  settleTime = 1            ## Seconds to wait for writers after a spool
+                            ## file changes
+  
+  def __init__(self,archiver,configFilePath=''):
+    fcsxml.FCSBaseObject.__init__(self)
+    self.printLogs = True
+    self.archiver = archiver
+    self.configFilePath = configFilePath
+    self.watcher = None
+    self.shouldStop = False
+    self.shouldReload = False
+  
+  def loadConfiguration(self,parser):
+    '''Loads our daemonStatusInterval and daemonPollInterval values from the
+    GLOBAL section of the provided ConfigParser object.'''
+    try:
+      self.statusInterval = parser.getint('GLOBAL','daemonStatusInterval')
+    except:
+      pass
+    try:
+      self.pollInterval = parser.getint('GLOBAL','daemonPollInterval')
+    except:
+      pass
+    try:
+      self.debug = parser.getboolean('GLOBAL','debug')
+    except:
+      pass
+  
+  def reloadConfiguration(self):
+    '''Re-reads our configuration file and applies it to our archiver.'''
+    if not self.configFilePath or not os.path.isfile(self.configFilePath):
+      self.logger('Could not reload configuration, file: \'%s\' does not '
+                                      'exist!' % self.configFilePath,'error')
+      return False
+    self.logger('Reloading configuration from file: \'%s\'' 
+                                                      % self.configFilePath)
+    parser = ConfigParser.SafeConfigParser()
+    parser.read(self.configFilePath)
+    self.archiver.loadConfiguration(parser)
+    self.loadConfiguration(parser)
+    return True
+  
+  def handleSignal(self,signalNumber,frame):
+    '''Our signal handler, flags a stop or configuration reload.'''
+    if signalNumber == signal.SIGHUP:
+      self.shouldReload = True
+    else:
+      self.shouldStop = True
+    if self.watcher:
+      self.watcher.interrupt()
+  
+  def newArchiveSetName(self):
+    '''Returns a selection set name for new queue entries. Unlike names 
+    generated by fcsArchiver, these include seconds, as we may submit
+    several sets within a minute.'''
+    return 'SELECTION_%s' % datetime.datetime.today().strftime('%Y-%m-%d:%H%M%S')
+  
+  def processQueues(self):
+    '''Performs a full queue processing run, equivalent to 
+    ``fcsArchiver.py --processQueue``'''
+    archiver = self.archiver
+    archiver.archiveSetName = self.newArchiveSetName()
+    archiver.checkRestoreQueue()
+    archiver.intakeRestoreQueue()
+    archiver.checkArchiveQueue()
+    archiver.intakeArchiveQueue()
+    fcsxml.memoryMonitor.enforceBudget()
+  
+  def processSpoolFiles(self,fileNames):
+    '''Reads and submits new entries from the provided spool files.'''
+    archiver = self.archiver
+    archiver.archiveSetName = self.newArchiveSetName()
+    if 'filesToRestore' in fileNames:
+      archiver.intakeRestoreQueue()
+    if 'filesToArchive' in fileNames:
+      archiver.intakeArchiveQueue()
+    fcsxml.memoryMonitor.enforceBudget()
+  
+  def runSafely(self,method,*args):
+    '''Calls method, logging rather than raising any exception, so that a 
+    single failed run does not stop the daemon.'''
+    logOffset = self.archiver.logOffset
+    try:
+      try:
+        method(*args)
+        return True
+      except Exception, err:
+        self.logger('An error occured running %s: %s: %s' 
+            % (method.__name__,err.__class__.__name__,err),'error')
+        return False
+    finally:
+      ## Our output is typically redirected to a log file by launchd
+      self.archiver.logOffset = logOffset
+      sys.stdout.flush()
+  
+  def run(self):
+    '''Runs until we receive SIGTERM or SIGINT.
+    
+    :returns: (*int*) -- Our exit code
+    
+    '''
+    
+    supportPath = self.archiver.supportPath
+    if not supportPath or not os.path.isdir(supportPath):
+      self.logger('Cannot run daemon, support path: \'%s\' does not exist!'
+                                                      % supportPath,'error')
+      return 2
+    
+    for signalNumber in (signal.SIGTERM,signal.SIGINT,signal.SIGHUP):
+      signal.signal(signalNumber,self.handleSignal)
+    
+    self.watcher = spoolWatcher(directory=supportPath,
+                                fileNames=['filesToArchive','filesToRestore'],
+                                pollInterval=self.pollInterval)
+    if self.watcher.usesKQueue():
+      watchMethod = 'kqueue'
+    else:
+      watchMethod = 'polling every %s seconds' % self.pollInterval
+    self.logger('Starting fcsArchiver daemon, watching: \'%s\' (%s), '
+      'processing queues every %s seconds.' % (supportPath,watchMethod,
+                                                        self.statusInterval))
+    
+    nextStatusCheck = 0
+    try:
+      while not self.shouldStop:
+        if self.shouldReload:
+          self.shouldReload = False
+          self.runSafely(self.reloadConfiguration)
+          nextStatusCheck = 0
+        
+        ## Run our scheduled queue processing
+        if time.time() >= nextStatusCheck:
+          self.runSafely(self.processQueues)
+          nextStatusCheck = time.time() + self.statusInterval
+          continue
+        
+        ## Wait for spool entries or our next status check
+        pendingFileNames = self.watcher.wait(timeout=nextStatusCheck - time.time())
+        if pendingFileNames and not self.shouldStop:
+          time.sleep(self.settleTime)
+          self.logger('Found new entries in: %s' % ', '.join(pendingFileNames))
+          if not self.runSafely(self.processSpoolFiles,pendingFileNames):
+            ## Don't spin on a spool file we are unable to process
+            time.sleep(self.pollInterval)
+    finally:
+      self.watcher.close()
+      self.watcher = None
+    
+    self.logger('Stopping fcsArchiver daemon.')
+    return 0
+
+
 class PresStoreCorruptDataError(Exception):
   def __init__(self,error):
     self.error = error
@@ -3152,6 +4125,10 @@ Options:
     -p, --processQueue           Process archive and restore queues
         --processRestoreQueue    Process restore queues
         --processArchiveQueue    Process archive queues
+    -d, --daemon                 Run as a resident process: new entries in our
+                                 spool files are processed as they arrive and
+                                 queues are processed every 
+                                 daemonStatusInterval seconds
         
     --getVolumeBarcode           Lists volume barcode for the requested file
     --getVolumeLabel             (must be used with --file option)
@@ -3160,9 +4137,13 @@ Options:
     --getVolumeBarcodeForFile=   Outputs barcode for specified file
     --getVolumeLabelForFile=     Outputs label for specified file
     --getVolumeBarcodeForLabel=  Outputs the barcode for the specified label
+    
+    --memoryReport               Outputs memory usage by object type after
+                                 processing
 
 Examples:
   fcsArchiver --processArchiveQueue
+  fcsArchiver --daemon --configFile=/usr/local/etc/fcsArchiver.conf
   fcsArchiver --getVolumeBarcode --file='/myfile.txt'
   fcsArchiver --getVolumeBarcodeForFile='/myfile.txt'
   fcsArchiver --getVolumeBarcodeForLabel=10001
@@ -3193,12 +4174,12 @@ def main():
 
   ## Get our flags
   try:
-    optlist, list = getopt.getopt(sys.argv[1:],':hvpf::',['processQueue',
-    'processRestoreQueue','processArchiveQueue','help',
+    optlist, list = getopt.getopt(sys.argv[1:],':hvpdf::',['processQueue',
+    'processRestoreQueue','processArchiveQueue','daemon','help',
       'configFile=','tapeSet=','version',
       'getVolumeBarcode','getVolumeLabel','file=',
       'getVolumeBarcodeForFile=','getVolumeLabelForFile=',
-      'getVolumeBarcodeForLabel='])
+      'getVolumeBarcodeForLabel=','memoryReport'])
   except getopt.GetoptError:
     print 'Syntax Error!'
     helpMessage()
@@ -3219,9 +4200,9 @@ def main():
       printVersionInfo()
       return 0
     elif opt[0] == '-f' or opt[0] == '--configFile':
-      configFile = opt[1]
-      if not os.path.isfile(configFile):
-        print 'Config file does not exist at path:%s' % configFile
+      configFilePath = opt[1]
+      if not os.path.isfile(configFilePath):
+        print 'Config file does not exist at path:%s' % configFilePath
         return 2
     elif opt[0] == '-p' or opt[0] == '--processQueue':
       actions.append('processQueue')
@@ -3229,6 +4210,8 @@ def main():
       actions.append('processArchiveQueue')
     elif opt[0] == '--processRestoreQueue':
       actions.append('processRestoreQueue')
+    elif opt[0] == '-d' or opt[0] == '--daemon':
+      actions.append('daemon')
     elif opt[0] == '--getVolumeLabelForFile':
       actions.append('getVolumeLabelForFile')
       filePath = opt[1]
@@ -3246,6 +4229,8 @@ def main():
       filePath = opt[1]
     elif opt[0] == '--tapeSet':
       tapeSet = opt[1].tolower()
+    elif opt[0] == '--memoryReport':
+      actions.append('memoryReport')
       
   ## Read in our config file data
   ## If no config file was specified or doesn't exist, look in PWD
@@ -3284,61 +4269,26 @@ def main():
   ## Process Queues  
   if ('processQueue' in actions 
   or 'processArchiveQueue' in actions 
-  or 'processRestoreQueue' in actions):    
+  or 'processRestoreQueue' in actions):
     if 'processQueue' in actions or 'processRestoreQueue' in actions:
       ## Process our restore queues first
-      fcs.logger('Processing Restore Queues...')
-      fcs.logOffset += 1
-      try:
-        fcs.loadRestoreQueue()
-        fcs.processRestoreQueue()
-      except FCSArchiveEmptyQueueError,err:
-        fcs.logger('Restore Queue is empty.')
-      '''except Exception, err:
-        print 'ERROR: An unknown error occured: %s' % err'''
-        
-      fcs.logOffset -= 1
-      fcs.logger('Checking for new restore files...')
-      fcs.logOffset += 1   
-      try:
-        fcs.createRestoreQueueFromFile()
-        fcs.loadRestoreQueue()
-        fcs.restoreFilesFromQueue()        
-      except FCSArchiveEmptyQueueError,err:
-        fcs.logger('Restore Queue is empty.')
-      '''except Exception, err:
-        print 'ERROR: An unknown error occured: %s' % err'''
-      fcs.logOffset -= 1
+      fcs.checkRestoreQueue()
+      fcs.intakeRestoreQueue()
       fcs.logger('Finished processing all restore queues.')
-
+      fcsxml.memoryMonitor.enforceBudget()
     
     if 'processQueue' in actions or 'processArchiveQueue' in actions:
       ## Process our archive queues
-      fcs.logger('Processing Archive Queues...')
-      fcs.logOffset += 1
-      try:
-        fcs.loadArchiveQueue()
-        fcs.processArchiveQueue()
-      except FCSArchiveEmptyQueueError,err:
-        fcs.logger('Archive Queue is empty.')
-      '''except Exception, err:
-        print 'ERROR: An unknown error occured: %s' % err'''
-      
-      fcs.logOffset -= 1
-      fcs.logger('Checking for new archive files...') 
-      fcs.logOffset += 1
-
-      try:
-        fcs.createArchiveQueueFromFile()
-        fcs.loadArchiveQueue()
-        fcs.archiveFilesFromQueue()
-      except FCSArchiveEmptyQueueError,err:
-        fcs.logger('Archive Queue is empty.')
-      '''except Exception, err:
-        print 'ERROR: An unknown error occured: %s' % err'''
-      fcs.logOffset -= 1
+      fcs.checkArchiveQueue()
+      fcs.intakeArchiveQueue()
       fcs.logger('Finished processing all archive queues.')
+      fcsxml.memoryMonitor.enforceBudget()
 
+  ## Run as a resident process
+  if 'daemon' in actions:
+    daemon = fcsArchiverDaemon(archiver=fcs,configFilePath=configFilePath)
+    daemon.loadConfiguration(cfgParser)
+    return daemon.run()
   
   ## Request archive information
   if 'getVolumeLabelForFile' in actions or 'getVolumeBarcodeForFile' in actions:
@@ -3396,7 +4346,9 @@ def main():
     except Exception, err:
       print 'An unknown error occured reading volume barcode: %s' % err
       exitCode = 25
-
+  
+  if 'memoryReport' in actions:
+    print fcsxml.memoryMonitor.report()
                     
   ## Return our stored exit code.
   return exitCode
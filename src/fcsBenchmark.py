@@ -0,0 +1,479 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+
+################################
+##
+##  Transmogrifier: fcsBenchmark
+##  A benchmark suite for fcsxml
+##
+##
+##  This module benchmarks frequently used FCSVRClient operations against
+##  the simulated fcsvr_client provided by fcsSimulator. Each benchmark is
+##  run in a fresh process, reporting wall time, the number of fcsvr_client
+##  subprocesses spawned and peak memory. Results can be saved as a baseline,
+##  subsequent runs are compared against it and regressions are reported.
+##
+##  This code is made available via the GPL3 license as part of the Transmogrifier
+##  project available at:
+##  http://sourceforge.net/projects/transmogrifier/
+##
+#############################################################
+
+import sys,getopt,os,os.path,shutil,subprocess
+import time,tempfile,plistlib,resource
+
+import fcsxml
+import fcsSimulator
+from fcsxml import FCSBaseObject,FCSVRClient,FCSXMLField
+
+version = '1.0b'
+build = '2011042001'
+
+
+class FCSBenchmarkSkipped(Exception):
+  '''Raised by a benchmark's setup if it cannot run in this environment.'''
+  pass
+
+
+class FCSBenchmark(FCSBaseObject):
+  '''FCSBenchmark runs our benchmark cases against a simulated fcsvr_client.
+  Each case consists of an optional setup method (case_<name>_setup), which
+  is not measured, and a run method (case_<name>). Both are passed a shared
+  dict which can be used to hand objects from setup to run.
+
+  >>> benchmark = fcsBenchmark.FCSBenchmark()
+  >>> results = benchmark.runCases()
+  >>> print benchmark.reportForResults(results)
+
+  '''
+
+  cases = ['initWithAssetID','loadField','productionMemberAddresses',
+            'assetsFromProduction','assetWithField','setMD',
+            'getFSPathFromArchivePath']
+
+  workDir = ''          ## Directory which holds our fixture, state and logs
+  fixturePath = ''      ## Path to our fixture, generated if not provided
+  repeat = 3            ## Number of times each case is run, we report the
+                        ## fastest wall time and highest counts
+  latencyScale = 1.0    ## Multiplier applied to fixture latencies
+  tolerance = 0.25      ## Fraction by which wall time or memory may exceed
+                        ## our baseline before it is flagged
+
+  numProductions = 4    ## Parameters used to generate our fixture
+  assetsPerProduction = 25
+  nestingDepth = 8
+  numAssetIDs = 20      ## Number of assets used by per-asset cases
+
+  def __init__(self,workDir='',fixturePath='',repeat=3,latencyScale=1.0):
+    '''Our construct.'''
+    FCSBaseObject.__init__(self)
+    self.workDir = workDir
+    self.fixturePath = fixturePath
+    self.repeat = repeat
+    self.latencyScale = latencyScale
+    self.removeWorkDir = False
+
+  def prepare(self):
+    '''Creates our work directory, fixture and fcsvr_client executable.'''
+
+    if not self.workDir:
+      self.workDir = tempfile.mkdtemp(prefix='fcsBenchmark')
+      self.removeWorkDir = True
+    elif not os.path.isdir(self.workDir):
+      os.makedirs(self.workDir)
+
+    if not self.fixturePath:
+      self.fixturePath = os.path.join(self.workDir,'fixture.plist')
+      fixture = fcsSimulator.generateFixture(
+                              numProductions=self.numProductions,
+                              assetsPerProduction=self.assetsPerProduction,
+                              nestingDepth=self.nestingDepth)
+      plistlib.writePlist(fixture,self.fixturePath)
+
+    ## Write an fcsvr_client executable which runs under our interpreter
+    clientPath = self.clientPath()
+    clientFile = open(clientPath,'w')
+    clientFile.write('#!%s\nimport sys\nsys.path.insert(0,%r)\n'
+                      'import fcsSimulator\n'
+                      'sys.exit(fcsSimulator.fcsvrClientMain(fixturePath=%r))\n'
+                      % (sys.executable,os.path.dirname(
+                        os.path.abspath(fcsSimulator.__file__)),
+                        self.fixturePath))
+    clientFile.close()
+    os.chmod(clientPath,0755)
+    return True
+
+  def cleanup(self):
+    '''Removes our work directory, if we created it.'''
+    if self.removeWorkDir and os.path.isdir(self.workDir):
+      shutil.rmtree(self.workDir)
+
+  def clientPath(self):
+    return os.path.join(self.workDir,'fcsvr_client')
+
+  def statePath(self):
+    return os.path.join(self.workDir,'state.plist')
+
+  def logPath(self):
+    return os.path.join(self.workDir,'calls.log')
+
+  def environment(self):
+    '''Returns the environment used by our benchmark processes.'''
+    env = dict(os.environ)
+    env['FCSSIM_FIXTURE'] = self.fixturePath
+    env['FCSSIM_STATE'] = self.statePath()
+    env['FCSSIM_LOG'] = self.logPath()
+    env['FCSSIM_LATENCY_SCALE'] = '%s' % self.latencyScale
+    env['PYTHONPATH'] = os.pathsep.join([os.path.dirname(
+                              os.path.abspath(__file__))]
+                              + [path for path in [env.get('PYTHONPATH')] if path])
+    return env
+
+  #############
+  ## Running
+
+  def runCases(self,caseNames=None):
+    '''Runs the provided cases (default all), returning a dict of result
+    dicts keyed by case name. Each result contains wallTime (seconds),
+    subprocessCount and peakMemoryKB, or skipped if the case could not run.
+    '''
+
+    if not caseNames:
+      caseNames = self.cases
+    self.prepare()
+
+    results = {}
+    for caseName in caseNames:
+      self.logger('Running benchmark: %s' % caseName,'detailed')
+      caseResults = []
+      for iteration in range(self.repeat):
+        caseResult = self.runCaseInSubprocess(caseName)
+        caseResults.append(caseResult)
+        if 'skipped' in caseResult:
+          break
+      results[caseName] = self.combineResults(caseResults)
+    return results
+
+  def runCaseInSubprocess(self,caseName):
+    '''Runs a single iteration of the named case in a new process, against
+    a freshly reset simulator state.'''
+
+    fcsSimulator.FCSSimulator(fixturePath=self.fixturePath,
+                                      statePath=self.statePath()).reset()
+    resultPath = os.path.join(self.workDir,'%s.result.plist' % caseName)
+    if os.path.exists(resultPath):
+      os.remove(resultPath)
+
+    cmdArgs = [sys.executable,os.path.abspath(__file__).replace('.pyc','.py'),
+                '--runCase=%s' % caseName,'--workDir=%s' % self.workDir,
+                '--fixture=%s' % self.fixturePath]
+    benchmarkCMD = subprocess.Popen(cmdArgs,env=self.environment(),
+                                      stdout=subprocess.PIPE,
+                                      stderr=subprocess.STDOUT,
+                                      universal_newlines=True)
+    benchmarkCMD_STDOUT,benchmarkCMD_STDERR = benchmarkCMD.communicate()
+
+    if not benchmarkCMD.returncode == 0 or not os.path.exists(resultPath):
+      message = ('Benchmark: %s failed with exit code: %s Output:\n%s'
+                      % (caseName,benchmarkCMD.returncode,benchmarkCMD_STDOUT))
+      self.logger(message,'error')
+      raise RuntimeError(message)
+
+    return plistlib.readPlist(resultPath)
+
+  def runCase(self,caseName):
+    '''Runs the named case in the current process, writing our result to
+    our work directory. This is called in the process created by
+    :func:`fcsBenchmark.FCSBenchmark.runCaseInSubprocess`.'''
+
+    FCSVRClient.pathToFCSVRClient = self.clientPath()
+    context = {'client':FCSVRClient()}
+    result = {}
+
+    try:
+      try:
+        setupFunction = getattr(self,'case_%s_setup' % caseName)
+      except AttributeError:
+        setupFunction = None
+      if setupFunction:
+        setupFunction(context)
+
+      startCallCount = self.callCount()
+      startTime = time.time()
+      getattr(self,'case_%s' % caseName)(context)
+      result['wallTime'] = time.time() - startTime
+      result['subprocessCount'] = self.callCount() - startCallCount
+      result['peakMemoryKB'] = self.peakMemoryKB()
+    except FCSBenchmarkSkipped, err:
+      result = {'skipped':'%s' % err}
+
+    plistlib.writePlist(result,os.path.join(self.workDir,
+                                            '%s.result.plist' % caseName))
+    return result
+
+  def callCount(self):
+    '''Returns the number of fcsvr_client calls recorded in our log.'''
+    if not os.path.exists(self.logPath()):
+      return 0
+    logFile = open(self.logPath())
+    try:
+      return len(logFile.readlines())
+    finally:
+      logFile.close()
+
+  def peakMemoryKB(self):
+    '''Returns the peak resident memory of this process in KB.'''
+    maxRSS = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+      maxRSS = maxRSS / 1024
+    return int(maxRSS)
+
+  def combineResults(self,caseResults):
+    '''Combines iteration results, reporting the fastest wall time and the
+    highest subprocess count and memory use.'''
+    for caseResult in caseResults:
+      if 'skipped' in caseResult:
+        return caseResult
+    return {'wallTime':min([result['wallTime'] for result in caseResults]),
+            'subprocessCount':max([result['subprocessCount']
+                                              for result in caseResults]),
+            'peakMemoryKB':max([result['peakMemoryKB']
+                                              for result in caseResults])}
+
+  #############
+  ## Baselines
+
+  def loadBaseline(self,filePath):
+    '''Returns baseline results from the provided plist.'''
+    return plistlib.readPlist(filePath)
+
+  def saveBaseline(self,results,filePath):
+    '''Writes the provided results as our baseline.'''
+    plistlib.writePlist(results,filePath)
+    return True
+
+  def regressionsForResults(self,results,baseline):
+    '''Compares results against a baseline, returning a list of messages
+    describing each regression. Any increase in subprocess count is a
+    regression, wall time and memory may exceed the baseline by our
+    tolerance.'''
+
+    regressions = []
+    for caseName in sorted(results.keys()):
+      result = results[caseName]
+      if 'skipped' in result or not caseName in baseline:
+        continue
+      baselineResult = baseline[caseName]
+      if 'skipped' in baselineResult:
+        continue
+      if result['subprocessCount'] > baselineResult['subprocessCount']:
+        regressions.append('%s: subprocess count increased from %s to %s'
+          % (caseName,baselineResult['subprocessCount'],
+                                              result['subprocessCount']))
+      if result['wallTime'] > baselineResult['wallTime'] * (1 + self.tolerance):
+        regressions.append('%s: wall time increased from %.3fs to %.3fs'
+          % (caseName,baselineResult['wallTime'],result['wallTime']))
+      if (result['peakMemoryKB']
+                  > baselineResult['peakMemoryKB'] * (1 + self.tolerance)):
+        regressions.append('%s: peak memory increased from %sKB to %sKB'
+          % (caseName,baselineResult['peakMemoryKB'],result['peakMemoryKB']))
+    return regressions
+
+  def reportForResults(self,results,baseline=None):
+    '''Returns a printable table of results, with baseline values if
+    provided.'''
+
+    lines = ['%-28s %10s %12s %12s' % ('Benchmark','Wall (s)','Subprocesses',
+                                                              'Peak (KB)')]
+    for caseName in self.cases:
+      if not caseName in results:
+        continue
+      result = results[caseName]
+      if 'skipped' in result:
+        lines.append('%-28s skipped: %s' % (caseName,result['skipped']))
+        continue
+      lines.append('%-28s %10.3f %12s %12s' % (caseName,result['wallTime'],
+                          result['subprocessCount'],result['peakMemoryKB']))
+      if baseline and caseName in baseline and not 'skipped' in baseline[caseName]:
+        baselineResult = baseline[caseName]
+        lines.append('%-28s %10.3f %12s %12s' % ('  (baseline)',
+                          baselineResult['wallTime'],
+                          baselineResult['subprocessCount'],
+                          baselineResult['peakMemoryKB']))
+    return '\n'.join(lines)
+
+  #############
+  ## Cases
+
+  def case_initWithAssetID(self,context):
+    for assetID in range(1,self.numAssetIDs + 1):
+      FCSVRClient(entityType='asset',id=assetID)
+
+  def case_loadField_setup(self,context):
+    context['assets'] = [FCSVRClient(entityType='asset',id=assetID)
+                                  for assetID in range(1,self.numAssetIDs + 1)]
+
+  def case_loadField(self,context):
+    for asset in context['assets']:
+      asset.loadField(FCSXMLField(name='Owner'))
+      asset.valueForField('Title')
+      asset.valueForField('File Name')
+
+  def case_productionMemberAddresses(self,context):
+    context['client'].productionMemberAddresses(productionID=1,recurse=True)
+
+  def case_assetsFromProduction(self,context):
+    context['client'].assetsFromProduction(productionID=1,recurse=True)
+
+  def case_assetWithField(self,context):
+    for assetID in range(1,self.numAssetIDs + 1):
+      context['client'].assetWithField(FCSXMLField(name='Membership',
+                                                  value='A-%s' % assetID))
+
+  def case_setMD_setup(self,context):
+    if not os.geteuid() == 0:
+      raise FCSBenchmarkSkipped('setMD requires root privileges')
+    self.case_loadField_setup(context)
+
+  def case_setMD(self,context):
+    for asset in context['assets']:
+      asset.setField(FCSXMLField(name='Title',dbname='CUST_TITLE',
+                        value='Benchmark %s' % asset.entityID))
+      asset.setMD()
+
+  def case_getFSPathFromArchivePath(self,context):
+    for assetID in range(1,self.numAssetIDs + 1):
+      context['client'].getFSPathFromArchivePath(
+                    '/Users/Shared/FCSStore/Archive/2/Clip-%04d.mov' % assetID)
+
+
+def helpMessage():
+    print '''
+Usage:
+
+  fcsBenchmark.py [options] [benchmark ...]
+
+Options:
+  -h, --help                  Displays this help message
+  -v, --version               Display version number
+  -b pathtofile,              Compare results against the baseline at
+    --baseline=pathtofile     pathtofile, exits with status 4 if a regression
+                              is found.
+  --writeBaseline             Save results as the baseline at the path
+                              specified by --baseline
+  --fixture=pathtofile        Use the fixture at pathtofile rather than
+                              generating one.
+  --repeat=3                  Number of times each benchmark is run
+  --latencyScale=1.0          Multiplier applied to simulated latency
+  --tolerance=0.25            Fraction by which wall time and memory may
+                              exceed the baseline.
+  --list                      List available benchmarks
+
+   '''
+
+def printVersionInfo():
+  '''Prints out version info'''
+  print ("\nfcsBenchmark.py\n  Version: %s Build: %s\n"
+        "  Framework Version: %s Build: %s\n\n"
+        "Copyright (C) 2009-2011 Beau Hunter, 318 Inc.\n" % (version,build,
+                                                        fcsxml.version,
+                                                        fcsxml.build))
+
+def main():
+  '''Our main function, runs our benchmarks and compares them to our
+  baseline'''
+
+  baselinePath = ''
+  writeBaseline = False
+  fixturePath = ''
+  workDir = ''
+  runCaseName = ''
+  repeat = 3
+  latencyScale = 1.0
+  tolerance = 0.25
+
+  ## Get our flags
+  try:
+    optlist, list = getopt.getopt(sys.argv[1:],':hvb:',['baseline=',
+      'writeBaseline','fixture=','repeat=','latencyScale=','tolerance=',
+      'list','runCase=','workDir=','help','version'])
+  except getopt.GetoptError:
+    print 'Syntax Error!'
+    helpMessage()
+    return 1
+
+  #### PROCESS OUR PASSED ARGUMENTS ####
+  for opt in optlist:
+    if opt[0] == '-h' or opt[0] == '--help':
+      helpMessage()
+      return 0
+    elif opt[0] == '-v' or opt[0] == '--version':
+      printVersionInfo()
+      return 0
+    elif opt[0] == '-b' or opt[0] == '--baseline':
+      baselinePath = os.path.abspath(os.path.expanduser(opt[1]))
+    elif opt[0] == '--writeBaseline':
+      writeBaseline = True
+    elif opt[0] == '--fixture':
+      fixturePath = os.path.abspath(os.path.expanduser(opt[1]))
+    elif opt[0] == '--repeat':
+      repeat = int(opt[1])
+    elif opt[0] == '--latencyScale':
+      latencyScale = float(opt[1])
+    elif opt[0] == '--tolerance':
+      tolerance = float(opt[1])
+    elif opt[0] == '--list':
+      for caseName in FCSBenchmark.cases:
+        print caseName
+      return 0
+    elif opt[0] == '--runCase':
+      runCaseName = opt[1]
+    elif opt[0] == '--workDir':
+      workDir = opt[1]
+
+  benchmark = FCSBenchmark(workDir=workDir,fixturePath=fixturePath,
+                                  repeat=repeat,latencyScale=latencyScale)
+  benchmark.tolerance = tolerance
+
+  ## Run a single case, used by our benchmark subprocesses
+  if runCaseName:
+    benchmark.runCase(runCaseName)
+    return 0
+
+  for caseName in list:
+    if not caseName in benchmark.cases:
+      print 'Unknown benchmark: %s' % caseName
+      return 1
+
+  try:
+    results = benchmark.runCases(caseNames=list)
+  finally:
+    benchmark.cleanup()
+
+  baseline = None
+  if baselinePath and not writeBaseline and os.path.exists(baselinePath):
+    baseline = benchmark.loadBaseline(baselinePath)
+
+  print benchmark.reportForResults(results,baseline=baseline)
+
+  if writeBaseline:
+    if not baselinePath:
+      print 'A baseline path must be provided with --baseline!'
+      return 1
+    benchmark.saveBaseline(results,baselinePath)
+    print '\nWrote baseline to: %s' % baselinePath
+  elif baseline:
+    regressions = benchmark.regressionsForResults(results,baseline)
+    if regressions:
+      print '\nFound %s regressions:' % len(regressions)
+      for regression in regressions:
+        print '  %s' % regression
+      return 4
+    print '\nNo regressions found.'
+
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,988 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+
+################################
+##
+##  Transmogrifier: fcsSimulator
+##  A Final Cut Server and PresStore simulator
+##
+##
+##  This module provides stand-ins for the fcsvr_client and nsdchat
+##  executables which are driven by a fixture dataset of assets, productions,
+##  devices, links and tape volumes. The executables in support/simulator
+##  wrap this module, pointing the pathToFCSVRClient (FCSVRClient section)
+##  and nsdchatpath (BACKUP section) configuration options at them allows
+##  fcsxml and fcsArchiver to be exercised without a Final Cut Server or
+##  PresStore installation, forming the basis of our benchmark harness.
+##
+##  The simulator is configured via the following environment variables:
+##
+##    FCSSIM_FIXTURE        path to the fixture plist to load
+##    FCSSIM_STATE          path to the state plist, which records changes
+##                          made by write operations between calls
+##    FCSSIM_LATENCY_SCALE  multiplier applied to fixture latencies
+##                          (0 disables simulated latency)
+##    FCSSIM_LOG            path to a file which records each invocation
+##
+##  This code is made available via the GPL3 license as part of the Transmogrifier
+##  project available at:
+##  http://sourceforge.net/projects/transmogrifier/
+##
+#############################################################
+
+import sys,os,os.path,time,tempfile
+import re,datetime,fcntl,plistlib,urllib
+from xml.etree import cElementTree as ElementTree
+from xml.sax.saxutils import escape
+
+
+version = '1.0b'
+build = '2011042001'
+
+
+class FCSSimulatorError(Exception):
+  '''Raised by simulated commands, error codes mirror those reported by
+  fcsvr_client (i.e. 'E_FILE', 'E_COM').'''
+
+  def __init__(self,code='E_UNKNOWN',desc='',exitStatus=1):
+    self.code = code
+    self.desc = desc
+    self.exitStatus = exitStatus
+
+  def __str__(self):
+    return '%s: %s' % (self.code,self.desc)
+
+
+class FCSSimulator:
+  '''FCSSimulator loads our fixture dataset (or previously saved state) and
+  provides the shared state and latency handling used by
+  :class:`fcsSimulator.FCSVRClientSimulator` and
+  :class:`fcsSimulator.NSDChatSimulator`.
+
+  Fixture datasets are plists containing the following keys:
+
+  ================  =========================================================
+  Key               Description
+  ================  =========================================================
+  fields            (*list*) Dicts with FIELD_ID, FIELD_NAME, FIELD_DATA_TYPE
+  devices           (*list*) Dicts with DEVICE_ID, DEVICE_NAME, DEVICE_TYPE,
+                    DEV_ROOT_PATH and DEV_ARCHIVE
+  assets            (*dict*) Asset metadata dicts keyed by asset id
+  productions       (*dict*) Production metadata dicts keyed by project id
+  links             (*list*) Dicts with parent, child and linkType values
+  volumes           (*dict*) Dicts with barcode and isonline keyed by label
+  plans             (*dict*) Dicts with database and volumes (list of labels)
+                    keyed by archive plan
+  archiveEntries    (*dict*) Lists of volume labels keyed by archive
+                    database, then by file path
+  latency           (*dict*) Seconds of latency per command, keyed by
+                    command name, 'default' is used for unlisted commands.
+                    nsdchat commands are keyed by 'nsdchat:<Class>'
+  failures          (*dict*) Error codes keyed by entity address, then by
+                    command name (i.e. {'/asset/13':{'analyze':'E_COM'}})
+  jobDuration       (*float*) Seconds before a submitted PresStore job
+                    reports as completed
+  ================  =========================================================
+
+  '''
+
+  fixturePath = ''
+  statePath = ''
+  latencyScale = 1.0
+  logPath = ''
+  data = {}
+
+  fcsTypes = { 'KtString32' : 'string', 'KtString' : 'string',
+              'KtInt' : 'int', 'KtInt64' : 'bigint', 'KtDateTime' : 'timestamp',
+              'KtReal' : 'real', 'KtBool' : 'bool', 'KtAtom' : 'atom',
+              'PxTimecode' : 'timecode', 'KtAddress' : 'string' }
+
+  def __init__(self,fixturePath='',statePath=''):
+    '''Our construct, values not provided are read from our environment.'''
+
+    if not fixturePath:
+      fixturePath = os.environ.get('FCSSIM_FIXTURE','')
+    if not statePath:
+      statePath = os.environ.get('FCSSIM_STATE','')
+    if not statePath and fixturePath:
+      statePath = os.path.join(tempfile.gettempdir(),'fcsSimulatorState-%s'
+                                            % os.path.basename(fixturePath))
+
+    self.fixturePath = fixturePath
+    self.statePath = statePath
+    self.logPath = os.environ.get('FCSSIM_LOG','')
+    try:
+      self.latencyScale = float(os.environ.get('FCSSIM_LATENCY_SCALE',1.0))
+    except ValueError:
+      self.latencyScale = 1.0
+    self.data = {}
+    self.lockFile = None
+
+  def load(self,exclusive=False):
+    '''Loads our state, acquiring a lock which is held until
+    :func:`fcsSimulator.FCSSimulator.release` is called. If exclusive
+    is true, callers may modify and save our state.
+
+    :raises: FCSSimulatorError if no fixture can be loaded
+    '''
+
+    if self.statePath:
+      self.lockFile = open('%s.lock' % self.statePath,'a')
+      if exclusive:
+        fcntl.flock(self.lockFile,fcntl.LOCK_EX)
+      else:
+        fcntl.flock(self.lockFile,fcntl.LOCK_SH)
+
+    if self.statePath and os.path.exists(self.statePath):
+      self.data = plistlib.readPlist(self.statePath)
+    elif self.fixturePath and os.path.exists(self.fixturePath):
+      self.data = plistlib.readPlist(self.fixturePath)
+    else:
+      raise FCSSimulatorError('E_COM','No fixture found at path:\'%s\''
+                                                          % self.fixturePath)
+    return self.data
+
+  def save(self):
+    '''Writes our state to disk, requires that we were loaded exclusively.'''
+    if not self.statePath:
+      return False
+    tempPath = '%s.%s' % (self.statePath,os.getpid())
+    plistlib.writePlist(self.data,tempPath)
+    os.rename(tempPath,self.statePath)
+    return True
+
+  def release(self):
+    '''Releases our state lock.'''
+    if self.lockFile:
+      fcntl.flock(self.lockFile,fcntl.LOCK_UN)
+      self.lockFile.close()
+      self.lockFile = None
+
+  def reset(self):
+    '''Discards any saved state, reverting to our fixture.'''
+    if self.statePath and os.path.exists(self.statePath):
+      os.remove(self.statePath)
+    return True
+
+  def nextID(self,counterName):
+    '''Returns the next value for the named counter.'''
+    counters = self.data.setdefault('counters',{})
+    counters[counterName] = counters.get(counterName,0) + 1
+    return counters[counterName]
+
+  def simulateLatency(self,command):
+    '''Sleeps for the fixture's latency for the provided command.'''
+    latencies = self.data.get('latency',{})
+    latency = latencies.get(command,latencies.get('default',0))
+    if latency and self.latencyScale > 0:
+      time.sleep(latency * self.latencyScale)
+
+  def failureForAddress(self,address,command):
+    '''Returns any error code injected for the provided address and command.'''
+    try:
+      return self.data['failures'][address][command]
+    except KeyError:
+      return None
+
+  def logCall(self,tool,args):
+    '''Records an invocation in our call log, if configured.'''
+    if not self.logPath:
+      return
+    logFile = open(self.logPath,'a')
+    try:
+      fcntl.flock(logFile,fcntl.LOCK_EX)
+      logFile.write('%.6f\t%s\t%s\t%s\n' % (time.time(),os.getpid(),tool,
+                                                            ' '.join(args)))
+    finally:
+      logFile.close()
+
+  def fcsTypeForField(self,fieldID,value):
+    '''Returns the fcsvr_client XML type for the provided field, falling back
+    to the python type of value if the field is not defined.'''
+    for field in self.data.get('fields',[]):
+      if field.get('FIELD_ID') == fieldID:
+        return self.fcsTypes.get(field.get('FIELD_DATA_TYPE'),'string')
+    if isinstance(value,bool):
+      return 'bool'
+    elif isinstance(value,(int,long)):
+      return 'int'
+    elif isinstance(value,float):
+      return 'real'
+    return 'string'
+
+
+class FCSVRClientSimulator:
+  '''Simulates the fcsvr_client commands used by fcsxml: getmd, setmd,
+  search, list_parent_links, list_child_links, make_link, create, createasset,
+  delete, archive, restore and analyze. XML output is indented in the same
+  manner as fcsvr_client, which our DOM based parsers rely upon.
+  '''
+
+  writeCommands = ('setmd','make_link','create','createasset','delete',
+                                                        'archive','restore')
+  valueOptions = ('--crit','--type','--linkparentaddr','--linkparentlinktype',
+                                                  '--projaddr','--linktype')
+
+  def __init__(self,simulator):
+    '''Our construct, accepts a :class:`fcsSimulator.FCSSimulator`.'''
+    self.simulator = simulator
+    self.data = simulator.data
+
+  def run(self,args,stdin=None):
+    '''Runs the fcsvr_client command represented by args, returning a
+    tuple of (exitStatus,output).'''
+
+    if not args:
+      return (1,'usage: fcsvr_client <command> [options]\n')
+
+    command = args[0]
+    options = {}
+    arguments = []
+    index = 1
+    while index < len(args):
+      arg = args[index]
+      if arg in self.valueOptions and index + 1 < len(args):
+        options[arg] = args[index + 1]
+        index += 2
+        continue
+      elif arg.startswith('--'):
+        options[arg] = True
+      else:
+        arguments.append(arg)
+      index += 1
+
+    self.simulator.logCall('fcsvr_client',args)
+
+    exclusive = command in self.writeCommands
+    try:
+      self.simulator.load(exclusive=exclusive)
+      self.data = self.simulator.data
+      try:
+        handler = getattr(self,'command_%s' % command)
+      except AttributeError:
+        raise FCSSimulatorError('E_NOTSUPP','Command: %s is not supported'
+                                                                    % command)
+      try:
+        output = handler(arguments,options,stdin)
+      except IndexError:
+        raise FCSSimulatorError('E_NOTSUPP','Missing arguments for command: %s'
+                                                                    % command)
+      if exclusive:
+        self.simulator.save()
+      return (0,output)
+    except FCSSimulatorError, err:
+      return (err.exitStatus,self.xmlForError(err))
+    finally:
+      ## Simulate latency once our lock is released, so that concurrent
+      ## callers overlap as they would against a server
+      self.simulator.release()
+      self.simulator.simulateLatency(command)
+
+  #############
+  ## Entity access
+
+  def splitAddress(self,address):
+    '''Returns a tuple of (entityType,entityID) for an address.'''
+    address = urllib.unquote(address.strip('"\''))
+    match = re.match('/(\w+)/(.+)',address)
+    if not match:
+      raise FCSSimulatorError('E_FILE','Invalid address: %s' % address)
+    return (match.group(1),match.group(2))
+
+  def entityStore(self,entityType):
+    '''Returns the dict of entities for the provided entityType.'''
+    if entityType == 'asset':
+      return self.data.setdefault('assets',{})
+    elif entityType == 'project':
+      return self.data.setdefault('productions',{})
+    raise FCSSimulatorError('E_NOTSUPP','Unsupported entity type: %s'
+                                                                % entityType)
+
+  def entityForAddress(self,address):
+    '''Returns the metadata dict for the provided address.'''
+    entityType,entityID = self.splitAddress(address)
+    if entityType == 'field':
+      for field in self.data.get('fields',[]):
+        if field.get('FIELD_ID') == entityID:
+          return field
+    elif entityType == 'dev':
+      for device in self.data.get('devices',[]):
+        if '%s' % device.get('DEVICE_ID') == entityID:
+          return device
+    else:
+      try:
+        return self.entityStore(entityType)[entityID]
+      except KeyError:
+        pass
+    raise FCSSimulatorError('E_FILE','No such entity: /%s/%s'
+                                                      % (entityType,entityID))
+
+  def checkFailure(self,address,command):
+    '''Raises an injected failure for the provided address and command.'''
+    code = self.simulator.failureForAddress(address,command)
+    if code:
+      raise FCSSimulatorError(code,'Simulated failure for %s %s'
+                                                          % (command,address))
+
+  def recordsForEntities(self,entities):
+    '''Returns search result records for the provided metadata dicts.'''
+    return [[('COMPLETE','bool',True),('METADATA','values',
+                                  self.valuesForMetadata(entity))]
+                                                      for entity in entities]
+
+  def valuesForMetadata(self,metadata):
+    '''Returns a list of (id,type,value) tuples for a metadata dict.'''
+    values = []
+    for key in sorted(metadata.keys()):
+      value = metadata[key]
+      values.append((key,self.simulator.fcsTypeForField(key,value),value))
+    return values
+
+  #############
+  ## Commands
+
+  def command_getmd(self,arguments,options,stdin):
+    address = arguments[0]
+    self.checkFailure(address,'getmd')
+    return self.xmlForRecords([self.valuesForMetadata(
+                                            self.entityForAddress(address))])
+
+  def command_setmd(self,arguments,options,stdin):
+    address = arguments[0]
+    self.checkFailure(address,'setmd')
+    metadata = self.entityForAddress(address)
+    if len(arguments) > 1:
+      xmlString = open(arguments[1].strip('"\'')).read()
+    else:
+      xmlString = stdin
+    for valueID,(valueType,valueData) in self.valuesFromXML(xmlString).iteritems():
+      metadata[valueID] = valueData
+    return ''
+
+  def command_search(self,arguments,options,stdin):
+    entityType = arguments[0].strip('/').split('/')[0]
+    if entityType == 'field':
+      entities = self.data.get('fields',[])
+    elif entityType == 'dev':
+      entities = self.data.get('devices',[])
+    else:
+      store = self.entityStore(entityType)
+      entities = [store[key] for key in sorted(store.keys(),key=self.idSortKey)]
+
+    if '--xmlcrit' in options:
+      criteria = ElementTree.fromstring(stdin).find('values')
+      entities = [entity for entity in entities
+                                if self.entityMatchesCriteria(entity,criteria)]
+    elif '--crit' in options:
+      searchString = options['--crit'].lower()
+      entities = [entity for entity in entities
+                  if [value for value in entity.itervalues()
+                    if isinstance(value,basestring)
+                                      and searchString in value.lower()]]
+
+    return self.xmlForRecords(self.recordsForEntities(entities))
+
+  def command_list_parent_links(self,arguments,options,stdin):
+    address = urllib.unquote(arguments[0].strip('"\''))
+    self.checkFailure(address,'list_parent_links')
+    records = []
+    for link in self.data.get('links',[]):
+      if link['parent'] == address:
+        records.append([('LINK_TYPE','int',link['linkType']),
+                        ('ADDRESS','string',link['child'])])
+    return self.xmlForRecords(records)
+
+  def command_list_child_links(self,arguments,options,stdin):
+    address = urllib.unquote(arguments[0].strip('"\''))
+    self.checkFailure(address,'list_child_links')
+    records = []
+    for link in self.data.get('links',[]):
+      if link['child'] == address:
+        records.append([('LINK_TYPE','int',link['linkType']),
+                        ('ADDRESS','string',link['parent'])])
+    if not records and address.startswith('/dev/'):
+      raise FCSSimulatorError('E_FILE','No such file: %s' % address)
+    return self.xmlForRecords(records)
+
+  def command_make_link(self,arguments,options,stdin):
+    parentAddress = arguments[0].strip('"\'')
+    childAddress = arguments[1].strip('"\'')
+    linkType = int(options.get('--linktype',1))
+    links = self.data.setdefault('links',[])
+    if '--movelink' in options:
+      links[:] = [link for link in links if not (link['child'] == childAddress
+                                          and link['linkType'] == linkType)]
+    for link in links:
+      if (link['parent'] == parentAddress and link['child'] == childAddress
+                                            and link['linkType'] == linkType):
+        raise FCSSimulatorError('E_DUPLICATE','Link already exists')
+    links.append({'parent':parentAddress,'child':childAddress,
+                                                        'linkType':linkType})
+    return ''
+
+  def command_create(self,arguments,options,stdin):
+    entityType = arguments[0].strip('/').split('/')[0]
+    store = self.entityStore(entityType)
+    entityID = '%s' % self.nextEntityID(entityType)
+    metadata = {'PROJECT_NUMBER':int(entityID),'DB_ENTITY_ID':int(entityID),
+                'PROJECT_TYPE':options.get('--type','pa_production_package')}
+    for argument in arguments[1:]:
+      if '=' in argument:
+        key,value = argument.split('=',1)
+        metadata[key] = value.strip('"')
+    store[entityID] = metadata
+    address = '/%s/%s' % (entityType,entityID)
+    if '--linkparentaddr' in options:
+      self.data.setdefault('links',[]).append({
+                      'parent':options['--linkparentaddr'],'child':address,
+                      'linkType':int(options.get('--linkparentlinktype',16))})
+    return '%s\n' % address
+
+  def command_createasset(self,arguments,options,stdin):
+    mdSet = arguments[0]
+    fcsPath = urllib.unquote(arguments[1].strip('"\''))
+    assetID = '%s' % self.nextEntityID('asset')
+    self.entityStore('asset')[assetID] = {'ASSET_NUMBER':int(assetID),
+                              'DB_ENTITY_ID':int(assetID),
+                              'ASSET_TYPE':mdSet,
+                              'CUST_TITLE':os.path.basename(fcsPath)}
+    address = '/asset/%s' % assetID
+    links = self.data.setdefault('links',[])
+    links.append({'parent':address,'child':fcsPath,'linkType':2})
+    if '--projaddr' in options:
+      links.append({'parent':options['--projaddr'],'child':address,
+                                                              'linkType':1})
+    return '%s\n' % address
+
+  def command_delete(self,arguments,options,stdin):
+    address = arguments[-1].strip('"\'')
+    self.checkFailure(address,'delete')
+    entityType,entityID = self.splitAddress(address)
+    self.entityForAddress(address)
+    del self.entityStore(entityType)[entityID]
+    self.data['links'] = [link for link in self.data.get('links',[])
+                    if not link['parent'] == address
+                                            and not link['child'] == address]
+    return ''
+
+  def command_archive(self,arguments,options,stdin):
+    address = arguments[0].strip('"\'')
+    self.checkFailure(address,'archive')
+    device = self.entityForAddress(arguments[1])
+    if not device.get('DEV_ARCHIVE'):
+      raise FCSSimulatorError('E_NOTSUPP','Device: %s is not an archive device'
+                                                              % arguments[1])
+    self.entityForAddress(address)
+    self.data.setdefault('archived',{})[address] = arguments[1]
+    return ''
+
+  def command_restore(self,arguments,options,stdin):
+    address = arguments[0].strip('"\'')
+    self.checkFailure(address,'restore')
+    self.entityForAddress(address)
+    try:
+      del self.data.setdefault('archived',{})[address]
+    except KeyError:
+      raise FCSSimulatorError('E_NOTSUPP','Entity: %s is not archived'
+                                                                    % address)
+    return ''
+
+  def command_analyze(self,arguments,options,stdin):
+    address = arguments[-1].strip('"\'')
+    self.checkFailure(address,'analyze')
+    self.entityForAddress(address)
+    return ''
+
+  #############
+  ## Search criteria
+
+  def entityMatchesCriteria(self,entity,criteria):
+    '''Evaluates fcsvr_client --xmlcrit criteria (a ``<values>`` element)
+    against the provided metadata dict.'''
+
+    critValues = {}
+    for valueElement in criteria.findall('value'):
+      critValues[valueElement.get('id')] = valueElement
+
+    critType = int(critValues['CRIT_TYPE'].find('int').text)
+    if critType == 1:
+      cmpValueElement = critValues['CRIT_CMP_VALUE'].find('value')
+      fieldID = cmpValueElement.get('id')
+      searchValue = (cmpValueElement[0].text or '').lower()
+      cmpOp = critValues['CRIT_CMP_OP'].find('atom').text
+      if not fieldID in entity:
+        return False
+      entityValue = self.stringForValue(entity[fieldID]).lower()
+      if cmpOp == 'eq':
+        return entityValue == searchValue
+      elif cmpOp == 'contains':
+        return searchValue in entityValue
+      raise FCSSimulatorError('E_NOTSUPP','Unsupported CRIT_CMP_OP: %s'
+                                                                      % cmpOp)
+
+    if critType == 2:
+      critName,matchFunction = 'CRIT_UNION',any
+    elif critType == 3:
+      critName,matchFunction = 'CRIT_INTERSECT',all
+    else:
+      raise FCSSimulatorError('E_NOTSUPP','Unsupported CRIT_TYPE: %s'
+                                                                    % critType)
+
+    subCriteria = critValues[critName].find('valuesList').findall('values')
+    return matchFunction([self.entityMatchesCriteria(entity,subCriterion)
+                                              for subCriterion in subCriteria])
+
+  #############
+  ## XML
+
+  def stringForValue(self,value):
+    '''Returns the fcsvr_client string representation of a value.'''
+    if isinstance(value,bool):
+      if value:
+        return 'true'
+      return 'false'
+    elif isinstance(value,datetime.datetime):
+      return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+    elif isinstance(value,unicode):
+      return value.encode('utf-8')
+    return '%s' % value
+
+  def xmlForRecords(self,records):
+    '''Returns fcsvr_client formatted XML for a list of records, each record
+    being a list of (id,type,value) tuples. Values of type 'values' are
+    nested records.'''
+
+    lines = ['<?xml version="1.0"?>','<session>']
+    for record in records:
+      self.appendValuesXML(lines,record,1)
+    lines.append('</session>')
+    return '%s\n' % '\n'.join(lines)
+
+  def appendValuesXML(self,lines,record,depth):
+    '''Appends indented XML for a record to lines.'''
+    indent = '  ' * depth
+    lines.append('%s<values>' % indent)
+    for valueID,valueType,value in record:
+      lines.append('%s  <value id="%s">' % (indent,escape(valueID)))
+      if valueType == 'values':
+        self.appendValuesXML(lines,value,depth + 2)
+      elif valueType == 'string':
+        lines.append('%s    <string xml:space="preserve">%s</string>'
+                                % (indent,escape(self.stringForValue(value))))
+      else:
+        lines.append('%s    <%s>%s</%s>' % (indent,valueType,
+                                escape(self.stringForValue(value)),valueType))
+      lines.append('%s  </value>' % indent)
+    lines.append('%s</values>' % indent)
+
+  def xmlForError(self,err):
+    '''Returns fcsvr_client formatted error XML.'''
+    return self.xmlForRecords([[('CODE','atom',err.code),
+                                ('DESC','string',err.desc),
+                                ('NODE','string','fcsSimulator'),
+                                ('SRC_FILE','string','fcsSimulator.py'),
+                                ('SRC_LINE','int',0)]])
+
+  def valuesFromXML(self,xmlString):
+    '''Returns a dict of (type,value) tuples keyed by value id, read from
+    fcsvr_client formatted XML (as generated by setmd callers).'''
+
+    values = {}
+    for valueElement in ElementTree.fromstring(xmlString).find('values'):
+      if not len(valueElement):
+        continue
+      dataElement = valueElement[0]
+      valueData = dataElement.text or ''
+      if dataElement.tag in ('int','bigint'):
+        valueData = int(valueData)
+      elif dataElement.tag == 'real':
+        valueData = float(valueData)
+      elif dataElement.tag == 'bool':
+        valueData = (valueData.lower() == 'true')
+      values[valueElement.get('id')] = (dataElement.tag,valueData)
+    return values
+
+  #############
+  ## Helpers
+
+  def nextEntityID(self,entityType):
+    '''Returns an unused entity ID for the provided entityType.'''
+    store = self.entityStore(entityType)
+    entityID = self.simulator.nextID(entityType)
+    if store:
+      entityID = max(entityID,max([int(key) for key in store.keys()]) + 1)
+      self.data['counters'][entityType] = entityID
+    return entityID
+
+  def idSortKey(self,entityID):
+    try:
+      return int(entityID)
+    except ValueError:
+      return entityID
+
+
+class NSDChatSimulator:
+  '''Simulates the PresStore nsdchat commands used by fcsArchiver. Archive
+  selections record their entries against the next volume in the archive
+  plan, so that subsequent restore lookups (ArchiveEntry handle, volume)
+  resolve as they would against a PresStore server.
+  '''
+
+  def __init__(self,simulator):
+    '''Our construct, accepts a :class:`fcsSimulator.FCSSimulator`.'''
+    self.simulator = simulator
+    self.data = simulator.data
+
+  def tokenize(self,commandString):
+    '''Splits an nsdchat command into tokens, honoring Tcl style {} and
+    "" grouping.'''
+    return [brace or quote or word for brace,quote,word in
+            re.findall(r'\{([^}]*)\}|"([^"]*)"|(\S+)',commandString)]
+
+  def run(self,args,stdin=None):
+    '''Runs the nsdchat command represented by args, returning a tuple of
+    (exitStatus,output).'''
+
+    if not '-c' in args:
+      return (1,'usage: nsdchat -c <command>\n')
+
+    tokens = self.tokenize(' '.join(args[args.index('-c') + 1:]))
+    self.simulator.logCall('nsdchat',args)
+    if not tokens:
+      return (1,'usage: nsdchat -c <command>\n')
+
+    try:
+      self.simulator.load(exclusive=True)
+      self.data = self.simulator.data
+      try:
+        handler = getattr(self,'command_%s' % tokens[0])
+      except AttributeError:
+        raise FCSSimulatorError('E_NOTSUPP','Unknown command: %s' % tokens[0])
+      try:
+        output = handler(tokens[1:])
+      except IndexError:
+        raise FCSSimulatorError('E_NOTSUPP','Missing arguments for command: %s'
+                                                                  % tokens[0])
+      self.simulator.save()
+      return (0,'%s\n' % output)
+    except FCSSimulatorError, err:
+      if self.data:
+        self.data['lastError'] = err.desc
+        self.simulator.save()
+      return (err.exitStatus,'')
+    finally:
+      self.simulator.release()
+      self.simulator.simulateLatency('nsdchat:%s' % tokens[0])
+
+  #############
+  ## Commands
+
+  def command_geterror(self,tokens):
+    return self.data.get('lastError','')
+
+  def command_ArchiveSelection(self,tokens):
+    return self.selectionCommand('archive',tokens)
+
+  def command_RestoreSelection(self,tokens):
+    return self.selectionCommand('restore',tokens)
+
+  def selectionCommand(self,selectionType,tokens):
+    '''Handles ArchiveSelection and RestoreSelection commands.'''
+    selections = self.data.setdefault('selections',{})
+    if tokens[0] == 'create':
+      plan = ''
+      if len(tokens) > 2:
+        plan = tokens[2]
+        self.planForName(plan)
+      handle = '%sSelection%s' % (selectionType,
+                                    self.simulator.nextID('selection'))
+      selections[handle] = {'type':selectionType,'plan':plan,'entries':[]}
+      return handle
+
+    try:
+      selection = selections[tokens[0]]
+    except KeyError:
+      raise FCSSimulatorError('E_FILE','Unknown selection: %s' % tokens[0])
+
+    action = tokens[1]
+    if action == 'addentry':
+      entry = tokens[2]
+      if selectionType == 'archive' and not os.path.exists(entry):
+        raise FCSSimulatorError('E_FILE','No such file: %s' % entry)
+      selection['entries'].append(entry)
+      return entry
+    elif action == 'submit':
+      jobID = '%s' % self.simulator.nextID('job')
+      if selectionType == 'archive':
+        self.archiveEntries(selection['plan'],selection['entries'])
+      self.data.setdefault('jobs',{})[jobID] = {'type':selectionType,
+                                            'submitted':time.time(),
+                                            'entries':selection['entries']}
+      del selections[tokens[0]]
+      return jobID
+    raise FCSSimulatorError('E_NOTSUPP','Unknown selection action: %s'
+                                                                    % action)
+
+  def command_ArchivePlan(self,tokens):
+    plan = self.planForName(tokens[0])
+    if tokens[1] == 'database':
+      return plan['database']
+    raise FCSSimulatorError('E_NOTSUPP','Unknown ArchivePlan action: %s'
+                                                                % tokens[1])
+
+  def command_ArchiveEntry(self,tokens):
+    archiveEntries = self.data.setdefault('archiveEntries',{})
+    if tokens[0] == 'handle':
+      filePath = tokens[2]
+      database = tokens[3]
+      if not filePath in archiveEntries.get(database,{}):
+        return ''
+      handle = '%s' % self.simulator.nextID('entry')
+      self.data.setdefault('entryHandles',{})[handle] = [database,filePath]
+      return handle
+
+    try:
+      database,filePath = self.data.get('entryHandles',{})[tokens[0]]
+    except KeyError:
+      raise FCSSimulatorError('E_FILE','Unknown handle: %s' % tokens[0])
+    if tokens[1] == 'volume':
+      return ' '.join(archiveEntries.get(database,{}).get(filePath,[]))
+    raise FCSSimulatorError('E_NOTSUPP','Unknown ArchiveEntry action: %s'
+                                                                % tokens[1])
+
+  def command_Volume(self,tokens):
+    try:
+      volume = self.data.get('volumes',{})[tokens[0]]
+    except KeyError:
+      raise FCSSimulatorError('E_FILE','Unknown volume: %s' % tokens[0])
+    if tokens[1] == 'barcode':
+      return volume.get('barcode') or '<empty>'
+    elif tokens[1] == 'isonline':
+      if volume.get('isonline'):
+        return '1'
+      return '0'
+    raise FCSSimulatorError('E_NOTSUPP','Unknown Volume action: %s'
+                                                                % tokens[1])
+
+  def command_Job(self,tokens):
+    try:
+      job = self.data.get('jobs',{})[tokens[0]]
+    except KeyError:
+      return ''
+    if tokens[1] == 'status':
+      if time.time() - job['submitted'] >= self.data.get('jobDuration',0):
+        return 'completed'
+      return 'running'
+    raise FCSSimulatorError('E_NOTSUPP','Unknown Job action: %s' % tokens[1])
+
+  #############
+  ## Helpers
+
+  def planForName(self,planName):
+    '''Returns the archive plan dict for the provided plan name.'''
+    try:
+      return self.data.get('plans',{})[planName]
+    except KeyError:
+      raise FCSSimulatorError('E_FILE','Unknown archive plan: %s' % planName)
+
+  def archiveEntries(self,planName,filePaths):
+    '''Records archived file paths against the plan's current volume.'''
+    plan = self.planForName(planName)
+    volumes = plan.get('volumes',[])
+    if not volumes:
+      raise FCSSimulatorError('E_FILE','Archive plan: %s has no volumes'
+                                                                  % planName)
+    label = volumes[self.simulator.nextID('plan%s' % planName) % len(volumes)]
+    entries = self.data.setdefault('archiveEntries',{}).setdefault(
+                                                          plan['database'],{})
+    for filePath in filePaths:
+      entries.setdefault(filePath,[]).append(label)
+
+
+def generateFixture(numProductions=5,assetsPerProduction=10,numVolumes=4,
+                                              latency=None,nestingDepth=1):
+  '''Returns a fixture dataset dict containing numProductions productions,
+  each with assetsPerProduction member assets and a chain of nestingDepth
+  nested productions (each with a single member asset), in addition to 
+  archive plans, volumes and archive entries for half of the generated 
+  assets.
+
+  :param numProductions: The number of productions to generate
+  :type numProductions: int
+  :param assetsPerProduction: The number of assets to link to each production
+  :type assetsPerProduction: int
+  :param numVolumes: The number of tape volumes per archive plan
+  :type numVolumes: int
+  :param latency: Per command latency values, see
+    :class:`fcsSimulator.FCSSimulator`
+  :type latency: dict
+  :param nestingDepth: The number of nested productions below each production
+  :type nestingDepth: int
+
+  :returns: (*dict*) -- The fixture dataset
+  '''
+
+  if latency is None:
+    latency = {'default':0.05,'getmd':0.08,'search':0.15,'nsdchat:Job':0.02}
+
+  fixture = {'latency':latency,'failures':{},'jobDuration':0.0,
+              'counters':{},'links':[],'assets':{},'productions':{}}
+
+  fixture['fields'] = [
+    {'FIELD_ID':'ASSET_NUMBER','FIELD_NAME':'Asset ID','FIELD_DATA_TYPE':'KtInt'},
+    {'FIELD_ID':'ASSET_TYPE','FIELD_NAME':'Asset Type','FIELD_DATA_TYPE':'KtAtom'},
+    {'FIELD_ID':'PROJECT_NUMBER','FIELD_NAME':'Project ID','FIELD_DATA_TYPE':'KtInt'},
+    {'FIELD_ID':'PROJECT_TYPE','FIELD_NAME':'Project Type','FIELD_DATA_TYPE':'KtAtom'},
+    {'FIELD_ID':'DB_ENTITY_ID','FIELD_NAME':'Entity ID','FIELD_DATA_TYPE':'KtInt'},
+    {'FIELD_ID':'CUST_DEVICE','FIELD_NAME':'Stored On','FIELD_DATA_TYPE':'KtString32'},
+    {'FIELD_ID':'CUST_TITLE','FIELD_NAME':'Title','FIELD_DATA_TYPE':'KtString32'},
+    {'FIELD_ID':'CUST_DESCRIPTION','FIELD_NAME':'Description','FIELD_DATA_TYPE':'KtString32'},
+    {'FIELD_ID':'CUST_OWNER','FIELD_NAME':'Owner','FIELD_DATA_TYPE':'KtString32'},
+    {'FIELD_ID':'CUST_NOTES','FIELD_NAME':'Notes','FIELD_DATA_TYPE':'KtString32'},
+    {'FIELD_ID':'CUST_MEMBERSHIP','FIELD_NAME':'Membership','FIELD_DATA_TYPE':'KtString32'},
+    {'FIELD_ID':'CUST_STATUS','FIELD_NAME':'Status','FIELD_DATA_TYPE':'KtString32'},
+    {'FIELD_ID':'PA_MD_CUST_FILENAME','FIELD_NAME':'File Name','FIELD_DATA_TYPE':'KtString32'},
+    {'FIELD_ID':'PA_MD_CUST_SIZE','FIELD_NAME':'Size','FIELD_DATA_TYPE':'KtInt64'},
+    {'FIELD_ID':'CUST_ARCHIVE_STATUS','FIELD_NAME':'Archive Status','FIELD_DATA_TYPE':'KtString32'},
+    {'FIELD_ID':'CUST_ARCHIVE_STATE','FIELD_NAME':'Archive State','FIELD_DATA_TYPE':'KtString32'},
+    {'FIELD_ID':'CUST_ARCHIVE_HISTORY','FIELD_NAME':'Archive History','FIELD_DATA_TYPE':'KtString32'},
+    {'FIELD_ID':'CUST_TAPE_BARCODE','FIELD_NAME':'Tape Barcode','FIELD_DATA_TYPE':'KtString32'},
+    {'FIELD_ID':'CUST_TAPE_BARCODE_OFFSITE','FIELD_NAME':'Tape Barcode - Offsite','FIELD_DATA_TYPE':'KtString32'},
+  ]
+
+  fixture['devices'] = [
+    {'DEVICE_ID':1,'DEVICE_NAME':'Library','DEVICE_TYPE':'contentbase',
+      'DEV_ROOT_PATH':'/Library/Application Support/Final Cut Server/Library',
+      'DEV_ARCHIVE':False},
+    {'DEVICE_ID':2,'DEVICE_NAME':'Media','DEVICE_TYPE':'filesystem',
+      'DEV_ROOT_PATH':'/Volumes/Media','DEV_ARCHIVE':False},
+    {'DEVICE_ID':3,'DEVICE_NAME':'Archive','DEVICE_TYPE':'filesystem',
+      'DEV_ROOT_PATH':'/Users/Shared/FCSStore/Archive','DEV_ARCHIVE':True},
+  ]
+
+  fixture['volumes'] = {}
+  fixture['plans'] = {}
+  fixture['archiveEntries'] = {}
+  for planIndex,planName in enumerate(('10001','10002')):
+    database = 'Default-Archive-%s' % planName
+    labels = []
+    for volumeIndex in range(numVolumes):
+      label = '%s' % ((planIndex + 1) * 10000 + volumeIndex + 1)
+      labels.append(label)
+      barcode = ''
+      if volumeIndex < numVolumes - 1:
+        barcode = 'LTO%s' % label
+      fixture['volumes'][label] = {'barcode':barcode,
+                                        'isonline':(volumeIndex % 2 == 0)}
+    fixture['plans'][planName] = {'database':database,'volumes':labels}
+    fixture['archiveEntries'][database] = {}
+
+  assetID = 0
+  projectID = 0
+  for productionIndex in range(numProductions):
+    projectID += 1
+    productionAddress = '/project/%s' % projectID
+    fixture['productions']['%s' % projectID] = {'PROJECT_NUMBER':projectID,
+                              'DB_ENTITY_ID':projectID,
+                              'PROJECT_TYPE':'pa_production_package',
+                              'CUST_TITLE':'Production %s' % projectID,
+                              'CUST_OWNER':'admin',
+                              'CUST_STATUS':'In Progress'}
+
+    ## Create our chain of nested productions, each with a single member
+    memberParents = [productionAddress] * assetsPerProduction
+    parentAddress = productionAddress
+    for depth in range(nestingDepth):
+      projectID += 1
+      nestedAddress = '/project/%s' % projectID
+      fixture['productions']['%s' % projectID] = {'PROJECT_NUMBER':projectID,
+                              'DB_ENTITY_ID':projectID,
+                              'PROJECT_TYPE':'pa_production_package',
+                              'CUST_TITLE':'Production %s Selects' % projectID,
+                              'CUST_OWNER':'admin'}
+      fixture['links'].append({'parent':parentAddress,
+                                'child':nestedAddress,'linkType':16})
+      memberParents.append(nestedAddress)
+      parentAddress = nestedAddress
+
+    for parentAddress in memberParents:
+      assetID += 1
+      assetAddress = '/asset/%s' % assetID
+      fileName = 'Clip-%04d.mov' % assetID
+      fixture['assets']['%s' % assetID] = {'ASSET_NUMBER':assetID,
+                              'DB_ENTITY_ID':assetID,
+                              'ASSET_TYPE':'pa_asset_media',
+                              'CUST_DEVICE':'Media',
+                              'CUST_TITLE':'Clip %s' % assetID,
+                              'CUST_MEMBERSHIP':'A-%s' % assetID,
+                              'CUST_OWNER':'admin',
+                              'PA_MD_CUST_FILENAME':fileName,
+                              'PA_MD_CUST_SIZE':assetID * 1048576}
+      fixture['links'].append({'parent':parentAddress,
+                                          'child':assetAddress,'linkType':1})
+      fixture['links'].append({'parent':assetAddress,
+                              'child':'/dev/2/%s' % urllib.quote(fileName),
+                              'linkType':2})
+
+      ## Archive half of our assets to each plan
+      if assetID % 2 == 0:
+        archivePath = '/Users/Shared/FCSStore/Archive/2/%s' % fileName
+        for planName,plan in fixture['plans'].iteritems():
+          label = plan['volumes'][assetID % numVolumes]
+          fixture['archiveEntries'][plan['database']][archivePath] = [label]
+        fixture['assets']['%s' % assetID]['CUST_ARCHIVE_STATUS'] = 'Archived'
+
+  return fixture
+
+
+def fcsvrClientMain(args=None,fixturePath=''):
+  '''Entry point for our simulated fcsvr_client executable.'''
+  if args is None:
+    args = sys.argv[1:]
+  stdin = None
+  if '--xmlcrit' in args:
+    stdin = sys.stdin.read()
+  client = FCSVRClientSimulator(FCSSimulator(fixturePath=fixturePath))
+  exitStatus,output = client.run(args,stdin=stdin)
+  sys.stdout.write(output)
+  return exitStatus
+
+
+def nsdchatMain(args=None,fixturePath=''):
+  '''Entry point for our simulated nsdchat executable.'''
+  if args is None:
+    args = sys.argv[1:]
+  nsdchat = NSDChatSimulator(FCSSimulator(fixturePath=fixturePath))
+  exitStatus,output = nsdchat.run(args)
+  sys.stdout.write(output)
+  return exitStatus
+
+
+def main():
+  '''Command line interface used to generate fixtures and reset state.'''
+
+  usage = ('usage: fcsSimulator.py generate <fixturePath> [numProductions] '
+          '[assetsPerProduction]\n       fcsSimulator.py reset [fixturePath]')
+  args = sys.argv[1:]
+  if not args:
+    print usage
+    return 1
+
+  if args[0] == 'generate' and len(args) > 1:
+    generateArgs = [int(arg) for arg in args[2:4]]
+    plistlib.writePlist(generateFixture(*generateArgs),args[1])
+    print 'Wrote fixture to: %s' % args[1]
+  elif args[0] == 'reset':
+    fixturePath = ''
+    if len(args) > 1:
+      fixturePath = args[1]
+    FCSSimulator(fixturePath=fixturePath).reset()
+  else:
+    print usage
+    return 1
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
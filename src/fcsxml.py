@@ -21,15 +21,31 @@
 
 import sys,os.path,shutil,subprocess
 import re,datetime,time,tempfile,copy
+import threading,Queue,shlex,signal
 import urllib, plistlib
-import codecs
+import codecs,collections
+import atexit,json
+import gc,types,weakref
 from ConfigParser import *
 from xml.dom import minidom
+from xml.sax.saxutils import escape as xmlEscape
+from xml.etree import cElementTree as ElementTree
+from cStringIO import StringIO
 
 
 version = '1.0b'
 build = '2011042001'
 
+## Log headers for each of our logging levels
+logLevelHeaders = {'error':' ERROR  : ',
+                    'debug':' DEBUG  : ',
+                    'warning':'WARNING : ',
+                    'detailed':' DETAIL : ',
+                    'normal':' INFO   : '}
+
+## Logging levels which are enabled when debug is not set
+defaultLogLevels = ('error','normal','detailed')
+
 class FCSBaseObject:
   '''FCSBaseObject is the Transmogrifier root object upon which all other 
   classes extent. It provides basic error logging capabilities.'''
@@ -40,7 +56,7 @@ class FCSBaseObject:
   
   
   ## Logging vars
-  log = []
+  log = collections.deque(maxlen=500)
   lastError = ""
   lastMSG = ""
   debug = False
@@ -50,12 +66,13 @@ class FCSBaseObject:
   printLogs = False
   printLogDate = True
   printClassInLog = False
+  logBufferSize = 500   ## Number of recent log entries retained
   
   timezoneOffset = 7
   
   def __init__(self):
     '''Our construct.'''
-    self.log = []
+    self.log = collections.deque(maxlen=self.logBufferSize)
     self.lastError = ''
     self.lastMSG = ''
     self.debug = False
@@ -82,9 +99,23 @@ class FCSBaseObject:
       
     return entityPath    
     
-  def logger(self,logMSG,logLevel='normal',printClassInLog=None):
+  def isLogLevelEnabled(self,logLevel):
+    '''Returns whether messages logged at the provided level are recorded. 
+    Callers can use this to avoid building expensive log messages.
+    
+    :param logLevel: The logging level ('normal','detailed','debug','error')
+    :type logLevel: str
+    
+    :returns: (*bool*) -- True if messages at logLevel are recorded
+    '''
+    return self.debug or logLevel in defaultLogLevels
+    
+  def logger(self,logMSG,logLevel='normal',printClassInLog=None,logArgs=None):
     '''Provides a basic Logging Function. Prints our message to standard out
-    based upon our configured log level.
+    based upon our configured log level. Messages at disabled levels (debug
+    and warning, unless debug is set) are discarded without any formatting;
+    enabled messages are stored in a bounded buffer of recent entries 
+    (see :attr:`logBufferSize`).
       
     :param logMSG: The log message
     :type logMSG: str
@@ -92,6 +123,9 @@ class FCSBaseObject:
     :type logLevel: str
     :param printClassInLog: Flag for whether we will print the class name in our logging output
     :type printClassInLog: bool
+    :param logArgs: Arguments used to format logMSG, formatting is deferred 
+      until we know that the message will be recorded
+    :type logArgs: tuple
     
     :returns: bool - Always returns True
     
@@ -100,49 +134,43 @@ class FCSBaseObject:
       At some point we should probably migrate to msg module
       
     '''
-            
-    if (logLevel == 'error' 
-    or logLevel == 'normal' 
-    or logLevel == 'detailed' 
-    or self.debug):
-        i = 0
-        headerText = ''
-        while i < self.logOffset:
-          headerText+='  '
-          i+=1
-        if logLevel.lower() == 'error':
-          headerText = ' ERROR  : %s' % headerText
-        elif logLevel.lower() == 'debug':
-          headerText = ' DEBUG  : %s' % headerText
-        elif logLevel.lower() == 'warning':
-          headerText = 'WARNING : %s' % headerText
-        elif logLevel.lower() == 'detailed':
-          headerText = ' DETAIL : %s' % headerText
-        else:
-          headerText = ' INFO   : %s' % headerText
-        
-        if self.printLogDate:
-          dateString = datetime.datetime.today().strftime("%b %d %H:%M:%S")
-          headerText = "%s: %s" % (dateString,headerText)
+    
+    if not self.debug and not logLevel in defaultLogLevels:
+      return True
+    
+    if logArgs is not None:
+      logMSG = logMSG % logArgs
+    
+    if self.printLogs or self.debug:
+      try:
+        headerText = logLevelHeaders[logLevel]
+      except KeyError:
+        headerText = logLevelHeaders.get(logLevel.lower(),
+                                                    logLevelHeaders['normal'])
+      headerText = '%s%s' % (headerText,'  ' * self.logOffset)
+      
+      if self.printLogDate:
+        dateString = time.strftime('%b %d %H:%M:%S')
+        headerText = '%s: %s' % (dateString,headerText)
+      
+      if printClassInLog == None:
+        printClassInLog = self.printClassInLog
+      
+      if printClassInLog:
+        print '%s%s: %s' % (headerText,self.__class__.__name__,logMSG)
+      else:
+        print '%s%s' % (headerText,logMSG)
         
-        if self.printLogs or self.debug:
-          if printClassInLog == None:
-            printClassInLog = self.printClassInLog
-          
-          if printClassInLog:
-            print '%s%s: %s' % (headerText,self.__class__.__name__,logMSG)
-          else:
-            print '%s%s' % (headerText,logMSG)
-            
-          sys.stdout.flush()
-        self.lastMSG = logMSG
+      sys.stdout.flush()
+    self.lastMSG = logMSG
     
     if logLevel == 'error':
-        self.lastError = logMSG
+      self.lastError = logMSG
     self.log.append({'logLevel' : logLevel, 'logMSG' : logMSG})
+    return True
   
   def logs(self,logLevel=''):
-    '''Returns a list of stored log entries.
+    '''Returns a list of recent log entries.
     
     :param logLevel: Limit returned log entries to those matching this log level.
     :type logLevel: str
@@ -150,11 +178,14 @@ class FCSBaseObject:
     :returns: ((list)) -- List of log entries, each entry is a dictionary with keys: logMSG and logLevel
     '''
     
+    if not logLevel:
+      return list(self.log)
+    
     returnedLogs = []
-    logs = self.log
-    for log in logs:
-      if logLevel and logLevel.lower() == log['logLevel'].lower():
+    for log in self.log:
+      if logLevel.lower() == log['logLevel'].lower():
         returnedLogs.append(log)
+    return returnedLogs
   
   def printLogs(self, logLevel='all'):
     '''Prints all stored log entries.
@@ -174,9 +205,78 @@ class FCSBaseObject:
     :returns: (dict) -- Log dict with keys: logMSG and logLevel'''
     errorLogs = self.logs('error')
     return errorLogs[len(errorLogs)]
-
-
-class FCSXMLField(FCSBaseObject):
+  
+  def runCommand(self,cmdString,input=None,timeout=0,captureOutput=True,
+                                              family='',args=None,env=None):
+    '''Runs the provided command via our shared, instrumented command runner
+    (:data:`fcsxml.commandRunner`). All external commands should be run via 
+    this method so that they are accounted for, see 
+    :func:`fcsxml.FCSCommandRunner.run` for a description of parameters.
+    
+    :raises: OSError
+    :returns: (:class:`fcsxml.FCSCommandResult`) -- The command results
+    '''
+    return commandRunner.run(cmdString,input=input,timeout=timeout,
+                              captureOutput=captureOutput,family=family,
+                              args=args,env=env)
+
+
+class FCSSlottedObject(object):
+  '''FCSSlottedObject is the root of our lightweight value types, such as
+  :class:`fcsxml.FCSXMLField`, which are created in large numbers. Unlike 
+  :class:`fcsxml.FCSBaseObject`, instances carry no logging state: 
+  attributes are declared via __slots__ and log messages are delegated to 
+  an owner object (typically the :class:`fcsxml.FCSVRClient` or archiver
+  which created us), or to a shared logger if we have no owner. We only 
+  hold a weak reference to our owner.
+  
+  :param owner: The object which receives our log messages
+  :type owner: fcsxml.FCSBaseObject
+  
+  '''
+  
+  __slots__ = ('ownerRef',)
+  
+  sharedLogger = FCSBaseObject()  ## Logger used by objects without an owner
+  
+  def __init__(self,owner=None):
+    '''Our construct.'''
+    self.setOwner(owner)
+  
+  def setOwner(self,owner):
+    '''Sets the object which receives our log messages.
+    
+    :param owner: The owning object, or None
+    :type owner: fcsxml.FCSBaseObject
+    
+    '''
+    if owner is None:
+      self.ownerRef = None
+    else:
+      self.ownerRef = weakref.ref(owner)
+  
+  def getOwner(self):
+    '''Returns our owner, or our shared logger if we have no owner, or our
+    owner has been released.'''
+    owner = None
+    if self.ownerRef is not None:
+      owner = self.ownerRef()
+    if owner is None:
+      owner = self.sharedLogger
+    return owner
+  
+  def isDebug(self):
+    '''Returns whether our owner is in debug mode.'''
+    return self.getOwner().debug
+  
+  def logger(self,logMSG,logLevel='normal',printClassInLog=None,logArgs=None):
+    '''Logs the provided message via our owner, see 
+    :func:`fcsxml.FCSBaseObject.logger`.'''
+    return self.getOwner().logger(logMSG,logLevel=logLevel,
+                          printClassInLog=printClassInLog,logArgs=logArgs)
+  
+  
+class FCSXMLField(FCSSlottedObject):
   '''This object is representative of a field in Final Cut Server. It is used to 
   store field name, the underlying FCS database field name, and the field value.
   This object provides basic data sanity checking and data formatting.
@@ -191,6 +291,8 @@ class FCSXMLField(FCSBaseObject):
   :type dbname: str
   :param dbDataType: The underlying Final Cut Server field datatype
   :type dbDataType: str
+  :param owner: The object which receives our log messages (optional)
+  :type owner: fcsxml.FCSBaseObject
   
   :raises: :class:`fcsxml.FCSValidationError`
   
@@ -200,31 +302,31 @@ class FCSXMLField(FCSBaseObject):
     the provided dataType.
   '''
   
-  name = ''
-  dbname = ''
-  value = ''
-  dataType = ''
-  dbDataType = ''
+  __slots__ = ('name','dbname','value','dataType','dbDataType',
+                                              'dataTypeLoaded','valueLoaded')
   
-  dataTypeLoaded = False
-  valueLoaded = False
+  timezoneOffset = FCSBaseObject.timezoneOffset
   
   validDataTypes = { 'string' : 'KtString32','varchar' : 'KtString','int':'KtInt',
       'integer':'KtInt','int64':'KtInt64','bigint':'KtInt64','dateTime':'KtDateTime',
       'timestamp':'KtDateTime','timecode':'PxTimecode','float':'KtReal','coords':'KtIntXY',
       'fraction':'KtFraction','bool':'KtBool','list':'KtMdValueMap' }
   
-  def __init__(self, name='', value='', dataType='',dbname='',dbDataType=''):
+  def __init__(self, name='', value='', dataType='',dbname='',dbDataType='',
+                                                                  owner=None):
     '''Our construct which allows us to set our field name, dbname, datatype,
     or db datatype
     '''
     
-    FCSBaseObject.__init__(self)
+    FCSSlottedObject.__init__(self,owner=owner)
           
     self.name = name
     self.dbname = dbname
+    self.value = ''
     self.dataType = ''
     self.dbDataType = ''
+    self.dataTypeLoaded = False
+    self.valueLoaded = False
     if dataType:
       self.setDataType(dataType)
     if dbDataType:
@@ -234,8 +336,6 @@ class FCSXMLField(FCSBaseObject):
     
     self.dataTypeLoaded = False
     self.valueLoaded = False
-    
-    self.debug = False
      
   def __str__(self):
     '''Output our field name for string operations.
@@ -446,7 +546,7 @@ class FCSXMLObject(FCSBaseObject):
   fields = {}
   deviceDict = {}
   lastError = ''
-  log = []
+  log = collections.deque(maxlen=500)
   overwriteExistingFiles = True
   debug = False
   configParser = ''
@@ -464,7 +564,6 @@ class FCSXMLObject(FCSBaseObject):
     self.fields = {}
     self.deviceDict = {}
     self.lastError = ''
-    self.log = []
     self.fcsXMLinDir
     self.configParser = ''
     
@@ -664,11 +763,11 @@ class FCSXMLObject(FCSBaseObject):
         if len(field.childNodes) > 0:
           theField = FCSXMLField(name=field.attributes['fieldName'].value, 
               value=self.getXMLNodeText(field.childNodes),
-              dataType=field.attributes['dataType'].value)
+              dataType=field.attributes['dataType'].value,owner=self)
         else:
           theField = FCSXMLField(name=field.attributes['fieldName'].value, 
               value='',
-              dataType=field.attributes['dataType'].value)            
+              dataType=field.attributes['dataType'].value,owner=self)
         
         self.fields[field.attributes['fieldName'].value] = theField
         ##self.lastError = 'Loaded Key:', theField.name
@@ -983,173 +1082,1871 @@ class FCSXMLObject(FCSBaseObject):
       return True 
        
             
-class FCSVRClient(FCSBaseObject):
-  '''Our FCSVRClient object, it is our interface for reading and manipulating 
-  data from Final Cut Server via the fcsvr_client executable installed at 
-  ``/Library/Application Support/Final Cut Server/Final Cut Server.bundle/Contents/MacOS/fcsvr_client``
+class FCSXMLRecordReader(FCSBaseObject):
+  '''FCSXMLRecordReader is a streaming reader for XML returned by 
+  fcsvr_client (getmd, search, list_parent_links, list_child_links, etc). 
+  Rather than building a full DOM, we incrementally parse the output and 
+  yield a dictionary for each top level ``<values>`` element, keyed by 
+  ``<value>`` id. Nested ``<values>`` elements (i.e. the METADATA value of 
+  a search result) are returned as nested dictionaries.
   
-  :param entityType: The Type of entity: 'asset' or 'project' (production)
-  :type entityType: str
-  :param entityID: The unique numeric FCS id of this object
-  :type entityID: int
-  :param entityPath: The FCS entity path for this object (i.e. '/asset/10')
-  :type entityPath: str
-  :param configParser: An optional :mod:`ConfigParser` object to configure 
-                        default behavior. Alternatively this can be a file
-                        system path to a configuration file to load
-  :type configParser: :class:`ConfigParser.SafeConfigParser` or str
+  >>> reader = fcsxml.FCSXMLRecordReader()
+  >>> for record in reader.records(fcsvrCMD_STDOUT):
+  ...   print record['METADATA']['CUST_TITLE']
   
-  .. note::
-    If an entityPath value is provided, it will override values for entityType and id
+  '''
+  
+  def records(self,xmlString,includeTypes=False):
+    '''Generator which yields a dictionary for each top level ``<values>``
+    element in the provided fcsvr_client XML output.
     
-  If upon creation the object is provided enough information to uniquely
-  resolve the FCS object (either via specifying entityType,id, or entityPath),
-  the object will init via :func:`FCSVRClient.initWithAssetID`.
+    :param xmlString: The XML output from fcsvr_client
+    :type xmlString: str
+    :param includeTypes: If true, each value will be returned as a tuple of
+      (fcsType,value), i.e. ('string','My Title'). Otherwise we return the
+      value alone.
+    :type includeTypes: bool
+    
+    :raises: SyntaxError (ElementTree.ParseError) if the XML is malformed
+    
+    :returns: (*generator*) -- Yields a dict for each record
+    
+    '''
+    
+    if type(xmlString) == type(u''):
+      xmlString = xmlString.encode('utf-8')
+    
+    valuesStack = []      ## Stack of dicts for open <values> elements
+    nestedValues = None   ## Last closed nested <values> dict
+    root = None
+    
+    for event,element in ElementTree.iterparse(StringIO(xmlString),
+                                                    events=('start','end')):
+      tag = element.tag
+      if event == 'start':
+        if root is None:
+          root = element
+        elif tag == 'values':
+          valuesStack.append({})
+          nestedValues = None
+        continue
+      
+      if tag == 'value' and valuesStack:
+        valueID = element.get('id')
+        if nestedValues is not None:
+          valueData = nestedValues
+          valueType = 'values'
+          nestedValues = None
+        else:
+          valueType = ''
+          valueData = ''
+          for child in element:
+            valueType = child.tag
+            valueData = child.text or ''
+            break
+        if includeTypes:
+          valuesStack[-1][valueID] = (valueType,valueData)
+        else:
+          valuesStack[-1][valueID] = valueData
+      elif tag == 'values' and valuesStack:
+        record = valuesStack.pop()
+        if valuesStack:
+          nestedValues = record
+        else:
+          yield record
+          ## Release parsed elements
+          root.clear()
   
-  Thus, this:
+  def recordList(self,xmlString,includeTypes=False):
+    '''Returns a list of all records in the provided fcsvr_client XML
+    output, see :func:`fcsxml.FCSXMLRecordReader.records`
+    
+    :returns: (*list*) -- List of dicts
+    '''
+    return list(self.records(xmlString,includeTypes=includeTypes))
   
-  >>> myFCSObj = fcsxml.FCSVRClient()
-  >>> myFCSObj.initWithProductionID(10)
-  True
   
-  Is equivalent to:
+class FCSAddressSet:
+  '''FCSAddressSet is an insertion ordered set of FCS entity addresses 
+  (i.e. '/asset/12'), providing constant time membership tests while 
+  preserving the order in which addresses were added.
   
-  >>> myFCSObj = fcsxml.FCSVRClient(entityPath='/project/10')
+  :param addresses: An optional list of addresses to add
+  :type addresses: list
   
-  Is equivalent to:
+  '''
   
-  >>> myFCSObj = fcsxml.FCSVRClient(entityType='project',entityID=10)
+  def __init__(self,addresses=None):
+    '''Our construct.'''
+    self.addresses = []
+    self.index = set()
+    if addresses:
+      self.extend(addresses)
   
-  Other notable ways to init an FCSVRClientObject:
+  def add(self,address):
+    '''Adds the provided address if it is not already present.
+    
+    :returns: (*bool*) -- True if the address was added.
+    '''
+    if address in self.index:
+      return False
+    self.index.add(address)
+    self.addresses.append(address)
+    return True
   
-  >>> myFCSObj = fcsxml.FCSVRClient().initWithAssetTitle(title='my great file')
-  >>> myFCSObj = fcsxml.FCSVRClient().initWithProductionTitle(title='My Production')
-  >>> myFCSObj = fcsxml.FCSVRClient().initWithAssetFromFSPath(FSPath='/FinalCutServer/Library/my great file.mov')
-  >>> myFCSObj = fcsxml.FCSVRClient().initWithAssetFromFSPath(FSPath='/FinalCutServer/Library/my great file.mov')
-
-  '''
+  def extend(self,addresses):
+    '''Adds each of the provided addresses, in order.'''
+    for address in addresses:
+      self.add(address)
   
-  entityType = ''
-  entityID = ''
-  entityMetadataSet = ''
-  entityTitle = ''
+  def __contains__(self,address):
+    return address in self.index
   
-  defaultProductionMetadataSet = 'pa_production_package'
-  defaultAssetMetadataSet = 'pa_asset_media'
-  defaultThumbnailMetadataSet = 'pa_asset_thumbnail'
+  def __iter__(self):
+    return iter(self.addresses)
   
-  defaultDeviceName = 'Library'
+  def __len__(self):
+    return len(self.addresses)
   
-  fields = {}
-  deviceDict = {}
-  supportDir = '/tmp'
-  overwriteExistingFiles = True
+  def __getitem__(self,index):
+    return self.addresses[index]
   
-  thumbnailPath = ''
-  posterFramePath = ''
-  proxyPath = ''
-  editProxyPath = ''
   
-  thumbnailDeviceName = ''
+class FCSSearchCriteria:
+  '''FCSSearchCriteria represents compiled search criteria XML for use by 
+  fcsvr_client search --xmlcrit. Criteria are generated in memory and passed
+  to fcsvr_client via stdin, instances are immutable and may be cached and
+  re-used across searches (see 
+  :func:`fcsxml.FCSVRClient.searchCriteriaForFields`).
   
-  parentXMLObject = ''
-  childXMLObject = ''
+  Criteria compiled with placeholder values act as templates: 
+  :func:`criteriaWithValues` substitutes values into the compiled XML 
+  without rebuilding it.
   
-  FCSUID = 0          ## Our FCS User ID. If this is not set we will attempt
-                      ## to read it in from /Library/Preferences/com.apple.FinalCutServer.settings.plist
+  :param xml: The UTF-8 encoded criteria XML
+  :type xml: str
+  :param description: A description of the criteria used for logging
+  :type description: str
   
-  useSudo = False      ## Call /usr/bin/sudo before calling fcsvr_client commands
-                      ## that require root access. You'll want to make sure that
-                      ## You have modified your sudoers file if you set this to true.
+  '''
   
-  pathToFCSVRClient = '/Library/Application Support/Final Cut Server/Final Cut Server.bundle/Contents/MacOS/fcsvr_client'
-
-  configParser = ''
-  devicesMap = ''
-
+  placeholderFormat = u'\ue000FCSVALUE%s\ue000'  ## Template value placeholder
   
-  registeredEntities = ['asset','project','dev','field','mdgroup','group']
+  def __init__(self,xml,description=''):
+    '''Our construct.'''
+    self.xml = xml
+    self.description = description
   
-  def __init__(self,entityType='asset',entityID=0,id=0,entityPath='',configParser=''):
-    '''Our constructor.'''
+  def criteriaWithValues(self,values):
+    '''Returns new criteria with each placeholder (see 
+    :attr:`placeholderFormat`) replaced by the escaped value at the same 
+    index of values.
     
-    FCSBaseObject.__init__(self)
-    if entityPath:
-      pathMatch = re.match('\/(.*)\/(.*)',entityPath)
-      if pathMatch:
-        self.entityType = pathMatch.groups()[0]
-        self.entityID = pathMatch.groups()[1]
-    else:
-      self.entityType = entityType
-      if entityID:
-        self.entityID = entityID
-      elif id:
-        self.entityID = id
-      
-    self.entityMetadataSet = ''
-    self.overwriteExistingFiles = True
-    self.thumbnailPath = ''
-    self.parentXMLObject = ''
-    self.childXMLObject = ''
-    self.thumbnailDeviceName = 'Library'
-    self.debug = False
-    self.keepFiles = False
-    self.devicesMap = ''
-    self.fields = {}
-    self.deviceDict = {}
-    self.FCSUID = self.getFCSUID()
-    self.thumbnailPath = ''
-    self.posterFramePath = ''
-    self.proxyPath = ''
-    self.editProxyPath = ''
-    self.defaultProductionMetadataSet = 'pa_production_package'
-    self.defaultAssetMetadataSet = 'pa_asset_media'
-    self.defaultDeviceName = 'Library'
-
-    self.useSudo = True
-    self.printClassInLog = True
-    self.debug = False
-    self.printLogs = True
+    :param values: Provide a list of values, one per placeholder
+    :type values: list
     
-    if configParser:
-      if type('string') == type(configParser):
-        self.loadConfiguration(filePath=configParser)
-      else:
-        self.loadConfiguration(parser=configParser)
-        
-    if self.entityID and self.entityType == 'asset':
-      self.initWithAssetID(assetID=self.entityID)
-    elif self.entityID and self.entityType == 'project':
-      self.initWithProductionID(productionID=self.entityID)
-        
-  def loadConfiguration(self, parser=None,filePath=None):
-    '''This method will load internal parameters as specified in the
-    provided :class:`ConfigParser.SafeConfigParser` object, or via the 
-    configuration file referenced via the filePath parameter.
+    :returns: (*fcsxml.FCSSearchCriteria*) -- The search criteria
+    '''
+    xml = self.xml
+    for index,value in enumerate(values):
+      if not type(value) == type(u''):
+        value = ('%s' % value).decode('utf-8')
+      placeholder = (self.placeholderFormat % index).encode('utf-8')
+      xml = xml.replace(placeholder,
+              xmlEscape(value,{'"':'&quot;'}).encode('utf-8'))
+    return FCSSearchCriteria(xml=xml,description=self.description)
+  
+  def __str__(self):
+    return self.description
+  
+  def writeToFile(self,filePath):
+    '''Writes our criteria XML to the provided path.'''
+    theFile = open(filePath,'w')
+    theFile.write(self.xml)
+    theFile.close()
+    return filePath
+  
+  
+class FCSCommandResult:
+  '''This object stores the results of a command run via 
+  :class:`fcsxml.FCSCommandRunner`. 
+  
+  :param cmdString: The command that was executed.
+  :type cmdString: str
+  
+  '''
+  
+  cmdString = ''
+  returncode = None
+  stdout = ''
+  stderr = ''
+  duration = 0
+  timedOut = False
+  family = ''       ## The command family, i.e. 'fcsvr_client'
+  caller = ''       ## The function which ran the command
+  startTime = 0
+  
+  def __init__(self,cmdString=''):
+    '''Our construct.'''
+    self.cmdString = cmdString
+    self.returncode = None
+    self.stdout = ''
+    self.stderr = ''
+    self.duration = 0
+    self.timedOut = False
+    self.family = ''
+    self.caller = ''
+    self.startTime = 0
+
+
+class FCSEntityActionResult:
+  '''This object stores the result of an action (i.e. 'archive') performed
+  on a single entity via :func:`fcsxml.FCSVRClient.performActionOnEntities`.
+  
+  :param entityPath: The entity address (i.e. '/asset/10')
+  :type entityPath: str
+  :param action: The name of the action performed
+  :type action: str
+  
+  '''
+  
+  entityPath = ''
+  action = ''
+  result = None
+  error = None
+  
+  def __init__(self,entityPath='',action=''):
+    '''Our construct.'''
+    self.entityPath = entityPath
+    self.action = action
+    self.result = None
+    self.error = None
+  
+  def success(self):
+    '''Returns whether the action completed without error.'''
+    return self.error is None
+  
+  def __str__(self):
+    if self.error is None:
+      return '%s %s: success' % (self.action,self.entityPath)
+    return '%s %s: %s' % (self.action,self.entityPath,self.error)
+
+class FCSCommandRunner(FCSBaseObject):
+  '''FCSCommandRunner is our central, instrumented command execution layer.
+  External commands run by Transmogrifier (fcsvr_client, nsdchat, sftp,
+  Compressor, qtinfo, etc) are run via our shared instance 
+  (:data:`fcsxml.commandRunner`), typically through 
+  :func:`fcsxml.FCSBaseObject.runCommand`. For each command we record its 
+  family (the name of the executable), caller, duration, exit code and the 
+  number of bytes written to stdout. Per family counters and duration 
+  histograms are maintained for the life of the process, and a bounded 
+  list of events is kept which can be written as a Chrome trace 
+  (chrome://tracing) file.
+  
+  >>> print fcsxml.commandRunner.summary()
+  
+  '''
+  
+  ## Upper bounds (in milliseconds) of our duration histogram buckets, a 
+  ## final bucket counts all longer durations.
+  histogramBuckets = (10,25,50,100,250,500,1000,2500,5000,10000,30000)
+  maxEvents = 20000     ## Maximum number of events retained for tracing
+  
+  ## Executables which wrap the command we are interested in
+  wrapperCommands = ('sudo','env','nice','ssh')
+  
+  ## Functions which are skipped when determining the caller of a command
+  callerSkipFunctions = ('run','runCommand','runMany','fcsvr_client_run')
+  
+  def __init__(self):
+    '''Our construct.'''
+    FCSBaseObject.__init__(self)
+    self.lock = threading.Lock()
+    self.printSummaryAtExit = False
+    self.tracePathAtExit = ''
+    self.atExitRegistered = False
+    self.reset()
+  
+  def loadConfiguration(self,parser):
+    '''Loads our at-exit reporting options from the GLOBAL section of the 
+    provided ConfigParser object: 'commandSummary' (bool) prints our summary
+    at exit, 'commandTracePath' writes a Chrome trace file at exit.'''
+    printSummary = self.printSummaryAtExit
+    tracePath = self.tracePathAtExit
+    try:
+      printSummary = parser.getboolean('GLOBAL','commandSummary')
+    except:
+      pass
+    try:
+      tracePath = parser.get('GLOBAL','commandTracePath')
+    except:
+      pass
+    self.dumpAtExit(printSummary=printSummary,tracePath=tracePath)
+  
+  def reset(self):
+    '''Clears all recorded counters and events.'''
+    self.lock.acquire()
+    try:
+      self.startTime = time.time()
+      self.familyCounters = {}
+      self.callerCounters = {}
+      self.events = collections.deque(maxlen=self.maxEvents)
+      self.droppedEvents = 0
+    finally:
+      self.lock.release()
+  
+  def run(self,cmdString,input=None,timeout=0,captureOutput=True,family='',
+                                                        args=None,env=None):
+    '''Runs the provided command, blocking until it completes, and records 
+    the results.
     
-    :param parser: A configuration object.
-    :type parser: :class:`ConfigParser.SafeConfigParser`
-    :param filePath: An absolute path to a configuration file.
-    :type filePath: str
-        
+    :param cmdString: The command to run
+    :type cmdString: str
+    :param input: Data to send to the command's standard input (optional)
+    :type input: str
+    :param timeout: Seconds after which the command is killed, 0 for none.
+      Commands with a timeout are run in their own process group, so that 
+      the entire group (including any children of /bin/sh) is killed.
+      Killed commands are returned with timedOut set.
+    :type timeout: int
+    :param captureOutput: If false, stdout and stderr are inherited from our
+      process rather than captured.
+    :type captureOutput: bool
+    :param family: The command family to record, by default this is 
+      determined from the executable name.
+    :type family: str
+    :param args: An argument list, if provided the command is executed 
+      directly, rather than via /bin/sh.
+    :type args: list
+    :param env: The environment for the command (optional)
+    :type env: dict
+    
+    :raises: OSError
+    :returns: (:class:`fcsxml.FCSCommandResult`) -- The command results
     
-    .. note:: 
-      If you subclass, you should call this parent function. If we raise a 
-      RuntimeError Exception, you should abort or perform your own 
-      exhaustive sanity checks
-      
     '''
     
+    if type(cmdString) == type(u''):
+      cmdString = cmdString.encode('utf-8')
+    if type(input) == type(u''):
+      input = input.encode('utf-8')
     
-    if not isinstance(parser,ConfigParser) and not filePath:
-      message = 'loadConfiguration() Not passed a valid ConfigParser Object!'
-      self.logger(message, 'error')
-      raise RuntimeError(message)
-    elif not isinstance(parser,ConfigParser):
-      if not filePath:
-        filePath = '/usr/local/etc/transmogrifier.conf'
-      self.logger('Loading configuration from filepath: %s' % filePath,'debug')
-      parser = SafeConfigParser()
+    result = FCSCommandResult(cmdString=cmdString)
+    result.family = family or self.familyForCommand(cmdString,args=args)
+    result.caller = self.callerForCommand()
+    
+    if input is None:
+      stdin = None
+    else:
+      stdin = subprocess.PIPE
+    if captureOutput:
+      stdout = subprocess.PIPE
+      stderr = subprocess.PIPE
+    else:
+      stdout = None
+      stderr = None
+    
+    ## Commands which may be killed get their own process group
+    if timeout:
+      preexecFunction = os.setpgrp
+    else:
+      preexecFunction = None
+    
+    result.startTime = time.time()
+    try:
+      if args:
+        process = subprocess.Popen(args,stdin=stdin,stdout=stdout,
+                                        stderr=stderr,env=env,
+                                        preexec_fn=preexecFunction,
+                                        universal_newlines=True)
+      else:
+        process = subprocess.Popen(cmdString,shell=True,stdin=stdin,
+                                        stdout=stdout,stderr=stderr,env=env,
+                                        preexec_fn=preexecFunction,
+                                        universal_newlines=True)
+    except OSError:
+      result.returncode = 127
+      result.duration = time.time() - result.startTime
+      self.record(result)
+      raise
+    
+    timer = None
+    if timeout:
+      timer = threading.Timer(timeout,self.killProcess,[process,result])
+      timer.start()
+    try:
+      processSTDOUT,processSTDERR = process.communicate(input)
+    finally:
+      if timer:
+        timer.cancel()
+    
+    result.stdout = processSTDOUT or ''
+    result.stderr = processSTDERR or ''
+    result.returncode = process.returncode
+    result.duration = time.time() - result.startTime
+    self.record(result)
+    
+    return result
+  
+  def killProcess(self,process,result):
+    '''Terminates a process which has exceeded its timeout, along with
+    any other members of its process group.'''
+    result.timedOut = True
+    try:
+      os.killpg(process.pid,signal.SIGKILL)
+    except OSError:
+      try:
+        process.kill()
+      except OSError:
+        pass
+  
+  def familyForCommand(self,cmdString,args=None):
+    '''Returns the command family (the executable name) for a command, 
+    skipping wrappers such as sudo and ssh.
+    
+    :param cmdString: The command string
+    :type cmdString: str
+    :param args: The command's argument list (optional)
+    :type args: list
+    
+    :returns: (*str*) -- The command family, i.e. 'fcsvr_client'
+    
+    '''
+    if args:
+      tokens = args
+    else:
+      try:
+        tokens = shlex.split(cmdString)
+      except ValueError:
+        tokens = cmdString.split()
+    
+    index = 0
+    while index < len(tokens):
+      executable = os.path.basename(tokens[index])
+      if executable == 'ssh':
+        ## Skip our ssh options and destination host
+        index += 1
+        while index < len(tokens) and tokens[index].startswith('-'):
+          index += 1
+        index += 1
+        continue
+      elif executable in self.wrapperCommands or '=' in executable:
+        index += 1
+        continue
+      return executable
+    return 'unknown'
+  
+  def callerForCommand(self):
+    '''Returns a description of the function which requested our command, 
+    i.e. 'FCSVRClient.initWithAssetID'.'''
+    try:
+      frame = sys._getframe(2)
+    except ValueError:
+      return 'unknown'
+    while frame and frame.f_code.co_name in self.callerSkipFunctions:
+      frame = frame.f_back
+    if not frame:
+      return 'unknown'
+    functionName = frame.f_code.co_name
+    callerObject = frame.f_locals.get('self')
+    if callerObject is not None:
+      return '%s.%s' % (callerObject.__class__.__name__,functionName)
+    return '%s:%s' % (os.path.basename(frame.f_code.co_filename),functionName)
+  
+  def record(self,result):
+    '''Records the provided :class:`fcsxml.FCSCommandResult`.'''
+    
+    durationMS = result.duration * 1000
+    bucket = len(self.histogramBuckets)
+    for index,bucketLimit in enumerate(self.histogramBuckets):
+      if durationMS <= bucketLimit:
+        bucket = index
+        break
+    stdoutBytes = len(result.stdout or '')
+    failed = not result.returncode == 0
+    
+    self.lock.acquire()
+    try:
+      try:
+        counters = self.familyCounters[result.family]
+      except KeyError:
+        counters = {'count':0,'failures':0,'timeouts':0,'totalDuration':0.0,
+                    'maxDuration':0.0,'stdoutBytes':0,
+                    'histogram':[0] * (len(self.histogramBuckets) + 1)}
+        self.familyCounters[result.family] = counters
+      counters['count'] += 1
+      if failed:
+        counters['failures'] += 1
+      if result.timedOut:
+        counters['timeouts'] += 1
+      counters['totalDuration'] += result.duration
+      if result.duration > counters['maxDuration']:
+        counters['maxDuration'] = result.duration
+      counters['stdoutBytes'] += stdoutBytes
+      counters['histogram'][bucket] += 1
+      
+      callerKey = (result.family,result.caller)
+      callerCounter = self.callerCounters.setdefault(callerKey,[0,0.0])
+      callerCounter[0] += 1
+      callerCounter[1] += result.duration
+      
+      if len(self.events) == self.maxEvents:
+        self.droppedEvents += 1
+      self.events.append((result.startTime,result.duration,result.family,
+                          result.caller,result.returncode,stdoutBytes,
+                          result.cmdString[:256],
+                          threading.currentThread().ident))
+    finally:
+      self.lock.release()
+  
+  def countersForFamily(self,family):
+    '''Returns a copy of the counters recorded for the provided command 
+    family. Counters include count, failures, timeouts, totalDuration, 
+    maxDuration (seconds), stdoutBytes and histogram (a list of counts for 
+    each of our :attr:`histogramBuckets`).
+    
+    :param family: The command family, i.e. 'fcsvr_client'
+    :type family: str
+    
+    :returns: (*dict*) -- Our counters, or None if no commands were recorded
+    
+    '''
+    self.lock.acquire()
+    try:
+      counters = self.familyCounters.get(family)
+      if counters is None:
+        return None
+      counters = dict(counters)
+      counters['histogram'] = list(counters['histogram'])
+      return counters
+    finally:
+      self.lock.release()
+  
+  def summary(self,maxCallers=10):
+    '''Returns a printable summary of recorded commands, including per 
+    family counters, duration histograms and our busiest callers.
+    
+    :param maxCallers: The number of callers to report
+    :type maxCallers: int
+    
+    :returns: (*str*) -- The summary
+    '''
+    
+    self.lock.acquire()
+    try:
+      familyCounters = dict(self.familyCounters)
+      callerCounters = dict(self.callerCounters)
+    finally:
+      self.lock.release()
+    
+    totalCount = sum([counters['count'] 
+                                for counters in familyCounters.itervalues()])
+    totalDuration = sum([counters['totalDuration'] 
+                                for counters in familyCounters.itervalues()])
+    lines = ['Command summary: %s commands, %.3fs total, %.3fs elapsed' 
+              % (totalCount,totalDuration,time.time() - self.startTime)]
+    lines.append('  %-20s %7s %6s %10s %10s %10s %12s' % ('Family','Count',
+                  'Failed','Total (s)','Mean (ms)','Max (ms)','Stdout (KB)'))
+    for family in sorted(familyCounters.keys()):
+      counters = familyCounters[family]
+      lines.append('  %-20s %7s %6s %10.3f %10.1f %10.1f %12.1f' % (family,
+                  counters['count'],counters['failures'],
+                  counters['totalDuration'],
+                  counters['totalDuration'] * 1000 / counters['count'],
+                  counters['maxDuration'] * 1000,
+                  counters['stdoutBytes'] / 1024.0))
+    
+    lines.append('  Duration histogram (ms):')
+    bucketNames = ['<=%s' % bucketLimit 
+                                    for bucketLimit in self.histogramBuckets]
+    bucketNames.append('>%s' % self.histogramBuckets[-1])
+    for family in sorted(familyCounters.keys()):
+      histogram = familyCounters[family]['histogram']
+      lines.append('    %-18s %s' % (family,' '.join(['%s:%s' % 
+                      (bucketNames[index],count) 
+                        for index,count in enumerate(histogram) if count])))
+    
+    lines.append('  Top callers:')
+    callers = sorted(callerCounters.items(),key=lambda item: item[1][1],
+                                                                reverse=True)
+    for (family,caller),(count,duration) in callers[:maxCallers]:
+      lines.append('    %-40s %-16s %6s %10.3fs' % (caller,family,count,
+                                                                    duration))
+    return '\n'.join(lines)
+  
+  def writeChromeTrace(self,filePath):
+    '''Writes recorded events to filePath in Chrome trace event format, 
+    which can be loaded via chrome://tracing.
+    
+    :param filePath: The path to write to
+    :type filePath: str
+    
+    :returns: (*bool*) -- True
+    '''
+    
+    self.lock.acquire()
+    try:
+      events = list(self.events)
+      startTime = self.startTime
+    finally:
+      self.lock.release()
+    
+    pid = os.getpid()
+    traceEvents = []
+    for (eventStart,duration,family,caller,returncode,stdoutBytes,cmdString,
+                                                          threadID) in events:
+      traceEvents.append({'name':family,'cat':family,'ph':'X','pid':pid,
+                          'tid':threadID,
+                          'ts':int((eventStart - startTime) * 1000000),
+                          'dur':int(duration * 1000000),
+                          'args':{'caller':caller,'exitCode':returncode,
+                                  'stdoutBytes':stdoutBytes,
+                                  'command':cmdString}})
+    
+    traceFile = open(filePath,'w')
+    try:
+      json.dump({'traceEvents':traceEvents,'displayTimeUnit':'ms',
+                  'otherData':{'droppedEvents':self.droppedEvents}},traceFile)
+    finally:
+      traceFile.close()
+    return True
+  
+  def dumpAtExit(self,printSummary=False,tracePath=''):
+    '''Configures our process to print a summary and/or write a Chrome 
+    trace file when it exits.
+    
+    :param printSummary: Whether to log our summary at exit
+    :type printSummary: bool
+    :param tracePath: Path to write a Chrome trace file at exit (optional)
+    :type tracePath: str
+    
+    '''
+    self.printSummaryAtExit = printSummary
+    self.tracePathAtExit = tracePath
+    if (printSummary or tracePath) and not self.atExitRegistered:
+      atexit.register(self.dumpResults)
+      self.atExitRegistered = True
+  
+  def dumpResults(self):
+    '''Prints our summary and writes our trace file, as configured by
+    :func:`fcsxml.FCSCommandRunner.dumpAtExit`.'''
+    if self.printSummaryAtExit:
+      print self.summary()
+    if self.tracePathAtExit:
+      try:
+        self.writeChromeTrace(self.tracePathAtExit)
+      except IOError, err:
+        self.logger('Could not write command trace to path: \'%s\' Error: %s'
+                                      % (self.tracePathAtExit,err),'error')
+
+
+## Our shared command runner, see :class:`fcsxml.FCSCommandRunner`
+commandRunner = FCSCommandRunner()
+
+
+class FCSCommandPool(FCSBaseObject):
+  '''FCSCommandPool is a shared, bounded pool of command runners. All 
+  :class:`fcsxml.FCSVRClient` instances in a process route their fcsvr_client 
+  calls through a single pool (:attr:`fcsxml.FCSVRClient.commandPool`), which
+  limits the number of concurrently running fcsvr_client processes, enforces 
+  per-command timeouts and re-uses a prepared environment between calls.
+  
+  :param maxWorkers: The maximum number of commands that may run concurrently
+  :type maxWorkers: int
+  :param timeout: The default per-command timeout in seconds (0 for none)
+  :type timeout: int
+  
+  .. note::
+    fcsvr_client is a one-shot executable and cannot be kept resident, so
+    each command still results in a process. Commands which do not require 
+    shell features (redirection, pipes, variable expansion) are executed 
+    directly, avoiding the additional /bin/sh process per call.
+  
+  '''
+  
+  maxWorkers = 4
+  timeout = 0
+  
+  ## Characters which require us to hand the command to /bin/sh
+  shellCharacters = re.compile(r'[<>|;&`$*?\[\]]')
+  
+  def __init__(self,maxWorkers=4,timeout=0):
+    '''Our construct.'''
+    FCSBaseObject.__init__(self)
+    self.maxWorkers = 0
+    self.timeout = timeout
+    self.environment = None
+    self.activeCount = 0            ## Number of commands currently running
+    self.condition = threading.Condition()
+    self.setMaxWorkers(maxWorkers)
+  
+  def setMaxWorkers(self,maxWorkers):
+    '''Sets the maximum number of commands which may run concurrently. This
+    may be called while commands are running: if the limit is lowered, 
+    running commands complete and new commands wait until fewer than 
+    maxWorkers are running.
+    
+    :param maxWorkers: The maximum number of concurrent commands
+    :type maxWorkers: int
+    
+    '''
+    
+    maxWorkers = int(maxWorkers)
+    if maxWorkers < 1:
+      maxWorkers = 1
+    
+    self.condition.acquire()
+    try:
+      self.maxWorkers = maxWorkers
+      self.condition.notifyAll()
+    finally:
+      self.condition.release()
+  
+  def acquireWorker(self):
+    '''Blocks until fewer than maxWorkers commands are running and claims a
+    worker slot, which must be returned via :func:`releaseWorker`.'''
+    self.condition.acquire()
+    try:
+      while self.activeCount >= self.maxWorkers:
+        self.condition.wait()
+      self.activeCount += 1
+    finally:
+      self.condition.release()
+  
+  def releaseWorker(self):
+    '''Returns a worker slot claimed via :func:`acquireWorker`.'''
+    self.condition.acquire()
+    try:
+      self.activeCount -= 1
+      self.condition.notify()
+    finally:
+      self.condition.release()
+  
+  def setTimeout(self,timeout):
+    '''Sets the default per-command timeout, in seconds. A value of 0 
+    disables the timeout.
+    
+    :param timeout: The timeout in seconds
+    :type timeout: int
+    
+    '''
+    self.timeout = float(timeout)
+    
+  def getEnvironment(self):
+    '''Returns the environment used for all commands run by the pool. The
+    environment is built once and re-used for subsequent calls.
+    
+    :returns: (*dict*) -- Our environment
+    
+    '''
+    if self.environment is None:
+      self.environment = dict(os.environ)
+    return self.environment
+  
+  def argsForCommand(self,cmdString):
+    '''Returns an argument list for cmdString if it can be executed directly,
+    or False if the command requires /bin/sh.
+    
+    :param cmdString: The command string
+    :type cmdString: str
+    
+    :returns: (*list*) -- The argument list, or False
+    
+    '''
+    if self.shellCharacters.search(cmdString):
+      return False
+    try:
+      return shlex.split(cmdString)
+    except ValueError:
+      return False
+    
+  def run(self,cmdString,input=None,timeout=None):
+    '''Runs the provided command, blocking until a worker slot is available.
+    
+    :param cmdString: The command to run
+    :type cmdString: str
+    :param input: Data to send to the command's standard input (optional)
+    :type input: str
+    :param timeout: Timeout in seconds, if not provided we use our default
+    :type timeout: int
+    
+    :raises: FCSVROfflineError, OSError
+    :returns: (:class:`fcsxml.FCSCommandResult`) -- The command results
+    
+    '''
+    
+    if type(cmdString) == type(u''):
+      cmdString = cmdString.encode('utf-8')
+    if timeout is None:
+      timeout = self.timeout
+    
+    args = self.argsForCommand(cmdString)
+    
+    self.acquireWorker()
+    try:
+      result = self.runCommand(cmdString,input=input,timeout=timeout,
+                                        args=args,env=self.getEnvironment())
+    finally:
+      self.releaseWorker()
+    
+    if result.timedOut:
+      message = ('Command timed out after %s seconds: %s' 
+                                                      % (timeout,cmdString))
+      self.logger(message,'error')
+      raise FCSVROfflineError(message)
+    
+    return result
+  
+  def runMany(self,cmdStrings,timeout=None):
+    '''Runs each of the provided commands across the pool, returning a list 
+    of :class:`fcsxml.FCSCommandResult` objects in the same order as the 
+    provided commands.
+    
+    :param cmdStrings: A list of commands to run
+    :type cmdStrings: list
+    :param timeout: Timeout in seconds for each command
+    :type timeout: int
+    
+    :returns: (*list*) -- A list of :class:`fcsxml.FCSCommandResult` objects
+    
+    '''
+    return self.map(lambda cmdString: self.run(cmdString,timeout=timeout),
+                                                                    cmdStrings)
+  
+  def map(self,function,items,returnExceptions=False,maxWorkers=None):
+    '''Calls function with each item in items using up to maxWorkers 
+    threads, returning a list of results in the same order as items. If
+    returnExceptions is False, the first exception raised by function is
+    re-raised once all items have been processed, otherwise the exception
+    is returned in place of the item's result.
+    
+    :param function: The callable to apply to each item
+    :type function: function
+    :param items: The items to process
+    :type items: list
+    :param returnExceptions: Whether to return exceptions as results
+    :type returnExceptions: bool
+    :param maxWorkers: The number of threads to use, defaults to our 
+      maxWorkers value
+    :type maxWorkers: int
+    
+    :returns: (*list*) -- The results of each call
+    
+    '''
+    
+    items = list(items)
+    results = [None] * len(items)
+    errors = []
+    workQueue = Queue.Queue()
+    for index,item in enumerate(items):
+      workQueue.put((index,item))
+    
+    def worker():
+      while True:
+        try:
+          index,item = workQueue.get_nowait()
+        except Queue.Empty:
+          return
+        try:
+          results[index] = function(item)
+        except Exception, inst:
+          results[index] = inst
+          errors.append(inst)
+    
+    if not maxWorkers:
+      maxWorkers = self.maxWorkers
+    workerCount = min(maxWorkers,len(items))
+    if workerCount <= 1:
+      worker()
+    else:
+      threads = []
+      for count in range(workerCount):
+        thread = threading.Thread(target=worker)
+        thread.setDaemon(True)
+        thread.start()
+        threads.append(thread)
+      for thread in threads:
+        thread.join()
+    
+    if errors and not returnExceptions:
+      raise errors[0]
+    
+    return results
+  
+            
+class FCSFieldRegistry(FCSBaseObject):
+  '''FCSFieldRegistry is a process-wide registry of Final Cut Server field 
+  definitions, mapping field names to FCS DB field names and FCS DB data 
+  types. A single registry is shared by all :class:`fcsxml.FCSVRClient` 
+  instances (:attr:`fcsxml.FCSVRClient.fieldRegistry`) so that schema lookups
+  only call fcsvr_client once per field. The registry can be populated lazily,
+  bulk loaded via :func:`fcsxml.FCSVRClient.loadFieldRegistry`, and persisted
+  to disk via :func:`saveToFile` and :func:`loadFromFile`.
+  
+  '''
+  
+  registryVersion = 1     ## Version stamp written to persisted registries
+  
+  isLoaded = False        ## Set to true once the full schema has been loaded
+  loadTime = 0
+  
+  def __init__(self):
+    '''Our construct.'''
+    FCSBaseObject.__init__(self)
+    self.fieldsByDBName = {}
+    self.dbNamesByName = {}
+    self.isLoaded = False
+    self.loadTime = 0
+    self.lock = threading.RLock()
+  
+  def clear(self):
+    '''Removes all registered fields.'''
+    self.lock.acquire()
+    try:
+      self.fieldsByDBName = {}
+      self.dbNamesByName = {}
+      self.isLoaded = False
+      self.loadTime = 0
+    finally:
+      self.lock.release()
+  
+  def registerField(self,field):
+    '''Registers the provided field definition.
+    
+    :param field: The field to register, must have a name and dbname set
+    :type field: fcsxml.FCSXMLField
+    
+    :returns: (*bool*) -- True if the field was registered
+    
+    '''
+    if not field.name or not field.dbname:
+      return False
+    self.lock.acquire()
+    try:
+      self.fieldsByDBName[field.dbname] = (field.name,field.dbDataType)
+      if not field.name in self.dbNamesByName:
+        self.dbNamesByName[field.name] = field.dbname
+    finally:
+      self.lock.release()
+    return True
+  
+  def registerFieldName(self,fieldName,dbname):
+    '''Registers the resolved FCS DB field name for a requested field name.
+    
+    :param fieldName: The requested field name
+    :type fieldName: str
+    :param dbname: The FCS DB field name the field name resolved to
+    :type dbname: str
+    
+    '''
+    self.lock.acquire()
+    try:
+      self.dbNamesByName[fieldName] = dbname
+    finally:
+      self.lock.release()
+  
+  def fieldWithDBName(self,dbname):
+    '''Returns a new :class:`fcsxml.FCSXMLField` object for the field 
+    registered with the provided dbname.
+    
+    :param dbname: The FCS DB field name
+    :type dbname: str
+    
+    :returns: (*fcsxml.FCSXMLField*) -- The field, or None if the field is 
+      not registered.
+    
+    '''
+    try:
+      name,dbDataType = self.fieldsByDBName[dbname]
+    except KeyError:
+      return None
+    
+    myField = FCSXMLField(name=name,dbname=dbname)
+    if dbDataType:
+      try:
+        myField.setDBDataType(dbDataType)
+      except:
+        pass
+    return myField
+  
+  def fieldWithName(self,fieldName):
+    '''Returns a new :class:`fcsxml.FCSXMLField` object for the field 
+    registered with the provided field name.
+    
+    :param fieldName: The field name
+    :type fieldName: str
+    
+    :returns: (*fcsxml.FCSXMLField*) -- The field, or None if the field is 
+      not registered.
+    
+    '''
+    try:
+      return self.fieldWithDBName(self.dbNamesByName[fieldName])
+    except KeyError:
+      return None
+  
+  def fields(self):
+    '''Returns a list of :class:`fcsxml.FCSXMLField` objects for all 
+    registered fields.'''
+    return [self.fieldWithDBName(dbname) for dbname in self.fieldsByDBName.keys()]
+  
+  def loadFromFile(self,filePath,maxAge=0):
+    '''Loads a registry previously written by :func:`saveToFile`.
+    
+    :param filePath: Path to the registry file
+    :type filePath: str
+    :param maxAge: If provided, registries older than this number of seconds
+      will not be loaded.
+    :type maxAge: int
+    
+    :returns: (*bool*) -- True if the registry was loaded
+    
+    '''
+    if not os.path.isfile(filePath):
+      return False
+    try:
+      plistDict = plistlib.readPlist(filePath)
+    except Exception, inst:
+      self.logger('loadFromFile() Could not read field registry at path:\'%s\''
+                                ' Error:%s' % (filePath,inst),'warning')
+      return False
+    
+    if not plistDict.get('version') == self.registryVersion:
+      self.logger('loadFromFile() Field registry at path:\'%s\' has version:%s,'
+                    ' expected:%s, ignoring!' % (filePath,plistDict.get('version'),
+                                              self.registryVersion),'warning')
+      return False
+    
+    loadTime = plistDict.get('loadTime',0)
+    if maxAge and time.time() - loadTime > maxAge:
+      self.logger('loadFromFile() Field registry at path:\'%s\' has expired,'
+                                          ' ignoring!' % filePath,'debug')
+      return False
+    
+    self.lock.acquire()
+    try:
+      for dbname,fieldInfo in plistDict.get('fields',{}).iteritems():
+        self.fieldsByDBName[dbname] = (fieldInfo['name'],fieldInfo['dbDataType'])
+      self.dbNamesByName.update(plistDict.get('fieldNames',{}))
+      self.isLoaded = plistDict.get('isLoaded',False)
+      self.loadTime = loadTime
+    finally:
+      self.lock.release()
+    
+    self.logger('loadFromFile() Loaded %s fields from path:\'%s\'' 
+                                  % (len(self.fieldsByDBName),filePath),'debug')
+    return True
+  
+  def saveToFile(self,filePath):
+    '''Writes our registry to disk.
+    
+    :param filePath: Path to the registry file
+    :type filePath: str
+    
+    :raises: IOError
+    
+    '''
+    self.lock.acquire()
+    try:
+      fields = {}
+      for dbname,(name,dbDataType) in self.fieldsByDBName.iteritems():
+        fields[dbname] = {'name':name,'dbDataType':dbDataType}
+      plistDict = {'version':self.registryVersion,
+                    'loadTime':self.loadTime or time.time(),
+                    'isLoaded':self.isLoaded,
+                    'fields':fields,
+                    'fieldNames':dict(self.dbNamesByName)}
+    finally:
+      self.lock.release()
+    
+    tempFilePath = '%s.tmp' % filePath
+    plistlib.writePlist(plistDict,tempFilePath)
+    os.rename(tempFilePath,filePath)
+    return True
+  
+  
+class FCSDeviceRegistry(FCSBaseObject):
+  '''FCSDeviceRegistry is a process-wide registry of Final Cut Server devices,
+  shared by all :class:`fcsxml.FCSVRClient` instances 
+  (:attr:`fcsxml.FCSVRClient.deviceRegistry`). Devices are indexed by 
+  DEVICE_ID and DEVICE_NAME, and by DEV_ROOT_PATH via a path component trie 
+  which resolves the device for a file system path by longest prefix. The 
+  registry expires after maxAge seconds and can be persisted to disk via 
+  :func:`saveToFile` and :func:`loadFromFile`.
+  
+  '''
+  
+  registryVersion = 1     ## Version stamp written to persisted registries
+  
+  maxAge = 0              ## Seconds for which our device map is valid, 0 
+                          ## for no expiration
+  loadTime = 0
+  
+  def __init__(self,maxAge=0):
+    '''Our construct.'''
+    FCSBaseObject.__init__(self)
+    self.maxAge = maxAge
+    self.loadTime = 0
+    self.devicesMap = {}
+    self.devicesByName = {}
+    self.pathTrie = {}
+    self.lock = threading.RLock()
+  
+  def isValid(self):
+    '''Returns whether we have a loaded, unexpired device map.
+    
+    :returns: (*bool*)
+    '''
+    if not self.devicesMap or not self.loadTime:
+      return False
+    if self.maxAge and time.time() - self.loadTime > self.maxAge:
+      self.logger('isValid() Device registry has expired.','debug')
+      return False
+    return True
+  
+  def clear(self):
+    '''Removes all registered devices.'''
+    self.setDevicesMap({},loadTime=0)
+  
+  def setDevicesMap(self,devicesMap,loadTime=None):
+    '''Registers the provided devices map, as generated by
+    :func:`fcsxml.FCSVRClient.getDevicesMap`, rebuilding our indexes.
+    
+    :param devicesMap: Dictionary of device dictionaries keyed by device id
+    :type devicesMap: dict
+    :param loadTime: The time at which the map was loaded, defaults to now
+    :type loadTime: float
+    
+    '''
+    
+    if loadTime is None:
+      loadTime = time.time()
+    
+    devicesByName = {}
+    pathTrie = {}
+    for deviceID,deviceDict in devicesMap.iteritems():
+      if 'DEVICE_NAME' in deviceDict:
+        devicesByName[deviceDict['DEVICE_NAME']] = deviceDict
+      if 'FSPATH' in deviceDict and deviceDict['FSPATH']:
+        node = pathTrie
+        for component in self.pathComponents(deviceDict['FSPATH']):
+          node = node.setdefault(component,{})
+        node[None] = deviceID
+    
+    self.lock.acquire()
+    try:
+      self.devicesMap = devicesMap
+      self.devicesByName = devicesByName
+      self.pathTrie = pathTrie
+      self.loadTime = loadTime
+    finally:
+      self.lock.release()
+  
+  def pathComponents(self,path):
+    '''Returns a list of path components for the provided path, ignoring 
+    empty components.'''
+    return [component for component in path.split('/') if component]
+  
+  def deviceWithID(self,id):
+    '''Returns the device dictionary for the provided device id.
+    
+    :raises: KeyError, ValueError
+    '''
+    return self.devicesMap[int(id)]
+  
+  def deviceWithName(self,name):
+    '''Returns the device dictionary for the provided device name.
+    
+    :raises: KeyError
+    '''
+    return self.devicesByName[name]
+  
+  def deviceWithPath(self,path):
+    '''Returns the device dictionary for the device whose DEV_ROOT_PATH is 
+    the longest prefix of the provided file system path.
+    
+    :raises: KeyError
+    '''
+    node = self.pathTrie
+    deviceID = node.get(None)
+    for component in self.pathComponents(path):
+      if not component in node:
+        break
+      node = node[component]
+      if None in node:
+        deviceID = node[None]
+    
+    if deviceID is None:
+      raise KeyError(path)
+    return self.devicesMap[deviceID]
+  
+  def loadFromFile(self,filePath):
+    '''Loads a device map previously written by :func:`saveToFile`. Expired
+    device maps will not be loaded.
+    
+    :param filePath: Path to the registry file
+    :type filePath: str
+    
+    :returns: (*bool*) -- True if the device map was loaded
+    
+    '''
+    if not os.path.isfile(filePath):
+      return False
+    try:
+      plistDict = plistlib.readPlist(filePath)
+    except Exception, inst:
+      self.logger('loadFromFile() Could not read device registry at path:'
+                              '\'%s\' Error:%s' % (filePath,inst),'warning')
+      return False
+    
+    if not plistDict.get('version') == self.registryVersion:
+      self.logger('loadFromFile() Device registry at path:\'%s\' has version:'
+                '%s, expected:%s, ignoring!' % (filePath,plistDict.get('version'),
+                                              self.registryVersion),'warning')
+      return False
+    
+    loadTime = plistDict.get('loadTime',0)
+    if self.maxAge and time.time() - loadTime > self.maxAge:
+      self.logger('loadFromFile() Device registry at path:\'%s\' has expired,'
+                                          ' ignoring!' % filePath,'debug')
+      return False
+    
+    devicesMap = {}
+    for deviceDict in plistDict.get('devices',[]):
+      devicesMap[deviceDict['DEVICE_ID']] = dict(deviceDict)
+    
+    self.setDevicesMap(devicesMap,loadTime=loadTime)
+    self.logger('loadFromFile() Loaded %s devices from path:\'%s\'' 
+                                          % (len(devicesMap),filePath),'debug')
+    return True
+  
+  def saveToFile(self,filePath):
+    '''Writes our device map to disk.
+    
+    :param filePath: Path to the registry file
+    :type filePath: str
+    
+    :raises: IOError
+    
+    '''
+    plistDict = {'version':self.registryVersion,
+                  'loadTime':self.loadTime,
+                  'devices':self.devicesMap.values()}
+    tempFilePath = '%s.tmp' % filePath
+    plistlib.writePlist(plistDict,tempFilePath)
+    os.rename(tempFilePath,filePath)
+    return True
+  
+  
+class FCSLinkCache(FCSBaseObject):
+  '''FCSLinkCache is a process-wide cache of parsed link records, shared by 
+  all :class:`fcsxml.FCSVRClient` instances 
+  (:attr:`fcsxml.FCSVRClient.linkCache`). Entries are keyed by entity 
+  address and link origin ('parent' or 'child'), and hold the link records
+  returned by :func:`fcsxml.FCSVRClient.getLinkRecords`. Entries expire 
+  after maxAge seconds, and the least recently used entries are discarded
+  once maxEntries is exceeded.
+  
+  '''
+  
+  maxAge = 60             ## Seconds for which cached links are valid, 0 
+                          ## for no expiration
+  maxEntries = 5000       ## Maximum number of cached link lists
+  
+  def __init__(self,maxAge=60,maxEntries=5000):
+    '''Our construct.'''
+    FCSBaseObject.__init__(self)
+    self.maxAge = maxAge
+    self.maxEntries = maxEntries
+    self.entries = collections.OrderedDict()
+    self.hits = 0
+    self.misses = 0
+    self.lock = threading.RLock()
+  
+  def linksForAddress(self,address,origin='parent'):
+    '''Returns cached link records for the provided address and origin, or
+    None if no valid entry exists.
+    
+    :param address: The entity address (i.e. '/project/10')
+    :type address: str
+    :param origin: The link origin, 'parent' or 'child'
+    :type origin: str
+    
+    :returns: (*list*) -- A list of link record dicts, or None
+    
+    '''
+    key = (address,origin)
+    self.lock.acquire()
+    try:
+      if not key in self.entries:
+        self.misses += 1
+        return None
+      records,loadTime = self.entries.pop(key)
+      if self.maxAge and time.time() - loadTime > self.maxAge:
+        self.misses += 1
+        return None
+      ## Re-insert to mark as most recently used
+      self.entries[key] = (records,loadTime)
+      self.hits += 1
+      return records
+    finally:
+      self.lock.release()
+  
+  def setLinksForAddress(self,address,records,origin='parent'):
+    '''Caches the provided link records for the provided address and origin.
+    
+    :param address: The entity address (i.e. '/project/10')
+    :type address: str
+    :param records: A list of link record dicts
+    :type records: list
+    :param origin: The link origin, 'parent' or 'child'
+    :type origin: str
+    
+    '''
+    key = (address,origin)
+    self.lock.acquire()
+    try:
+      if key in self.entries:
+        del self.entries[key]
+      self.entries[key] = (records,time.time())
+      while self.maxEntries and len(self.entries) > self.maxEntries:
+        self.entries.popitem(last=False)
+    finally:
+      self.lock.release()
+  
+  def invalidateAddress(self,address):
+    '''Removes all cached links for the provided address, as well as any
+    cached link lists which reference the address.
+    
+    :param address: The entity address (i.e. '/asset/12')
+    :type address: str
+    
+    '''
+    self.lock.acquire()
+    try:
+      for key,(records,loadTime) in self.entries.items():
+        if key[0] == address:
+          del self.entries[key]
+          continue
+        for record in records:
+          if record.get('ADDRESS') == address:
+            del self.entries[key]
+            break
+    finally:
+      self.lock.release()
+    self.logger('invalidateAddress() Invalidated cached links for:%s' 
+                                                          % address,'debug')
+  
+  def clear(self):
+    '''Removes all cached links.'''
+    self.lock.acquire()
+    try:
+      self.entries.clear()
+    finally:
+      self.lock.release()
+  
+  
+class FCSSearchCache(FCSBaseObject):
+  '''FCSSearchCache is a process-wide cache of entity search results, shared
+  by all :class:`fcsxml.FCSVRClient` instances 
+  (:attr:`fcsxml.FCSVRClient.searchCache`). Results of title and field 
+  searches are cached by their normalized criteria: positive entries store
+  the resolved entity, while negative entries record that no entity was
+  found. Entries expire after maxAge (or negativeMaxAge for negative 
+  entries) seconds, and the least recently used entries are discarded once
+  maxEntries is exceeded.
+  
+  Keys are tuples of (searchType,entityType,dbname,value,mdSet,matchType).
+  
+  '''
+  
+  maxAge = 300            ## Seconds for which found entities are cached
+  negativeMaxAge = 60     ## Seconds for which failed searches are cached
+  maxEntries = 1000       ## Maximum number of cached searches
+  
+  def __init__(self,maxAge=300,negativeMaxAge=60,maxEntries=1000):
+    '''Our construct.'''
+    FCSBaseObject.__init__(self)
+    self.maxAge = maxAge
+    self.negativeMaxAge = negativeMaxAge
+    self.maxEntries = maxEntries
+    self.entries = collections.OrderedDict()
+    self.hits = 0
+    self.misses = 0
+    self.lock = threading.RLock()
+  
+  def resultForKey(self,key):
+    '''Returns a tuple (isCached,result) for the provided key. For negative
+    entries, result will be None, otherwise result is a dictionary with keys
+    'entityType', 'entityID', 'entityMetadataSet' and 'entityTitle'.
+    
+    :param key: The search key
+    :type key: tuple
+    
+    :returns: (*tuple*) -- (bool,dict)
+    
+    '''
+    self.lock.acquire()
+    try:
+      if not key in self.entries:
+        self.misses += 1
+        return (False,None)
+      result,loadTime = self.entries.pop(key)
+      if result is None:
+        maxAge = self.negativeMaxAge
+      else:
+        maxAge = self.maxAge
+      if maxAge and time.time() - loadTime > maxAge:
+        self.misses += 1
+        return (False,None)
+      ## Re-insert to mark as most recently used
+      self.entries[key] = (result,loadTime)
+      self.hits += 1
+      return (True,result)
+    finally:
+      self.lock.release()
+  
+  def setResultForKey(self,key,result):
+    '''Caches the provided result for the provided key, result should be
+    None to record a failed search.
+    
+    :param key: The search key
+    :type key: tuple
+    :param result: The entity dictionary, or None
+    :type result: dict
+    
+    '''
+    self.lock.acquire()
+    try:
+      if key in self.entries:
+        del self.entries[key]
+      self.entries[key] = (result,time.time())
+      while self.maxEntries and len(self.entries) > self.maxEntries:
+        self.entries.popitem(last=False)
+    finally:
+      self.lock.release()
+  
+  def invalidate(self,entityType,value=''):
+    '''Invalidates cached searches which may be affected by the creation of
+    a new entity: all negative entries for the entity type, as well as any
+    entries whose searched value overlaps the provided value.
+    
+    :param entityType: The type of the created entity (i.e. 'project')
+    :type entityType: str
+    :param value: The title (or other searched value) of the new entity
+    :type value: str
+    
+    '''
+    if type(value) == type(''):
+      value = value.decode('utf-8','replace')
+    value = value.lower().strip()
+    
+    self.lock.acquire()
+    try:
+      for key,(result,loadTime) in self.entries.items():
+        if not key[1] == entityType:
+          continue
+        keyValue = key[3].lower().strip()
+        if (result is None 
+            or (value and (value in keyValue or keyValue in value))):
+          del self.entries[key]
+    finally:
+      self.lock.release()
+  
+  def invalidateAddress(self,address):
+    '''Removes all cached searches which resolved to the provided entity 
+    address (i.e. '/project/10').'''
+    self.lock.acquire()
+    try:
+      for key,(result,loadTime) in self.entries.items():
+        if (result is not None and '/%s/%s' % (result['entityType'],
+                                          result['entityID']) == address):
+          del self.entries[key]
+    finally:
+      self.lock.release()
+  
+  def clear(self):
+    '''Removes all cached searches.'''
+    self.lock.acquire()
+    try:
+      self.entries.clear()
+    finally:
+      self.lock.release()
+  
+  
+class FCSMemoryMonitor(FCSBaseObject):
+  '''FCSMemoryMonitor enforces a memory budget for long running processes
+  and reports memory usage by object type. Our shared instance is 
+  :data:`fcsxml.memoryMonitor`. When our resident size exceeds 
+  memoryBudget, shared caches (link, search and metadata snapshots) are 
+  released, as is any memory held by objects registered via 
+  :func:`registerReleasable`, and a garbage collection is forced.
+  
+  >>> fcsxml.memoryMonitor.memoryBudget = 256 * 1024
+  >>> fcsxml.memoryMonitor.enforceBudget()
+  >>> print fcsxml.memoryMonitor.report()
+  
+  '''
+  
+  memoryBudget = 0      ## Resident size (in KB) at which caches are released,
+                        ## 0 to disable
+  
+  def __init__(self,memoryBudget=0):
+    '''Our construct.'''
+    FCSBaseObject.__init__(self)
+    self.memoryBudget = memoryBudget
+    self.releaseCount = 0
+    self.releasables = weakref.WeakSet()  ## Objects which implement releaseMemory()
+  
+  def registerReleasable(self,releasable):
+    '''Registers an object whose releaseMemory() method will be called 
+    whenever our caches are released. Only a weak reference is kept.
+    
+    :param releasable: Provide an object which implements releaseMemory()
+    :type releasable: object
+    '''
+    self.releasables.add(releasable)
+  
+  def residentMemoryKB(self):
+    '''Returns the current resident size of our process in KB, or 0 if it 
+    cannot be determined.
+    
+    :returns: (*int*) -- Resident size in KB
+    '''
+    
+    ## Linux exposes our current resident size via /proc
+    try:
+      statusFile = open('/proc/self/status')
+      try:
+        for line in statusFile:
+          if line.startswith('VmRSS:'):
+            return int(line.split()[1])
+      finally:
+        statusFile.close()
+    except (IOError,ValueError):
+      pass
+    
+    ## Otherwise consult ps
+    try:
+      psCMD = commandRunner.run('/bin/ps -o rss= -p %s' % os.getpid(),
+                                                                family='ps')
+      return int(psCMD.stdout.strip())
+    except (OSError,ValueError):
+      return 0
+  
+  def objectUsageByType(self,moduleNames=None):
+    '''Returns the number of live instances, and their approximate size, 
+    for each of our object types. Sizes include each instance and its 
+    attribute dictionary, but not the objects which it references.
+    
+    :param moduleNames: Limit results to classes defined in these modules, 
+      by default fcsxml, fcsArchiver and xml.dom.minidom.
+    :type moduleNames: list
+    
+    :returns: (*dict*) -- Dictionary keyed by class name, each value is a 
+      dictionary with keys 'count' and 'bytes'
+    '''
+    
+    if moduleNames is None:
+      moduleNames = ('fcsxml','fcsArchiver','xml.dom.minidom')
+    
+    usage = {}
+    for object in gc.get_objects():
+      try:
+        objectClass = object.__class__
+        moduleName = objectClass.__module__
+      except AttributeError:
+        continue
+      if not moduleName in moduleNames:
+        continue
+      ## Skip classes themselves
+      if isinstance(object,(type,types.ClassType)):
+        continue
+      size = sys.getsizeof(object)
+      try:
+        size += sys.getsizeof(object.__dict__)
+      except AttributeError:
+        pass
+      className = '%s.%s' % (moduleName,objectClass.__name__)
+      try:
+        typeUsage = usage[className]
+      except KeyError:
+        typeUsage = {'count':0,'bytes':0}
+        usage[className] = typeUsage
+      typeUsage['count'] += 1
+      typeUsage['bytes'] += size
+    
+    return usage
+  
+  def report(self,maxTypes=20,moduleNames=None):
+    '''Returns a printable memory usage report, including our resident size,
+    the size of our shared caches and live objects by type.
+    
+    :param maxTypes: The number of object types to report
+    :type maxTypes: int
+    :param moduleNames: Limit object types to those defined in these modules
+    :type moduleNames: list
+    
+    :returns: (*str*) -- The report
+    '''
+    
+    lines = ['Memory report: resident size: %s KB budget: %s KB'
+              % (self.residentMemoryKB(),self.memoryBudget or 'none')]
+    lines.append('  Shared caches: linkCache: %s entries, searchCache: %s '
+                  'entries, commandRunner: %s events' 
+                  % (len(FCSVRClient.linkCache.entries),
+                    len(FCSVRClient.searchCache.entries),
+                    len(commandRunner.events)))
+    
+    usage = self.objectUsageByType(moduleNames=moduleNames)
+    lines.append('  %-45s %8s %12s' % ('Type','Count','Size (KB)'))
+    sortedUsage = sorted(usage.items(),key=lambda item: item[1]['bytes'],
+                                                                reverse=True)
+    for className,typeUsage in sortedUsage[:maxTypes]:
+      lines.append('  %-45s %8s %12.1f' % (className,typeUsage['count'],
+                                                typeUsage['bytes'] / 1024.0))
+    return '\n'.join(lines)
+  
+  def releaseCaches(self):
+    '''Releases our shared caches and memory held by registered objects, and
+    forces a garbage collection.
+    
+    :returns: (*int*) -- The number of unreachable objects collected
+    '''
+    FCSVRClient.linkCache.clear()
+    FCSVRClient.searchCache.clear()
+    for releasable in list(self.releasables):
+      releasable.releaseMemory()
+    self.releaseCount += 1
+    return gc.collect()
+  
+  def enforceBudget(self):
+    '''Releases our caches if our resident size exceeds our memoryBudget.
+    
+    :returns: (*bool*) -- True if caches were released
+    '''
+    
+    if not self.memoryBudget:
+      return False
+    
+    residentSize = self.residentMemoryKB()
+    if residentSize <= self.memoryBudget:
+      return False
+    
+    collected = self.releaseCaches()
+    self.logger('Resident size: %s KB exceeds memory budget: %s KB, released '
+        'caches (%s objects collected, resident size now: %s KB).' 
+        % (residentSize,self.memoryBudget,collected,self.residentMemoryKB()),
+        'detailed')
+    return True
+
+
+## Our shared memory monitor, see :class:`fcsxml.FCSMemoryMonitor`
+memoryMonitor = FCSMemoryMonitor()
+
+
+class FCSVRClient(FCSBaseObject):
+  '''Our FCSVRClient object, it is our interface for reading and manipulating 
+  data from Final Cut Server via the fcsvr_client executable installed at 
+  ``/Library/Application Support/Final Cut Server/Final Cut Server.bundle/Contents/MacOS/fcsvr_client``
+  
+  :param entityType: The Type of entity: 'asset' or 'project' (production)
+  :type entityType: str
+  :param entityID: The unique numeric FCS id of this object
+  :type entityID: int
+  :param entityPath: The FCS entity path for this object (i.e. '/asset/10')
+  :type entityPath: str
+  :param configParser: An optional :mod:`ConfigParser` object to configure 
+                        default behavior. Alternatively this can be a file
+                        system path to a configuration file to load
+  :type configParser: :class:`ConfigParser.SafeConfigParser` or str
+  
+  .. note::
+    If an entityPath value is provided, it will override values for entityType and id
+    
+  If upon creation the object is provided enough information to uniquely
+  resolve the FCS object (either via specifying entityType,id, or entityPath),
+  the object will init via :func:`FCSVRClient.initWithAssetID`.
+  
+  Thus, this:
+  
+  >>> myFCSObj = fcsxml.FCSVRClient()
+  >>> myFCSObj.initWithProductionID(10)
+  True
+  
+  Is equivalent to:
+  
+  >>> myFCSObj = fcsxml.FCSVRClient(entityPath='/project/10')
+  
+  Is equivalent to:
+  
+  >>> myFCSObj = fcsxml.FCSVRClient(entityType='project',entityID=10)
+  
+  Other notable ways to init an FCSVRClientObject:
+  
+  >>> myFCSObj = fcsxml.FCSVRClient().initWithAssetTitle(title='my great file')
+  >>> myFCSObj = fcsxml.FCSVRClient().initWithProductionTitle(title='My Production')
+  >>> myFCSObj = fcsxml.FCSVRClient().initWithAssetFromFSPath(FSPath='/FinalCutServer/Library/my great file.mov')
+  >>> myFCSObj = fcsxml.FCSVRClient().initWithAssetFromFSPath(FSPath='/FinalCutServer/Library/my great file.mov')
+
+  '''
+  
+  entityType = ''
+  entityID = ''
+  entityMetadataSet = ''
+  entityTitle = ''
+  
+  defaultProductionMetadataSet = 'pa_production_package'
+  defaultAssetMetadataSet = 'pa_asset_media'
+  defaultThumbnailMetadataSet = 'pa_asset_thumbnail'
+  
+  defaultDeviceName = 'Library'
+  
+  fields = {}
+  deviceDict = {}
+  supportDir = '/tmp'
+  overwriteExistingFiles = True
+  
+  thumbnailPath = ''
+  posterFramePath = ''
+  proxyPath = ''
+  editProxyPath = ''
+  
+  thumbnailDeviceName = ''
+  
+  parentXML = ''        ## Cached list_parent_links output for our entity
+  childXML = ''         ## Cached list_child_links output for our entity
+  
+  mdSnapshot = {}       ## Cached getmd values for our entity, keyed by dbname
+  mdSnapshotTime = 0    ## Time at which our snapshot was loaded
+  mdSnapshotTTL = 0     ## Number of seconds for which our snapshot is valid,
+                        ## 0 to keep the snapshot until it is invalidated.
+  
+  FCSUID = 0          ## Our FCS User ID. If this is not set we will attempt
+                      ## to read it in from /Library/Preferences/com.apple.FinalCutServer.settings.plist
+  
+  useSudo = False      ## Call /usr/bin/sudo before calling fcsvr_client commands
+                      ## that require root access. You'll want to make sure that
+                      ## You have modified your sudoers file if you set this to true.
+  
+  pathToFCSVRClient = '/Library/Application Support/Final Cut Server/Final Cut Server.bundle/Contents/MacOS/fcsvr_client'
+
+  configParser = ''
+  devicesMap = ''
+
+  
+  registeredEntities = ['asset','project','dev','field','mdgroup','group']
+  
+  commandPool = FCSCommandPool()  ## Shared by all FCSVRClient instances, all
+                                  ## fcsvr_client calls are run via this pool.
+  xmlReader = FCSXMLRecordReader()  ## Streaming reader for fcsvr_client XML
+  
+  fieldRegistry = FCSFieldRegistry()  ## Shared field schema registry
+  fieldRegistryPath = ''    ## Path to persist our field registry to
+  fieldRegistryMaxAge = 0   ## Max age in seconds for a persisted registry
+  preloadFieldRegistry = False  ## Load all field definitions on first lookup
+  
+  deviceRegistry = FCSDeviceRegistry()  ## Shared device registry
+  deviceRegistryPath = ''   ## Path to persist our device registry to
+  
+  linkCache = FCSLinkCache()  ## Shared cache of parsed link records
+  searchCache = FCSSearchCache()  ## Shared cache of title/field searches
+  
+  bulkSearchBatchSize = 200   ## Maximum number of ids per bulk search
+  maxConcurrentEntityActions = 0  ## Max members archived/restored/analyzed
+                                  ## at once, 0 to use our pool size
+  
+  searchMatchScores = {'exact':50,'exact_whitespace':45,'caseinsensitive':25,
+                        'caseinsensitive_whitespace':20,'substring':1}
+  searchValueTypes = {'dateTime':'timestamp','float':'real','int64':'bigint',
+                        'coords':'intpair'}  ## FCS XML value types by dataType
+  
+  searchCriteriaTemplates = {}  ## Shared compiled search criteria templates
+  searchCriteriaTemplatesLock = threading.Lock()
+  
+  def __init__(self,entityType='asset',entityID=0,id=0,entityPath='',configParser=''):
+    '''Our constructor.'''
+    
+    FCSBaseObject.__init__(self)
+    if entityPath:
+      pathMatch = re.match('\/(.*)\/(.*)',entityPath)
+      if pathMatch:
+        self.entityType = pathMatch.groups()[0]
+        self.entityID = pathMatch.groups()[1]
+    else:
+      self.entityType = entityType
+      if entityID:
+        self.entityID = entityID
+      elif id:
+        self.entityID = id
+      
+    self.entityMetadataSet = ''
+    self.overwriteExistingFiles = True
+    self.thumbnailPath = ''
+    self.parentXML = ''
+    self.childXML = ''
+    self.mdSnapshot = {}
+    self.mdSnapshotTime = 0
+    self.mdSnapshotTTL = 0
+    self.thumbnailDeviceName = 'Library'
+    self.debug = False
+    self.keepFiles = False
+    self.devicesMap = ''
+    self.fields = {}
+    self.deviceDict = {}
+    self.FCSUID = self.getFCSUID()
+    self.thumbnailPath = ''
+    self.posterFramePath = ''
+    self.proxyPath = ''
+    self.editProxyPath = ''
+    self.defaultProductionMetadataSet = 'pa_production_package'
+    self.defaultAssetMetadataSet = 'pa_asset_media'
+    self.defaultDeviceName = 'Library'
+
+    self.useSudo = True
+    self.printClassInLog = True
+    self.debug = False
+    self.printLogs = True
+    
+    if configParser:
+      if type('string') == type(configParser):
+        self.loadConfiguration(filePath=configParser)
+      else:
+        self.loadConfiguration(parser=configParser)
+        
+    if self.entityID and self.entityType == 'asset':
+      self.initWithAssetID(assetID=self.entityID)
+    elif self.entityID and self.entityType == 'project':
+      self.initWithProductionID(productionID=self.entityID)
+        
+  def loadConfiguration(self, parser=None,filePath=None):
+    '''This method will load internal parameters as specified in the
+    provided :class:`ConfigParser.SafeConfigParser` object, or via the 
+    configuration file referenced via the filePath parameter.
+    
+    :param parser: A configuration object.
+    :type parser: :class:`ConfigParser.SafeConfigParser`
+    :param filePath: An absolute path to a configuration file.
+    :type filePath: str
+        
+    
+    .. note:: 
+      If you subclass, you should call this parent function. If we raise a 
+      RuntimeError Exception, you should abort or perform your own 
+      exhaustive sanity checks
+      
+    '''
+    
+    
+    if not isinstance(parser,ConfigParser) and not filePath:
+      message = 'loadConfiguration() Not passed a valid ConfigParser Object!'
+      self.logger(message, 'error')
+      raise RuntimeError(message)
+    elif not isinstance(parser,ConfigParser):
+      if not filePath:
+        filePath = '/usr/local/etc/transmogrifier.conf'
+      self.logger('Loading configuration from filepath: %s' % filePath,'debug')
+      parser = SafeConfigParser()
       parser.read(filePath)
       
     try:
@@ -1193,10 +2990,74 @@ class FCSVRClient(FCSBaseObject):
         self.useSudo = parser.getboolean('FCSVRClient','useSudo')
       except:
         pass
+      try:
+        self.pathToFCSVRClient = parser.get('FCSVRClient','pathToFCSVRClient')
+      except:
+        pass
+      commandRunner.loadConfiguration(parser)
       try:
         self.defaultDeviceName = parse.get('FCSVRClient','defaultDeviceName')
       except:
         pass
+      try:
+        self.mdSnapshotTTL = parser.getfloat('FCSVRClient','metadataSnapshotTTL')
+      except:
+        pass
+      try:
+        self.preloadFieldRegistry = parser.getboolean('FCSVRClient','preloadFieldRegistry')
+      except:
+        pass
+      try:
+        self.fieldRegistryMaxAge = parser.getfloat('FCSVRClient','fieldRegistryMaxAge')
+      except:
+        pass
+      try:
+        self.fieldRegistryPath = parser.get('FCSVRClient','fieldRegistryPath')
+        if self.fieldRegistryPath and not self.fieldRegistry.isLoaded:
+          self.fieldRegistry.loadFromFile(self.fieldRegistryPath,
+                                            maxAge=self.fieldRegistryMaxAge)
+      except:
+        pass
+      try:
+        self.deviceRegistry.maxAge = parser.getfloat('FCSVRClient','deviceRegistryMaxAge')
+      except:
+        pass
+      try:
+        self.deviceRegistryPath = parser.get('FCSVRClient','deviceRegistryPath')
+      except:
+        pass
+      try:
+        self.linkCache.maxAge = parser.getfloat('FCSVRClient','linkCacheMaxAge')
+      except:
+        pass
+      try:
+        self.linkCache.maxEntries = parser.getint('FCSVRClient','linkCacheMaxEntries')
+      except:
+        pass
+      try:
+        self.searchCache.maxAge = parser.getfloat('FCSVRClient','searchCacheMaxAge')
+      except:
+        pass
+      try:
+        self.searchCache.negativeMaxAge = parser.getfloat('FCSVRClient','searchCacheNegativeMaxAge')
+      except:
+        pass
+      try:
+        self.searchCache.maxEntries = parser.getint('FCSVRClient','searchCacheMaxEntries')
+      except:
+        pass
+      try:
+        self.commandPool.setMaxWorkers(parser.getint('FCSVRClient','maxConcurrentCommands'))
+      except:
+        pass
+      try:
+        self.maxConcurrentEntityActions = parser.getint('FCSVRClient','maxConcurrentEntityActions')
+      except:
+        pass
+      try:
+        self.commandPool.setTimeout(parser.getfloat('FCSVRClient','commandTimeout'))
+      except:
+        pass
         
     except:
        self.logger('loadConfiguration() Problem loading configuration records, please double check your configuration', 'error') 
@@ -1253,58 +3114,66 @@ class FCSVRClient(FCSBaseObject):
     :returns: (*dict*) -- A dict object populated with the above information
       for all devices configured in FCS.
     
+    .. note:
+      Device information is shared by all FCSVRClient instances via 
+      :class:`fcsxml.FCSDeviceRegistry`. If deviceRegistryPath is set, the
+      device map will be persisted to, and loaded from, disk.
+    
     '''
     
-    if self.devicesMap and len(self.devicesMap) > 0 and useCache:
-      return self.devicesMap
+    if useCache:
+      if (not self.deviceRegistry.isValid() and self.deviceRegistryPath):
+        self.deviceRegistry.loadFromFile(self.deviceRegistryPath)
+      if self.deviceRegistry.isValid():
+        self.devicesMap = self.deviceRegistry.devicesMap
+        return self.devicesMap
 
     ## Run our fcsvr_client command.
     fcsvrCMDTXT = "'%s' search /dev --xml" % (self.pathToFCSVRClient)
-    fcsvrCMD = subprocess.Popen(fcsvrCMDTXT,shell=True,stdout=subprocess.PIPE,
-                                  stderr=subprocess.PIPE,
-                                  universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
 
     if not fcsvrCMD.returncode == 0:
       ##self.logger('%s' % fcsvrCMD_STDOUT,'error')
       ##raise RuntimeError('Could not parse output from fcsvr_client')
       return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
-                                        cmdString='fcsvr_client %s' % cmdString)
+                                        cmdString=fcsvrCMDTXT)
 
-    ## Create a dom object from our string:
+    ## Parse our results
+    devicesMap = {}
     try:
-      myDom = minidom.parseString(fcsvrCMD_STDOUT)
-    except:
+      for record in self.xmlReader.records(fcsvrCMD_STDOUT):
+        metadata = record.get('METADATA')
+        if not metadata or not metadata.get('DEVICE_ID'):
+          continue
+        deviceDict = {}
+        if 'DEV_ROOT_PATH' in metadata:
+          deviceDict['DEV_ROOT_PATH'] = metadata['DEV_ROOT_PATH']
+          deviceDict['FSPATH'] = metadata['DEV_ROOT_PATH']
+        if 'DEVICE_TYPE' in metadata:
+          deviceDict['DEVICE_TYPE'] = metadata['DEVICE_TYPE']
+        if 'DEVICE_NAME' in metadata:
+          deviceDict['DEVICE_NAME'] = metadata['DEVICE_NAME']
+        deviceDict['DEVICE_ID'] = int(metadata['DEVICE_ID'])
+        deviceDict['DESC_DEVICE_ADDRESS'] = '/dev/%s' % deviceDict['DEVICE_ID']
+        if 'DEV_ARCHIVE' in metadata:
+          if metadata['DEV_ARCHIVE'] == 'true':
+            deviceDict['DEV_ARCHIVE'] = True
+          else:
+            deviceDict['DEV_ARCHIVE'] = False
+        devicesMap[deviceDict['DEVICE_ID']] = deviceDict
+    except (SyntaxError,ValueError):
       self.logger('Could not parse output from fcsvr_client','error')
       raise RuntimeError('Could not parse output from fcsvr_client')
 
-    devicesMap = {}
-    for rootValues in myDom.getElementsByTagName('values'):
-      deviceDict = {}
-      for rootValue in rootValues.getElementsByTagName('value'):
-        if rootValue.attributes['id'].value == 'METADATA':
-          for values in rootValue.getElementsByTagName('values'):
-            for value in values.getElementsByTagName('value'):
-              valueID = value.attributes['id'].value
-              if valueID == 'DEV_ROOT_PATH':
-                deviceDict['DEV_ROOT_PATH'] = value.childNodes[1].childNodes[0].data
-                deviceDict['FSPATH'] = value.childNodes[1].childNodes[0].data
-              elif valueID == 'DEVICE_TYPE':
-                deviceDict['DEVICE_TYPE'] = value.childNodes[1].childNodes[0].data
-              elif valueID == 'DEVICE_NAME':
-                deviceDict['DEVICE_NAME'] = value.childNodes[1].childNodes[0].data
-              elif valueID == 'DEVICE_ID':
-                deviceDict['DEVICE_ID'] = int(value.childNodes[1].childNodes[0].data)
-                deviceDict['DESC_DEVICE_ADDRESS'] = '/dev/%s' % deviceDict['DEVICE_ID']
-              elif valueID == 'DEV_ARCHIVE':
-                archiveValue = value.childNodes[1].childNodes[0].data
-                if archiveValue == 'true':
-                  deviceDict['DEV_ARCHIVE'] = True
-                else:
-                  deviceDict['DEV_ARCHIVE'] = False
-        if 'DEVICE_ID' in deviceDict and deviceDict['DEVICE_ID']:
-          devicesMap[deviceDict['DEVICE_ID']] = deviceDict
-
+    self.deviceRegistry.setDevicesMap(devicesMap)
+    if self.deviceRegistryPath:
+      try:
+        self.deviceRegistry.saveToFile(self.deviceRegistryPath)
+      except Exception, inst:
+        self.logger('getDevicesMap() Could not write device registry to path:'
+                    '\'%s\' Error:%s' % (self.deviceRegistryPath,inst),'warning')
+    
     self.devicesMap = devicesMap
     return self.devicesMap
         
@@ -1324,13 +3193,12 @@ class FCSVRClient(FCSBaseObject):
     
     '''
 
-    deviceIDMap = self.getDevicesMap()
+    self.getDevicesMap()
     self.logger('deviceWithID() Called with ID: %s' % id,'debug')
-    myID = int(id)
     
-    if myID in deviceIDMap:
-      return deviceIDMap[myID]
-    else:
+    try:
+      return self.deviceRegistry.deviceWithID(id)
+    except KeyError:
       raise FCSEntityNotFoundError(entityType='device',entityID=id)
       #self.logger('DeviceID: %s has not been registered!' % id,'error')
       #return False
@@ -1359,12 +3227,10 @@ class FCSVRClient(FCSBaseObject):
       self.logger(message,'error')
       raise FCSError(message)
 
-    for deviceID,deviceDict in deviceIDMap.iteritems():
-      if 'DEVICE_NAME' in deviceDict and deviceDict['DEVICE_NAME'] == id:
-        return deviceIDMap[deviceID]
-
-    ## We are here if we found no match.
-    raise FCSEntityNotFoundError(entityType='device',entityTitle=id)
+    try:
+      return self.deviceRegistry.deviceWithName(id)
+    except KeyError:
+      raise FCSEntityNotFoundError(entityType='device',entityTitle=id)
 
 
   def deviceWithPath(self,path):
@@ -1390,18 +3256,10 @@ class FCSVRClient(FCSBaseObject):
       self.logger(message,'error')
       raise FCSError(message)
       
-    myDevice = {}
-    self.logger('deviceWithName() Called with path: %s' % path,'debug')
-    for deviceID,deviceDict in deviceIDMap.iteritems():
-      if 'FSPATH' in deviceDict:
-        subPath = path[0:len(deviceDict['FSPATH'])]
-        self.logger('deviceWithName() comparing subPath: %s to path:%s' % (subPath,deviceDict['FSPATH']),'debug')
-        if subPath == deviceDict['FSPATH']:
-          myDevice = deviceDict
-          break
-    if myDevice:
-      return myDevice
-    else:
+    self.logger('deviceWithPath() Called with path: %s' % path,'debug')
+    try:
+      return self.deviceRegistry.deviceWithPath(path)
+    except KeyError:
       raise FCSEntityNotFoundError(entityType='device',entityPath=path)
       
   def valueForDBField(self,dbFieldName):
@@ -1651,7 +3509,129 @@ class FCSVRClient(FCSBaseObject):
           'warning')
             
       return False
-  
+  
+  
+  def loadMetadataSnapshot(self,force=False):
+    '''Loads all metadata values for our entity with a single fcsvr_client 
+    getmd call, caching the results for subsequent field reads. If we 
+    already have a valid snapshot, it will be returned without calling
+    fcsvr_client.
+    
+    :param force: If true, we will reload the snapshot regardless of it's
+      cached state.
+    :type force: bool
+    
+    :raises: fcsxml.FCSObjectLoadError, fcsxml.FCSError, 
+      fcsxml.FCSVRClientError
+    
+    :returns: (*dict*) -- Dictionary of (fieldType,value) tuples keyed by 
+      FCS DB field name.
+    
+    '''
+    
+    if not force and self.metadataSnapshotIsValid():
+      return self.mdSnapshot
+      
+    if not self.entityType or not self.entityID:
+      message = 'Could not load metadata, entityType or entityID not set!'
+      self.logger(message,'error')
+      raise FCSObjectLoadError(message)
+    
+    ## Run our fcsvr_client command.
+    fcsvrCMDTXT = "'%s' getmd /%s/%s --xml" % (self.pathToFCSVRClient,
+                                                  self.entityType,self.entityID)
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
+      
+    self.logger("fcsvr_client command: fcsvr_client getmd /%s/%s --xml" 
+                                  % (self.entityType,self.entityID),'debug')
+
+    if not fcsvrCMD.returncode == 0:
+      return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
+                                          cmdString=fcsvrCMDTXT)
+        
+    ## Parse our results
+    try:
+      records = self.xmlReader.recordList(fcsvrCMD_STDOUT,includeTypes=True)
+    except:
+      message = ("Could not parse output from fcsvr_client command: "
+        "fcsvr_client getmd /%s/%s --xml" % (self.entityType,self.entityID))
+      self.logger(message,'error')
+      raise FCSError(message)
+    
+    return self.loadMetadataSnapshotFromRecords(records)
+  
+  def loadMetadataSnapshotFromRecords(self,records):
+    '''Indexes all values from the provided getmd records into our metadata 
+    snapshot.
+    
+    :param records: Records read from fcsvr_client getmd --xml output via
+      :func:`fcsxml.FCSXMLRecordReader.records` with includeTypes set
+    :type records: list
+    
+    :returns: (*dict*) -- Dictionary of (fieldType,value) tuples keyed by 
+      FCS DB field name.
+    
+    '''
+    
+    snapshot = {}
+    for record in records:
+      snapshot.update(record)
+    
+    self.logger('loadMetadataSnapshotFromRecords() Loaded %s values for /%s/%s'
+                % (len(snapshot),self.entityType,self.entityID),'debug')
+    
+    self.mdSnapshot = snapshot
+    self.mdSnapshotTime = time.time()
+    return snapshot
+  
+  def metadataSnapshotIsValid(self):
+    '''Returns whether our metadata snapshot is loaded and has not expired.
+    
+    :returns: (*bool*)
+    
+    '''
+    if not self.mdSnapshotTime:
+      return False
+    if (self.mdSnapshotTTL 
+        and time.time() - self.mdSnapshotTime > self.mdSnapshotTTL):
+      self.logger('metadataSnapshotIsValid() Metadata snapshot has expired.',
+                                                                      'debug')
+      return False
+    return True
+    
+  def invalidateMetadataSnapshot(self):
+    '''Discards our cached metadata snapshot, subsequent field loads will
+    call fcsvr_client.'''
+    self.mdSnapshot = {}
+    self.mdSnapshotTime = 0
+    return True
+    
+  def fieldFromMetadataSnapshot(self,fieldName,dbFieldName):
+    '''Returns an FCSXMLField object for the requested field from our 
+    metadata snapshot, loading the snapshot if necessary. The resulting
+    field is cached in self.fields.
+    
+    :param fieldName: The name of the field
+    :type fieldName: str
+    :param dbFieldName: The FCS DB name of the field
+    :type dbFieldName: str
+    
+    :returns: (*fcsxml.FCSXMLField*) -- The field, or False if our entity 
+      has no value for the field.
+    
+    '''
+    snapshot = self.loadMetadataSnapshot()
+    if not dbFieldName in snapshot:
+      return False
+      
+    fieldType,fieldData = snapshot[dbFieldName]
+    self.logger('Found field: \'%s\', with data: \'%s\'' 
+                                          % (dbFieldName,fieldData),'debug')
+    FCSField = FCSXMLField(name=fieldName,value=fieldData,
+                            dataType=fieldType,dbname=dbFieldName,owner=self)
+    self.fields[fieldName] = FCSField
+    return FCSField
   
   def loadField(self,field):
     '''Function which loads the specified field. If the field is not defined 
@@ -1697,70 +3677,14 @@ class FCSVRClient(FCSBaseObject):
       self.logger('loadField() No fieldname provided!','error');
       raise RuntimeError('Could not load field name: no data provided');
     
-    self.logger("loadField() Loading field with name:'%s' dbname:'%s'" 
-      % (fieldName,dbFieldName),'debug')
+    self.logger("loadField() Loading field with name:'%s' dbname:'%s'",
+      'debug',logArgs=(fieldName,dbFieldName))
         
     ## If we have a registered entityID, try to fetch the actual field value
     if self.entityID:
-      ## Run our fcsvr_client command.
-      fcsvrCMDTXT = "'%s' getmd /%s/%s --xml" % (self.pathToFCSVRClient,
-                                                  self.entityType,self.entityID)
-      fcsvrCMD = subprocess.Popen(fcsvrCMDTXT,shell=True,
-                                              stdout=subprocess.PIPE,
-                                              stderr=subprocess.PIPE,
-                                              universal_newlines=True)
-      fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
-        
-      self.logger("fcsvr_client command: fcsvr_client getmd /%s/%s --xml" 
-                                    % (self.entityType,self.entityID),'debug')
-
-      if not fcsvrCMD.returncode == 0:
-        ##self.logger("%s %s" % (fcsvrCMD_STDOUT,fcsvrCMD_STDERR),'error')
-        ##return False
-        return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
-                                            cmdString=fcsvrCMDTXT)
-          
-      ## Create a dom object from our string:
-      try:
-        myDom = minidom.parseString(fcsvrCMD_STDOUT)
-      except:
-        message = ("Could not parse output from fcsvr_client command: "
-          "fcsvr_client getmd /%s/%s --xml" % (self.entityType,
-                                                        self.entityID))
-        self.logger(message,'error')
-        raise FCSError(message)
-      
-      try:
-        for rootElement in myDom.childNodes[0].childNodes:
-          ##self.logger("Nodename: %s" %rootElement.nodeName,'debug')
-          if rootElement.nodeName == "values":
-            for value in rootElement.getElementsByTagName("value"):
-              valueID = value.attributes["id"].value
-              ##self.logger("valueID: %s" % valueID,'debug')
-              if valueID == dbFieldName:
-                self.testNode = value
-                fieldValueNode = value.childNodes[1]
-                fieldType = fieldValueNode.nodeName
-                try:
-                  self.logger('Found field: %s, reading value.' % dbFieldName,
-                    'debug')
-                  fieldData = fieldValueNode.childNodes[0].data
-                except Exception, inst:
-                  self.logger('An error occured reading value for field: %s'
-                    % inst,'error')
-                  fieldData = ""
-                self.logger('Found field: \'%s\', with data: \'%s\'' 
-                  % (dbFieldName,fieldData),'debug')
-                FCSField = FCSXMLField(name=fieldName,value=fieldData,
-                                        dataType=fieldType,dbname=dbFieldName)
-                self.fields[fieldName] = FCSField
-                return FCSField
-      except:
-        message = ("Error extracting field:'%s' from fcsvr_client command: "
-          "fcsvr_client getmd /%s/%s --xml" % (dbFieldName,self.entityType,
-                                                self.entityID))
-        self.logger(message,'error')
-        raise FCSError(message)
+      FCSField = self.fieldFromMetadataSnapshot(fieldName,dbFieldName)
+      if FCSField:
+        return FCSField
     
     ## If we have gotten to this point, then the asset did not have a value for
     ## the requested field. If we can query the dataType for the field, return
@@ -1770,11 +3694,12 @@ class FCSVRClient(FCSBaseObject):
     dbDataType = self.dbDataTypeForDBFieldName(dbFieldName)
     
     self.logger('Creating new field with name:\'%s\' dbname:\'%s\'' 
-      ' dataType:\'%s\' dbDataType:%s'
-      % (fieldName,dbFieldName,dataType,dbDataType),'debug')
+      ' dataType:\'%s\' dbDataType:%s','debug',
+      logArgs=(fieldName,dbFieldName,dataType,dbDataType))
     if (dataType):
       FCSField = FCSXMLField(name=fieldName,dbname=dbFieldName,
-                                    dataType=dataType,dbDataType=dbDataType);
+                                    dataType=dataType,dbDataType=dbDataType,
+                                    owner=self);
       self.fields[fieldName] = FCSField
       return FCSField
 
@@ -1833,67 +3758,9 @@ class FCSVRClient(FCSBaseObject):
     
     ## If we have a registered entityID, try to fetch the actual field value
     if self.entityID:
-      ## Run our fcsvr_client command.
-      fcsvrCMDString = "'%s' getmd /%s/%s --xml" % (self.pathToFCSVRClient,
-                                                      self.entityType,
-                                                      self.entityID)
-      fcsvrCMD = subprocess.Popen(fcsvrCMDString,shell=True,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE,
-                                    universal_newlines=True)
-      fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
-        
-      self.logger("fcsvr_client command: %s" % fcsvrCMDString,'debug')
-
-      if not fcsvrCMD.returncode == 0:
-        ##errorString = '%s %s' % (fcsvrCMD_STDOUT,fcsvrCMD_STDERR)
-        ##self.logger(errorString,'error')
-        ##raise FCSVRClientError('%s' % errorString,cmdString)
-        return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
-                                            cmdString=fcsvrCMDTXT)
-
-        
-        
-      ## Create a dom object from our string:
-      try:
-        myDom = minidom.parseString(fcsvrCMD_STDOUT)
-      except:
-        errorString = 'Could not parse output from fcsvr_client command.'
-        self.logger('%s fcsvr_client cmd:%s' % (errorString,fcsvrCMDString),'error')
-        raise FCSVRClientError(errorString,fcsvrCMDString)
-      
-      try:
-        for rootElement in myDom.childNodes[0].childNodes:
-          ##self.logger("loadFieldWithName() Nodename: %s" % rootElement.nodeName,'debug')
-          if rootElement.nodeName == "values":
-            for value in rootElement.getElementsByTagName("value"):
-              valueID = value.attributes["id"].value
-              ##self.logger("loadFieldWithName() valueID: %s" % valueID,'debug')
-              if valueID == dbFieldName:
-                ##self.logger('loadFieldWithName() found field with name:%s' % dbFieldName,'debug')
-                self.testNode = value
-                fieldValueNode = value.childNodes[1]
-                fieldType = fieldValueNode.nodeName
-                try:
-                  fieldData = fieldValueNode.childNodes[0].data
-                except:
-                  self.logger('loadFieldWithName() An error occured reading '
-                    ' data for field:%s' % dbFieldName,'debug')
-                  fieldData = ''
-                  
-                self.logger('loadFieldWithName() Found field with dbname:\'%s\''
-                  'value:\'%s\' type:\'%s\'' % (dbFieldName,fieldData,fieldType),
-                  'debug')
-                FCSField = FCSXMLField(name=fieldName,value=fieldData,
-                                          dataType=fieldType,dbname=dbFieldName)
-                self.fields[fieldName] = FCSField
-                return FCSField
-      except:
-        self.logger("Error extracting field:'%s' from fcsvr_client command: "
-          "fcsvr_client getmd /%s/%s --xml" % (dbFieldName,self.entityType,
-                                                self.entityID),'error')
-        raise FCSFieldNotFoundError(fieldName)
-        
+      FCSField = self.fieldFromMetadataSnapshot(fieldName,dbFieldName)
+      if FCSField:
+        return FCSField
     
     ## If we have gotten to this point, then the asset did not have a value for
     ## the requested field. If we can query the dataType for the field, return
@@ -1908,10 +3775,9 @@ class FCSVRClient(FCSBaseObject):
     
     if (dataType):
       FCSField = FCSXMLField(name=fieldName,dbname=dbFieldName,
-                              dataType=dataType,dbDataType=dbDataType);
+                              dataType=dataType,dbDataType=dbDataType,
+                              owner=self);
       self.fields[name] = FCSField
-      if self.debug:
-        FCSField.debug = True
       return FCSField
 
     raise FCSFieldNotFoundError(fieldName)
@@ -1984,6 +3850,7 @@ class FCSVRClient(FCSBaseObject):
       raise FCSDuplicateError(message)
     else:
       self.fields[field.name] = field
+      self.invalidateMetadataSnapshot()
           
   def removeFieldWithName(self, fieldName):
     '''Remove FCSXMLField object registered with passed field name. 
@@ -2023,42 +3890,15 @@ class FCSVRClient(FCSBaseObject):
 
     self.logger("Retrieving field name for dbname:%s" % dbname,'debug')
 
-     ## Run our fcsvr_client command.
-    fcsvrCMDTXT = "'%s' getmd /field/%s --xml" % (self.pathToFCSVRClient,dbname)
-    fcsvrCMD = subprocess.Popen(fcsvrCMDTXT,shell=True,stdout=subprocess.PIPE,stderr=subprocess.PIPE,universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
-      
-    self.logger("fcsvr_client command: fcsvr_client getmd /field/%s --xml" % dbname,'debug')
-
-    if not fcsvrCMD.returncode == 0:
-      return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
-                                          cmdString=fcsvrCMDTXT)
-    
-    ## Create a dom object from our string:
     try:
-      myDom = minidom.parseString(fcsvrCMD_STDOUT)
-    except:
-      self.logger("Could not parse output from fcsvr_client command: fcsvr_client getmd /field/%s --xml" % dbname,'error')
+      myField = self.initFieldWithDBName(dbname)
+    except (FCSFieldNotFoundError,RuntimeError):
+      self.logger("Could not read field name for dbname:%s" % dbname,'debug')
       return False
     
-    try:
-      fieldName = ""
-      for rootElement in myDom.childNodes[0].childNodes:
-        self.logger("Nodename: %s" %rootElement.nodeName,'debug')
-        if rootElement.nodeName == "values":
-          for value in rootElement.getElementsByTagName("value"):
-            valueID = value.attributes["id"].value
-            #self.logger("valueID: %s" % valueID,'debug')
-            if valueID == "FIELD_NAME":
-              fieldName = value.childNodes[1].childNodes[0].data
-              break
-    except:
-      self.logger("Uncaught exception reading field name for dbname:%s" % dbname,'debug')
-      return False
-      
-    if fieldName:
-      self.logger("Found fieldname: %s for dbname: %s"% (fieldName,dbname),'debug')
-      return fieldName
+    if myField and myField.name:
+      self.logger("Found fieldname: %s for dbname: %s"% (myField.name,dbname),'debug')
+      return myField.name
     else:
       return False
 
@@ -2131,18 +3971,19 @@ class FCSVRClient(FCSBaseObject):
     self.logger("initFieldWithDBName() Constructing field with dbname:%s" 
       % dbname,'debug')
     
+    ## Consult our registry
+    registeredField = self.fieldRegistry.fieldWithDBName(dbname)
+    if registeredField:
+      return registeredField
+    
     ## URL encode our fieldname
     encodedDBName = urllib.quote(dbname)
     
     ## Run our fcsvr_client command.
     fcsvrCMDTXT = ("'%s' getmd /field/%s --xml" 
       % (self.pathToFCSVRClient,encodedDBName))
-    fcsvrCMD = subprocess.Popen(fcsvrCMDTXT,
-                                  shell=True,
-                                  stdout=subprocess.PIPE,
-                                  stderr=subprocess.PIPE,
-                                  universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
     
     self.logger("initFieldWithDBName() fcsvr_client command: "
       "fcsvr_client getmd /field/%s --xml" % dbname,'debug')
@@ -2179,6 +4020,7 @@ class FCSVRClient(FCSBaseObject):
       
     if myField and myField.dbname == dbname:
       self.logger("Found field for dbname: %s, dataType:%s"% (dbname,myField.dataType),'debug')
+      self.fieldRegistry.registerField(myField)
       return myField
     elif not myField.dbname == dbname:
       raise RuntimeError("Constructed field does not match dbname:%s" % dbname)
@@ -2188,6 +4030,129 @@ class FCSVRClient(FCSBaseObject):
 
 
   
+  def fieldsFromFieldSearchDOM(self,xmlDOM):
+    '''Returns a list of :class:`fcsxml.FCSXMLField` objects from the output
+    of an fcsvr_client search of /field.
+    
+    :param xmlDOM: The dom object returned by fcsvr_client search /field --xml
+    :type xmlDOM: xml.dom.minidom.Document
+    
+    :returns: (*list*) -- List of :class:`fcsxml.FCSXMLField` objects
+    
+    '''
+    
+    fields = []
+    searchRoot = xmlDOM.childNodes[0]
+    for searchResult in searchRoot.childNodes:
+      if not searchResult.nodeName == "values":
+        continue
+      for rootValue in searchResult.getElementsByTagName("value"):
+        rootValueID = rootValue.attributes["id"].value
+        if rootValueID == "COMPLETE":
+          didComplete = rootValue.childNodes[1].childNodes[0].data
+          if not didComplete:
+            break;
+        elif rootValueID == "METADATA":
+          myField = FCSXMLField()
+          for value in rootValue.getElementsByTagName("values")[0].childNodes:
+            if not value.nodeType == 1:
+              continue
+            try:
+              valueID = value.attributes["id"].value
+            except: 
+              continue
+            try:
+              valueData = value.childNodes[1].childNodes[0].data
+            except:
+              continue
+            if valueID == "FIELD_NAME":
+              myField.name = valueData
+            elif valueID == "FIELD_ID":
+              myField.dbname = valueData
+            elif valueID == "FIELD_DATA_TYPE":
+              ## if datatype is ktAtom, then we are a system field.
+              if valueData == 'KtAtom' or valueData == 'KtAddress':
+                continue
+              try:
+                myField.setDBDataType(valueData)
+              except:
+                self.logger('An unknown error occurred setting dataType:%s'
+                    ', skipping field.)' % valueData,'warning')
+                continue
+          if myField.name and myField.dbname:
+            fields.append(myField)
+    
+    return fields
+  
+  def loadFieldRegistry(self,force=False):
+    '''Loads all field definitions from Final Cut Server into our shared
+    :class:`fcsxml.FCSFieldRegistry` using a single fcsvr_client search. If
+    fieldRegistryPath is set, the loaded registry will be written to disk.
+    
+    :param force: Reload the registry even if it has already been loaded
+    :type force: bool
+    
+    :raises: fcsxml.FCSVRClientError, fcsxml.FCSError
+    
+    :returns: (*fcsxml.FCSFieldRegistry*) -- Our loaded registry
+    
+    '''
+    
+    if self.fieldRegistry.isLoaded and not force:
+      return self.fieldRegistry
+    
+    fcsvrCMDTXT = '"%s" search /field --xml' % self.pathToFCSVRClient
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
+    
+    self.logger('fcsvr_client command: fcsvr_client search /field --xml','debug')
+    
+    if not fcsvrCMD.returncode == 0:
+      return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
+                                          cmdString=fcsvrCMDTXT)
+    try:
+      myDom = minidom.parseString(fcsvrCMD_STDOUT)
+    except:
+      message = ('Could not parse output from fcsvr_client command: '
+                                        'fcsvr_client search /field --xml')
+      self.logger(message,'error')
+      raise FCSError(message)
+    
+    fields = self.fieldsFromFieldSearchDOM(myDom)
+    for field in fields:
+      self.fieldRegistry.registerField(field)
+    self.fieldRegistry.isLoaded = True
+    self.fieldRegistry.loadTime = time.time()
+    
+    self.logger('loadFieldRegistry() Loaded %s field definitions.' 
+                                                    % len(fields),'debug')
+    
+    if self.fieldRegistryPath:
+      self.saveFieldRegistry()
+    
+    return self.fieldRegistry
+  
+  def saveFieldRegistry(self,filePath=''):
+    '''Writes our shared field registry to disk.
+    
+    :param filePath: The path to write to, defaults to fieldRegistryPath
+    :type filePath: str
+    
+    :returns: (*bool*) -- True if the registry was written.
+    
+    '''
+    if not filePath:
+      filePath = self.fieldRegistryPath
+    if not filePath:
+      return False
+    try:
+      self.fieldRegistry.saveToFile(filePath)
+    except Exception, inst:
+      self.logger('saveFieldRegistry() Could not write field registry to path:'
+                                  '\'%s\' Error:%s' % (filePath,inst),'warning')
+      return False
+    return True
+  
   def initFieldWithFieldName(self,fieldName):
     '''Returns a FCSXMLField object from a provided fieldName. Uses fcsvr_client
     to retrieve all the necessary parameters for the field. This method differs
@@ -2201,22 +4166,74 @@ class FCSVRClient(FCSBaseObject):
     
     :returns: (*fcsxml.FCSXMLField*) -- The associated FCSXMLField object
     
-    '''
+    .. note: Resolved fields are stored in our shared 
+      :class:`fcsxml.FCSFieldRegistry`, subsequent lookups will not call
+      fcsvr_client. If our registry is loaded, it is consulted first, but if
+      it has no exact or case-insensitive match for fieldName (i.e. for a 
+      field created since it was loaded) we search fcsvr_client. Partial 
+      matches are never cached.
     
+    '''
     
     self.logger("Constructing field with name:%s" % fieldName,'debug')
-
+    
+    ## Consult our registry
+    registeredField = self.fieldRegistry.fieldWithName(fieldName)
+    if registeredField:
+      return registeredField
+    
+    if self.preloadFieldRegistry and not self.fieldRegistry.isLoaded:
+      self.loadFieldRegistry()
+    
+    ## Look for an exact or case-insensitive match in our loaded registry, 
+    ## otherwise search fcsvr_client.
+    myField = None
+    matchType = ''
+    if self.fieldRegistry.isLoaded:
+      myField,matchType = self.preferredFieldForFieldName(fieldName,
+                                self.fieldRegistry.fields(),allowPartial=False)
+    if not myField:
+      candidateFields = self.fieldsWithFieldName(fieldName)
+      if candidateFields is False:
+        return False
+      myField,matchType = self.preferredFieldForFieldName(fieldName,
+                                                              candidateFields)
+    if not myField:
+      raise RuntimeError("An error occured while determining preferred value from matches for fieldName:%s!" % fieldName)
+    
+    self.logger("Found dbFieldName: %s for fieldName: %s with dataType: %s"
+                   % (myField.dbname,myField.name,myField.dataType),'debug')
+    
+    ## Only cache exact and case-insensitive resolutions of our name
+    if not matchType == 'substring':
+      self.fieldRegistry.registerFieldName(fieldName,myField.dbname)
+    return self.fieldRegistry.fieldWithDBName(myField.dbname)
+  
+  def fieldsWithFieldName(self,fieldName):
+    '''Returns a list of FCSXMLField objects returned by an fcsvr_client 
+    search for the provided field name. Returned fields are registered in 
+    our shared :class:`fcsxml.FCSFieldRegistry`.
+    
+    :param fieldName: The field name to be queried.
+    :type fieldName: str
+    
+    :raises: FCSVRClientError
+    :returns: (*list*) -- A list of FCSXMLField objects, or False if the 
+      fcsvr_client output could not be parsed.
+    
+    '''
+    
     ## Run our fcsvr_client command.
     fcsvrCMDTXT = '"%s" search --crit  "%s" /field --xml' % (self.pathToFCSVRClient,fieldName)
-    fcsvrCMD = subprocess.Popen(fcsvrCMDTXT,shell=True,stdout=subprocess.PIPE,stderr=subprocess.PIPE,universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
-      
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
+        
     self.logger('fcsvr_client command: fcsvr_client  search --crit  "%s" /field --xml' % fieldName,'debug')
-
+  
     if not fcsvrCMD.returncode == 0:
       return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
                                           cmdString=fcsvrCMDTXT)
-    
+      
     ## Create a dom object from our string:
     try:
       myDom = minidom.parseString(fcsvrCMD_STDOUT)
@@ -2224,90 +4241,58 @@ class FCSVRClient(FCSBaseObject):
       self.logger('Could not parse output from fcsvr_client command: fcsvr_client  search --crit  "%s" /field --xml' % fieldName,'error')
       return False
       
-    didComplete = False
-    #try:
-    testFieldName = ""
-    searchRoot = myDom.childNodes[0]
-    searchResultCount = 0
+    candidateFields = self.fieldsFromFieldSearchDOM(myDom)
+    for field in candidateFields:
+      self.fieldRegistry.registerField(field)
+    
+    return candidateFields
+  
+  def preferredFieldForFieldName(self,fieldName,candidateFields,
+                                                            allowPartial=True):
+    '''Returns the preferred field from candidateFields for the provided
+    field name, along with its match type: 'exact' for exact and 
+    case-insensitive matches, or 'substring' for fields whose name prefixes 
+    fieldName.
+    
+    :param fieldName: The field name to be queried.
+    :type fieldName: str
+    :param candidateFields: A list of FCSXMLField objects to consider
+    :type candidateFields: list
+    :param allowPartial: Whether to consider partial (prefix) matches
+    :type allowPartial: bool
+    
+    :returns: (*tuple*) -- (FCSXMLField,matchType), or (None,'') if no 
+      field matches.
+    
+    '''
+    
     exactMatches = []
     caseInsensitiveMatches = []
     partialMatches = []
-    for searchResult in searchRoot.childNodes:
-      ## self.logger("initFieldWithFieldName() Searching nodename: %s" % searchResult.nodeName,'debug')
-      if searchResult.nodeName == "values":
-        didFindMatch = False
-        matchType = ""
-        dbFieldName = ""
-        for rootValue in searchResult.getElementsByTagName("value"):
-          ## self.logger("initFieldWithFieldName() rootValue nodename: %s" % rootValue.nodeName,'debug')          
-          rootValueID = rootValue.attributes["id"].value
-          ## self.logger("initFieldWithFieldName() Searching rootValueID: %s" % rootValueID,'debug')
-          if rootValueID == "COMPLETE":
-            didComplete = rootValue.childNodes[1].childNodes[0].data
-            if not didComplete:
-              break;
-            searchResultCount += 1
-          elif rootValueID == "METADATA":
-            myField = FCSXMLField()
-            for value in rootValue.getElementsByTagName("values")[0].childNodes:
-              if not value.nodeType == 1:
-                ##self.logger("initFieldWithFieldName() Skipping nodetype: %s" % value.nodeType,'debug')  
-                continue
-                        
-              try:
-                valueID = value.attributes["id"].value
-                ##self.logger("initFieldWithFieldName() - Found METADATA value node"
-                ##" with ID: %s" % valueID,'debug')  
-              except: 
-                continue
-              if valueID == "FIELD_NAME":
-                myField.name = value.childNodes[1].childNodes[0].data
-                ##self.logger("initFieldWithFieldName() Testing field with name: %s" % myField.name,'debug')
-                if not myField.name:
-                  break;
-                elif myField.name == fieldName:
-                  didFindMatch = True
-                  matchType = "exact"
-                elif myField.name.lower() == fieldName.lower():
-                  didFindMatch = True
-                  matchType = "caseinsensitive"                    
-                else:
-                  if len(myField.name) > len(fieldName):
-                    if testFieldName[0:len(fieldName)].lower() == fieldName.lower():
-                      didFindMatch = True
-                      matchType = "substring"
-                  else:
-                    if fieldName[0:len(myField.name)].lower() == myField.name.lower():
-                      didFindMatch = True
-                      matchType = "substring"
-              elif valueID == "FIELD_ID":
-                myField.dbname = value.childNodes[1].childNodes[0].data
-              elif valueID == "FIELD_DATA_TYPE":
-                dbDataType = value.childNodes[1].childNodes[0].data
-                ## if datatype is ktAtom, then we are a system field.
-                if dbDataType == 'KtAtom' or dbDataType == 'KtAddress':
-                  continue
-                try:
-                  myField.setDBDataType(dbDataType)
-                except:
-                  self.logger('An unknown error occurred setting dataType:%s'
-                      ', skipping field.)' % dbDataType,'warning')
-                  continue
-              
-            if didFindMatch and myField:
-              self.logger("initFieldWithFieldName() Found match:%s for fieldname: %s" % (matchType,myField.name),'debug')
-              if matchType == "exact":
-                exactMatches.append(myField)
-              elif matchType == "caseinsensitive":
-                caseInsensitiveMatches.append(myField)
-              elif matchType == "substring":
-                partialMatches.append(myField)
-              
-                
-                                           
-    #except:
-    #  self.logger("Uncaught exception reading field name for dbFieldName:%s" % dbFieldName,'debug')
-    #  return False
+    for myField in candidateFields:
+      didFindMatch = False
+      matchType = ""
+      if not myField.name:
+        continue
+      elif myField.name == fieldName:
+        didFindMatch = True
+        matchType = "exact"
+      elif myField.name.lower() == fieldName.lower():
+        didFindMatch = True
+        matchType = "caseinsensitive"                    
+      elif allowPartial and len(myField.name) <= len(fieldName):
+        if fieldName[0:len(myField.name)].lower() == myField.name.lower():
+          didFindMatch = True
+          matchType = "substring"
+      
+      if didFindMatch:
+        self.logger("initFieldWithFieldName() Found match:%s for fieldname: %s" % (matchType,myField.name),'debug')
+        if matchType == "exact":
+          exactMatches.append(myField)
+        elif matchType == "caseinsensitive":
+          caseInsensitiveMatches.append(myField)
+        elif matchType == "substring":
+          partialMatches.append(myField)
     
     myField = ""
     ## analyze our findings
@@ -2374,19 +4359,18 @@ class FCSVRClient(FCSBaseObject):
     elif len(partialMatches) > 1:
       self.logger("Found %s matches for field name:%s, returning first result!" % (len(exactMatches),fieldName),'warning')
       myField = partialMatches[0]  
-    else:
-      raise RuntimeError("An error occured while determining preferred value from matches for fieldName:%s!" % fieldName)
     
-    if myField:
-      self.logger("Found dbFieldName: %s for fieldName: %s with dataType: %s"
-                     % (myField.dbname,myField.name,myField.dataType),'debug')
-      return myField
+    if not myField:
+      return (None,'')
+    elif exactMatches or caseInsensitiveMatches:
+      return (myField,'exact')
     else:
-      return False
+      return (myField,'substring')
 
-  def assetWithField(self,field,mdSet='',matchType='exact'):
+  def assetWithField(self,field,mdSet='',matchType='exact',useCache=True):
     '''Returns a new FCSVRClient object matching the provided 
-    :class:`fcsxml.FCSXMLObject`.
+    :class:`fcsxml.FCSXMLObject`. Results are cached in our shared 
+    :class:`fcsxml.FCSSearchCache`.
     
     :param field: Provide the field to match
     :type field: fcsxml.FCSXMLObject
@@ -2397,6 +4381,8 @@ class FCSVRClient(FCSBaseObject):
     :param matchType: An optional parameter to specify the search behavior.
       Currently two matchType's are supported: 'exact' (default), and 'substring'
     :type matchType: str
+    :param useCache: Specify whether cached search results may be used
+    :type useCache: bool
     
     :returns: (*fcsxml.FCSVRClient*) -- Asset entity matching provided parameters.
     
@@ -2406,6 +4392,17 @@ class FCSVRClient(FCSBaseObject):
     
     '''
     
+    if useCache:
+      if field.dbname:
+        dbname = field.dbname
+      else:
+        dbname = self.dbFieldNameForFieldName(field.name)
+      return self.cachedSearch(searchFunction=self.assetWithField,
+                      searchArgs={'field':field,'mdSet':mdSet,
+                                                      'matchType':matchType},
+                      entityType='asset',dbname=dbname,value=field.value,
+                      mdSet=mdSet,matchType=matchType)
+    
     self.logger('Retrieving Asset for field:%s' % field.name,'debug')
     
     ## Run our fcsvr_client command.
@@ -2413,9 +4410,8 @@ class FCSVRClient(FCSBaseObject):
     fcsvrCMDTXT = ('"%s" search --crit  "%s" /asset --xml' 
                               % (self.pathToFCSVRClient,title))
     '''
-    #### Generate our search XML file
-    ## Create our title field
-    XMLSearchFilePath = self.generateSearchXML(fields=[field],
+    #### Generate our search criteria
+    searchCriteria = self.searchCriteriaForFields(fields=[field],
                                                          matchType=matchType)
                                                          
     if field.dbname:
@@ -2429,112 +4425,48 @@ class FCSVRClient(FCSBaseObject):
                                           % (dbname,fieldValue),'debug')
       
     
-    fcsvrCMDTXT = ('"%s" search /asset --xml --xmlcrit < "%s"' 
-                              % (self.pathToFCSVRClient,XMLSearchFilePath))
+    fcsvrCMDTXT = ('"%s" search /asset --xml --xmlcrit' 
+                                                    % self.pathToFCSVRClient)
                               
-    fcsvrCMD = subprocess.Popen(fcsvrCMDTXT,
-                                  shell=True,
-                                  stdout=subprocess.PIPE,
-                                  stderr=subprocess.PIPE,
-                                  universal_newlines=True)
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT,input=searchCriteria.xml)
                                   
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
       
-    self.logger('fcsvr_client command:\'%s\'' % fcsvrCMDTXT,'debug')
-
-    ## Delete our temp search file
-    if not self.keepFiles:
-      os.remove(XMLSearchFilePath)
-
-    if not fcsvrCMD.returncode == 0:
-      return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
-                                          cmdString=fcsvrCMDTXT)   
-
-    ## Create a dom object from our string:
-    try:
-      myDom = minidom.parseString(fcsvrCMD_STDOUT)
-    except:
-      self.logger('Could not parse output from fcsvr_client command: \'%s\''
-                       % fcsvrCMDTXT,'error')
-      raise RuntimeError('fcsvr_client returned unexpected results!')
-
-      
-    didComplete = False
-    #try:
-    matches = []    
-    searchRoot = myDom.childNodes[0]
-    searchResultCount = 0
-    
-    ## Iterate through the DOM and extract our results.
-    for searchResult in searchRoot.childNodes:
-      ##self.logger("productionWithTitle() Searching nodename: %s" % searchResult.nodeName,'debug')
-      if searchResult.nodeName == 'values':
-        searchResultDict = {} 
-        didFindMatch = False
-        for rootValue in searchResult.getElementsByTagName('value'):
-          ## This is the result level, here for each result
-          ##self.logger("productionWithTitle() rootValue nodename: %s" % rootValue.nodeName,'debug')          
-          rootValueID = rootValue.attributes['id'].value
-          ##self.logger('productionWithTitle() Searching rootValueID: %s' % rootValueID,'debug')
-          if rootValueID == 'COMPLETE':
-            didComplete = rootValue.childNodes[1].childNodes[0].data
-            if not didComplete:
-              break;
-            searchResultCount += 1
-          elif rootValueID == 'METADATA':
-            for value in rootValue.getElementsByTagName('value'):
-              valueID = value.attributes['id'].value
-              '''self.logger('Comparing node: %s, looking for %s' 
-                % (valueID,dbname),'debug')'''
-              if valueID == dbname:
-                theFieldValue = value.childNodes[1].childNodes[0].data
-                '''self.logger(' - FOUND NODE:%s with value:%s' 
-                                        % (dbname,theFieldValue),'debug')'''
-                if not theFieldValue:
-                  break;
-                elif fieldValue == theFieldValue:
-                  didFindMatch = True
-                  searchResultDict['matchType'] = 'exact'
-                elif fieldValue.strip() == theFieldValue.strip():
-                  didFindMatch = True
-                  searchResultDict['matchType'] = 'exact_whitespace'
-                elif fieldValue.lower() == theFieldValue.lower():
-                  didFindMatch = True
-                  searchResultDict['matchType'] = 'caseinsensitive'                    
-                elif fieldValue.lower().strip() == theFieldValue.lower().strip():
-                  didFindMatch = True
-                  searchResultDict['matchType'] = 'caseinsensitive_whitespace'
-                elif fieldValue in theFieldValue:
-                  didFindMatch = True
-                  searchResultDict['matchType'] = 'substring'
-                else:
-                  if len(fieldValue) > len(theFieldValue):
-                    if fieldValue[0:len(theFieldValue)].lower() == theFieldValue.lower():
-                      didFindMatch = True
-                      searchResultDict['matchType'] = 'substring'
-                    elif fieldValue.lower() in theFieldValue.lower():
-                      didFindMatch = True
-                      searchResultDict['matchType'] = 'substring'
-                  else:
-                    if theFieldValue[0:len(fieldValue)].lower() == fieldValue.lower():
-                      didFindMatch = True
-                      searchResultDict['matchType'] = 'substring'
-                    elif fieldValue in theFieldValue:
-                      didFindMatch = True
-                      searchResultDict['matchType'] = 'substring'
-              if valueID == 'ASSET_TYPE':
-                searchResultDict['ASSET_TYPE'] = value.childNodes[1].childNodes[0].data
-              if valueID == 'ASSET_NUMBER':
-                searchResultDict['ASSET_NUMBER'] = value.childNodes[1].childNodes[0].data
+    self.logger('fcsvr_client command:\'%s\' criteria: %s' 
+                                      % (fcsvrCMDTXT,searchCriteria),'debug')
 
-              
+    if not fcsvrCMD.returncode == 0:
+      return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
+                                          cmdString=fcsvrCMDTXT)   
+
+    ## Iterate through our results and extract matches.
+    matches = []
+    try:
+      for record in self.xmlReader.records(fcsvrCMD_STDOUT):
+        if not record.get('COMPLETE'):
+          continue
+        metadata = record.get('METADATA')
+        if not metadata:
+          continue
+        searchResultDict = {} 
+        didFindMatch = False
+        theFieldValue = metadata.get(dbname)
+        resultMatchType = self.searchMatchType(fieldValue,theFieldValue)
+        if resultMatchType:
+          didFindMatch = True
+          searchResultDict['matchType'] = resultMatchType
+        
+        if 'ASSET_TYPE' in metadata:
+          searchResultDict['ASSET_TYPE'] = metadata['ASSET_TYPE']
+        if 'ASSET_NUMBER' in metadata:
+          searchResultDict['ASSET_NUMBER'] = metadata['ASSET_NUMBER']
+        
         if didFindMatch and 'ASSET_NUMBER' in searchResultDict:
           matches.append(searchResultDict)
-           
-                                           
-    #except:
-    #  self.logger("Uncaught exception reading field name for dbFieldName:%s" % dbFieldName,'debug')
-    #  return False
+    except SyntaxError:
+      self.logger('Could not parse output from fcsvr_client command: \'%s\''
+                       % fcsvrCMDTXT,'error')
+      raise RuntimeError('fcsvr_client returned unexpected results!')
     
     #### Analyze our findings
     
@@ -2633,8 +4565,269 @@ class FCSVRClient(FCSBaseObject):
     return theAsset
 
 
-  def assetWithTitle(self,title,mdSet='',matchType='exact'):
-    '''Returns a new FCSVRClient object matching the provided title. 
+  def assetsWithFieldValues(self,field,values,mdSet='',matchType='exact',
+                                                              batchSize=None):
+    '''Resolves assets for each of the provided values of a field, utilizing
+    OR-combined search criteria in batches of up to :attr:`bulkSearchBatchSize`
+    values, rather than a search for each value (as 
+    :func:`fcsxml.FCSVRClient.assetWithField` does). Matches for each value
+    are ranked in the same fashion as 
+    :func:`fcsxml.FCSVRClient.assetWithField`. For 'exact' searches only 
+    results whose field value matches exactly or differs by case or 
+    whitespace are considered, for 'substring' searches, only results whose
+    field value contains the searched value are considered. Returned assets 
+    are fully initialized from the search results.
+    
+    :param field: Provide the field to match, it's value is ignored.
+    :type field: fcsxml.FCSXMLField
+    :param values: Provide a list of values to search for
+    :type values: list
+    :param mdSet: An optional parameter that can be provided to limit search
+      results to a specific FCS metadata set. This should be the FCS metadata
+      set id (i.e. "pa_asset_media") 
+    :type mdSet: str
+    :param matchType: An optional parameter to specify the search behavior.
+      Currently two matchType's are supported: 'exact' (default), and 'substring'
+    :type matchType: str
+    :param batchSize: Specify the maximum number of values per search
+    :type batchSize: int
+    
+    :raises: FCSError, FCSFieldNotFoundError, FCSVRClientError
+    :returns: (*dict*) -- Dictionary of :class:`FCSVRClient` objects keyed by
+      value, values for which no asset could be found are omitted.
+    
+    .. versionadded:: 1.0b
+    
+    '''
+    
+    if not batchSize:
+      batchSize = self.bulkSearchBatchSize
+    
+    ## Resolve our field definition
+    if field.dbname:
+      searchField = self.initFieldWithDBName(field.dbname)
+    else:
+      searchField = self.initFieldWithFieldName(field.name)
+    dbname = searchField.dbname
+    
+    dataType = searchField.dataType
+    if not dataType or dataType[0:6] == 'string':
+      valueType = 'string'
+    elif dataType == 'integer':
+      valueType = 'int'
+    elif dataType in self.searchValueTypes:
+      valueType = self.searchValueTypes[dataType]
+    else:
+      valueType = dataType
+    
+    ## Remove duplicate values, preserving order
+    searchValues = []
+    seenValues = set()
+    for value in values:
+      if value and not value in seenValues:
+        seenValues.add(value)
+        searchValues.append(value)
+    if not searchValues:
+      return {}
+    
+    batches = [searchValues[index:index + batchSize]
+                          for index in range(0,len(searchValues),batchSize)]
+                          
+    self.logger('assetsWithFieldValues() Searching for %s values of field:%s'
+            ' with %s searches' % (len(searchValues),dbname,len(batches)),'debug')
+    
+    def searchBatch(batchValues):
+      searchCriteria = self.searchCriteriaForValues(dbname=dbname,
+                    values=batchValues,valueType=valueType,matchType=matchType)
+      fcsvrCMDTXT = ('"%s" search /asset --xml --xmlcrit' 
+                                                    % self.pathToFCSVRClient)
+      fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT,input=searchCriteria.xml)
+      self.logger('fcsvr_client command:\'%s\' criteria: %s' 
+                                      % (fcsvrCMDTXT,searchCriteria),'debug')
+      if not fcsvrCMD.returncode == 0:
+        return self.fcsvr_client_error(errorString=fcsvrCMD.stdout,
+                                          cmdString=fcsvrCMDTXT)
+      try:
+        return self.xmlReader.recordList(fcsvrCMD.stdout,includeTypes=True)
+      except SyntaxError:
+        message = ('Could not parse output from fcsvr_client command: \'%s\''
+                                                                % fcsvrCMDTXT)
+        self.logger(message,'error')
+        raise FCSError(message)
+    
+    ## Collect our results, indexed by our field's normalized value. As each
+    ## batch returns records for many values, exact searches only consider
+    ## records which match a value exactly or by case/whitespace, substring
+    ## searches consider records whose value contains the searched value.
+    resultRecords = []
+    resultsByValue = {}
+    for records in self.commandPool.map(searchBatch,batches):
+      for record in records:
+        if not record.get('COMPLETE',('',''))[1]:
+          continue
+        metadata = record.get('METADATA')
+        if not metadata or not metadata[0] == 'values':
+          continue
+        metadata = metadata[1]
+        resultValue = metadata.get(dbname,('',''))[1]
+        if not resultValue or not metadata.get('ASSET_NUMBER',('',''))[1]:
+          continue
+        resultRecords.append((resultValue,metadata))
+        resultsByValue.setdefault(resultValue.lower().strip(),[]).append(
+                                                        (resultValue,metadata))
+    
+    ## Select the best match for each of our values.
+    assets = {}
+    for value in searchValues:
+      if matchType == 'substring':
+        candidates = [(resultValue,metadata) 
+                          for resultValue,metadata in resultRecords
+                          if value.lower().strip() in resultValue.lower()]
+      else:
+        candidates = resultsByValue.get(value.lower().strip(),[])
+      
+      topScore = 0
+      theMatch = None
+      for resultValue,metadata in candidates:
+        resultMatchType = self.searchMatchType(value,resultValue)
+        if not resultMatchType:
+          continue
+        searchScore = self.searchMatchScores[resultMatchType]
+        resultMDSet = metadata.get('ASSET_TYPE',('',''))[1]
+        if mdSet and resultMDSet.lower() == mdSet.lower():
+          searchScore += 50
+        if searchScore > topScore:
+          topScore = searchScore
+          theMatch = metadata
+      
+      if not theMatch:
+        self.logger('Found no assets matching value: \'%s\' for field: %s'
+                                                % (value,dbname),'detailed')
+        continue
+      
+      theAsset = FCSVRClient(configParser=self.configParser)
+      if self.debug:
+        theAsset.debug = True
+      if self.printLogs:
+        theAsset.printLogs = True
+      theAsset.initWithAssetRecords(records=[theMatch])
+      
+      if mdSet and not mdSet == theAsset.entityMetadataSet:
+        self.logger('Found asset: %s for value: \'%s\' with mdSet: %s, which '
+          'does not match mdSet: %s, excluding!' % (theAsset.entityPath(),
+                                    value,theAsset.entityMetadataSet,mdSet),
+                                    'detailed')
+        continue
+      
+      assets[value] = theAsset
+      
+    return assets
+  
+  def searchMatchType(self,value,resultValue):
+    '''Compares a searched value with a value returned by fcsvr_client search
+    and returns the type of match, used to rank search results.
+    
+    :param value: The searched value
+    :type value: str
+    :param resultValue: The value returned by fcsvr_client
+    :type resultValue: str
+    
+    :returns: (*str*) -- The match type (see :attr:`searchMatchScores`), or 
+      an empty string if the values do not match.
+    
+    '''
+    if not resultValue:
+      return ''
+    elif value == resultValue:
+      return 'exact'
+    elif value.strip() == resultValue.strip():
+      return 'exact_whitespace'
+    elif value.lower() == resultValue.lower():
+      return 'caseinsensitive'
+    elif value.lower().strip() == resultValue.lower().strip():
+      return 'caseinsensitive_whitespace'
+    elif value in resultValue:
+      return 'substring'
+    elif len(value) > len(resultValue):
+      if value[0:len(resultValue)].lower() == resultValue.lower():
+        return 'substring'
+      elif value.lower() in resultValue.lower():
+        return 'substring'
+    else:
+      if resultValue[0:len(value)].lower() == value.lower():
+        return 'substring'
+    return ''
+  
+  def cachedSearch(self,searchFunction,searchArgs,entityType,dbname,value,
+                                                    mdSet='',matchType='exact'):
+    '''Performs a search via the provided search function, utilizing our 
+    shared :class:`fcsxml.FCSSearchCache`. Searches which raise 
+    :class:`fcsxml.FCSEntityNotFoundError` are cached as negative entries.
+    
+    :param searchFunction: The search method, which must accept a useCache
+      keyword argument (i.e. :func:`fcsxml.FCSVRClient.assetWithTitle`)
+    :type searchFunction: function
+    :param searchArgs: Keyword arguments to pass to searchFunction
+    :type searchArgs: dict
+    :param entityType: The entity type searched for
+    :type entityType: str
+    :param dbname: The FCS DB field name searched
+    :type dbname: str
+    :param value: The value searched for
+    :type value: str
+    :param mdSet: The metadata set filter
+    :type mdSet: str
+    :param matchType: The search match type
+    :type matchType: str
+    
+    :raises: FCSEntityNotFoundError
+    :returns: (*fcsxml.FCSVRClient*) -- The resolved entity
+    
+    '''
+    
+    if type(value) == type(''):
+      value = value.decode('utf-8','replace')
+    cacheKey = (searchFunction.__name__,entityType,dbname,value,mdSet,matchType)
+    
+    isCached,result = self.searchCache.resultForKey(cacheKey)
+    if isCached and result is None:
+      self.logger('%s() Using cached search result, no %s found for value:'
+                      ' \'%s\'' % (searchFunction.__name__,entityType,value),
+                      'debug')
+      raise FCSEntityNotFoundError(entityType=entityType,entityTitle=value,
+                                                          entityMDSet=mdSet)
+    elif isCached:
+      self.logger('%s() Using cached search result: /%s/%s for value: \'%s\''
+                      % (searchFunction.__name__,result['entityType'],
+                      result['entityID'],value),'debug')
+      theEntity = FCSVRClient(configParser=self.configParser)
+      if self.debug:
+        theEntity.debug = True
+      if self.printLogs:
+        theEntity.printLogs = True
+      theEntity.entityType = result['entityType']
+      theEntity.entityID = result['entityID']
+      theEntity.entityMetadataSet = result['entityMetadataSet']
+      if result['entityTitle']:
+        theEntity.entityTitle = result['entityTitle']
+      return theEntity
+    
+    try:
+      theEntity = searchFunction(useCache=False,**searchArgs)
+    except FCSEntityNotFoundError:
+      self.searchCache.setResultForKey(cacheKey,None)
+      raise
+    
+    self.searchCache.setResultForKey(cacheKey,
+                          {'entityType':theEntity.entityType,
+                          'entityID':theEntity.entityID,
+                          'entityMetadataSet':theEntity.entityMetadataSet,
+                          'entityTitle':theEntity.entityTitle})
+    return theEntity
+  
+  def assetWithTitle(self,title,mdSet='',matchType='exact',useCache=True):
+    '''Returns a new FCSVRClient object matching the provided title. Results
+    are cached in our shared :class:`fcsxml.FCSSearchCache`.
     
     :param title: Provide the asset title to search for
     :type title: str
@@ -2645,6 +4838,8 @@ class FCSVRClient(FCSBaseObject):
     :param matchType: An optional parameter to specify the search behavior.
       Currently two matchType's are supported: 'exact' (default), and 'substring'
     :type matchType: str
+    :param useCache: Specify whether cached search results may be used
+    :type useCache: bool
     
     :returns: (*fcsxml.FCSVRClient*) -- Asset entity matching provided parameters.
     
@@ -2656,6 +4851,13 @@ class FCSVRClient(FCSBaseObject):
     
     title = title.replace('`',"'").replace('"',"'")
     
+    if useCache:
+      return self.cachedSearch(searchFunction=self.assetWithTitle,
+                      searchArgs={'title':title,'mdSet':mdSet,
+                                                      'matchType':matchType},
+                      entityType='asset',dbname='CUST_TITLE',value=title,
+                      mdSet=mdSet,matchType=matchType)
+    
     self.logger('Retrieving Asset for name:%s' % title,'debug')
     
     ## Run our fcsvr_client command.
@@ -2663,29 +4865,22 @@ class FCSVRClient(FCSBaseObject):
     fcsvrCMDTXT = ('"%s" search --crit  "%s" /asset --xml' 
                               % (self.pathToFCSVRClient,title))
     '''
-    #### Generate our search XML file
+    #### Generate our search criteria
     ## Create our title field
     myTitleField = FCSXMLField(name='Title',dbname='CUST_TITLE',value=title)
 
-    XMLSearchFilePath = self.generateSearchXML(fields=[myTitleField],
+    searchCriteria = self.searchCriteriaForFields(fields=[myTitleField],
                                                          matchType=matchType)
     
-    fcsvrCMDTXT = ('"%s" search /asset --xml --xmlcrit < "%s"' 
-                              % (self.pathToFCSVRClient,XMLSearchFilePath))
+    fcsvrCMDTXT = ('"%s" search /asset --xml --xmlcrit' 
+                                                    % self.pathToFCSVRClient)
                               
-    fcsvrCMD = subprocess.Popen(fcsvrCMDTXT,
-                                  shell=True,
-                                  stdout=subprocess.PIPE,
-                                  stderr=subprocess.PIPE,
-                                  universal_newlines=True)
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT,input=searchCriteria.xml)
                                   
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
       
-    self.logger('fcsvr_client command:\'%s\'' % fcsvrCMDTXT,'debug')
-
-    ## Delete our temp search file
-    if not self.keepFiles:
-      os.remove(XMLSearchFilePath)
+    self.logger('fcsvr_client command:\'%s\' criteria: %s' 
+                                      % (fcsvrCMDTXT,searchCriteria),'debug')
 
     if not fcsvrCMD.returncode == 0:
       return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
@@ -2871,9 +5066,10 @@ class FCSVRClient(FCSBaseObject):
     return theAsset
 
   
-  def productionWithTitle(self,title,mdSet="",matchType='exact'):
+  def productionWithTitle(self,title,mdSet="",matchType='exact',useCache=True):
     '''Returns a new FCSVRClient production/project object matching the 
-    provided production title. 
+    provided production title. Results are cached in our shared 
+    :class:`fcsxml.FCSSearchCache`.
     
     :param title: Provide the production title to search for
     :type title: str
@@ -2884,6 +5080,8 @@ class FCSVRClient(FCSBaseObject):
     :param matchType: An optional parameter to specify the search behavior.
       Currently two matchType's are supported: 'exact' (default), and 'substring'
     :type matchType: str
+    :param useCache: Specify whether cached search results may be used
+    :type useCache: bool
     
     :returns: (*fcsxml.FCSVRClient*) -- Asset entity matching provided parameters.
     
@@ -2898,29 +5096,34 @@ class FCSVRClient(FCSBaseObject):
       msg = 'Could not load production, an empty title was provided!'
       self.logger(msg,'error')
       raise FCSProductionLoadError(msg)
+    
+    if useCache:
+      return self.cachedSearch(searchFunction=self.productionWithTitle,
+                      searchArgs={'title':title,'mdSet':mdSet,
+                                                      'matchType':matchType},
+                      entityType='project',dbname='CUST_TITLE',value=title,
+                      mdSet=mdSet,matchType=matchType)
       
     self.logger("Retrieving Production for name:%s" % title,'debug')
     
     ## Run our fcsvr_client command.
     ##fcsvrCMDTXT = '"%s" search --crit  "%s" /project --xml' % (self.pathToFCSVRClient,title)
     
-    #### Generate our search XML file
+    #### Generate our search criteria
     ## Create our title field
     myTitleField = FCSXMLField(name='Title',dbname='CUST_TITLE',value=title)
 
-    XMLSearchFilePath = self.generateSearchXML(fields=[myTitleField],
+    searchCriteria = self.searchCriteriaForFields(fields=[myTitleField],
                                                             matchType=matchType)
     
-    fcsvrCMDTXT = ('"%s" search /project --xml --xmlcrit < "%s"' 
-                              % (self.pathToFCSVRClient,XMLSearchFilePath))
+    fcsvrCMDTXT = ('"%s" search /project --xml --xmlcrit' 
+                                                    % self.pathToFCSVRClient)
     
-    fcsvrCMD = subprocess.Popen(fcsvrCMDTXT,shell=True,stdout=subprocess.PIPE,
-                                  stderr=subprocess.PIPE,
-                                  universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT,input=searchCriteria.xml)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
       
     self.logger('fcsvr_client command: fcsvr_client  search /project --xml'
-      ' --xmlcrit < "%s"' % XMLSearchFilePath,'debug')
+      ' --xmlcrit criteria: %s' % searchCriteria,'debug')
 
     if not fcsvrCMD.returncode == 0:
       return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
@@ -2931,13 +5134,9 @@ class FCSVRClient(FCSBaseObject):
       myDom = minidom.parseString(fcsvrCMD_STDOUT)
     except:
       self.logger('Could not parse output from fcsvr_client command: '
-        'fcsvr_client  search /project --xml --xmlcrit < "%s"' % XMLSearchFilePath,
-        'error')
+        'fcsvr_client  search /project --xml --xmlcrit criteria: %s' 
+        % searchCriteria,'error')
       raise RuntimeError("fcsvr_client returned unexpected results!")
-
-    ## remove our file from disk
-    if not self.keepFiles:
-      os.remove(XMLSearchFilePath)
       
     didComplete = False
     #try:
@@ -3007,7 +5206,7 @@ class FCSVRClient(FCSBaseObject):
       theMatch = matches[0]
     elif not matches:
       self.logger("Found no productions matching search string: '%s'" % title,'error')
-      raise RuntimeError("No production found for title: '%s'" % title)
+      raise FCSEntityNotFoundError(entityType='project',entityTitle=title)
     elif matches > 1:
 
       self.logger("Found %s productions matching search string: '%s'" % (len(matches),title),"detailed")
@@ -3065,7 +5264,7 @@ class FCSVRClient(FCSBaseObject):
       theProduction.entityID = theMatch["PROJECT_NUMBER"]
       theProduction.entityMetadataSet = theMatch["PROJECT_TYPE"]
     else:
-      raise RuntimeError("No production found for title: '%s'" % title)
+      raise FCSEntityNotFoundError(entityType='project',entityTitle=title)
     
     
     return theProduction
@@ -3174,8 +5373,8 @@ class FCSVRClient(FCSBaseObject):
     self.logger('fcsvrCMD:\n  %s' % fcsvrCMDTXT,'debug')
     
     ## run fcsvr_client
-    fcsvrCMD = subprocess.Popen('%s' % fcsvrCMDTXT ,shell=True,stdout=subprocess.PIPE,stderr=subprocess.PIPE,universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
 
     self.logger("fcsvr_client output: %s" % fcsvrCMD_STDOUT,'debug')
 
@@ -3196,6 +5395,9 @@ class FCSVRClient(FCSBaseObject):
     obj.entityID = projectID
     obj.entityType = "project"
     obj.entityMetadataSet = mdSet
+    
+    ## Invalidate any cached searches which may match our new production
+    self.searchCache.invalidate('project',title)
   
     if setMD:
       obj.setMD()
@@ -3328,6 +5530,11 @@ class FCSVRClient(FCSBaseObject):
     ## At this point we have a legitimate child and parent, proceed to remove
     ## child from parent.
     
+    ## Discard any cached links for our parent and child, we need current
+    ## membership information.
+    self.linkCache.invalidateAddress(parentEntityPath)
+    self.linkCache.invalidateAddress(childEntityPath)
+    
     ## Get current production members
     try:
       currentMembers = parentObject.productionMemberAddresses()
@@ -3360,6 +5567,7 @@ class FCSVRClient(FCSBaseObject):
     ## Delete the temp production, the asset is now no longer a member of 
     ## ANY productions.
     tempProd.delete()
+    self.linkCache.invalidateAddress(tempProd.entityPath())
     
     ## Iterate through each pre-exsisting production link, and
     ## re-establish membership (provided it is not the provided parent 
@@ -3382,6 +5590,8 @@ class FCSVRClient(FCSBaseObject):
                                     moveLink=False)
 
     ## Flush our caches
+    self.linkCache.invalidateAddress(parentEntityPath)
+    self.linkCache.invalidateAddress(childEntityPath)
     self.flushCaches()
     return True  
       
@@ -3485,6 +5695,8 @@ class FCSVRClient(FCSBaseObject):
     else:
       moveLink = False
     '''
+    ## Create our link, fcsvr_client_make_link() will invalidate any cached
+    ## links for the production and member.
     return self.fcsvr_client_make_link(1,parentPath=theProductionPath,childPath=theMemberPath,moveLink=moveLink)
 
   
@@ -3599,14 +5811,10 @@ class FCSVRClient(FCSBaseObject):
                         recurse=recurse)
     assets = []
     
-    ## Iterate through each returned asset address and instantiate.
-    for assetAddress in assetAddresses:
-      regexMatch = re.match('/(.*)/(.*)',assetAddress)
-      memberType = regexMatch.group(1)
-      memberID = regexMatch.group(2)
-      myAsset = FCSVRClient(id=memberID,configParser=self.configParser)
-      myAsset.initWithAssetID(memberID)
-      
+    ## Load all of our assets via bulk search, results are returned in the
+    ## same order as our addresses.
+    assetIDs = [assetAddress.split('/')[-1] for assetAddress in assetAddresses]
+    for myAsset in self.assetsWithIDs(assetIDs):
       ## If no mdSet parameter was passed, otherwise ensure that our 
       ## mdSet matches.
       if not mdSet:
@@ -3623,7 +5831,8 @@ class FCSVRClient(FCSBaseObject):
   
   def productionAssetAddresses(self,productionID="",
                                       productionTitle="",
-                                      recurse=False):
+                                      recurse=False,
+                                      generator=False):
                                       
     '''Function which returns asset addresses '/asset/12' from a production.
     If recurse is set to true, we will recurse through any nested productions 
@@ -3635,6 +5844,10 @@ class FCSVRClient(FCSBaseObject):
     :type productionTitle: str
     :param recurse: Specify whether we will recurse through sub-productions
     :type recurse: bool
+    :param generator: If true, we will return a generator which yields asset
+      addresses as they are discovered (see 
+      :func:`fcsxml.FCSVRClient.productionMemberAddresses`)
+    :type generator: bool
    
     
     :raises: FCSValidationError, FCSProductionLoadError
@@ -3662,32 +5875,22 @@ class FCSVRClient(FCSBaseObject):
     
     memberAddresses = self.productionMemberAddresses(productionID=productionID,
                                                 productionTitle=productionTitle,
-                                                recurse=recurse)
-    
-    assetAddresses = []
-    productionAddresses = []
-    processedProductionAddresses = ["/project/%s" % productionID]
-    
-    for memberAddress in memberAddresses:
-      self.logger('productionAssetAddresses() processing member address: %s'
-        % memberAddress,'debug')
-      regexMatch = re.match('/(.*)/(.*)',memberAddress)
-      memberType = regexMatch.group(1)
-      memberID = regexMatch.group(2)
-      if memberType == "asset":
-        if memberAddress not in assetAddresses:
-          assetAddresses.append(memberAddress)
-      
-      ''' Old code, this is now handled by productionMemberAddresses
-      elif (memberType == "project" and recurse
-      and memberAddress not in processedProductionAddresses):
-        memberAddresses.extend(self.productionMemberAddresses(productionID=memberID))
-      '''
-      
+                                                recurse=recurse,
+                                                generator=generator)
+    
+    if generator:
+      return (memberAddress for memberAddress in memberAddresses 
+                                        if memberAddress.startswith('/asset/'))
+    
+    ## productionMemberAddresses returns unique addresses
+    assetAddresses = [memberAddress for memberAddress in memberAddresses
+                                        if memberAddress.startswith('/asset/')]
+    
     return assetAddresses
   
   def productionMemberAddresses(self,productionID="",productionTitle="",
-                                    recurse=False,_processedMemberAddresses=None):
+                                    recurse=False,_processedMemberAddresses=None,
+                                    generator=False):
     '''Function which returns all entity addresses ['/asset/12','/project/10']
     from a production. If recurse is set to true, we will recurse through any 
     nested productions and collate their memberships. The 
@@ -3703,6 +5906,11 @@ class FCSVRClient(FCSBaseObject):
     :param _processedMemberAddresses: Specify a list of previously processed 
       production addresses (used internally to prevent infinite recursion)
     :type _processedMemberAddresses: list
+    :param generator: If true, we will return a generator which yields unique
+      member addresses as each production is loaded, allowing callers to 
+      begin processing members before all nested productions are resolved. 
+      When recursing, addresses are yielded breadth first.
+    :type generator: bool
     
     :raises: FCSValidationError, FCSProductionLoadError, FCSEntityNotFoundError
     
@@ -3730,67 +5938,186 @@ class FCSVRClient(FCSBaseObject):
       raise FCSEntityNotFoundError(entityType='project',
                                                   entityTitle=productionTitle)
     
+    ## If no member addresses were provided, create an empty list
+    if _processedMemberAddresses == None:
+      _processedMemberAddresses = []
+    
+    if generator:
+      return self.iterProductionMemberAddresses(productionID=productionID,
+                          recurse=recurse,
+                          processedAddresses=_processedMemberAddresses)
+    
+    if not recurse:
+      assetAddresses,projectAddresses = self.productionLinkAddresses(
+                                                                productionID)
+      memberAddresses = FCSAddressSet(assetAddresses)
+      memberAddresses.extend(projectAddresses)
+    else:
+      ## Fetch the links for all nested productions, fanning out across our 
+      ## command pool one level of nesting at a time.
+      productionLinks = dict(self.iterProductionLinks(productionID=productionID,
+                                  processedAddresses=_processedMemberAddresses))
+      
+      ## Collate our results, depth first, from our loaded links
+      processedAddresses = FCSAddressSet(_processedMemberAddresses)
+      memberAddresses = self.collateProductionMemberAddresses(
+                          productionID='%s' % productionID,
+                          productionLinks=productionLinks,
+                          processedAddresses=processedAddresses)
+      _processedMemberAddresses[:] = list(processedAddresses)
+      
+    if len(memberAddresses) == 0:
+      self.logger("No member addresses were found for production with id:'%s'" 
+        % productionID,'detailed')
+      
+    return list(memberAddresses)
+  
+  def iterProductionMemberAddresses(self,productionID,recurse=False,
+                                                      processedAddresses=None):
+    '''Generator which yields unique member addresses for the provided 
+    production as each production's links are loaded. If recurse is true, 
+    nested productions are loaded breadth first, one level of nesting at a 
+    time across our command pool.
+    
+    :param productionID: Specify the production ID to query
+    :type productionID: int
+    :param recurse: Specify whether we will recurse through sub-productions
+    :type recurse: bool
+    :param processedAddresses: Specify a list of previously processed 
+      production addresses which will not be loaded.
+    :type processedAddresses: list
+    
+    :returns: (*generator*) -- Yields member addresses
+    
+    '''
+    
+    if not recurse:
+      productionLinks = [('%s' % productionID,
+                                  self.productionLinkAddresses(productionID))]
+    else:
+      productionLinks = self.iterProductionLinks(productionID=productionID,
+                                          processedAddresses=processedAddresses)
+    
+    seenAddresses = set()
+    for memberProductionID,(assetAddresses,projectAddresses) in productionLinks:
+      for memberAddress in assetAddresses + projectAddresses:
+        if not memberAddress in seenAddresses:
+          seenAddresses.add(memberAddress)
+          yield memberAddress
+  
+  def iterProductionLinks(self,productionID,processedAddresses=None):
+    '''Generator which loads the links for the provided production and all 
+    of it's nested productions, breadth first, fanning out each level of 
+    nesting across our command pool. Each production is loaded only once.
+    
+    :param productionID: Specify the production ID to query
+    :type productionID: int
+    :param processedAddresses: Specify a list of previously processed 
+      production addresses which will not be loaded.
+    :type processedAddresses: list
+    
+    :returns: (*generator*) -- Yields (productionID,(assetAddresses,
+      projectAddresses)) tuples, see 
+      :func:`fcsxml.FCSVRClient.productionLinkAddresses`
+    
+    '''
+    
+    visitedAddresses = set(processedAddresses or [])
+    visitedAddresses.add('/project/%s' % productionID)
+    pendingProductionIDs = ['%s' % productionID]
+    while pendingProductionIDs:
+      self.logger('iterProductionLinks() loading links for %s productions' 
+                                            % len(pendingProductionIDs),'debug')
+      results = self.commandPool.map(self.productionLinkAddresses,
+                                                      pendingProductionIDs)
+      nextProductionIDs = []
+      for memberProductionID,links in zip(pendingProductionIDs,results):
+        for projectAddress in links[1]:
+          if projectAddress in visitedAddresses:
+            continue
+          visitedAddresses.add(projectAddress)
+          regexMatch = re.match('/(.*)/(.*)',projectAddress)
+          if not regexMatch.group(1) == 'project':
+            self.logger('Found unknown project type: \'%s\' when processing '
+              'member: \'%s\' from production: \'/project/%s\''
+              % (regexMatch.group(1),projectAddress,memberProductionID),
+              'warning')
+            continue
+          nextProductionIDs.append(regexMatch.group(2))
+        yield (memberProductionID,links)
+      pendingProductionIDs = nextProductionIDs
+  
+  def productionLinkAddresses(self,productionID):
+    '''Returns the member asset and member production addresses for the
+    provided production, utilizing a single fcsvr_client list_parent_links 
+    call.
+    
+    :param productionID: Specify the production ID to query
+    :type productionID: int
+    
+    :returns: (*tuple*) -- A tuple of lists: (assetAddresses,projectAddresses)
+    
+    '''
+    linkRecords = self.getParentLinks(id=productionID,type='project')
+    
     ## Get our asset members.
-    assetAddresses = self.getValueForLinkType(value="ADDRESS",
-                                      linkType=1,id=productionID,type="project")
+    assetAddresses = self.getValueForLinkType(value="ADDRESS",linkType=1,
+                          id=productionID,type="project",xmlDOM=linkRecords)
     
     ## Get our production members.
     try:
-      projectAddresses = self.getValueForLinkType(value="ADDRESS",
-                                     linkType=16,id=productionID,type="project")
+      projectAddresses = self.getValueForLinkType(value="ADDRESS",linkType=16,
+                          id=productionID,type="project",xmlDOM=linkRecords)
     except:
       projectAddresses = []
     
-    ## Create our resultant memberAddresses list
-    memberAddresses = []
+    return (assetAddresses,projectAddresses)
+  
+  def collateProductionMemberAddresses(self,productionID,productionLinks,
+                                                      processedAddresses):
+    '''Returns all member addresses for the provided production and it's
+    nested productions, based upon previously loaded links. Results are 
+    ordered depth first: a production's own members, followed by the members
+    of each of it's nested productions.
+    
+    :param productionID: Specify the production ID to collate
+    :type productionID: str
+    :param productionLinks: Dictionary of (assetAddresses,projectAddresses)
+      tuples keyed by production ID, as returned by 
+      :func:`fcsxml.FCSVRClient.productionLinkAddresses`
+    :type productionLinks: dict
+    :param processedAddresses: Previously processed addresses, this set will
+      be updated with processed addresses.
+    :type processedAddresses: fcsxml.FCSAddressSet
+    
+    :returns: (*fcsxml.FCSAddressSet*) -- An ordered set of member addresses
+    
+    '''
     
-    ## Append our found assets.
-    memberAddresses.extend(assetAddresses)
+    assetAddresses,projectAddresses = productionLinks[productionID]
+    memberAddresses = FCSAddressSet(assetAddresses)
     memberAddresses.extend(projectAddresses)
     
-    ## If no member addresses were provided, create an empty list
-    if _processedMemberAddresses == None:
-      _processedMemberAddresses = []
-
-    ## If we are set to recurse, do so.
-    if recurse:
-      _processedMemberAddresses.append('/project/%s' % productionID)
-      for projectAddress in projectAddresses:
-        if not projectAddress in _processedMemberAddresses:
-          regexMatch = re.match('/(.*)/(.*)',projectAddress)
-          memberProductionType = regexMatch.group(1)
-          memberProductionID = regexMatch.group(2)
-          if not memberProductionType == 'project':
-            self.logger('Found unknown project type: \'%s\' when processing '
-              'member: \'%s\' from production: \'/project/%s\''
-              % (memberProductionType,projectAddress,productionID),'warning')
-            continue
-          self.logger('productionMemberAddresses() recursing through '
-            'production: %s' % projectAddress,'debug')
-            
-          ## Query the sub production, pass our processed addresses so they
-          ## aren't processed again.
-          self.logOffset += 1
-          resultAddresses = self.productionMemberAddresses(
-                          productionID=memberProductionID,
-                          recurse=True,
-                          _processedMemberAddresses=_processedMemberAddresses)
-          self.logOffset -= 1
-                                          
-          ## Iterate through result addresses, append any new entries.
-          for resultAddress in resultAddresses:
-            if not resultAddress in memberAddresses:
-              memberAddresses.append(resultAddress)
-            if not resultAddress in _processedMemberAddresses:
-              _processedMemberAddresses.extend(resultAddresses)
-     
+    processedAddresses.add('/project/%s' % productionID)
+    for projectAddress in projectAddresses:
+      if projectAddress in processedAddresses:
+        continue
+      regexMatch = re.match('/(.*)/(.*)',projectAddress)
+      memberProductionID = regexMatch.group(2)
+      if (not regexMatch.group(1) == 'project' 
+        or not memberProductionID in productionLinks):
+        continue
       
-    if len(memberAddresses) == 0:
-      self.logger("No member addresses were found for production with id:'%s'" 
-        % productionID,'detailed')
+      resultAddresses = self.collateProductionMemberAddresses(
+                                      productionID=memberProductionID,
+                                      productionLinks=productionLinks,
+                                      processedAddresses=processedAddresses)
       
-    return memberAddresses
+      ## Append any new entries.
+      memberAddresses.extend(resultAddresses)
+      processedAddresses.extend(resultAddresses)
     
+    return memberAddresses
   
   def assetsFromProject(self,projectID="",mdSet=''):
     '''Function which returns a list of associated :class:`FCSVRClient` asset 
@@ -3811,13 +6138,9 @@ class FCSVRClient(FCSBaseObject):
     assetAddresses = self.projectElementAddresses(id=projectID,addressType='asset')
     assets = []
     
-    for assetAddress in assetAddresses:
-      regexMatch = re.match('/(.*)/(.*)',assetAddress)
-      memberType = regexMatch.group(1)
-      memberID = regexMatch.group(2)
-      
-      myAsset = FCSVRClient(id=memberID,configParser=self.configParser)
-      
+    ## Load all of our assets via bulk search.
+    assetIDs = [assetAddress.split('/')[-1] for assetAddress in assetAddresses]
+    for myAsset in self.assetsWithIDs(assetIDs):
       ## If no mdSet parameter was passed add our asset to the list, 
       ## otherwise ensure that our mdSet matches.
       if not mdSet:
@@ -3829,7 +6152,7 @@ class FCSVRClient(FCSBaseObject):
         ' mdSet: %s, excluding!' 
         % (myAsset.entityPath(),myAsset.entityMetadataSet,mdSet),'debug')
       
-      return assets
+    return assets
   
   def projectElementAddresses(self,id='',addressType='asset'):
     '''Function which returns a list of element addresses associated to an FCP
@@ -3945,7 +6268,7 @@ class FCSVRClient(FCSBaseObject):
     
     ## Get our parent production
     ## Fetch our XML DOM for our child links.
-    childLinkDOM = self.getChildLinksXML(id=id,type=entityType)
+    childLinkDOM = self.getChildLinks(id=id,type=entityType)
     if entityType == 'project':
       linkType = 16
     else:
@@ -3962,14 +6285,16 @@ class FCSVRClient(FCSBaseObject):
       
     return parentAddresses
   
-  def archive(self,deviceID='',deviceDict='',recurseProductions=False):
+  def archive(self,deviceID='',deviceDict='',recurseProductions=False,
+                                                          maxConcurrent=None):
     '''This method archives the loaded entity. If this is a production, then we 
     will archive all assets which are members of the production. If 
     recurseProductions is true, then we will archive it's members as well. 
     Either deviceID or a deviceDict must be provided to specify the destination
     archive device.
     
-    
+    Production members are archived concurrently, see 
+    :func:`fcsxml.FCSVRClient.performActionOnEntities`.
     
     :param deviceID: Specify the device ID to archive to.
     :type deviceID: int
@@ -3978,9 +6303,13 @@ class FCSVRClient(FCSBaseObject):
     :param recurseProductions: Specify whether to recurse productions for 
       archiving (assuming the calling entity is a production).
     :type recurseProductions: bool
+    :param maxConcurrent: Specify the maximum number of production members
+      to archive at once.
+    :type maxConcurrent: int
     
-    :raises: FCSAssetOfflineError, FCSError, 
-    
+    :raises: FCSAssetOfflineError, FCSError, FCSEntityActionError
+    :returns: (*list*) -- For productions, a list of 
+      :class:`fcsxml.FCSEntityActionResult` objects.
     
     '''
     
@@ -3999,18 +6328,12 @@ class FCSVRClient(FCSBaseObject):
     elif deviceDict:
       deviceID = deviceDict['DEVICE_ID']
     
-    ## If this is a production, restore all members of the production.
+    ## If this is a production, archive all members of the production.
     if self.entityType == 'project':
-      if recurseProductions:
-        members = self.productionMemberAddresses()
-      else:
-        members = self.productionAssetAddresses()
-      
-      ## Iterate through our members and restore them
-      for member in members:
-        memberObj = FCSVRClient(entityPath=member,
-                                    configParser=self.configParser)
-        memberObj.archive(recurseProductions=recurseProductions)        
+      return self.performActionOnProductionMembers(action='archive',
+                                  actionArgs={'deviceID':deviceID},
+                                  recurseProductions=recurseProductions,
+                                  maxConcurrent=maxConcurrent)
       
     ## If this is an asset, simply archive it.
     elif self.entityType == 'asset':
@@ -4040,8 +6363,8 @@ class FCSVRClient(FCSBaseObject):
                                                       
       self.logger('fcsvrCMD:\n  %s' % fcsvrCMDString,'debug')
 
-      fcsvrCMD = subprocess.Popen(fcsvrCMDString,shell=True,stdout=subprocess.PIPE,stderr=subprocess.PIPE,universal_newlines=True)
-      fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+      fcsvrCMD = self.fcsvr_client_run(fcsvrCMDString)
+      fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
 
       self.logger("fcsvr_client output: %s %s" % (fcsvrCMD_STDOUT,fcsvrCMD_STDERR),'debug')
 
@@ -4057,30 +6380,32 @@ class FCSVRClient(FCSBaseObject):
           self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
                                             cmdString=fcsvrCMDString)
      
-  def restore(self,recurseProductions=False):
+  def restore(self,recurseProductions=False,maxConcurrent=None):
     '''Restores the loaded entity. If this is a production, then we will
     restore all assets which are members of the production. If recurseProductions
-    is true, then we will restore it's members as well. 
+    is true, then we will restore it's members as well. Production members
+    are restored concurrently, see 
+    :func:`fcsxml.FCSVRClient.performActionOnEntities`.
     
     :param recurseProductions: Specify whether we recursively restore assets
       for the provided production.
     :type recurseProductions: bool
+    :param maxConcurrent: Specify the maximum number of production members
+      to restore at once.
+    :type maxConcurrent: int
         
-    :raises: FCSError, FCSVRClientPermissionDenied, FCSVRClientFileError
+    :raises: FCSError, FCSVRClientPermissionDenied, FCSVRClientFileError,
+      FCSEntityActionError
+    :returns: (*list*) -- For productions, a list of 
+      :class:`fcsxml.FCSEntityActionResult` objects.
     
     '''
     
     ## If this is a production, restore all members of the production.
     if self.entityType == 'project':
-      if recurseProductions:
-        members = self.productionMemberAddresses()
-      else:
-        members = self.productionAssetAddresses()
-      
-      ## Iterate through our members and restore them
-      for member in members:
-        memberObj = FCSVRClient(entityPath=member,configParser=self.configParser)
-        memberObj.restore(recurseProductions=recurseProductions)        
+      return self.performActionOnProductionMembers(action='restore',
+                                  recurseProductions=recurseProductions,
+                                  maxConcurrent=maxConcurrent)
       
     ## If this is an asset, simply restore it.
     elif self.entityType == 'asset':
@@ -4111,8 +6436,8 @@ class FCSVRClient(FCSBaseObject):
                                                       
       self.logger('fcsvrCMD:\n  %s' % fcsvrCMDString,'debug')
 
-      fcsvrCMD = subprocess.Popen(fcsvrCMDString,shell=True,stdout=subprocess.PIPE,stderr=subprocess.PIPE,universal_newlines=True)
-      fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+      fcsvrCMD = self.fcsvr_client_run(fcsvrCMDString)
+      fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
 
       self.logger("fcsvr_client output: %s %s" % (fcsvrCMD_STDOUT,fcsvrCMD_STDERR),'debug')
 
@@ -4128,8 +6453,11 @@ class FCSVRClient(FCSBaseObject):
           return False
       return True
     
-  def analyze(self,force=False,FCP=False,recurseProductions=False):
-    '''This method will force FCS to analyze the loaded entity.
+  def analyze(self,force=False,FCP=False,recurseProductions=False,
+                                                          maxConcurrent=None):
+    '''This method will force FCS to analyze the loaded entity. If this is a
+    production, members are analyzed concurrently, see 
+    :func:`fcsxml.FCSVRClient.performActionOnEntities`.
     
     :param force: Specify whether we call fcsvr_client with the --force option
     :type force: bool
@@ -4138,23 +6466,22 @@ class FCSVRClient(FCSBaseObject):
     :param recurseProductions: Specify whether we recurse production membership
       when analyzing assets.
     :type recurseProductions: bool
+    :param maxConcurrent: Specify the maximum number of production members
+      to analyze at once.
+    :type maxConcurrent: int
     
-    
+    :raises: FCSError, FCSEntityActionError
+    :returns: (*list*) -- For productions, a list of 
+      :class:`fcsxml.FCSEntityActionResult` objects.
     
     '''
     
     ## If this is a production, analyze all members of the production.
     if self.entityType == 'project':
-      if recurseProductions:
-        members = self.productionMemberAddresses()
-      else:
-        members = self.productionAssetAddresses()
-      
-      ## Iterate through our members and analyze them
-      for member in members:
-        memberObj = FCSVRClient(entityPath=member,
-                                      configParser=self.configParser)
-        memberObj.analyze(force=force,FCP=FCP)        
+      return self.performActionOnProductionMembers(action='analyze',
+                                  actionArgs={'force':force,'FCP':FCP},
+                                  recurseProductions=recurseProductions,
+                                  maxConcurrent=maxConcurrent)
       
     ## If this is an asset, simply restore it.
     elif self.entityType == 'asset':
@@ -4179,8 +6506,8 @@ class FCSVRClient(FCSBaseObject):
                                                       
       self.logger('fcsvrCMD:\n  %s' % fcsvrCMDString,'debug')
 
-      fcsvrCMD = subprocess.Popen(fcsvrCMDString,shell=True,stdout=subprocess.PIPE,stderr=subprocess.PIPE,universal_newlines=True)
-      fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+      fcsvrCMD = self.fcsvr_client_run(fcsvrCMDString)
+      fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
 
       self.logger("fcsvr_client output: %s %s" % (fcsvrCMD_STDOUT,fcsvrCMD_STDERR),'debug')
 
@@ -4188,6 +6515,93 @@ class FCSVRClient(FCSBaseObject):
         self.logger("FCSVRClient Error: %s %s" % (fcsvrCMD_STDOUT,fcsvrCMD_STDERR),'error')
         self.fcsvr_client_error(fcsvrCMD_STDOUT)    
                   
+  def performActionOnEntities(self,entities,action,actionArgs=None,
+                                                        maxConcurrent=None):
+    '''Performs the provided action (i.e. 'archive', 'restore', 'analyze') on 
+    each of the provided entities concurrently via our shared command pool.
+    Failures do not abort remaining entities, they are recorded in each
+    entity's result.
+    
+    :param entities: Specify a list of :class:`FCSVRClient` objects or entity
+      addresses (i.e. '/asset/10'). Loaded objects are used as is, objects
+      created for addresses are not initialized from fcsvr_client.
+    :type entities: list
+    :param action: Specify the name of the FCSVRClient method to call
+    :type action: str
+    :param actionArgs: Specify keyword arguments to pass to the action
+    :type actionArgs: dict
+    :param maxConcurrent: Specify the maximum number of entities to process
+      at once, defaults to :attr:`maxConcurrentEntityActions` (the number of 
+      concurrent fcsvr_client processes remains limited by our command pool)
+    :type maxConcurrent: int
+    
+    :returns: (*list*) -- A list of :class:`fcsxml.FCSEntityActionResult` 
+      objects, in the order of the provided entities.
+    
+    '''
+    
+    if actionArgs is None:
+      actionArgs = {}
+    if not maxConcurrent:
+      maxConcurrent = self.maxConcurrentEntityActions
+    
+    def performAction(entity):
+      if isinstance(entity,FCSVRClient):
+        entityObj = entity
+      else:
+        ## Our actions only require an address, so don't init the entity
+        ## (which would call fcsvr_client getmd).
+        entityType,entityID = entity.split('/')[1:3]
+        entityObj = FCSVRClient(configParser=self.configParser)
+        entityObj.entityType = entityType
+        entityObj.entityID = entityID
+      actionResult = FCSEntityActionResult(entityPath=entityObj.entityPath(),
+                                                                action=action)
+      try:
+        actionResult.result = getattr(entityObj,action)(**actionArgs)
+      except Exception, inst:
+        self.logger('performActionOnEntities() Failed to %s %s: %s' 
+                          % (action,actionResult.entityPath,inst),'error')
+        actionResult.error = inst
+      return actionResult
+    
+    self.logger('performActionOnEntities() Performing action:%s on %s entities'
+                                            % (action,len(entities)),'debug')
+    
+    return self.commandPool.map(performAction,entities,
+                                                  maxWorkers=maxConcurrent)
+  
+  def performActionOnProductionMembers(self,action,actionArgs=None,
+                              recurseProductions=False,maxConcurrent=None):
+    '''Performs the provided action on each asset member of our loaded
+    production via :func:`fcsxml.FCSVRClient.performActionOnEntities`. If
+    recurseProductions is true, assets of nested productions are included.
+    
+    :param action: Specify the name of the FCSVRClient method to call
+    :type action: str
+    :param actionArgs: Specify keyword arguments to pass to the action
+    :type actionArgs: dict
+    :param recurseProductions: Specify whether to include nested productions
+    :type recurseProductions: bool
+    :param maxConcurrent: Specify the maximum number of members to process
+      at once
+    :type maxConcurrent: int
+    
+    :raises: FCSEntityActionError if the action failed for any member
+    :returns: (*list*) -- A list of :class:`fcsxml.FCSEntityActionResult` 
+      objects
+    
+    '''
+    members = self.productionAssetAddresses(recurse=recurseProductions)
+    results = self.performActionOnEntities(entities=members,action=action,
+                          actionArgs=actionArgs,maxConcurrent=maxConcurrent)
+    
+    failedResults = [result for result in results if not result.success()]
+    if failedResults:
+      raise FCSEntityActionError(action=action,results=results)
+    
+    return results
+  
   def delete(self):
     '''Deletes the loaded entity.
     
@@ -4222,14 +6636,17 @@ class FCSVRClient(FCSBaseObject):
                                                       
     self.logger('fcsvrCMD:\n  %s' % fcsvrCMDString,'debug')
 
-    fcsvrCMD = subprocess.Popen('%s' % fcsvrCMDString,shell=True,stdout=subprocess.PIPE,stderr=subprocess.PIPE,universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDString)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
 
     self.logger("fcsvr_client output: %s %s" % (fcsvrCMD_STDOUT,fcsvrCMD_STDERR),'debug')
 
     if not fcsvrCMD.returncode == 0:
       self.logger("FCSVRClient Error: %s %s" % (fcsvrCMD_STDOUT,fcsvrCMD_STDERR),'error')
-      return fcsvr_client_error(fcsvrCMD_STDOUT)
+      return self.fcsvr_client_error(fcsvrCMD_STDOUT)
+    
+    ## Remove any cached searches which resolve to our deleted entity
+    self.searchCache.invalidateAddress(self.entityPath())
     
   def createAssetFromFSPath(self,path,deviceName="",deviceID="",mdSet="",
                                                 relPath="",
@@ -4387,6 +6804,8 @@ class FCSVRClient(FCSBaseObject):
                                       backgroundAnalyze=backgroundAnalyze,
                                       setMD=setMD):
       self.logger("Successfully Created Asset /asset/%s" % self.entityID)
+      ## Invalidate any cached searches which may match our new asset
+      self.searchCache.invalidate('asset',os.path.basename(targetPath))
       return True
     else:
       return False
@@ -4655,20 +7074,178 @@ class FCSVRClient(FCSBaseObject):
     ## Get our old thumbnail path:
     thumbnailPath = self.getFilePathForPosterFrame(id=assetID)
     
-    ## Copy our thumbnail over the existing thumbnail
+    ## Copy our thumbnail over the existing thumbnail
+    try:
+      shutil.copy(newThumbnailPath,thumbnailPath)
+      os.chown(thumbnailPath,self.FCSUID,-1)
+    except:
+      self.logger("Error copying new thumbnail from: %s to %s" % (newThumbnailPath,thumbnailPath),'error')
+      return False
+    
+    return True
+  
+  def searchCriteriaForValues(self,dbname,values,valueType='string',
+                                                          matchType='exact'):
+    '''Returns compiled search criteria for use by fcsvr_client search 
+    --xmlcrit which will match entities whose field (dbname) matches any of
+    the provided values.
+    
+    :param dbname: Provide the FCS DB field name to search (i.e. 'ASSET_NUMBER')
+    :type dbname: str
+    :param values: Provide a list of values to match
+    :type values: list
+    :param valueType: Provide the FCS XML value type (i.e. 'int', 'string')
+    :type valueType: str
+    :param matchType: An optional parameter to specify the search behavior.
+      Currently two matchType's are supported: 'exact' (default), and 'substring'
+    :type matchType: str
+    
+    :returns: (*fcsxml.FCSSearchCriteria*) -- The compiled search criteria
+    
+    '''
+    
+    ## <session>
+    ##   <values>
+    ##     <value id="CRIT_TYPE"><int>2</int></value>
+    ##     <value id="CRIT_UNION">
+    ##       <valuesList>
+    ##         <values>
+    ##           <value id="CRIT_CMP_VALUE">
+    ##             <value id="ASSET_NUMBER"><int>12</int></value>
+    ##           </value>
+    ##           <value id="CRIT_CMP_OP"><atom>eq</atom></value>
+    ##           <value id="CRIT_TYPE"><int>1</int></value>
+    ##         </values>
+    ##         ...
+    
+    if matchType == 'exact':
+      cmpOp = 'eq'
+    else:
+      cmpOp = 'contains'
+    
+    sessionElement = ElementTree.Element('session')
+    valuesElement = ElementTree.SubElement(sessionElement,'values')
+    critTypeElement = ElementTree.SubElement(valuesElement,'value',id='CRIT_TYPE')
+    ElementTree.SubElement(critTypeElement,'int').text = '2'
+    critUnionElement = ElementTree.SubElement(valuesElement,'value',
+                                                              id='CRIT_UNION')
+    valuesListElement = ElementTree.SubElement(critUnionElement,'valuesList')
+    
+    for value in values:
+      critElement = ElementTree.SubElement(valuesListElement,'values')
+      cmpValueElement = ElementTree.SubElement(critElement,'value',
+                                                          id='CRIT_CMP_VALUE')
+      fieldElement = ElementTree.SubElement(cmpValueElement,'value',id=dbname)
+      valueElement = ElementTree.SubElement(fieldElement,valueType)
+      if valueType == 'string':
+        valueElement.set('xml:space','preserve')
+      if type(value) == type(u''):
+        valueElement.text = value
+      else:
+        valueElement.text = ('%s' % value).decode('utf-8')
+      cmpOpElement = ElementTree.SubElement(critElement,'value',
+                                                          id='CRIT_CMP_OP')
+      ElementTree.SubElement(cmpOpElement,'atom').text = cmpOp
+      critTypeElement = ElementTree.SubElement(critElement,'value',
+                                                              id='CRIT_TYPE')
+      ElementTree.SubElement(critTypeElement,'int').text = '1'
+    
+    return FCSSearchCriteria(xml='<?xml version="1.0"?>\n%s' 
+                        % ElementTree.tostring(sessionElement,encoding='utf-8'),
+                        description='%s in %s values (%s)' % (dbname,
+                                                      len(values),matchType))
+  
+  def generateSearchXML(self,fields,matchType='exact'):
+    '''Generates an XML file for use by fcsvr_client search --xmlcrit, should
+    be past a list of FCSXMLFields (with their appropriate values set). Returns
+    an absolute path to the XML file.
+    
+    .. note:
+      Searches performed by this module no longer use temp files, search 
+      criteria are passed to fcsvr_client via stdin, see 
+      :func:`fcsxml.FCSVRClient.searchCriteriaForFields`
+    
+    :param fields: Provide a list of FCSXMLField objects with populated values
+      to use for searching.
+    :type fields: list
+    :param matchType: An optional parameter to specify the search behavior.
+      Currently two matchType's are supported: 'exact' (default), and 'substring'
+    :type matchType: str
+    
+    :returns: (*str*) POSIX Filesystem Path to temporary XML file.
+    
+    .. versionadded:: .96b
+
+    '''
+    
+    searchCriteria = self.searchCriteriaForFields(fields=fields,
+                                                        matchType=matchType)
+    
+    tempFileHandle,tempFilePath = tempfile.mkstemp(dir=self.supportDir,
+                                                          suffix="_search.xml")
+    self.logger("generateSearchXML() Using temp file: %s" % tempFilePath,'debug')    
+    os.fdopen(tempFileHandle).close()
+    
+    return searchCriteria.writeToFile(tempFilePath)
+  
+  def searchCriteriaForFields(self,fields,matchType='exact'):
+    '''Returns compiled search criteria for use by fcsvr_client search 
+    --xmlcrit, should be past a list of FCSXMLFields (with their appropriate
+    values set). Criteria are compiled once for each combination of fields, 
+    data types and matchType and stored in our shared 
+    :attr:`searchCriteriaTemplates`, values are then substituted for each 
+    search (see :func:`fcsxml.FCSSearchCriteria.criteriaWithValues`).
+    
+    :param fields: Provide a list of FCSXMLField objects with populated values
+      to use for searching.
+    :type fields: list
+    :param matchType: An optional parameter to specify the search behavior.
+      Currently two matchType's are supported: 'exact' (default), and 'substring'
+    :type matchType: str
+    
+    :returns: (*fcsxml.FCSSearchCriteria*) -- The compiled search criteria
+    
+    '''
+    
+    ## Resolve our fields, fields without values are not searched.
+    templateFields = []
+    values = []
+    for field in fields:
+      if not field.value:
+        continue
+      if field.dbname:
+        searchField = self.initFieldWithDBName(field.dbname)
+      else:
+        searchField = self.initFieldWithFieldName(field.name)
+      
+      templateField = FCSXMLField(name=searchField.name,
+                                  dbname=searchField.dbname,
+                                  dataType=searchField.dataType)
+      templateField.value = FCSSearchCriteria.placeholderFormat % len(values)
+      templateFields.append(templateField)
+      values.append(field.value)
+    
+    templateKey = (tuple([(field.dbname,field.dataType) 
+                                    for field in templateFields]),matchType)
     try:
-      shutil.copy(newThumbnailPath,thumbnailPath)
-      os.chown(thumbnailPath,self.FCSUID,-1)
-    except:
-      self.logger("Error copying new thumbnail from: %s to %s" % (newThumbnailPath,thumbnailPath),'error')
-      return False
+      template = self.searchCriteriaTemplates[templateKey]
+    except KeyError:
+      template = self.compileSearchCriteria(fields=templateFields,
+                                                        matchType=matchType)
+      self.searchCriteriaTemplatesLock.acquire()
+      try:
+        template = self.searchCriteriaTemplates.setdefault(templateKey,
+                                                                  template)
+      finally:
+        self.searchCriteriaTemplatesLock.release()
     
-    return True
+    return template.criteriaWithValues(values)
   
-  def generateSearchXML(self,fields,matchType='exact'):
-    '''Generates an XML file for use by fcsvr_client search --xmlcrit, should
-    be past a list of FCSXMLFields (with their appropriate values set). Returns
-    an absolute path to the XML file.
+  def compileSearchCriteria(self,fields,matchType='exact'):
+    '''Generates search criteria XML in memory from the provided list of 
+    FCSXMLFields (with their appropriate values set). Callers should 
+    typically use :func:`fcsxml.FCSVRClient.searchCriteriaForFields`, which
+    re-uses compiled criteria.
     
     :param fields: Provide a list of FCSXMLField objects with populated values
       to use for searching.
@@ -4677,10 +7254,8 @@ class FCSVRClient(FCSBaseObject):
       Currently two matchType's are supported: 'exact' (default), and 'substring'
     :type matchType: str
     
-    :returns: (*str*) POSIX Filesystem Path to temporary XML file.
+    :returns: (*fcsxml.FCSSearchCriteria*) -- The compiled search criteria
     
-    .. versionadded:: .96b
-
     '''
     
     ## Iterate through each of our passed fields, generate
@@ -4702,11 +7277,11 @@ class FCSVRClient(FCSBaseObject):
       
     
       if not fieldNames:
-        fieldNames = field
+        fieldNames = "%s" % field
       else:
         fieldNames += ", %s" % field
         
-    self.logger('generateSearchXML() Generating search XML with fields:%s'
+    self.logger('compileSearchCriteria() Generating search XML with fields:%s'
       ' match type:%s' % (fieldNames,matchType),'debug')
     
     ## create our new xml doc, add our root FCS elements:
@@ -4872,18 +7447,10 @@ class FCSVRClient(FCSBaseObject):
     critTypeElement.appendChild(critTypeIntElement)
     critIntersectValuesElement.appendChild(critTypeElement)
       
-    ## We have finished building our fields, at this point, write out our
+    ## We have finished building our fields, at this point, serialize our
     ## XML
-    tempFileHandle,tempFilePath = tempfile.mkstemp(dir=self.supportDir,
-                                                          suffix="_search.xml")
-    self.logger("generateSearchXML() Using temp file: %s" % tempFilePath,'debug')    
-    os.fdopen(tempFileHandle).close()
-    
-    theFile = codecs.open(tempFilePath, 'w','utf-8')
-    xmlDoc.writexml(theFile)
-    theFile.close()
-    
-    return tempFilePath
+    return FCSSearchCriteria(xml=xmlDoc.toxml(encoding='utf-8'),
+                    description='%s (%s)' % (fieldNames,matchType))
   
   def generateTempXMLFile(self):
     '''This file generates a temporary XML file constructed based upon
@@ -4956,8 +7523,8 @@ class FCSVRClient(FCSBaseObject):
     else:
       fcsvrCMDTXT = "'%s' setmd /%s/%s --xml '%s'" % (self.pathToFCSVRClient,self.entityType,self.entityID,tempFilePath)
       
-    fcsvrCMD = subprocess.Popen("%s" % fcsvrCMDTXT,shell=True,stdout=subprocess.PIPE,stderr=subprocess.PIPE,universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
 
     self.logger("fcsvr_client command:  %s" % "%s" % fcsvrCMDTXT,'debug')
     self.logger("fcsvr_client output: %s  tempfilepath: %s" % (fcsvrCMD_STDOUT,tempFilePath),'debug')
@@ -4966,6 +7533,9 @@ class FCSVRClient(FCSBaseObject):
     if not self.keepFiles:
       os.remove(tempFilePath)
 
+    ## Our stored metadata is no longer representative of FCS
+    self.invalidateMetadataSnapshot()
+
     if not fcsvrCMD.returncode == 0:
       self.logger("%s %s" % (fcsvrCMD_STDERR,fcsvrCMD_STDOUT),'error')
       return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
@@ -4974,6 +7544,86 @@ class FCSVRClient(FCSBaseObject):
     return True
 
 
+  def setMDForEntities(self,entities,maxConcurrent=None):
+    '''Writes metadata for many entities, running up to maxConcurrent 
+    :func:`fcsxml.FCSVRClient.setMD` operations at once via our shared
+    :class:`fcsxml.FCSCommandPool`. Entries referencing the same entity are 
+    coalesced into a single write.
+    
+    :param entities: A list of loaded :class:`fcsxml.FCSVRClient` objects, 
+      or (FCSVRClient,fields) tuples, where fields is a list of 
+      :class:`fcsxml.FCSXMLField` objects to set prior to writing.
+    :type entities: list
+    :param maxConcurrent: The maximum number of concurrent writes, defaults
+      to the command pool's maxWorkers value.
+    :type maxConcurrent: int
+    
+    :returns: (*dict*) -- Dictionary keyed by entity path, with a value of 
+      True for successful writes, or the raised exception for failures.
+    
+    >>> results = myFCSVRClient.setMDForEntities([(asset1,[myField]),
+    ...                                           (asset2,[myField])])
+    >>> for entityPath,result in results.iteritems():
+    ...   if not result is True:
+    ...     print 'Failed to write: %s Error: %s' % (entityPath,result)
+    
+    '''
+    
+    entityPaths = []
+    entityMap = {}
+    results = {}
+    
+    ## Coalesce our entities
+    for entry in entities:
+      if isinstance(entry,tuple):
+        entity,fields = entry
+      else:
+        entity,fields = entry,None
+      try:
+        entityPath = entity.entityPath()
+      except FCSObjectLoadError, inst:
+        self.logger('setMDForEntities() Could not write metadata for entity:'
+                                      ' %s Error:%s' % (entity,inst),'error')
+        results[str(entity)] = inst
+        continue
+      
+      if not entityPath in entityMap:
+        entityPaths.append(entityPath)
+        entityMap[entityPath] = entity
+      elif fields is None and not entity is entityMap[entityPath]:
+        fields = entity.fields.values()
+      
+      if fields:
+        for field in fields:
+          if not entityMap[entityPath].setField(field):
+            message = 'Could not set field: %s' % field.name
+            self.logger('setMDForEntities() %s for entity: %s' 
+                                          % (message,entityPath),'error')
+            results[entityPath] = FCSValidationError(message)
+    
+    ## Don't write entities which failed validation
+    entityPaths = [entityPath for entityPath in entityPaths 
+                                            if not entityPath in results]
+    
+    self.logger('setMDForEntities() Writing metadata for %s entities.' 
+                                                  % len(entityPaths),'debug')
+    
+    writeResults = self.commandPool.map(lambda entityPath: 
+                                              entityMap[entityPath].setMD(),
+                                        entityPaths,
+                                        returnExceptions=True,
+                                        maxWorkers=maxConcurrent)
+    
+    for entityPath,result in zip(entityPaths,writeResults):
+      if isinstance(result,Exception):
+        self.logger('setMDForEntities() Failed to write metadata for entity:'
+                                  ' %s Error:%s' % (entityPath,result),'error')
+        results[entityPath] = result
+      else:
+        results[entityPath] = True
+    
+    return results
+  
   def xmlOut(self,filePath):
     '''Output our XML to the specified file, this will be a fcsvr_client 
     compatable XML file (which is **not** compatable with FCS ReadXML responses)
@@ -5220,10 +7870,10 @@ class FCSVRClient(FCSBaseObject):
     
     
     ## if we have an xmlDOM, use it, otherwise grab it from our object
-    if not xmlDOM:
-      xmlDOM = self.getParentLinksXML(id=assetID)
+    if not xmlDOM and not isinstance(xmlDOM,list):
+      xmlDOM = self.getParentLinks(id=assetID)
     
-    if not xmlDOM:
+    if xmlDOM is None:
       message = 'Could not generate xml!'
       self.logger(message,'error')
       raise RuntimeError(message)
@@ -5272,10 +7922,10 @@ class FCSVRClient(FCSBaseObject):
       return self.proxyPath
     
     ## if we have an xmlDOM, use it, otherwise grab it from our object
-    if not xmlDOM:
-      xmlDOM = self.getParentLinksXML(id=entityID)
+    if not xmlDOM and not isinstance(xmlDOM,list):
+      xmlDOM = self.getParentLinks(id=entityID)
     
-    if not xmlDOM:
+    if xmlDOM is None:
       message = 'Could not generate xml!'
       self.logger(message,'error')
       raise RuntimeError(message)
@@ -5319,10 +7969,10 @@ class FCSVRClient(FCSBaseObject):
       return self.posterFramePath
     
     ## if we have an xmlDOM, use it, otherwise grab it from our object
-    if not xmlDOM:
-      xmlDOM = self.getParentLinksXML(id=assetID)
+    if not xmlDOM and not isinstance(xmlDOM,list):
+      xmlDOM = self.getParentLinks(id=assetID)
     
-    if not xmlDOM:
+    if xmlDOM is None:
       message = 'Could not generate xml!'
       self.logger(message,'error')
       raise RuntimeError(message)
@@ -5366,10 +8016,10 @@ class FCSVRClient(FCSBaseObject):
       return self.editProxyPath
     
     ## if we have an xmlDOM, use it, otherwise grab it from our object
-    if not xmlDOM:
-      xmlDOM = self.getParentLinksXML(id=assetID)
+    if not xmlDOM and not isinstance(xmlDOM,list):
+      xmlDOM = self.getParentLinks(id=assetID)
     
-    if not xmlDOM:
+    if xmlDOM is None:
       message = 'Could not generate xml!'
       self.logger(message,'error')
       raise RuntimeError(message)
@@ -5438,13 +8088,9 @@ class FCSVRClient(FCSBaseObject):
     cmdString = 'getmd "/project/%s" --xml' % productionID
 
     ## todo: add timeout to detect if FCSVR is down
-    fcsvrCMD = subprocess.Popen('"%s" %s' % (self.pathToFCSVRClient,cmdString),
-                                    shell=True,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE,
-                                    universal_newlines=True)
+    fcsvrCMD = self.fcsvr_client_run('"%s" %s' % (self.pathToFCSVRClient,cmdString))
                                     
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
       
     self.logger('fcsvr_client command: fcsvr_client %s' % cmdString,'debug')
 
@@ -5454,45 +8100,19 @@ class FCSVRClient(FCSBaseObject):
     
     ##self.logger("fcsvr_client output: %s  fcsPath: %s" % (fcsvrCMD_STDOUT,self.pathToFCSVRClient),'debug')
 
-    ## Create a dom object from our string:
+    ## Parse our results
     try:
-      myDom = minidom.parseString(fcsvrCMD_STDOUT)
+      records = self.xmlReader.recordList(fcsvrCMD_STDOUT,includeTypes=True)
     except:
       self.logger('Could not parse output from fcsvr_client command: fcsvr_client %s' % cmdString,'error')
       return False
     
-    self.dom = myDom
-    
-    #try:
-    sessionRoot = myDom.childNodes[0]
-    searchResultCount = 0
-    resolvedFileName = ''
-    resolvedMetadataSet = ''
-    resolvedTitle = ''
-    resolvedProjectID = ''
-    resolvedDBEntityID = ''
+    snapshot = self.loadMetadataSnapshotFromRecords(records)
     
-    for value in sessionRoot.getElementsByTagName('value'):
-      #self.logger('dbFieldNameForFieldName() rootValue nodename: %s' % rootValue.nodeName,'debug')          
-      valueID = value.attributes['id'].value
-      #self.logger('dbFieldNameForFieldName() Searching value: %s' % valueID,'debug')
-      if valueID == 'PROJECT_NUMBER':
-        try:
-          resolvedProjectID = value.childNodes[1].childNodes[0].data
-        except:
-          pass
-      elif valueID == 'DB_ENTITY_ID':
-        try:
-          resolvedDBEntityID = value.childNodes[1].childNodes[0].data
-        except:
-          pass
-      elif valueID == 'PROJECT_TYPE':
-        resolvedMetadataSet = value.childNodes[1].childNodes[0].data
-      elif valueID == 'CUST_TITLE':
-        try:
-          resolvedTitle = value.childNodes[1].childNodes[0].data
-        except:
-          resolvedTitle = ''
+    resolvedMetadataSet = snapshot.get('PROJECT_TYPE',('',''))[1]
+    resolvedTitle = snapshot.get('CUST_TITLE',('',''))[1]
+    resolvedProjectID = snapshot.get('PROJECT_NUMBER',('',''))[1]
+    resolvedDBEntityID = snapshot.get('DB_ENTITY_ID',('',''))[1]
         
     if (not resolvedDBEntityID or resolvedDBEntityID == '0'):
       msg = ('Could not init production with id:%s, production does not exist!' 
@@ -5533,12 +8153,8 @@ class FCSVRClient(FCSBaseObject):
     cmdString = 'getmd "/asset/%s" --xml' % assetID
 
     ## todo: add timeout to detect if FCSVR is down
-    fcsvrCMD = subprocess.Popen('"%s" %s' % (self.pathToFCSVRClient,cmdString),
-                            shell=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run('"%s" %s' % (self.pathToFCSVRClient,cmdString))
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
       
     self.logger('fcsvr_client command: fcsvr_client %s' % cmdString,'debug')
 
@@ -5548,65 +8164,46 @@ class FCSVRClient(FCSBaseObject):
     
     ##self.logger("fcsvr_client output: %s  fcsPath: %s" % (fcsvrCMD_STDOUT,self.pathToFCSVRClient),'debug')
 
-    ## Create a dom object from our string:
+    ## Parse our results
     try:
-      myDom = minidom.parseString(fcsvrCMD_STDOUT)
+      records = self.xmlReader.recordList(fcsvrCMD_STDOUT,includeTypes=True)
     except:
       message = ('Could not parse output from fcsvr_client command: '
         'fcsvr_client %s' % cmdString)
       self.logger(message,'error')
       raise RuntimeError(message)
     
-    self.dom = myDom
+    return self.initWithAssetRecords(records=records,assetID=assetID)
+  
+  def initWithAssetRecords(self,records,assetID=''):
+    '''Inits the local instance with an asset based on the provided metadata
+    records, as returned by fcsvr_client getmd or search. The records are 
+    stored as our metadata snapshot.
+    
+    :param records: Specify a list of metadata dictionaries of 
+      (fieldType,value) tuples keyed by FCS DB field name.
+    :type records: list
+    :param assetID: Specify the requested asset id (used for reporting)
+    :type assetID: int
     
-    #try:
-    sessionRoot = myDom.childNodes[0]
-    searchResultCount = 0
-    noMatch = False
-    resolvedRelPath = ''
-    resolvedDeviceID = '' 
-    resolvedDevice = ''
-    resolvedFileName = ''
-    resolvedAssetID = ''
-    resolvedMetadataSet = ''
-    resolvedTitle = ''
-    resolvedDBEntityID = ''
+    :raises: FCSEntityNotFoundError
     
-    for value in sessionRoot.getElementsByTagName('value'):
-      #self.logger('dbFieldNameForFieldName() rootValue nodename: %s' % rootValue.nodeName,'debug')          
-      valueID = value.attributes['id'].value
-      ##self.logger('dbFieldNameForFieldName() Searching value: %s' % valueID,'debug')
-      if valueID == 'CUST_LOCATION':
-        try:
-          resolvedRelPath = value.childNodes[1].childNodes[0].data
-          if not resolvedRelPath or not resolvedRelPath == relPath:
-            self.logger('Found Location: \'%s\' does not match our requested '
-                          'location:\'%s\',skipping search result!' 
-                          % (resolvedRelPath,relPath),'debug')
-            noMatch = True
-            break;
-        except:
-          pass
-      elif valueID == 'ASSET_NUMBER':
-        resolvedAssetID = value.childNodes[1].childNodes[0].data
-      elif valueID == 'DB_ENTITY_ID':
-        try:
-          resolvedDBEntityID = value.childNodes[1].childNodes[0].data
-        except:
-          pass
-      elif valueID == 'PA_MD_CUST_FILENAME':
-        resolvedFileName = value.childNodes[1].childNodes[0].data
-      elif valueID == 'CUST_DEVICE':
-        resolvedDeviceName = value.childNodes[1].childNodes[0].data
-        resolvedDevice = self.deviceWithName(resolvedDeviceName)
-        resolvedDeviceID = resolvedDevice['DEVICE_ID']          
-      elif valueID == 'ASSET_TYPE':
-        resolvedMetadataSet = value.childNodes[1].childNodes[0].data
-      elif valueID == 'CUST_TITLE':
-        try:
-          resolvedTitle = value.childNodes[1].childNodes[0].data
-        except:
-          resolvedTitle = ''
+    '''
+    
+    self.entityType = 'asset'
+    if self.fields:
+      self.fields = {}
+    
+    snapshot = self.loadMetadataSnapshotFromRecords(records)
+    
+    resolvedDevice = ''
+    resolvedAssetID = snapshot.get('ASSET_NUMBER',('',''))[1]
+    resolvedDBEntityID = snapshot.get('DB_ENTITY_ID',('',''))[1]
+    resolvedMetadataSet = snapshot.get('ASSET_TYPE',('',''))[1]
+    resolvedTitle = snapshot.get('CUST_TITLE',('',''))[1]
+    resolvedDeviceName = snapshot.get('CUST_DEVICE',('',''))[1]
+    if resolvedDeviceName:
+      resolvedDevice = self.deviceWithName(resolvedDeviceName)
     
     if not resolvedDBEntityID or resolvedDBEntityID == '0':
       msg = ('Could not init asset with id:%s, asset does not exist!' 
@@ -5625,6 +8222,124 @@ class FCSVRClient(FCSBaseObject):
     if self.entityID:
       return True
 
+  def assetsWithIDs(self,assetIDs,batchSize=None,ignoreMissing=False):
+    '''Returns a list of initialized :class:`FCSVRClient` asset objects for 
+    the provided asset ids. Rather than calling fcsvr_client getmd for each
+    asset (as :func:`fcsxml.FCSVRClient.initWithAssetID` does), assets are
+    resolved via a single fcsvr_client search per batch of ids, with batches
+    run across our command pool. As with 
+    :func:`fcsxml.FCSVRClient.initWithAssetID`, an error is raised if an 
+    asset does not exist, unless ignoreMissing is set, in which case it is
+    logged and omitted from the results.
+    
+    :param assetIDs: Specify a list of asset ids to load
+    :type assetIDs: list
+    :param batchSize: Specify the maximum number of ids to resolve per 
+      search, defaults to :attr:`bulkSearchBatchSize`
+    :type batchSize: int
+    :param ignoreMissing: Omit assets which could not be found rather than
+      raising an error
+    :type ignoreMissing: bool
+    
+    :raises: FCSEntityNotFoundError, FCSError, FCSVRClientError
+    :returns: (*list*) -- A list of :class:`FCSVRClient` objects, in the 
+      order of the provided ids
+    
+    .. versionadded:: 1.0b
+    
+    '''
+    
+    if not batchSize:
+      batchSize = self.bulkSearchBatchSize
+    
+    ## Remove duplicate ids, preserving order.
+    requestedIDs = []
+    seenIDs = set()
+    for assetID in assetIDs:
+      assetID = '%s' % assetID
+      if assetID and not assetID in seenIDs:
+        seenIDs.add(assetID)
+        requestedIDs.append(assetID)
+    
+    if not requestedIDs:
+      return []
+    
+    batches = [requestedIDs[index:index + batchSize] 
+                          for index in range(0,len(requestedIDs),batchSize)]
+    
+    self.logger('assetsWithIDs() Loading %s assets with %s searches' 
+                                  % (len(requestedIDs),len(batches)),'debug')
+    
+    ## Run our searches and index our results by asset id.
+    assetRecords = {}
+    for records in self.commandPool.map(self.assetRecordsWithIDs,batches):
+      for record in records:
+        assetID = record.get('ASSET_NUMBER',('',''))[1]
+        if assetID:
+          assetRecords[assetID] = record
+    
+    missingIDs = [assetID for assetID in requestedIDs 
+                                            if not assetID in assetRecords]
+    if missingIDs:
+      self.logger('assetsWithIDs() Could not find %s assets with ids: %s' 
+                        % (len(missingIDs),', '.join(missingIDs)),'error')
+      if not ignoreMissing:
+        raise FCSEntityNotFoundError(entityType='asset',entityID=missingIDs[0])
+    
+    assets = []
+    for assetID in requestedIDs:
+      if not assetID in assetRecords:
+        continue
+      myAsset = FCSVRClient(configParser=self.configParser)
+      myAsset.initWithAssetRecords(records=[assetRecords[assetID]],
+                                                          assetID=assetID)
+      assets.append(myAsset)
+    
+    return assets
+  
+  def assetRecordsWithIDs(self,assetIDs):
+    '''Returns the metadata records for the provided asset ids, utilizing a
+    single fcsvr_client search.
+    
+    :param assetIDs: Specify a list of asset ids to search for
+    :type assetIDs: list
+    
+    :raises: FCSError, FCSVRClientError
+    :returns: (*list*) -- A list of metadata dictionaries of (fieldType,value)
+      tuples keyed by FCS DB field name.
+    
+    '''
+    
+    searchCriteria = self.searchCriteriaForValues(dbname='ASSET_NUMBER',
+                                          values=assetIDs,valueType='int')
+    
+    fcsvrCMDTXT = ('"%s" search /asset --xml --xmlcrit' 
+                                                  % self.pathToFCSVRClient)
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT,input=searchCriteria.xml)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
+    
+    self.logger('fcsvr_client command:\'%s\' (%s ids)' 
+                                        % (fcsvrCMDTXT,len(assetIDs)),'debug')
+    
+    if not fcsvrCMD.returncode == 0:
+      return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
+                                          cmdString=fcsvrCMDTXT)
+    
+    assetRecords = []
+    try:
+      for record in self.xmlReader.records(fcsvrCMD_STDOUT,includeTypes=True):
+        metadata = record.get('METADATA')
+        if not metadata or not metadata[0] == 'values':
+          continue
+        assetRecords.append(metadata[1])
+    except SyntaxError:
+      message = ('Could not parse output from fcsvr_client command: \'%s\''
+                                                                % fcsvrCMDTXT)
+      self.logger(message,'error')
+      raise FCSError(message)
+    
+    return assetRecords
+  
   def initWithAssetFromField(self,field,matchType='exact'):
     '''Inits the local instance with an asset which has the provided
     field. A second parameter, matchType, can be provided which will 
@@ -5752,12 +8467,8 @@ class FCSVRClient(FCSBaseObject):
     cmdString = 'list_child_links %s --xml' % FCSPath
 
     ## todo: add timeout to detect if FCSVR is down
-    fcsvrCMD = subprocess.Popen('"%s" %s' % (self.pathToFCSVRClient,cmdString),
-                  shell=True,
-                  stdout=subprocess.PIPE,
-                  stderr=subprocess.PIPE,
-                  universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run('"%s" %s' % (self.pathToFCSVRClient,cmdString))
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
       
     self.logger('fcsvr_client command: fcsvr_client %s' % cmdString,'debug')
 
@@ -5780,8 +8491,6 @@ class FCSVRClient(FCSBaseObject):
       self.logger('Could not parse output from fcsvr_client command: fcsvr_client %s' % cmdString,'error')
       return False
     
-    self.dom = myDom
-    
     #try:
     sessionRoot = myDom.childNodes[0]
 
@@ -5797,6 +8506,9 @@ class FCSVRClient(FCSBaseObject):
         except:
           pass
     
+    ## Release our DOM
+    myDom.unlink()
+    
     resolvedAssetID = resolvedEntityPath.split('/')[2]
     
     self.logger('initWithAssetID() found entityPath:%s, assetID:%s for FCS Address:%s' 
@@ -5837,12 +8549,8 @@ class FCSVRClient(FCSBaseObject):
     cmdString = 'search --crit "%s" /asset --xml' % fileName
 
     ## todo: add timeout to detect if FCSVR is down
-    fcsvrCMD = subprocess.Popen('"%s" %s' % (self.pathToFCSVRClient,cmdString),
-                            shell=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run('"%s" %s' % (self.pathToFCSVRClient,cmdString))
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
       
     self.logger('fcsvr_client command: fcsvr_client %s' % cmdString,'debug')
 
@@ -5859,8 +8567,6 @@ class FCSVRClient(FCSBaseObject):
       self.logger('Could not parse output from fcsvr_client command: fcsvr_client %s' % cmdString,'error')
       return False
     
-    self.dom = myDom
-    
     #try:
     sessionRoot = myDom.childNodes[0]
     searchResultCount = 0
@@ -5979,26 +8685,28 @@ class FCSVRClient(FCSBaseObject):
       message = 'devicesMap could not be loaded!'
       self.logger('getFCSPathFromFSPath() %s' % message,'error')
       raise FCSValidationError(message)
-    for deviceID,device in devicesMap.iteritems():
-      if FSPath[0:len(device['DEV_ROOT_PATH'])] == device['DEV_ROOT_PATH']:
-        if device['DEVICE_TYPE'] == 'filesystem':
-          newPath = os.path.join(device['DESC_DEVICE_ADDRESS'],
-                                      FSPath[len(device['DEV_ROOT_PATH']) + 1:])
-        elif device['DEVICE_TYPE'] == 'contentbase':
-          try:
-            parentDirName = os.path.basename(os.path.dirname(FSPath))
-            decimalNameVal = int(parentDirName,16)
-            newPath = (os.path.join(device['DESC_DEVICE_ADDRESS'],'%s_%s' 
-                                 % (decimalNameVal,os.path.basename(FSPath))))
-          except:
-            message = 'Unexpected error converting contentbase path!'
-            self.logger('getFCSPathFromFSPath() %s' % message,'error')
-            raise FCSError(message)
-        else:
-          message = 'Unexpected DEVICE_TYPE:%s' % device['DEVICE_TYPE']
-          self.logger('getFCSPathFromFSPath() %s' % message ,'error')
+    try:
+      device = self.deviceWithPath(FSPath)
+    except FCSEntityNotFoundError:
+      device = {}
+    if device:
+      if device['DEVICE_TYPE'] == 'filesystem':
+        newPath = os.path.join(device['DESC_DEVICE_ADDRESS'],
+                                    FSPath[len(device['DEV_ROOT_PATH']) + 1:])
+      elif device['DEVICE_TYPE'] == 'contentbase':
+        try:
+          parentDirName = os.path.basename(os.path.dirname(FSPath))
+          decimalNameVal = int(parentDirName,16)
+          newPath = (os.path.join(device['DESC_DEVICE_ADDRESS'],'%s_%s' 
+                               % (decimalNameVal,os.path.basename(FSPath))))
+        except:
+          message = 'Unexpected error converting contentbase path!'
+          self.logger('getFCSPathFromFSPath() %s' % message,'error')
           raise FCSError(message)
-        break;
+      else:
+        message = 'Unexpected DEVICE_TYPE:%s' % device['DEVICE_TYPE']
+        self.logger('getFCSPathFromFSPath() %s' % message ,'error')
+        raise FCSError(message)
 
     self.logger('getFCSPathFromFSPath() resolved unquoted path:%s' % newPath
                                                                       ,'debug')
@@ -6239,9 +8947,11 @@ class FCSVRClient(FCSBaseObject):
     :type value: str
     :param linkType: The FCS Link type to return
     :type linkType: int
-    :param xmlDOM: Provide the XML DOM object to evaluate (*optional* - if none 
-      is provided we will utilize :func:`fcsxml.FCSVRClient.getParentLinksXML`
-      or :func:`fcsxml.FCSVRClient.getChildLinksXML`)
+    :param xmlDOM: Provide the link records to evaluate, as returned by
+      :func:`fcsxml.FCSVRClient.getParentLinks` or 
+      :func:`fcsxml.FCSVRClient.getChildLinks`. An XML DOM object from
+      :func:`fcsxml.FCSVRClient.getParentLinksXML` is also accepted.
+      (*optional* - if none is provided we will load link records ourselves)
      
     :param id: Specify the entity id for which to analyze links
     :type id: int
@@ -6270,7 +8980,7 @@ class FCSVRClient(FCSBaseObject):
     ## Assign new var (for readability)
     requestedValue = value
     
-    if not xmlDOM:
+    if not xmlDOM and not isinstance(xmlDOM,list):
       if not id and self.entityID:
         entityID = self.entityID
       elif not id:
@@ -6279,50 +8989,36 @@ class FCSVRClient(FCSBaseObject):
       else:
         entityID = id
       entityType = type
-      if origin == 'child':
-        xmlDOM = self.getChildLinksXML(id=entityID,type=entityType)
-      else:
-        xmlDOM = self.getParentLinksXML(id=entityID,type=entityType)
+      linkRecords = self.getLinkRecords(id=entityID,type=entityType,
+                                                              origin=origin)
+    elif isinstance(xmlDOM,list):
+      linkRecords = xmlDOM
+    else:
+      ## Legacy DOM object, (i.e. from getParentLinksXML())
+      linkRecords = self.xmlReader.records(xmlDOM.toxml())
 
-    ## Do our work on the DOM    
-    matchedEntries = []    ## List of matching dicts
+    ## Find our matching records
     matchedValues = []    ## List of specific matching values
-    linkAddress = ''
-    for myValues in xmlDOM.getElementsByTagName('values'):
-      loopDied = False
-      assetDict = {}
-      for myValue in myValues.getElementsByTagName('value'):
-        valueID = myValue.attributes['id'].value
-        ##self.logger('VALUE ID ATTRIB:%s' % valueID,'debug')
-        if valueID == 'LINK_TYPE':
-          ## Check to see if it's the thumbnail (LINK_TYPE of 5)
-          assetDict['LINK_TYPE'] = int(myValue.childNodes[1].childNodes[0].data)
-          if not assetDict['LINK_TYPE'] == linkType:
-            loopDied = True
-            assetDict = {}
-            break
-
-        if valueID == requestedValue:
-          assetDict[requestedValue] = myValue.childNodes[1].childNodes[0].data
-          
-      if (not loopDied and 'LINK_TYPE' in assetDict 
-        and assetDict['LINK_TYPE'] == linkType
-        and requestedValue in assetDict):
-        self.logger("Found matched value:'%s' (linkType:%s RequestedValue:'%s')" 
-          % (requestedValue,
-            assetDict['LINK_TYPE'],
-            assetDict[requestedValue])
-            ,'debug')
-        matchedEntries.append(assetDict)
-        matchedValues.append(assetDict[requestedValue])
+    for linkRecord in linkRecords:
+      try:
+        recordLinkType = int(linkRecord.get('LINK_TYPE',0))
+      except ValueError:
+        continue
+      if not recordLinkType == linkType:
+        continue
+      if requestedValue in linkRecord and linkRecord[requestedValue]:
+        self.logger("Found matched value:'%s' (linkType:%s RequestedValue:'%s')",
+          'debug',logArgs=(requestedValue,recordLinkType,
+                                                linkRecord[requestedValue]))
+        matchedValues.append(linkRecord[requestedValue])
             
     if not len(matchedValues) > 0:
       ##raise FCSError("Could not find entries with VALUE:%s LINK_TYPE:%s"
       ##  " in XML object!" % (requestedValue,linkType))
       return []
     else:
-      self.logger('Found %s matching entries for LINK_TYPE:%s in XML object!' 
-        % (len(matchedValues),linkType),'debug')
+      self.logger('Found %s matching entries for LINK_TYPE:%s in XML object!',
+        'debug',logArgs=(len(matchedValues),linkType))
     
     return matchedValues
   
@@ -6408,10 +9104,10 @@ class FCSVRClient(FCSBaseObject):
       assetID = id
     
     
-    if not xmlDOM:
-      xmlDOM = self.getParentLinksXML(id=assetID)
+    if not xmlDOM and not isinstance(xmlDOM,list):
+      xmlDOM = self.getParentLinks(id=assetID)
       
-    if not xmlDOM:
+    if xmlDOM is None:
       self.logger('Could not retrieve FCPath, no xmlDOM loaded!','error')
       return False
     
@@ -6474,19 +9170,19 @@ class FCSVRClient(FCSBaseObject):
       raise FCSValidationError(message)
       
     
-    ## If our assetID lookup matches our entityID and we have a cached value, return it
-    if entityID == self.entityID and type == self.entityType and self.childXMLObject:
-      return self.childXMLObject
+    ## If our assetID lookup matches our entityID and we have a cached value, 
+    ## parse and return it. We cache fcsvr_client output rather than the DOM, 
+    ## which is many times larger.
+    if (entityID == self.entityID and entityType == self.entityType 
+                                                    and self.childXML):
+      return minidom.parseString(self.childXML)
     
     ## Fetch our data from FCSVRXML
     fcsvrCMDString = "'%s' list_child_links /%s/%s --xml" % (self.pathToFCSVRClient,
                           entityType,
                           entityID)
-    fcsvrCMD = subprocess.Popen(fcsvrCMDString,shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDString)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
 
     self.logger('fcsvr_client command:%s' % fcsvrCMDString,'debug')
     ##self.logger('fcsvr_client output: %s  tempfilepath: %s' % (fcsvrCMD_STDOUT,tempFilePath),'debug')
@@ -6507,7 +9203,7 @@ class FCSVRClient(FCSBaseObject):
       raise FCSError(message)
     
     if entityID == self.entityID:
-      self.parentXMLObject = myDom
+      self.childXML = fcsvrCMD_STDOUT
       
     return myDom
 
@@ -6548,19 +9244,18 @@ class FCSVRClient(FCSBaseObject):
     elif id:
       entityID = id
     
-    ## If our assetID lookup matches our entityID and we have a cached value, return it
-    if entityID == self.entityID and self.parentXMLObject:
-      return self.parentXMLObject
+    ## If our assetID lookup matches our entityID and we have a cached value, 
+    ## parse and return it.
+    if (entityID == self.entityID and entityType == self.entityType 
+                                                    and self.parentXML):
+      return minidom.parseString(self.parentXML)
     
     ## Fetch our data from FCSVRXML
     fcsvrCMDString = '"%s" list_parent_links /%s/%s --xml' % (self.pathToFCSVRClient,
                           entityType,
                           entityID)
-    fcsvrCMD = subprocess.Popen(fcsvrCMDString,shell=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDString)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
 
     self.logger('fcsvr_client command:%s' % fcsvrCMDString,'debug')
     ##self.logger('fcsvr_client output: %s  tempfilepath: %s' % (fcsvrCMD_STDOUT,tempFilePath),'debug')
@@ -6581,10 +9276,126 @@ class FCSVRClient(FCSBaseObject):
       raise FCSError(message)
     
     if entityID == self.entityID:
-      self.parentXMLObject = myDom
+      self.parentXML = fcsvrCMD_STDOUT
       
     return myDom
   
+  def getChildLinks(self,id='',type='',useCache=True):
+    '''Returns a list of child link records for the requested entity, as 
+    read by :class:`fcsxml.FCSXMLRecordReader`. Each record is a dict keyed
+    by value id (i.e. 'LINK_TYPE', 'ADDRESS').
+    
+    :param id: Specify the entity id to determine child links for
+    :type id: int
+    :param type: Specify the entity type
+    :type type: str
+    :param useCache: Specify whether cached links may be returned
+    :type useCache: bool
+    
+    :raises: FCSError,FCSValidationError
+    :returns: (*list*) -- A list of link record dicts
+    
+    '''
+    return self.getLinkRecords(id=id,type=type,origin='child',
+                                                    useCache=useCache)
+  
+  def getParentLinks(self,id='',type='',useCache=True):
+    '''Returns a list of parent link records for the requested entity, as 
+    read by :class:`fcsxml.FCSXMLRecordReader`. Each record is a dict keyed
+    by value id (i.e. 'LINK_TYPE', 'ADDRESS').
+    
+    :param id: Specify the entity id to determine parent links for
+    :type id: int
+    :param type: Specify the entity type
+    :type type: str
+    :param useCache: Specify whether cached links may be returned
+    :type useCache: bool
+    
+    :raises: FCSError,FCSValidationError
+    :returns: (*list*) -- A list of link record dicts
+    
+    '''
+    return self.getLinkRecords(id=id,type=type,origin='parent',
+                                                    useCache=useCache)
+  
+  def getLinkRecords(self,id='',type='',origin='parent',useCache=True):
+    '''Returns a list of link records for the requested entity utilizing 
+    fcsvr_client list_parent_links or list_child_links. Results are stored
+    in our shared :class:`fcsxml.FCSLinkCache` (:attr:`linkCache`).
+    
+    :param id: Specify the entity id to determine links for
+    :type id: int
+    :param type: Specify the entity type
+    :type type: str
+    :param origin: Specify the origin of the links ('parent' or 'child')
+    :type origin: str
+    :param useCache: Specify whether cached links may be returned
+    :type useCache: bool
+    
+    :raises: FCSError,FCSValidationError
+    :returns: (*list*) -- A list of link record dicts
+    
+    '''
+    
+    ## Determine our entityType
+    entityType = ''
+    if not type and self.entityType: 
+      entityType = self.entityType
+    elif not self.entityType:
+      entityType = 'asset'
+    elif type:
+      entityType = type
+    
+    ## Determine our id
+    entityID = ''
+    if not id and self.entityType == entityType:
+      entityID = self.entityID
+    elif not id and not self.entityType == entityType:
+      message = 'Requested entity type does not match stored values!'
+      self.logger(message,'error')
+      raise FCSValidationError(message)
+    elif id:
+      entityID = id
+    
+    if not entityID or not entityType:
+      message = 'Passed invalid entity data, type or id missing!'
+      self.logger(message)
+      raise FCSValidationError(message)
+    
+    if origin == 'child':
+      cmdName = 'list_child_links'
+    else:
+      origin = 'parent'
+      cmdName = 'list_parent_links'
+    
+    entityAddress = '/%s/%s' % (entityType,entityID)
+    if useCache:
+      records = self.linkCache.linksForAddress(entityAddress,origin=origin)
+      if records is not None:
+        return records
+    
+    fcsvrCMDString = "'%s' %s /%s/%s --xml" % (self.pathToFCSVRClient,
+                          cmdName,entityType,entityID)
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDString)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
+
+    self.logger('fcsvr_client command:%s' % fcsvrCMDString,'debug')
+
+    if not fcsvrCMD.returncode == 0:
+      return self.fcsvr_client_error(errorString=fcsvrCMD_STDOUT,
+                                          cmdString=fcsvrCMDString)
+    try:
+      records = self.xmlReader.recordList(fcsvrCMD_STDOUT)
+    except SyntaxError:
+      message = ('Could not parse output from fcsvr_client, it does not appear ' 
+        'to be valid XML')
+      self.logger(message,'error')
+      raise FCSError(message)
+    
+    self.linkCache.setLinksForAddress(entityAddress,records,origin=origin)
+    
+    return records
+  
   def getThumbnailPath(self,assetID='',xmlDOM=''):
     '''This function will return a file system path for the given asset.
     
@@ -6599,8 +9410,8 @@ class FCSVRClient(FCSBaseObject):
     '''This function will flush any cached data: currently this is limited
     to any cached XML data returned from fcsvr_client.'''
     
-    self.parentXMLObject = ''
-    self.childXMLObject = ''
+    self.parentXML = ''
+    self.childXML = ''
     return True
 
   def fcsvr_client_create(self,address='',entityType='',parentAddress='',parentLinkType=''):
@@ -6671,11 +9482,8 @@ class FCSVRClient(FCSBaseObject):
         fcsvrCMDTXT = '\'%s\' %s' % (self.pathToFCSVRClient,cmdArgs)
     
     ## Run our fcsvr_client command.
-    fcsvrCMD = subprocess.Popen('%s' % fcsvrCMDTXT,shell=True,
-                                  stdout=subprocess.PIPE,
-                                  stderr=subprocess.PIPE,
-                                  universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
 
     self.logger('fcsvrCMD:\n  %s' % "'%s' %s" % (obj.pathToFCSVRClient,cmdArgs),'debug')
     self.logger('fcsvr_client output: %s  fcsPath: %s' % (fcsvrCMD_STDOUT,fcsPath),'debug')
@@ -6766,11 +9574,8 @@ class FCSVRClient(FCSBaseObject):
         fcsvrCMDTXT = '\'%s\' %s' % (self.pathToFCSVRClient,cmdArgs)
     
     ## Run our fcsvr_client command.
-    fcsvrCMD = subprocess.Popen('%s' % fcsvrCMDTXT,shell=True,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            universal_newlines=True)
-    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.communicate()
+    fcsvrCMD = self.fcsvr_client_run(fcsvrCMDTXT)
+    fcsvrCMD_STDOUT,fcsvrCMD_STDERR = fcsvrCMD.stdout,fcsvrCMD.stderr
 
     self.logger('fcsvrCMD:\n  %s' % fcsvrCMDTXT,'debug')
 
@@ -6782,9 +9587,29 @@ class FCSVRClient(FCSBaseObject):
                                               cmdString=fcsvrCMDTXT) 
      
     ## Flush our caches
+    self.linkCache.invalidateAddress(parentPath)
+    self.linkCache.invalidateAddress(childPath)
     self.flushCaches()
     return True
   
+  def fcsvr_client_run(self,cmdString,input=None,timeout=None):
+    '''Runs the provided fcsvr_client command via our shared 
+    :class:`fcsxml.FCSCommandPool`.
+    
+    :param cmdString: The command to run
+    :type cmdString: str
+    :param input: Data to pass to the command's standard input (optional)
+    :type input: str
+    :param timeout: Timeout in seconds, defaults to the pool's timeout
+    :type timeout: int
+    
+    :raises: FCSVROfflineError
+    :returns: (:class:`fcsxml.FCSCommandResult`) -- The command results
+    
+    '''
+    self.logger('fcsvr_client_run() Running command: %s' % cmdString,'debug')
+    return self.commandPool.run(cmdString,input=input,timeout=timeout)
+  
   def fcsvr_client_error(self,errorString='',cmdString=''):
     '''This method interprets an fcsvr_client error string and will throw
     the appropriate exception, it should be called if fcsvr_client returns
@@ -6930,7 +9755,10 @@ class FCSEntityNotFoundError(Exception):
     self.entityID = entityID
     self.entityPath = entityPath
     self.entityTitle = entityTitle
+    self.entityMDSet = entityMDSet
+    
   def __str__(self):
+    message = ''
     if self.entityID:
       message = ' id:\'%s\'' % self.entityID
     if self.entityPath:
@@ -7024,6 +9852,23 @@ class FCSObjectLoadError(Exception):
   def __str__(self):
     return repr(self.value)
 
+class FCSEntityActionError(Exception):
+  '''This exception is thrown when an action performed on multiple entities
+  fails for one or more of them. The results for all entities are available 
+  via the results attribute, failures via failedResults.'''
+  
+  def __init__(self,action,results):
+    self.action = action
+    self.results = results
+    self.failedResults = [result for result in results 
+                                                if not result.success()]
+  def __str__(self):
+    message = ('Failed to %s %s of %s entities:' % (self.action,
+                                  len(self.failedResults),len(self.results)))
+    for result in self.failedResults:
+      message += '\n  %s: %s' % (result.entityPath,result.error)
+    return repr(message)
+
 class FCSProductionLoadError(Exception):
   '''This exception is thrown when a production fails to load properly.'''
   
@@ -293,19 +293,41 @@ def main():
     sortedMemberIndex = []     ## List of members in sorted order
     invalidMembers = []         ## List of invalid memberValues.
     
+    ## Resolve all of our members with as few searches as possible
+    searchFCSObj = FCSVRClient(configParser=cfgParser)
+    if debug:
+      searchFCSObj.debug = True
+    bulkSearchFailed = False
+    try:
+      memberFCSObjs = searchFCSObj.assetsWithFieldValues(
+                                  field=FCSXMLField(name=membershipKey),
+                                  values=importMemberValues)
+    except Exception, excp:
+      searchFCSObj.printLogs = True
+      searchFCSObj.logger('Could not search for members with field: \'%s\','
+        ' resolving members individually. Error: %s' % (membershipKey,excp),
+        'error')
+      memberFCSObjs = {}
+      bulkSearchFailed = True
+    
     ## Iterate through our members and fetch each's asset ID
     count = 0
     for memberValue in importMemberValues:
       if debug:
         print 'DEBUG: processing memberValue: %s' % memberValue
     
-      ## Create an FCSVRClient object for our memberID
-      memberFCSObj = FCSVRClient(configParser=cfgParser)
-      if debug:
-        memberFCSObj.debug = True
+      ## Fetch the FCSVRClient object for our memberID, if our bulk search
+      ## failed, search for our member on it's own.
       try:
-        memberFCSObj.initWithAssetFromField(FCSXMLField(name=membershipKey,value=memberValue))
-      except Exception, excp:
+        if bulkSearchFailed:
+          memberFCSObj = FCSVRClient(configParser=cfgParser)
+          if debug:
+            memberFCSObj.debug = True
+          memberFCSObj.initWithAssetFromField(FCSXMLField(name=membershipKey,
+                                                            value=memberValue))
+        else:
+          memberFCSObj = memberFCSObjs[memberValue]
+      except Exception:
         print ('   * Cannot find asset for field: \'%s\' with value: \'%s\', '
            'unable to add to production list' % (membershipKey,memberValue))
         invalidMembers.append(memberValue)
@@ -15,10 +15,10 @@ import os
 import re
 import sys
 import datetime
-import signal
-import subprocess
 import time
 
+import fcsxml
+
 #import createDailyReel
 
 ## init our vars
@@ -178,28 +178,16 @@ class QmasterBatch():
   
     self.logger('Submission syntax: %s' % submitCMDString,'debug')
     
-    ## Set our timeout 
-    # Set the signal handler and a 5-second alarm
-    signal.signal(signal.SIGALRM, self.qmasterTimeoutHandler)
-    signal.alarm(self.compressorSubmissionTimeout)
-    try:
-      submitCMD = subprocess.Popen(submitCMDString,shell=True,stdout=subprocess.PIPE,stderr=subprocess.PIPE,universal_newlines=True)
-      cmd_STDOUT,cmd_STDERR = submitCMD.communicate()
-
-      ## Throw an error if non-zero return code from compressor
-      if not submitCMD.returncode == 0:      
-        raise QmasterSubmissionError(error=cmd_STDERR,retCode=submitCMD.returncode)
-    except QmasterSubmissionTimeoutError:
-        ## If we are Python 2.5, use os to kill the process.
-        versionInfo = sys.version_info
-        if versionInfo[0] == 2 and versionInfo[1] <= 5:
-          os.kill(submitCMD.pid, signal.SIGKILL)
-        else:
-          submitCMD.kill()
-        raise QmasterSubmissionTimeoutError()
-        
-    ## Cancel our timeout
-    signal.alarm(0)
+    ## Submit our job, Compressor is killed if it exceeds our timeout
+    submitCMD = self.runCommand(submitCMDString,
+                                  timeout=self.compressorSubmissionTimeout)
+    cmd_STDOUT,cmd_STDERR = submitCMD.stdout,submitCMD.stderr
+    if submitCMD.timedOut:
+      raise QmasterSubmissionTimeoutError()
+    
+    ## Throw an error if non-zero return code from compressor
+    if not submitCMD.returncode == 0:      
+      raise QmasterSubmissionError(error=cmd_STDERR,retCode=submitCMD.returncode)
     
     if not cmd_STDERR:
       raise QmasterNullDataError()
@@ -293,11 +281,8 @@ class QmasterBatch():
           (self.batchMonitorPath,self.cluster,self.batchID))
           
     self.logger('Checking batch status using syntax: \'%s\'' % statusCMDString,'debug')
-    statusCMD = subprocess.Popen(statusCMDString,shell=True,
-                                  stdout=subprocess.PIPE,
-                                  stderr=subprocess.PIPE,
-                                  universal_newlines=True)
-    cmd_STDOUT,cmd_STDERR = statusCMD.communicate()
+    statusCMD = self.runCommand(statusCMDString)
+    cmd_STDOUT,cmd_STDERR = statusCMD.stdout,statusCMD.stderr
     
     ## Batch Monitor returns malformed markup, we have to modify
     ## the closing tag to parse this properly
@@ -306,8 +291,13 @@ class QmasterBatch():
     
     return batchmonitor.status
 
-  def qmasterTimeoutHandler(signum,frame):
-    raise QmasterSubmissionTimeoutError
+  def runCommand(self,cmdString,timeout=0):
+    '''Runs the provided command via our shared, instrumented command runner,
+    see :func:`fcsxml.FCSCommandRunner.run`.
+    
+    :returns: (:class:`fcsxml.FCSCommandResult`) -- The command results
+    '''
+    return fcsxml.commandRunner.run(cmdString,timeout=timeout)
 
   def logger(self, logMSG, logLevel='normal'):
     '''(very) Basic Logging Function, we'll probably migrate to msg module'''
@@ -20,7 +20,6 @@ from ftplib import FTP
 from fcsxml import FCSXMLField, FCSXMLObject
 from transmogrifierTarget import TransmogrifierTargetObject, MediaFile
 from ConfigParser import *
-import subprocess 
 
 
 from xml.dom import minidom
@@ -184,11 +183,11 @@ class ShakeBlenderObject(TransmogrifierTargetObject):
             return False
             
         ## this could be Pythonized quite a bit
-        durationCMD = subprocess.Popen('/usr/libexec/podcastproducer/qtinfo "%s" | awk -F= \'/duration/ {print$2}\' | perl -p -e \'s/.*?\"(.*?)\".*$/$1/g\'' % filePath,shell=True,stdout=subprocess.PIPE,universal_newlines=True)
-        frameRateCMD = subprocess.Popen('/usr/libexec/podcastproducer/qtinfo "%s" | awk -F= \'/frameRate/ {print$2}\' | perl -p -e \'s/(.*?);.*$/$1/g\'' % filePath,shell=True,stdout=subprocess.PIPE,universal_newlines=True)
+        durationCMD = self.runCommand('/usr/libexec/podcastproducer/qtinfo "%s" | awk -F= \'/duration/ {print$2}\' | perl -p -e \'s/.*?\"(.*?)\".*$/$1/g\'' % filePath)
+        frameRateCMD = self.runCommand('/usr/libexec/podcastproducer/qtinfo "%s" | awk -F= \'/frameRate/ {print$2}\' | perl -p -e \'s/(.*?);.*$/$1/g\'' % filePath)
         
-        durationCMD_STDOUT, durationCMD_STDERR = durationCMD.communicate()
-        frameRateCMD_STDOUT, frameRateCMD_STDERR = frameRateCMD.communicate()
+        durationCMD_STDOUT = durationCMD.stdout
+        frameRateCMD_STDOUT = frameRateCMD.stdout
         
         if not durationCMD_STDOUT:
             self.logger("frameCountForMovieAtPath() could not get duration for movie at path:'%s'" % filePath,"error")
@@ -292,26 +291,26 @@ class ShakeBlenderObject(TransmogrifierTargetObject):
                 
                                 
                 ## Run our shake script
-                shakeRetCode = subprocess.call("/usr/bin/shake -exec '%s'" % (tempFilePath),shell=True,universal_newlines=True)
+                shakeRetCode = self.runCommand("/usr/bin/shake -exec '%s'" % (tempFilePath),captureOutput=False).returncode
                 if shakeRetCode is not 0:
                     self.logger("specialFunction('autoKey') Shake processing failed return code:'%s'" % shakeRetCode, "error")
                     return False
                 
                 ## Extract the audio from our source file
-                qtextractRetCode = subprocess.call("/usr/libexec/podcastproducer/qttrackextract audio '%s' '%s'" % (self.inFilePath,tempAudioFilePath),shell=True,stdout=subprocess.PIPE,universal_newlines=True)
+                qtextractRetCode = self.runCommand("/usr/libexec/podcastproducer/qttrackextract audio '%s' '%s'" % (self.inFilePath,tempAudioFilePath)).returncode
                 if qtextractRetCode is not 0:
                     self.logger("specialFunction('autoKey') Could not extract audio from movie:'%s' return code:'%s'" %(self.inFilePath,qtextractRetCode), "error")
                     return False
                 
                 ## Reattach the file
-                qtTrackAddRetCode = subprocess.call("/usr/libexec/podcastproducer/qttrackadd '%s' '%s' '%s'" % (tempAudioFilePath,tempRenderFilePath,tempReferenceFilePath),shell=True,universal_newlines=True)
+                qtTrackAddRetCode = self.runCommand("/usr/libexec/podcastproducer/qttrackadd '%s' '%s' '%s'" % (tempAudioFilePath,tempRenderFilePath,tempReferenceFilePath),captureOutput=False).returncode
                 ## "/usr/libexec/podcastproducer/qtjoin qttrackadd /private/tmp/audiofile.mov '" + self.outFilePath + "' '" + self.outFilePathStitched" 
                 if qtTrackAddRetCode is not 0:
                     self.logger("specialFunction('autoKey') Could not place audiofile:'%s' into movie:'%s' return code:'%s'" %(tempAudioFilePath,tempRenderFilePath,qtextractRetCode), "error")
                     return False
 
                 ## Save a flattened copy of the movie in it's final destination
-                qtFlattenRetCode = subprocess.call("/usr/libexec/podcastproducer/qtflatten '%s' '%s'" % (tempReferenceFilePath,self.outFilePath),shell=True,universal_newlines=True)
+                qtFlattenRetCode = self.runCommand("/usr/libexec/podcastproducer/qtflatten '%s' '%s'" % (tempReferenceFilePath,self.outFilePath),captureOutput=False).returncode
                 if qtFlattenRetCode is not 0:
                     self.logger("specialFunction('autoKey') Could not flatten movie:'%s' into movie:'%s' return code:'%s'" %(tempReferenceFilePath,self.outFilePath,qtFlattenRetCode), "error")
                     return False
@@ -1116,16 +1116,17 @@ def main():
           theField = fcsxml.FCSVRClient(configParser=cfgParser).initFieldWithFieldName(
                                               fieldName=theAction['fieldName'])
           ##theField = FCSXMLField(name=theAction["fieldName"])
-          if debug:
-            theField.debug = True
           theField.setValue(theAction["value"])
           
           if len(myTargetObjects) > 0:
-            for theObject in myTargetObjects:
-              theObject.setField(theField)
-              theObject.setMD()
-              ## Sleep for a few seconds between values
-              time.sleep(.5)
+            results = fcsxml.FCSVRClient(configParser=cfgParser).setMDForEntities(
+                        [(theObject,[theField]) for theObject in myTargetObjects])
+            for entityPath,result in results.iteritems():
+              if not result is True:
+                print ("ERROR Could not set field: %s for entity: %s. "
+                  " Reported Error: %s " % (theAction['fieldName'],entityPath,
+                                                                      result))
+                exitCode = 15
         elif actionName == "appendField":
           #print "Setting Field:%s to value:%s" % (theAction["fieldName"],theAction["value"])
           ## Get the current value
@@ -1143,7 +1144,14 @@ def main():
                                       fieldName=theAction['fieldName'],
                                       value=theAction['value'],
                                       useTimestamp = theAction['timestamp'])
-              target.setMD()
+            results = fcsxml.FCSVRClient(configParser=cfgParser).setMDForEntities(
+                                                              myTargetObjects)
+            for entityPath,result in results.iteritems():
+              if not result is True:
+                print ("ERROR Could not append field: %s for entity: %s. "
+                  " Reported Error: %s " % (theAction['fieldName'],entityPath,
+                                                                      result))
+                exitCode = 15
           
         elif actionName == "setBoolField":
           #print "Setting Field:%s to value:%s" % (theAction["fieldName"],theAction["value"])
@@ -1155,10 +1163,13 @@ def main():
             myTargetObject.setField(theField)
             myTargetObject.setMD()
           if myTargetObjects:
-            for theObject in myTargetObjects:
-              if theObject.setField(theField):
-                theObject.setMD()
-              else:
+            results = fcsxml.FCSVRClient(configParser=cfgParser).setMDForEntities(
+                        [(theObject,[theField]) for theObject in myTargetObjects])
+            for entityPath,result in results.iteritems():
+              if not result is True:
+                print ("ERROR Could not set field: %s for entity: %s. "
+                  " Reported Error: %s " % (theAction['fieldName'],entityPath,
+                                                                      result))
                 exitCode = 15
         elif actionName == "getAssetID":
           if myTargetObject:
@@ -1229,6 +1240,7 @@ def main():
               myTitle = ""
             print "ASSET_TITLE: %s" % myTitle
         elif actionName == "archive":
+          results = []
           if myTargetObject:
             print "Archiving Asset: %s" % myTargetObject.entityPath()
             try:
@@ -1236,17 +1248,22 @@ def main():
             except fcsxml.FCSAssetOfflineError,err:
               print " - %s" % eval(err.__str__())
               return 9
+            except fcsxml.FCSEntityActionError,err:
+              results = err.results
           if myTargetObjects:
-            myRetCode = 0
             for theObject in myTargetObjects:
               print "Archiving Asset: %s" % theObject.entityPath()
-              try:
-                theObject.archive()
-              except fcsxml.FCSAssetOfflineError,err:
-                print " - %s" % eval(err.__str__())
-                myRetCode = 9
-            if myRetCode == 9:
-              return myRetCode
+            results = fcsxml.FCSVRClient(configParser=cfgParser).performActionOnEntities(
+                                            myTargetObjects,action='archive')
+          myRetCode = 0
+          for result in results:
+            if isinstance(result.error,fcsxml.FCSAssetOfflineError):
+              print " - %s: %s" % (result.entityPath,eval(result.error.__str__()))
+              myRetCode = 9
+            elif result.error:
+              raise result.error
+          if myRetCode == 9:
+            return myRetCode
                 
         elif actionName == "restore":
           if myTargetObject:
@@ -1255,7 +1272,11 @@ def main():
           if myTargetObjects:
             for theObject in myTargetObjects:
               print "Restoring Asset: %s" % theObject.entityPath()
-              theObject.restore()
+            results = fcsxml.FCSVRClient(configParser=cfgParser).performActionOnEntities(
+                                            myTargetObjects,action='restore')
+            for result in results:
+              if result.error:
+                raise result.error
         elif actionName == "analyze":
           if myTargetObject:
             print "Analyzing Asset: %s" % myTargetObject.entityPath()
@@ -1263,7 +1284,11 @@ def main():
           if myTargetObjects:
             for theObject in myTargetObjects:
               print "Analyzing Asset: %s" % theObject.entityPath()
-              theObject.analyze(force=True)
+            results = fcsxml.FCSVRClient(configParser=cfgParser).performActionOnEntities(
+                        myTargetObjects,action='analyze',actionArgs={'force':True})
+            for result in results:
+              if result.error:
+                raise result.error
         elif actionName == "getProductionID":
           if myTargetObject:
             print "PRODUCTION_ID: %s" % myTargetObject.entityID
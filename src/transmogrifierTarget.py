@@ -17,6 +17,7 @@
 
 import os, os.path, re, glob, hashlib, shutil, sys, types, datetime, time
 from ftplib import FTP
+import fcsxml
 from fcsxml import FCSXMLField, FCSXMLObject
 from ConfigParser import *
 
@@ -140,6 +141,12 @@ class TransmogrifierTargetObject:
       if logLevel == "all" or logLevel == log["logLevel"]:
         print "%s:%s:%s" % (self.serviceName,log["logLevel"], log["logMSG"]) 
   
+  def runCommand(self, cmdString, timeout=0, captureOutput=True):
+    """Runs the provided command via our shared, instrumented command runner, 
+    returns an fcsxml.FCSCommandResult object. See fcsxml.FCSCommandRunner.run()"""
+    return fcsxml.commandRunner.run(cmdString,timeout=timeout,
+                                              captureOutput=captureOutput)
+  
   def loadConfiguration(self, parser):
     """Load from configuration file, expects a ConfigParser type object. If you subclass, 
     you should call this function. If we return false then you should abort. or do your own sanity checks"""
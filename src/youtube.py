@@ -96,7 +96,7 @@ class YouTubeObject(TransmogrifierTargetObject):
       entityID = re.sub(' ','_',re.sub(r'^(.*?)\.xml$',r'\1',os.path.basename(theFilePath)))
       self.logger("Checking batch status for job: %s" % entityID, "detailed")
       print "/usr/bin/sftp %s@%s:%s/status-%s.xml '%s/status-%s.xml'" % (self.ytUsername,self.ytSFTPServer,entityID,entityID,os.path.join(self.supportPath, "xmlin"),entityID)
-      if not os.system("/usr/bin/sftp %s@%s:%s/status-%s.xml \'%s/status-%s.xml\'" % (self.ytUsername,self.ytSFTPServer,entityID,entityID,os.path.join(self.supportPath, "xmlin"),entityID)):
+      if not self.runCommand("/usr/bin/sftp %s@%s:%s/status-%s.xml \'%s/status-%s.xml\'" % (self.ytUsername,self.ytSFTPServer,entityID,entityID,os.path.join(self.supportPath, "xmlin"),entityID),captureOutput=False).returncode:
         ## at this point we have sftp'd the status file locally to the xmlin
         ## directory. Check the file for any reported problems:
         ytXMLInPath = os.path.join(self.supportPath, "xmlin", "status-%s.xml" % entityID)
@@ -324,7 +324,7 @@ class YouTubeObject(TransmogrifierTargetObject):
         didFinishUpload = False;
         while ((currentRetryNum <= retryCount) and (not didFinishUpload)):
           ## Upload our files based on our batch process list
-          if not os.system("/usr/bin/sftp -b '%s' %s@%s" % (batchFilePath, self.ytUsername,self.ytSFTPServer)):
+          if not self.runCommand("/usr/bin/sftp -b '%s' %s@%s" % (batchFilePath, self.ytUsername,self.ytSFTPServer),captureOutput=False).returncode:
             currentTime = datetime.datetime.fromtimestamp(time.mktime(datetime.datetime.now().timetuple()))
             didFinishUpload = True;
             self.logger("upload() successfully uploaded files!", "detailed")
@@ -359,7 +359,7 @@ class YouTubeObject(TransmogrifierTargetObject):
       currentRetryNum = 1;
 
       while(currentRetryNum <= retryCount):
-        if not os.system("/usr/bin/sftp -b '%s' %s@%s" % (batchFilePath, self.ytUsername,self.ytSFTPServer)):
+        if not self.runCommand("/usr/bin/sftp -b '%s' %s@%s" % (batchFilePath, self.ytUsername,self.ytSFTPServer),captureOutput=False).returncode:
       
           ## Generate our shell file in our 'inprogress' directory
           ## so that we can keep track of existing is-progress uploads